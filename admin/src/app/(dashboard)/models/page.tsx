@@ -13,6 +13,11 @@ import { Card, CardContent, CardDescription, CardFooter, CardHeader, CardTitle }
 import { getModels, selectModel } from "@/features/admin/api";
 import type { ModelSelectionResponse } from "@/features/admin/types";
 
+function formatMetric(value: number | null, percent = false) {
+  if (value === null || value === undefined) return "-";
+  return percent ? `${Math.round(value * 100)}%` : value.toFixed(2);
+}
+
 const MODEL_DESCRIPTIONS: Record<string, string> = {
   "yolo11n.pt": "Ultra-fast lightweight model. Ideal for real-time edge processing with minimal latency.",
   "yolo11s.pt": "Balanced detection model. Offers a compromise between speed and accuracy for most classrooms.",
@@ -179,6 +184,24 @@ export default function ModelsPage() {
                           </p>
                         </div>
                       </div>
+                      {model.evaluations?.length ? (
+                        <div className="mt-3 space-y-1 text-xs text-muted-foreground">
+                          {model.evaluations.map((evaluation) => (
+                            <div
+                              key={evaluation.imgsz}
+                              className="grid grid-cols-5 gap-2 rounded-lg border border-border/50 px-3 py-2"
+                            >
+                              <span className="font-semibold text-foreground/80">{evaluation.imgsz}px</span>
+                              <span title="Macro precision">P {formatMetric(evaluation.macro_precision, true)}</span>
+                              <span title="Macro recall">R {formatMetric(evaluation.macro_recall, true)}</span>
+                              <span title="Mean absolute count error per frame">MAE {formatMetric(evaluation.count_mae)}</span>
+                              <span title={`CPU, ${evaluation.frames} frames`}>{formatMetric(evaluation.cpu_fps)} fps</span>
+                            </div>
+                          ))}
+                        </div>
+                      ) : (
+                        <p className="mt-3 text-xs text-muted-foreground">Not evaluated yet.</p>
+                      )}
                     </CardContent>
                     <CardFooter>
                       <Button
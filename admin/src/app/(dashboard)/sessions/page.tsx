@@ -151,6 +151,7 @@ export default function SessionsPage() {
   const [items, setItems] = useState<AdminSession[]>([]);
   const [activeItems, setActiveItems] = useState<AdminSession[]>([]);
   const [totalItems, setTotalItems] = useState(0);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
   const [loadingMore, setLoadingMore] = useState(false);
   const [selectedSessionId, setSelectedSessionId] = useState<number | null>(null);
@@ -183,10 +184,12 @@ export default function SessionsPage() {
     return () => clearTimeout(timer);
   }, [searchQuery]);
 
-  const buildQueryString = useCallback((skip: number, limit: number) => {
+  const buildQueryString = useCallback((limit: number, cursor: string | null = null) => {
     const params = new URLSearchParams();
-    params.set("skip", skip.toString());
     params.set("limit", limit.toString());
+    // Only the first page carries the (count) total; later pages continue from the cursor.
+    if (cursor) params.set("cursor", cursor);
+    else params.set("include_total", "true");
     if (debouncedSearch) params.set("search", debouncedSearch);
     if (statusFilter !== "all") params.set("is_active", statusFilter === "live" ? "true" : "false");
     if (teacherFilter) params.set("teacher_id", teacherFilter.toString());
@@ -207,8 +210,7 @@ export default function SessionsPage() {
     }
 
     try {
-      const skip = reset ? 0 : items.length;
-      const query = buildQueryString(skip, PAGE_SIZE);
+      const query = buildQueryString(PAGE_SIZE, reset ? null : nextCursor);
       
       const [sessionsRes, teachersRes, collegesRes] = await Promise.all([
         getSessions(query),
@@ -218,10 +220,11 @@ export default function SessionsPage() {
 
       if (reset) {
         setItems(sessionsRes.items);
+        setTotalItems(sessionsRes.total ?? sessionsRes.items.length);
       } else {
         setItems(prev => [...prev, ...sessionsRes.items]);
       }
-      setTotalItems(sessionsRes.total);
+      setNextCursor(sessionsRes.next_cursor ?? null);
       setTeachers(teachersRes.items);
       setColleges(collegesRes.items);
 
@@ -241,7 +244,7 @@ export default function SessionsPage() {
       setLoading(false);
       setLoadingMore(false);
     }
-  }, [notify, buildQueryString, items.length]);
+  }, [notify, buildQueryString, nextCursor]);
 
   // Initial load or on filter change
   useEffect(() => {
@@ -255,10 +258,11 @@ export default function SessionsPage() {
             const activeRes = await getSessions("?is_active=true&limit=50");
             setActiveItems(activeRes.items);
             // Also refresh current items to update live engagement scores in the list
-            const currentQuery = buildQueryString(0, items.length || PAGE_SIZE);
+            const currentQuery = buildQueryString(items.length || PAGE_SIZE);
             const refreshRes = await getSessions(currentQuery);
             setItems(refreshRes.items);
-            setTotalItems(refreshRes.total);
+            setTotalItems(refreshRes.total ?? refreshRes.items.length);
+            setNextCursor(refreshRes.next_cursor ?? null);
         } catch (e) {
             console.error("Polling failed", e);
         }
@@ -796,7 +800,7 @@ export default function SessionsPage() {
                   </Table>
                 </div>
 
-                {items.length < totalItems && (
+                {nextCursor && (
                   <div className="flex justify-center py-4">
                     <Button
                       variant="outline"
@@ -553,7 +553,7 @@ export default function SettingsPage() {
     setSettings((prev) => (prev ? { ...prev, exam_proctoring: { ...prev.exam_proctoring, [key]: value } } : prev));
   };
 
-  const updateAdminOps = (key: keyof AdminSettings["admin_ops"], value: boolean) => {
+  const updateAdminOps = (key: keyof AdminSettings["admin_ops"], value: boolean | number) => {
     setSettings((prev) => (prev ? { ...prev, admin_ops: { ...prev.admin_ops, [key]: value } } : prev));
   };
 
@@ -856,6 +856,19 @@ export default function SettingsPage() {
                     onChange={(e) => updateAdminOps("enable_admin_log_stream", e.target.checked)}
                   />
                 </label>
+                <div className="space-y-1">
+                  <label className="text-sm font-medium">Behavior log retention (days)</label>
+                  <Input
+                    type="number"
+                    min={0}
+                    max={3650}
+                    value={settings.admin_ops.behavior_log_retention_days}
+                    onChange={(e) => updateAdminOps("behavior_log_retention_days", Number(e.target.value || 0))}
+                  />
+                  <p className="text-xs text-muted-foreground">
+                    Logs of sessions ended longer ago are moved to archives. 0 keeps everything.
+                  </p>
+                </div>
               </div>
             </SettingsSection>
 
@@ -268,6 +268,30 @@ export type SessionMetricPoint = {
   engagement_score: number;
 };
 
+export type SessionFinalSummary = {
+  finalized_at: string | null;
+  duration_seconds: number;
+  log_count: number;
+  minute_count: number;
+  max_students_detected: number;
+  on_task_avg: number;
+  using_phone_avg: number;
+  sleeping_avg: number;
+  off_task_avg: number;
+  not_visible_avg: number;
+  average_engagement: number;
+  headcount_average_engagement: number;
+  peak_engagement: number | null;
+  peak_engagement_at: string | null;
+  lowest_engagement: number | null;
+  lowest_engagement_at: string | null;
+  alert_count: number;
+  critical_alert_count: number;
+  alerts_by_type: Record<string, number>;
+  time_in_state: Record<string, number>;
+  engagement_curve: [number, number][];
+};
+
 export type AdminSessionDetail = {
   session: AdminSession;
   total_logs: number;
@@ -275,11 +299,25 @@ export type AdminSessionDetail = {
   unread_alerts: number;
   logs: SessionLogPoint[];
   metrics_rollup: SessionMetricPoint[];
+  summary: SessionFinalSummary | null;
+};
+
+export type ModelEvaluation = {
+  imgsz: number;
+  confidence_threshold: number;
+  iou_threshold: number;
+  frames: number;
+  macro_precision: number | null;
+  macro_recall: number | null;
+  count_mae: number | null;
+  cpu_fps: number | null;
+  evaluated_at: string;
 };
 
 export type ModelOption = {
   file_name: string;
   is_current: boolean;
+  evaluations?: ModelEvaluation[];
 };
 
 export type ModelSelectionResponse = {
@@ -318,8 +356,10 @@ export type AdminAuditLogEntry = {
 };
 
 export type PaginatedResponse<T> = {
-  total: number;
+  // null unless the request sets include_total.
+  total: number | null;
   items: T[];
+  next_cursor?: string | null;
 };
 
 export type AdminWeightsSet = {
@@ -353,6 +393,7 @@ export type AdminSettings = {
   };
   admin_ops: {
     enable_admin_log_stream: boolean;
+    behavior_log_retention_days: number;
   };
   security: {
     access_token_expire_minutes: number;
@@ -1,3 +1,5 @@
+import 'dart:convert';
+
 import 'package:dio/dio.dart';
 import 'package:flutter/material.dart';
 import '../config/env_config.dart';
@@ -61,6 +63,47 @@ class ApiClient {
     }
   }
 
+  /// Reads a Server-Sent Events endpoint until the server closes it or the
+  /// subscription is cancelled. The server pings every 15 seconds, so a silent
+  /// connection for longer than [idleTimeout] is treated as dead.
+  Stream<ServerEvent> events(String path,
+      {Duration idleTimeout = const Duration(seconds: 45)}) async* {
+    final Response<ResponseBody> response;
+    try {
+      response = await _dio.get<ResponseBody>(
+        path,
+        options: Options(
+          responseType: ResponseType.stream,
+          receiveTimeout: idleTimeout,
+          headers: {'Accept': 'text/event-stream'},
+        ),
+      );
+    } on DioException catch (e) {
+      throw _handleError(e);
+    }
+    var event = 'message';
+    final data = StringBuffer();
+    final lines = response.data!.stream
+        .cast<List<int>>()
+        .transform(utf8.decoder)
+        .transform(const LineSplitter());
+    await for (final line in lines) {
+      if (line.isEmpty) {
+        if (data.isNotEmpty) {
+          yield ServerEvent(event, data.toString());
+        }
+        event = 'message';
+        data.clear();
+      } else if (line.startsWith('event:')) {
+        event = line.substring(6).trim();
+      } else if (line.startsWith('data:')) {
+        if (data.isNotEmpty) data.write('\n');
+        data.write(line.substring(5).trimLeft());
+      }
+      // Lines starting with ':' are keep-alive comments.
+    }
+  }
+
   dynamic _handleError(DioException e) {
     // 401 is already handled by AuthInterceptor (redirect + toast).
     String message = "Something went wrong";
@@ -85,3 +128,11 @@ class ApiException implements Exception {
   @override
   String toString() => message;
 }
+
+class ServerEvent {
+  final String event;
+  final String data;
+  ServerEvent(this.event, this.data);
+
+  Map<String, dynamic> get json => jsonDecode(data) as Map<String, dynamic>;
+}
@@ -49,6 +49,13 @@ class SessionRepository {
     }
   }
 
+  /// Live updates of an active session: a `snapshot` (same body as the
+  /// metrics endpoint) followed by `log`, `alert`, `alert_read`, `resync` and
+  /// `session_ended` events.
+  Stream<ServerEvent> sessionEvents(int sessionId) {
+    return _apiClient.events('/sessions/$sessionId/events');
+  }
+
   Future<SessionMetricsModel> getSessionMetrics(int sessionId) async {
     final response = await _apiClient.get('/sessions/$sessionId/metrics');
     final data = response.data;
@@ -145,6 +145,22 @@ class SessionMetricsModel {
           .toList(),
     );
   }
+
+  SessionMetricsModel copyWith({
+    int? totalLogs,
+    double? averageEngagement,
+    List<BehaviorLogModel>? recentLogs,
+    List<AlertModel>? alerts,
+  }) {
+    return SessionMetricsModel(
+      sessionId: sessionId,
+      studentsPresent: studentsPresent,
+      totalLogs: totalLogs ?? this.totalLogs,
+      averageEngagement: averageEngagement ?? this.averageEngagement,
+      recentLogs: recentLogs ?? this.recentLogs,
+      alerts: alerts ?? this.alerts,
+    );
+  }
 }
 
 class SessionSummaryModel {
@@ -1,6 +1,7 @@
 import 'package:flutter/material.dart';
 import 'package:teachtrack/features/session/domain/models/session_models.dart';
 import 'package:teachtrack/features/session/data/repositories/session_repository.dart';
+import 'package:teachtrack/core/network/api_client.dart';
 import 'dart:async';
 import 'package:teachtrack/core/services/foreground_session_service.dart';
 
@@ -14,6 +15,7 @@ class SessionProvider extends ChangeNotifier {
   bool _isLoading = false;
   String? _error;
   Timer? _metricsTimer;
+  StreamSubscription<ServerEvent>? _eventsSubscription;
   List<SessionSummaryModel> _history = [];
   bool _historyLoading = false;
   String? _historyError;
@@ -45,14 +47,14 @@ class SessionProvider extends ChangeNotifier {
         await ForegroundSessionService.startOrUpdate(session: _activeSession!);
       } else {
         _metrics = null;
-        _metricsTimer?.cancel();
+        _stopMetricsUpdates();
         await ForegroundSessionService.stop();
       }
     } catch (e) {
       _error = e.toString();
       _activeSession = null;
       _metrics = null;
-      _metricsTimer?.cancel();
+      _stopMetricsUpdates();
       await ForegroundSessionService.stop();
     } finally {
       _isLoading = false;
@@ -94,7 +96,7 @@ class SessionProvider extends ChangeNotifier {
       await _repository.stopSession(_activeSession!.id);
       _activeSession = null;
       _metrics = null;
-      _metricsTimer?.cancel();
+      _stopMetricsUpdates();
       await ForegroundSessionService.stop();
       await fetchSessionHistory(includeActive: false);
       notifyListeners();
@@ -107,7 +109,7 @@ class SessionProvider extends ChangeNotifier {
   void clearSessionState() {
     _activeSession = null;
     _metrics = null;
-    _metricsTimer?.cancel();
+    _stopMetricsUpdates();
     _isLoading = false;
     _error = null;
     _history = [];
@@ -122,28 +124,116 @@ class SessionProvider extends ChangeNotifier {
     notifyListeners();
   }
 
+  /// Follows the session's event stream; polls the metrics endpoint only while
+  /// the stream is unavailable.
   void startMetricsPolling() {
+    _stopMetricsUpdates();
+    _listenToSessionEvents();
+  }
+
+  void _stopMetricsUpdates() {
+    _metricsTimer?.cancel();
+    _metricsTimer = null;
+    _eventsSubscription?.cancel();
+    _eventsSubscription = null;
+  }
+
+  void _listenToSessionEvents() {
+    final sessionId = _activeSession?.id;
+    if (sessionId == null) return;
+    _eventsSubscription = _repository.sessionEvents(sessionId).listen(
+      _onSessionEvent,
+      onError: (Object e) {
+        debugPrint("Session event stream failed: $e");
+        _pollUntilReconnect(sessionId);
+      },
+      onDone: () => _pollUntilReconnect(sessionId),
+      cancelOnError: true,
+    );
+  }
+
+  void _pollUntilReconnect(int sessionId) {
+    _eventsSubscription = null;
+    if (_activeSession?.id != sessionId) return;
+    fetchMetrics();
+    var ticks = 0;
     _metricsTimer?.cancel();
-    fetchMetrics(); // Initial fetch
     _metricsTimer = Timer.periodic(const Duration(seconds: 5), (timer) {
-      fetchMetrics();
+      if (++ticks % 6 == 0) {
+        timer.cancel();
+        _metricsTimer = null;
+        _listenToSessionEvents();
+      } else {
+        fetchMetrics();
+      }
     });
   }
 
+  void _onSessionEvent(ServerEvent event) {
+    final current = _metrics;
+    switch (event.event) {
+      case 'snapshot':
+        _metrics = SessionMetricsModel.fromJson(event.json);
+        break;
+      case 'log':
+        if (current == null) return;
+        final payload = event.json;
+        final logs = [
+          ...current.recentLogs,
+          BehaviorLogModel.fromJson(payload['log'] as Map<String, dynamic>),
+        ];
+        final recent = logs.length > 20 ? logs.sublist(logs.length - 20) : logs;
+        _metrics = current.copyWith(
+          recentLogs: recent,
+          totalLogs: recent.length,
+          averageEngagement: (payload['average_engagement'] as num?)?.toDouble(),
+        );
+        break;
+      case 'alert':
+        if (current == null) return;
+        _metrics = current.copyWith(
+          alerts: [...current.alerts, AlertModel.fromJson(event.json)],
+        );
+        break;
+      case 'alert_read':
+        if (current == null) return;
+        final alertId = (event.json['id'] as num?)?.toInt();
+        _metrics = current.copyWith(
+          alerts: current.alerts.where((a) => a.id != alertId).toList(),
+        );
+        break;
+      case 'resync':
+        fetchMetrics();
+        return;
+      case 'session_ended':
+        _stopMetricsUpdates();
+        checkActiveSession();
+        return;
+      default:
+        return;
+    }
+    _publishMetrics();
+  }
+
   Future<void> fetchMetrics() async {
     if (_activeSession == null) return;
     try {
       _metrics = await _repository.getSessionMetrics(_activeSession!.id);
-      await ForegroundSessionService.startOrUpdate(
-        session: _activeSession!,
-        metrics: _metrics,
-      );
-      notifyListeners();
+      await _publishMetrics();
     } catch (e) {
       debugPrint("Error fetching metrics: $e");
     }
   }
 
+  Future<void> _publishMetrics() async {
+    if (_activeSession == null) return;
+    await ForegroundSessionService.startOrUpdate(
+      session: _activeSession!,
+      metrics: _metrics,
+    );
+    notifyListeners();
+  }
+
   Future<void> fetchSessionHistory({bool includeActive = false}) async {
     _historyLoading = true;
     _historyError = null;
@@ -238,7 +328,7 @@ class SessionProvider extends ChangeNotifier {
 
   @override
   void dispose() {
-    _metricsTimer?.cancel();
+    _stopMetricsUpdates();
     super.dispose();
   }
 }
@@ -0,0 +1,82 @@
+"""add search_documents and search_tokens (admin search index)
+
+Revision ID: a4b6c8d0e2f4
+Revises: f3a9c5d7e1b2
+Create Date: 2026-10-19 17:00:00.000000
+
+Existing users, subjects and class sections are indexed here, as
+search_service.rebuild_index does; from then on mapper events keep the index current.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.search import index_entries
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4b6c8d0e2f4'
+down_revision = 'f3a9c5d7e1b2'
+branch_labels = None
+depends_on = None
+
+# Tables as of this revision: entity type, table and searchable columns (app.models.search).
+_INDEXED = {
+    'user': ('users', ('username', 'fullname', 'firstname', 'lastname', 'email')),
+    'subject': ('subjects', ('name', 'code')),
+    'section': ('class_sections', ('name', 'section_code')),
+}
+_BATCH_SIZE = 500
+
+
+def upgrade() -> None:
+    op.create_table(
+        'search_documents',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('entity_type', sa.String(length=20), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_search_documents_entity', 'search_documents', ['entity_type', 'entity_id'], unique=True)
+    if op.get_bind().dialect.name == 'mysql':
+        op.create_index('ix_search_documents_content', 'search_documents', ['content'], mysql_prefix='FULLTEXT')
+
+    op.create_table(
+        'search_tokens',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('entity_type', sa.String(length=20), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('token', sa.String(length=64), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_search_tokens_lookup', 'search_tokens', ['entity_type', 'token', 'entity_id'], unique=False)
+    op.create_index('ix_search_tokens_entity', 'search_tokens', ['entity_type', 'entity_id'], unique=False)
+
+    _backfill()
+
+
+def _backfill() -> None:
+    bind = op.get_bind()
+    documents = sa.table(
+        'search_documents', sa.column('entity_type'), sa.column('entity_id'), sa.column('content')
+    )
+    tokens = sa.table('search_tokens', sa.column('entity_type'), sa.column('entity_id'), sa.column('token'))
+    for entity_type, (table_name, fields) in _INDEXED.items():
+        source = sa.table(table_name, sa.column('id'), *(sa.column(name) for name in fields))
+        rows = bind.execute(sa.select(source.c.id, *(source.c[name] for name in fields)).order_by(source.c.id)).all()
+        for start in range(0, len(rows), _BATCH_SIZE):
+            document_rows, token_rows = index_entries(entity_type, rows[start:start + _BATCH_SIZE])
+            if document_rows:
+                op.bulk_insert(documents, document_rows)
+                op.bulk_insert(tokens, token_rows)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_search_tokens_entity', table_name='search_tokens')
+    op.drop_index('ix_search_tokens_lookup', table_name='search_tokens')
+    op.drop_table('search_tokens')
+    if op.get_bind().dialect.name == 'mysql':
+        op.drop_index('ix_search_documents_content', table_name='search_documents')
+    op.drop_index('ix_search_documents_entity', table_name='search_documents')
+    op.drop_table('search_documents')
@@ -0,0 +1,90 @@
+"""composite indexes for hot alert, log and listing queries; drop redundant ones
+
+Revision ID: b5c7d9e1f3a5
+Revises: a4b6c8d0e2f4
+Create Date: 2026-10-19 18:00:00.000000
+
+add_missing_indexes created single-column indexes on behavior_logs and
+session_metrics next to (session_id, timestamp/window_start) composites that already
+serve every lookup; together with the ``id`` indexes duplicating the primary keys
+they only cost writes. The new composites serve the alert cooldown lookup, the
+dashboard unread counts, admin session lists and notification lists, and make the
+single-column indexes on their leading columns redundant. Minute windows become
+unique per session; duplicate windows (the latest computed one is kept) are removed
+first.
+
+tests/test_query_plans.py checks the query plans these indexes exist for.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5c7d9e1f3a5'
+down_revision = 'a4b6c8d0e2f4'
+branch_labels = None
+depends_on = None
+
+
+def _delete_duplicate_windows() -> None:
+    bind = op.get_bind()
+    duplicates = bind.execute(
+        sa.text(
+            "SELECT session_id, window_start, MAX(id) FROM session_metrics "
+            "GROUP BY session_id, window_start HAVING COUNT(*) > 1"
+        )
+    ).fetchall()
+    for session_id, window_start, keep_id in duplicates:
+        bind.execute(
+            sa.text(
+                "DELETE FROM session_metrics "
+                "WHERE session_id = :session_id AND window_start = :window_start AND id <> :keep_id"
+            ),
+            {"session_id": session_id, "window_start": window_start, "keep_id": keep_id},
+        )
+
+
+def upgrade() -> None:
+    # Composites first: on MySQL the foreign keys need an index led by their column.
+    op.create_index('ix_alerts_session_type_triggered', 'alerts', ['session_id', 'alert_type', 'triggered_at'], unique=False)
+    op.create_index('ix_alerts_read_severity_session', 'alerts', ['is_read', 'severity', 'session_id'], unique=False)
+    op.create_index('ix_class_sessions_active_start', 'class_sessions', ['is_active', 'start_time'], unique=False)
+    op.create_index(op.f('ix_class_sessions_start_time'), 'class_sessions', ['start_time'], unique=False)
+    op.create_index('ix_notifications_user_read_created', 'notifications', ['user_id', 'is_read', 'created_at'], unique=False)
+    _delete_duplicate_windows()
+    op.create_unique_constraint('uq_session_metrics_session_window', 'session_metrics', ['session_id', 'window_start'])
+
+    op.drop_index('ix_alerts_session_id', table_name='alerts')
+    op.drop_index('ix_alerts_is_read', table_name='alerts')
+    op.drop_index('ix_class_sessions_is_active', table_name='class_sessions')
+    op.drop_index('ix_notifications_user_id', table_name='notifications')
+    op.drop_index('ix_notifications_is_read', table_name='notifications')
+    op.drop_index('ix_behavior_logs_id', table_name='behavior_logs')
+    op.drop_index('ix_behavior_logs_session_id', table_name='behavior_logs')
+    op.drop_index('ix_behavior_logs_timestamp', table_name='behavior_logs')
+    op.drop_index('ix_session_metrics_id', table_name='session_metrics')
+    op.drop_index('ix_session_metrics_session_id', table_name='session_metrics')
+    op.drop_index('ix_session_metrics_window_start', table_name='session_metrics')
+    op.drop_index('ix_session_metrics_session_window', table_name='session_metrics')
+
+
+def downgrade() -> None:
+    op.create_index('ix_session_metrics_session_window', 'session_metrics', ['session_id', 'window_start'], unique=False)
+    op.create_index('ix_session_metrics_window_start', 'session_metrics', ['window_start'], unique=False)
+    op.create_index('ix_session_metrics_session_id', 'session_metrics', ['session_id'], unique=False)
+    op.create_index('ix_session_metrics_id', 'session_metrics', ['id'], unique=False)
+    op.create_index('ix_behavior_logs_timestamp', 'behavior_logs', ['timestamp'], unique=False)
+    op.create_index('ix_behavior_logs_session_id', 'behavior_logs', ['session_id'], unique=False)
+    op.create_index('ix_behavior_logs_id', 'behavior_logs', ['id'], unique=False)
+    op.create_index('ix_notifications_is_read', 'notifications', ['is_read'], unique=False)
+    op.create_index('ix_notifications_user_id', 'notifications', ['user_id'], unique=False)
+    op.create_index('ix_class_sessions_is_active', 'class_sessions', ['is_active'], unique=False)
+    op.create_index('ix_alerts_is_read', 'alerts', ['is_read'], unique=False)
+    op.create_index('ix_alerts_session_id', 'alerts', ['session_id'], unique=False)
+
+    op.drop_constraint('uq_session_metrics_session_window', 'session_metrics', type_='unique')
+    op.drop_index('ix_notifications_user_read_created', table_name='notifications')
+    op.drop_index(op.f('ix_class_sessions_start_time'), table_name='class_sessions')
+    op.drop_index('ix_class_sessions_active_start', table_name='class_sessions')
+    op.drop_index('ix_alerts_read_severity_session', table_name='alerts')
+    op.drop_index('ix_alerts_session_type_triggered', table_name='alerts')
@@ -0,0 +1,29 @@
+"""add per-camera counts to behavior_logs
+
+Revision ID: c3d9e2f1a7b4
+Revises: a6c8e10dcf99
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine.reflection import Inspector
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3d9e2f1a7b4'
+down_revision = 'a6c8e10dcf99'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = Inspector.from_engine(conn)
+    columns = [c['name'] for c in inspector.get_columns('behavior_logs')]
+    if 'camera_counts' not in columns:
+        op.add_column('behavior_logs', sa.Column('camera_counts', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('behavior_logs', 'camera_counts')
@@ -0,0 +1,57 @@
+"""add 5-minute, hourly and daily session metrics rollups
+
+Revision ID: d7e4a1b9c2f6
+Revises: c3d9e2f1a7b4
+Create Date: 2026-10-19 12:00:00.000000
+
+Run scripts/backfill_rollups.py afterwards to fill the tables for existing sessions.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7e4a1b9c2f6'
+down_revision = 'c3d9e2f1a7b4'
+branch_labels = None
+depends_on = None
+
+ROLLUP_TABLES = ('session_metrics_5m', 'session_metrics_hourly', 'session_metrics_daily')
+INDEXED_COLUMNS = ('id', 'session_id', 'bucket_start', 'teacher_id', 'section_id', 'subject_id', 'major_id', 'department_id')
+
+
+def upgrade() -> None:
+    for table in ROLLUP_TABLES:
+        op.create_table(
+            table,
+            sa.Column('id', sa.BigInteger(), nullable=False),
+            sa.Column('session_id', sa.Integer(), nullable=False),
+            sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+            sa.Column('teacher_id', sa.Integer(), nullable=True),
+            sa.Column('section_id', sa.Integer(), nullable=True),
+            sa.Column('subject_id', sa.Integer(), nullable=True),
+            sa.Column('major_id', sa.Integer(), nullable=True),
+            sa.Column('department_id', sa.Integer(), nullable=True),
+            sa.Column('activity_mode', sa.String(length=20), nullable=True),
+            sa.Column('minute_count', sa.Integer(), nullable=False),
+            sa.Column('total_detected', sa.BigInteger(), nullable=False),
+            sa.Column('on_task_sum', sa.DECIMAL(precision=12, scale=2), nullable=False),
+            sa.Column('using_phone_sum', sa.DECIMAL(precision=12, scale=2), nullable=False),
+            sa.Column('sleeping_sum', sa.DECIMAL(precision=12, scale=2), nullable=False),
+            sa.Column('off_task_sum', sa.DECIMAL(precision=12, scale=2), nullable=False),
+            sa.Column('not_visible_sum', sa.DECIMAL(precision=12, scale=2), nullable=False),
+            sa.Column('engagement_sum', sa.DECIMAL(precision=12, scale=2), nullable=False),
+            sa.Column('computed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+            sa.ForeignKeyConstraint(['session_id'], ['class_sessions.id']),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('session_id', 'bucket_start', name=f'uq_{table}_bucket'),
+        )
+        for column in INDEXED_COLUMNS:
+            op.create_index(op.f(f'ix_{table}_{column}'), table, [column], unique=False)
+
+
+def downgrade() -> None:
+    for table in reversed(ROLLUP_TABLES):
+        for column in reversed(INDEXED_COLUMNS):
+            op.drop_index(op.f(f'ix_{table}_{column}'), table_name=table)
+        op.drop_table(table)
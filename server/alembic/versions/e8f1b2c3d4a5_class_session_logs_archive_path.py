@@ -0,0 +1,29 @@
+"""add logs_archive_path to class_sessions
+
+Revision ID: e8f1b2c3d4a5
+Revises: d7e4a1b9c2f6
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine.reflection import Inspector
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8f1b2c3d4a5'
+down_revision = 'd7e4a1b9c2f6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = Inspector.from_engine(conn)
+    columns = [c['name'] for c in inspector.get_columns('class_sessions')]
+    if 'logs_archive_path' not in columns:
+        op.add_column('class_sessions', sa.Column('logs_archive_path', sa.String(length=500), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('class_sessions', 'logs_archive_path')
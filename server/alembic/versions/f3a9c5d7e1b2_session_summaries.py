@@ -0,0 +1,57 @@
+"""add session_summaries (statistics frozen when a session stops)
+
+Revision ID: f3a9c5d7e1b2
+Revises: e8f1b2c3d4a5
+Create Date: 2026-10-19 15:00:00.000000
+
+Run scripts/finalize_sessions.py afterwards to summarize sessions that already ended.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a9c5d7e1b2'
+down_revision = 'e8f1b2c3d4a5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'session_summaries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('session_id', sa.Integer(), nullable=False),
+        sa.Column('finalized_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('duration_seconds', sa.Integer(), nullable=False),
+        sa.Column('log_count', sa.Integer(), nullable=False),
+        sa.Column('minute_count', sa.Integer(), nullable=False),
+        sa.Column('max_students_detected', sa.Integer(), nullable=False),
+        sa.Column('on_task_avg', sa.DECIMAL(precision=7, scale=2), nullable=False),
+        sa.Column('using_phone_avg', sa.DECIMAL(precision=7, scale=2), nullable=False),
+        sa.Column('sleeping_avg', sa.DECIMAL(precision=7, scale=2), nullable=False),
+        sa.Column('off_task_avg', sa.DECIMAL(precision=7, scale=2), nullable=False),
+        sa.Column('not_visible_avg', sa.DECIMAL(precision=7, scale=2), nullable=False),
+        sa.Column('average_engagement', sa.DECIMAL(precision=5, scale=2), nullable=False),
+        sa.Column('headcount_average_engagement', sa.DECIMAL(precision=5, scale=2), nullable=False),
+        sa.Column('peak_engagement', sa.DECIMAL(precision=5, scale=2), nullable=True),
+        sa.Column('peak_engagement_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('lowest_engagement', sa.DECIMAL(precision=5, scale=2), nullable=True),
+        sa.Column('lowest_engagement_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('alert_count', sa.Integer(), nullable=False),
+        sa.Column('critical_alert_count', sa.Integer(), nullable=False),
+        sa.Column('alerts_by_type', sa.JSON(), nullable=True),
+        sa.Column('time_in_state', sa.JSON(), nullable=True),
+        sa.Column('engagement_curve', sa.JSON(), nullable=True),
+        sa.Column('engagement_weights', sa.JSON(), nullable=True),
+        sa.ForeignKeyConstraint(['session_id'], ['class_sessions.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_session_summaries_id'), 'session_summaries', ['id'], unique=False)
+    op.create_index(op.f('ix_session_summaries_session_id'), 'session_summaries', ['session_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_session_summaries_session_id'), table_name='session_summaries')
+    op.drop_index(op.f('ix_session_summaries_id'), table_name='session_summaries')
+    op.drop_table('session_summaries')
@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from app.api.v1 import deps
+from app.core.responses import FastJSONResponse
 from app.db.database import get_db
 from app.models.user import User as UserModel
 from app.schemas.admin import (
@@ -103,7 +104,7 @@ def list_admin_classes(
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(deps.get_current_active_superuser),
 ) -> Any:
-    return admin_service.list_classes(
+    classes = admin_service.list_classes(
         db,
         skip=skip,
         limit=limit,
@@ -114,6 +115,7 @@ def list_admin_classes(
         teacher_id=teacher_id,
         status=status,
     )
+    return FastJSONResponse(classes)
 
 
 @router.patch("/classes/{class_assignment_id}", response_model=AdminClassAssignment)
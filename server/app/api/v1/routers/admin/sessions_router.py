@@ -1,16 +1,28 @@
-from datetime import date
-from typing import Any, Optional
-
-from fastapi import APIRouter, Depends, File, UploadFile
+import os
+import shutil
+import tempfile
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Literal, Optional
+
+from fastapi import APIRouter, Depends, File, Form, UploadFile
 from sqlalchemy.orm import Session
 
 from app.api.v1 import deps
 from app.db.database import get_db
+from app.core.responses import FastJSONResponse, columnar
 from app.models.user import User as UserModel
 from app.schemas.admin import (
     PaginatedSessionsResponse,
     AdminSessionDetail,
+    AdminEngagementTrendResponse,
+    AdminBehaviorLogPoint,
+    AdminMetricPoint,
+    AdminTrendPoint,
     AdminModelSelectionRequest,
+    AdminRescoreRequest,
+    AdminRescoreResponse,
+    AdminVideoAnalysisJob,
 )
 from app.schemas.classroom import SubjectCoverUploadResponse
 from app.schemas.session import Alert as AlertSchema, ModelSelectionResponse, Session as SessionSchema
@@ -19,6 +31,19 @@ from app.constants import DEFAULT_PAGE_SIZE
 
 router = APIRouter()
 
+# layout=columns sends time series as one array per field instead of one object per point.
+Layout = Literal["rows", "columns"]
+
+
+def _session_detail_response(detail: dict[str, Any], layout: Layout) -> FastJSONResponse:
+    if layout == "columns":
+        detail = {
+            **detail,
+            "logs": columnar(detail["logs"], AdminBehaviorLogPoint.model_fields),
+            "metrics_rollup": columnar(detail["metrics_rollup"], AdminMetricPoint.model_fields),
+        }
+    return FastJSONResponse(detail)
+
 
 @router.get("/sessions", response_model=PaginatedSessionsResponse)
 def list_admin_sessions(
@@ -36,10 +61,12 @@ def list_admin_sessions(
     search: Optional[str] = None,
     sort: Optional[str] = "newest",
     activity_mode: Optional[str] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(deps.get_current_active_superuser),
 ) -> Any:
-    return admin_service.list_sessions(
+    sessions = admin_service.list_sessions(
         db,
         skip=skip,
         limit=limit,
@@ -55,16 +82,52 @@ def list_admin_sessions(
         search=search,
         sort=sort,
         activity_mode=activity_mode,
+        cursor=cursor,
+        include_total=include_total,
     )
+    return FastJSONResponse(sessions)
+
+
+@router.get("/analytics/engagement-trend", response_model=AdminEngagementTrendResponse)
+def get_engagement_trend(
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    resolution_seconds: int = 3600,
+    teacher_id: Optional[int] = None,
+    section_id: Optional[int] = None,
+    subject_id: Optional[int] = None,
+    major_id: Optional[int] = None,
+    department_id: Optional[int] = None,
+    activity_mode: Optional[str] = None,
+    layout: Layout = "rows",
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(deps.get_current_active_superuser),
+) -> Any:
+    trend = admin_service.get_engagement_trend(
+        db,
+        date_from=date_from,
+        date_to=date_to,
+        resolution_seconds=resolution_seconds,
+        teacher_id=teacher_id,
+        section_id=section_id,
+        subject_id=subject_id,
+        major_id=major_id,
+        department_id=department_id,
+        activity_mode=activity_mode,
+    )
+    if layout == "columns":
+        trend = {**trend, "points": columnar(trend["points"], AdminTrendPoint.model_fields)}
+    return FastJSONResponse(trend)
 
 
 @router.get("/sessions/{session_id}", response_model=AdminSessionDetail)
 def get_admin_session(
     session_id: int,
+    layout: Layout = "rows",
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(deps.get_current_active_superuser),
 ) -> Any:
-    return admin_service.get_session(db, session_id=session_id)
+    return _session_detail_response(admin_service.get_session(db, session_id=session_id), layout)
 
 
 @router.get("/sessions/{session_id}/detail", response_model=AdminSessionDetail)
@@ -72,11 +135,13 @@ def get_admin_session_detail(
     session_id: int,
     minutes: int = 120,
     logs_limit: int = 120,
+    layout: Layout = "rows",
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(deps.get_current_active_superuser),
 ) -> Any:
     # Admin UI uses /detail; this maps to the same underlying detail serializer.
-    return admin_service.get_session_detail(db, session_id=session_id, minutes=minutes, logs_limit=logs_limit)
+    detail = admin_service.get_session_detail(db, session_id=session_id, minutes=minutes, logs_limit=logs_limit)
+    return _session_detail_response(detail, layout)
 
 
 @router.post("/sessions/{session_id}/force-stop", response_model=SessionSchema)
@@ -88,6 +153,65 @@ def force_stop_admin_session(
     return admin_service.force_stop_session(db, session_id=session_id, actor_user_id=current_user.id)
 
 
+@router.post("/sessions/{session_id}/rescore", response_model=AdminRescoreResponse)
+def rescore_admin_session(
+    session_id: int,
+    payload: AdminRescoreRequest,
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(deps.get_current_active_superuser),
+) -> Any:
+    return admin_service.rescore_session(
+        db,
+        session_id=session_id,
+        confidence_threshold=payload.confidence_threshold,
+        actor_user_id=current_user.id,
+    )
+
+
+@router.post("/video-analysis", response_model=AdminVideoAnalysisJob)
+def start_video_analysis(
+    file: UploadFile = File(...),
+    section_id: int = Form(...),
+    subject_id: int = Form(...),
+    students_present: int = Form(...),
+    activity_mode: str = Form("LECTURE"),
+    teacher_id: Optional[int] = Form(None),
+    recorded_at: Optional[datetime] = Form(None),
+    inference_mode: str = Form("single"),
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(deps.get_current_active_superuser),
+) -> Any:
+    # The job outlives the request, so the upload is copied to a file the job deletes when done.
+    suffix = Path(file.filename or "").suffix or ".mp4"
+    fd, video_path = tempfile.mkstemp(prefix="teachtrack_video_", suffix=suffix)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            shutil.copyfileobj(file.file, handle, length=1024 * 1024)
+        return admin_service.start_video_analysis(
+            db,
+            video_path,
+            section_id=section_id,
+            subject_id=subject_id,
+            students_present=students_present,
+            activity_mode=activity_mode,
+            teacher_id=teacher_id,
+            recorded_at=recorded_at,
+            inference_mode=inference_mode,
+            actor_user_id=current_user.id,
+        )
+    except Exception:
+        Path(video_path).unlink(missing_ok=True)
+        raise
+
+
+@router.get("/video-analysis/{job_id}", response_model=AdminVideoAnalysisJob)
+def get_video_analysis_job(
+    job_id: str,
+    current_user: UserModel = Depends(deps.get_current_active_superuser),
+) -> Any:
+    return admin_service.get_video_analysis_job(job_id)
+
+
 @router.post("/subjects/{subject_id}/upload-cover", response_model=SubjectCoverUploadResponse)
 async def upload_subject_cover(
     subject_id: int,
@@ -1,23 +1,26 @@
 from datetime import date
 from typing import Any, Optional
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile
 from sqlalchemy.orm import Session
 
 from app.api.v1 import deps
+from app.core import compression
 from app.db.database import get_db
 from app.models.user import User as UserModel
 from app.schemas.admin import (
     AdminActionMessage,
+    AdminCompressionMetrics,
     AdminSettingsResponse,
     AdminSettingsUpdate,
     AdminDashboardResponse,
+    AdminSearchResponse,
     AdminServerLogsResponse,
     PaginatedAuditLogsResponse,
     PaginatedAlertsResponse,
     AdminTestDetectionResponse,
 )
-from app.services import admin_service, detector_service
+from app.services import admin_service, detector_service, event_hub
 from app.constants import DEFAULT_PAGE_SIZE
 
 router = APIRouter()
@@ -45,6 +48,17 @@ def get_admin_dashboard(
     )
 
 
+@router.get("/search", response_model=AdminSearchResponse)
+def search_admin_entities(
+    q: str,
+    types: Optional[list[str]] = Query(default=None),
+    limit: int = 20,
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(deps.get_current_active_superuser),
+) -> Any:
+    return admin_service.search(db, q, types, limit=limit)
+
+
 @router.get("/settings", response_model=AdminSettingsResponse)
 def get_admin_settings(
     db: Session = Depends(get_db),
@@ -90,24 +104,47 @@ def get_server_logs(
     return admin_service.get_server_logs(db)
 
 
+@router.get("/metrics/compression", response_model=AdminCompressionMetrics)
+def get_compression_metrics(
+    current_user: UserModel = Depends(deps.get_current_active_superuser),
+) -> Any:
+    return {"available_encodings": compression.available_encodings(), "encodings": compression.stats()}
+
+
 @router.get("/audit-logs", response_model=PaginatedAuditLogsResponse)
 def list_audit_logs(
     skip: int = 0,
     limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(deps.get_current_active_superuser),
 ) -> Any:
-    return admin_service.list_audit_logs(db, skip=skip, limit=limit)
+    return admin_service.list_audit_logs(db, skip=skip, limit=limit, cursor=cursor, include_total=include_total)
 
 
 @router.get("/alerts", response_model=PaginatedAlertsResponse)
 def list_alerts(
     skip: int = 0,
     limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(deps.get_current_active_superuser),
+) -> Any:
+    return admin_service.list_alerts(db, skip=skip, limit=limit, cursor=cursor, include_total=include_total)
+
+
+@router.get("/alerts/stream")
+async def stream_alerts(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(deps.get_current_active_superuser),
 ) -> Any:
-    return admin_service.list_alerts(db, skip=skip, limit=limit)
+    """Server-Sent Events of every new alert (``alert``) and alert read (``alert_read``)."""
+    db.close()
+    subscription = event_hub.subscribe(event_hub.ALERTS_TOPIC)
+    return event_hub.streaming_response(subscription, request, [": connected\n\n"])
 
 
 @router.post("/alerts/{alert_id}/mark-read", response_model=AdminActionMessage)
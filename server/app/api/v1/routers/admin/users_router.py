@@ -29,6 +29,8 @@ def list_admin_users(
     q: Optional[str] = None,
     is_active: Optional[bool] = None,
     is_superuser: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(deps.get_current_active_superuser),
 ) -> Any:
@@ -39,6 +41,8 @@ def list_admin_users(
         q=q,
         is_active=is_active,
         is_superuser=is_superuser,
+        cursor=cursor,
+        include_total=include_total,
     )
 
 
@@ -1,6 +1,7 @@
-from typing import Any, List
+from typing import Any, Callable, Hashable, List
 
-from fastapi import APIRouter, Depends, File, UploadFile
+from fastapi import APIRouter, Depends, File, Request, Response, UploadFile
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
 from app.api.v1 import deps
@@ -14,54 +15,99 @@ from app.schemas.classroom import (
     SubjectCoverUploadResponse,
     SubjectUpdate,
 )
-from app.services import classroom_service
+from app.services import catalog_cache, classroom_service
 from app.constants import MAX_PAGE_SIZE
 
 router = APIRouter()
 
+_COLLEGES = TypeAdapter(List[CollegeSchema])
+_DEPARTMENTS = TypeAdapter(List[DepartmentSchema])
+_MAJORS = TypeAdapter(List[MajorSchema])
+_SUBJECTS = TypeAdapter(List[SubjectSchema])
+_SUBJECT = TypeAdapter(SubjectSchema)
+_SECTIONS = TypeAdapter(List[SectionSchema])
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {value.strip().removeprefix("W/") for value in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _catalog_response(request: Request, key: Hashable, adapter: TypeAdapter, load: Callable[[], Any]) -> Response:
+    """Cached JSON body of ``load()`` (see catalog_cache), or 304 when the client's copy is current."""
+    entry = catalog_cache.get(key)
+    if entry is None:
+        computed_version = catalog_cache.version()
+        body = adapter.dump_json(adapter.validate_python(load(), from_attributes=True))
+        entry = catalog_cache.put(key, body, computed_version)
+    etag, body = entry
+    # Clients may keep the body but must revalidate it on every use.
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 
 @router.get("/colleges", response_model=List[CollegeSchema])
 def read_colleges(
+    request: Request,
     db: Session = Depends(get_db),
     current_user=Depends(deps.get_current_active_user),
 ) -> Any:
-    return classroom_service.read_colleges(db)
+    return _catalog_response(request, ("colleges",), _COLLEGES, lambda: classroom_service.read_colleges(db))
 
 
 @router.get("/departments", response_model=List[DepartmentSchema])
 def read_departments(
+    request: Request,
     db: Session = Depends(get_db),
     current_user=Depends(deps.get_current_active_user),
 ) -> Any:
-    return classroom_service.read_departments(db)
+    return _catalog_response(request, ("departments",), _DEPARTMENTS, lambda: classroom_service.read_departments(db))
 
 
 @router.get("/majors", response_model=List[MajorSchema])
 def read_majors(
+    request: Request,
     db: Session = Depends(get_db),
     current_user=Depends(deps.get_current_active_user),
 ) -> Any:
-    return classroom_service.read_majors(db)
+    return _catalog_response(request, ("majors",), _MAJORS, lambda: classroom_service.read_majors(db))
 
 
 @router.get("/subjects", response_model=List[SubjectSchema])
 def read_subjects(
+    request: Request,
     db: Session = Depends(get_db),
     current_user=Depends(deps.get_current_active_user),
     skip: int = 0,
     limit: int = MAX_PAGE_SIZE,
 ) -> Any:
-    return classroom_service.read_subjects(db, current_user.id, skip, limit)
+    return _catalog_response(
+        request,
+        ("subjects", current_user.id, skip, limit),
+        _SUBJECTS,
+        lambda: classroom_service.read_subjects(db, current_user.id, skip, limit),
+    )
 
 
 @router.get("/subjects/{subject_id}", response_model=SubjectSchema)
 def read_subject(
     *,
+    request: Request,
     db: Session = Depends(get_db),
     subject_id: int,
     current_user=Depends(deps.get_current_active_user),
 ) -> Any:
-    return classroom_service.read_subject(db, subject_id, current_user.id)
+    return _catalog_response(
+        request,
+        ("subject", current_user.id, subject_id),
+        _SUBJECT,
+        lambda: classroom_service.read_subject(db, subject_id, current_user.id),
+    )
 
 
 @router.patch("/subjects/{subject_id}", response_model=SubjectSchema)
@@ -88,18 +134,30 @@ async def upload_subject_cover_image(
 @router.get("/subjects/{subject_id}/sections", response_model=List[SectionSchema])
 def read_sections_by_subject(
     *,
+    request: Request,
     db: Session = Depends(get_db),
     subject_id: int,
     current_user=Depends(deps.get_current_active_user),
 ) -> Any:
-    return classroom_service.read_sections_by_subject(db, subject_id, current_user.id)
+    return _catalog_response(
+        request,
+        ("subject_sections", current_user.id, subject_id),
+        _SECTIONS,
+        lambda: classroom_service.read_sections_by_subject(db, subject_id, current_user.id),
+    )
 
 
 @router.get("/sections", response_model=List[SectionSchema])
 def read_sections(
+    request: Request,
     db: Session = Depends(get_db),
     current_user=Depends(deps.get_current_active_user),
     skip: int = 0,
     limit: int = MAX_PAGE_SIZE,
 ) -> Any:
-    return classroom_service.read_sections(db, current_user.id, skip, limit)
+    return _catalog_response(
+        request,
+        ("sections", current_user.id, skip, limit),
+        _SECTIONS,
+        lambda: classroom_service.read_sections(db, current_user.id, skip, limit),
+    )
@@ -1,6 +1,7 @@
 from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.api.v1 import deps
@@ -8,6 +9,8 @@ from app.db.database import get_db
 from app.schemas.session import (
     Alert as AlertSchema,
     AlertHistory as AlertHistorySchema,
+    BehaviorLogBatch,
+    BehaviorLogBatchResult,
     BehaviorLogCreate,
     ModelSelectionRequest,
     ModelSelectionResponse,
@@ -18,7 +21,7 @@ from app.schemas.session import (
     SessionMetrics,
     SessionSummary as SessionSummarySchema,
 )
-from app.services import alert_service, detector_service, engagement_service, session_lifecycle_service
+from app.services import alert_service, detector_service, engagement_service, event_hub, session_lifecycle_service
 from app.constants import MAX_PAGE_SIZE
 
 router = APIRouter()
@@ -94,15 +97,32 @@ def log_behavior_metrics(
     return {"status": "logged"}
 
 
+@router.post("/{session_id}/logs/batch", response_model=BehaviorLogBatchResult)
+def log_behavior_metrics_batch(
+    session_id: int,
+    batch: BehaviorLogBatch,
+    db: Session = Depends(get_db),
+    current_user=Depends(deps.get_current_active_user),
+) -> Any:
+    return engagement_service.process_behavior_log_batch(db, session_id, batch.ticks, current_user.id)
+
+
 @router.post("/{session_id}/detector/start", status_code=200)
 def start_webcam_detector(
     session_id: int,
+    inference_mode: str = detector_service.INFERENCE_MODE_SINGLE,
+    cameras: Optional[List[int]] = Query(None),
     db: Session = Depends(get_db),
     current_user=Depends(deps.get_current_active_user),
 ) -> Any:
     session_lifecycle_service.get_active_session_or_404(db, session_id, current_user.id)
     try:
-        status = detector_service.start_webcam_detector(session_id, engagement_service.process_behavior_log)
+        status = detector_service.start_webcam_detector(
+            session_id,
+            engagement_service.process_behavior_log,
+            inference_mode=inference_mode,
+            cameras=cameras,
+        )
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
     return {"status": status}
@@ -142,6 +162,7 @@ def get_webcam_detector_status(
 async def detect_behavior_metrics(
     session_id: int,
     file: UploadFile = File(...),
+    inference_mode: str = detector_service.INFERENCE_MODE_SINGLE,
     db: Session = Depends(get_db),
     current_user=Depends(deps.get_current_active_user),
 ) -> Any:
@@ -152,8 +173,11 @@ async def detect_behavior_metrics(
     except Exception:
         raise HTTPException(status_code=400, detail="Unable to read uploaded image")
 
+    if inference_mode not in detector_service.INFERENCE_MODES:
+        raise HTTPException(status_code=400, detail="Unsupported inference_mode")
+
     try:
-        counts = detector_service.detect_counts_from_image_bytes(raw)
+        counts = detector_service.detect_counts_from_image_bytes(raw, inference_mode=inference_mode)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
     except RuntimeError as exc:
@@ -173,6 +197,33 @@ def get_session_metrics(
     return engagement_service.get_session_metrics_response(db, session_id, current_user.id)
 
 
+@router.get("/{session_id}/events")
+async def stream_session_events(
+    session_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user=Depends(deps.get_current_active_user),
+) -> Any:
+    """Server-Sent Events: a ``snapshot`` (same body as /metrics), then ``log``, ``alert``,
+    ``alert_read``, ``resync`` and ``session_ended`` events, with ``: ping`` comments while idle."""
+    # Subscribe before taking the snapshot so nothing committed in between is missed.
+    subscription = event_hub.subscribe(event_hub.session_topic(session_id))
+    try:
+        session = await run_in_threadpool(session_lifecycle_service.get_session_or_404, db, session_id, current_user.id)
+        is_active = session.is_active
+        snapshot = await run_in_threadpool(engagement_service.get_session_metrics_response, db, session_id, current_user.id)
+    except Exception:
+        event_hub.unsubscribe(subscription)
+        raise
+    finally:
+        # The stream is long-lived; do not hold a pooled connection for it.
+        db.close()
+    initial = [event_hub.format_event("snapshot", snapshot)]
+    if not is_active:
+        initial.append(event_hub.format_event("session_ended", {"session_id": session_id}))
+    return event_hub.streaming_response(subscription, request, initial)
+
+
 @router.get("/{session_id}/metrics/rollup", response_model=List[SessionMetricRow])
 def get_session_metrics_rollup(
     session_id: int,
@@ -12,6 +12,9 @@ class Settings(BaseSettings):
     ENABLE_ADMIN_LOG_STREAM: bool = True
     DEBUG: bool = False
     CORS_ORIGINS: str = ""
+    # Responses smaller than this are sent uncompressed; larger ones are compressed off the event loop.
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_THREADPOOL_MIN_SIZE: int = 256 * 1024
 
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
@@ -46,6 +49,8 @@ class Settings(BaseSettings):
     DETECTION_CONFIDENCE_THRESHOLD: float = 0.5
     DETECTION_IMGSZ: int = 960
     ALERT_COOLDOWN_MINUTES: int = 5
+    RAW_DETECTIONS_DIR: str = "data/raw_detections"
+    BEHAVIOR_LOG_ARCHIVE_DIR: str = "data/log_archives"
     
     # Engagement calculation weights (PARTIAL)
     W_ON_TASK: float = 1.0
@@ -1,5 +1,14 @@
 from __future__ import annotations
 
+import base64
+import binascii
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable, Sequence
+
+from sqlalchemy import and_, or_
+
 from app.constants import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 
@@ -29,3 +38,86 @@ def clamp_pagination(
 ) -> tuple[int, int]:
     return clamp_skip(skip), clamp_limit(limit, default=default_limit, max_limit=max_limit)
 
+
+
+# --- Keyset (cursor) pagination ---------------------------------------------------
+#
+# A cursor is the sort key of the last row of a page, so the next page is a range
+# condition on indexed columns instead of an OFFSET that scans every skipped row.
+# Sort keys always end with the primary key, making them unique and the order total.
+# Cursors are opaque to clients (URL-safe base64 of JSON) and carry the name of the
+# sort they were issued for, so a cursor from another sort mode is rejected.
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"dec": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "dec" in value:
+            return Decimal(value["dec"])
+        raise ValueError("unknown cursor value")
+    return value
+
+
+def encode_cursor(sort: str, values: Sequence[Any]) -> str:
+    payload = json.dumps({"s": sort, "v": [_encode_value(value) for value in values]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, size: int) -> list[Any]:
+    """Sort key values of ``cursor``; ValueError when it is malformed or for another sort."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        values = [_decode_value(value) for value in payload["v"]]
+        issued_for = payload["s"]
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError, KeyError, TypeError) as exc:
+        raise ValueError("malformed cursor") from exc
+    if issued_for != sort or len(values) != size:
+        raise ValueError("cursor does not match the requested sort")
+    return values
+
+
+def keyset_after(keys: Sequence[tuple[Any, bool]], values: Sequence[Any]):
+    """Condition selecting rows after ``values`` in the order of ``keys`` ((column, descending), ...)."""
+    clauses = []
+    for index, (column, descending) in enumerate(keys):
+        equal_prefix = [keys[i][0] == values[i] for i in range(index)]
+        beyond = column < values[index] if descending else column > values[index]
+        clauses.append(and_(*equal_prefix, beyond))
+    return or_(*clauses)
+
+
+def keyset_page(
+    query,
+    keys: Sequence[tuple[Any, bool]],
+    *,
+    sort: str,
+    cursor: str | None,
+    limit: int,
+    key_of: Callable[[Any], Sequence[Any]],
+    skip: int = 0,
+) -> tuple[list[Any], str | None]:
+    """One page of ``query`` ordered by ``keys`` after ``cursor``, and the cursor of the next page.
+
+    ``key_of`` extracts the sort key values from a result row. Without a cursor the page
+    starts at ``skip`` (offset paging, kept for existing clients). Raises ValueError for
+    an invalid cursor.
+    """
+    order = [column.desc() if descending else column.asc() for column, descending in keys]
+    if cursor:
+        query = query.filter(keyset_after(keys, decode_cursor(cursor, sort, len(keys)))).order_by(*order)
+    else:
+        query = query.order_by(*order).offset(skip)
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(sort, key_of(rows[-1]))
@@ -0,0 +1,83 @@
+"""Fast JSON responses for large admin and analytics payloads.
+
+By default FastAPI validates what a route returns against its ``response_model``
+(one model instance per log point, class, session...) and then encodes that with
+``json``. For service output that is already shaped like the response model this
+work is pure overhead, and it dominates large responses such as a session detail
+with 500 log points. Routes opt in by returning ``FastJSONResponse(payload)``: the
+payload is encoded as is, with orjson when it is installed. The route keeps its
+``response_model`` for the OpenAPI schema; the service is responsible for returning
+exactly the documented fields.
+
+``columnar`` turns a list of time-series points into one array per field, which is
+smaller to send and what the chart components consume.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Iterable, Mapping
+from uuid import UUID
+
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+ROW_LAYOUTS = ("rows", "columns")
+
+
+def _datetime(value: datetime) -> str:
+    # Same ISO form as pydantic, which writes UTC as "Z".
+    text = value.isoformat()
+    return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return _datetime(value)
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, UUID):
+        return str(value)
+    # numpy scalars from the detection pipeline.
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+
+    def dumps(content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+
+else:
+
+    def dumps(content: Any) -> bytes:
+        return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """JSON response that encodes ``content`` without validating it against a model."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def columnar(rows: Iterable[Mapping[str, Any]], fields: Iterable[str]) -> dict[str, list[Any]]:
+    """``rows`` as one list per field, in row order; every field is present even with no rows."""
+    rows = list(rows)
+    return {field: [row[field] for row in rows] for field in fields}
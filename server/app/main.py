@@ -6,6 +6,7 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.routers.admin import router as admin_router
 from app.api.v1.routers import auth_router, users_router, classrooms_router, sessions_router, notifications_router
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
 from app.core.exceptions import unhandled_exception_handler
 from app.core.logging import RequestIdFilter, configure_logging
@@ -23,6 +24,12 @@ app = FastAPI(
     debug=settings.DEBUG,
 )
 app.add_exception_handler(Exception, unhandled_exception_handler)
+# Innermost, so it sees the route's complete body rather than RequestContextMiddleware's stream.
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    threadpool_min_size=settings.COMPRESSION_THREADPOOL_MIN_SIZE,
+)
 app.add_middleware(RequestContextMiddleware)
 
 cors_origins = [origin.strip() for origin in settings.CORS_ORIGINS.split(",") if origin.strip()]
@@ -15,10 +15,15 @@ from app.models.session import (
     BehaviorLog,
     Alert,
     SessionMetrics,
+    SessionMetrics5m,
+    SessionMetricsHourly,
+    SessionMetricsDaily,
+    SessionSummary,
     SessionHistory,
     AlertHistory,
 )
 from app.models.backup import BackupRun
+from app.models.search import SearchDocument, SearchToken
 
 __all__ = [
     "User",
@@ -34,8 +39,14 @@ __all__ = [
     "BehaviorLog",
     "Alert",
     "SessionMetrics",
+    "SessionMetrics5m",
+    "SessionMetricsHourly",
+    "SessionMetricsDaily",
+    "SessionSummary",
     "SessionHistory",
     "AlertHistory",
     "SystemSettings",
     "BackupRun",
+    "SearchDocument",
+    "SearchToken",
 ]
@@ -0,0 +1,96 @@
+"""Search index of users, subjects and class sections (see search_service).
+
+One SearchDocument per entity holds its normalised searchable text under a MySQL
+FULLTEXT index; SearchToken rows hold the same words one per row under a B-tree
+index for prefix lookups on other databases and for terms shorter than the FULLTEXT
+minimum token size. Both are kept current by mapper events on the indexed models, in
+the same transaction as the change.
+"""
+
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text, delete, event, insert, inspect
+from sqlalchemy.sql import func
+
+from app.db.database import Base
+from app.models.classroom import ClassSection, Subject
+from app.models.user import User
+from app.utils.search import MAX_TOKEN_LENGTH, document_tokens
+
+
+class SearchDocument(Base):
+    __tablename__ = "search_documents"
+    __table_args__ = (
+        Index("ix_search_documents_entity", "entity_type", "entity_id", unique=True),
+        Index("ix_search_documents_content", "content", mysql_prefix="FULLTEXT"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    entity_type = Column(String(20), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    content = Column(Text, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class SearchToken(Base):
+    __tablename__ = "search_tokens"
+    __table_args__ = (
+        Index("ix_search_tokens_lookup", "entity_type", "token", "entity_id"),
+        Index("ix_search_tokens_entity", "entity_type", "entity_id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    entity_type = Column(String(20), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    token = Column(String(MAX_TOKEN_LENGTH), nullable=False)
+
+
+# Indexed models: entity type and the attributes whose words are searchable.
+INDEXED_FIELDS = {
+    User: ("user", ("username", "fullname", "firstname", "lastname", "email")),
+    Subject: ("subject", ("name", "code")),
+    ClassSection: ("section", ("name", "section_code")),
+}
+
+
+def write_entry(connection, entity_type: str, entity_id: int, values, replace: bool = True) -> None:
+    """Replace the index entry of one entity with the words of ``values``."""
+    if replace:
+        remove_entry(connection, entity_type, entity_id)
+    tokens = document_tokens(values)
+    if not tokens:
+        return
+    connection.execute(
+        insert(SearchDocument).values(entity_type=entity_type, entity_id=entity_id, content=" ".join(tokens))
+    )
+    connection.execute(
+        insert(SearchToken),
+        [{"entity_type": entity_type, "entity_id": entity_id, "token": token} for token in tokens],
+    )
+
+
+def remove_entry(connection, entity_type: str, entity_id: int) -> None:
+    for model in (SearchDocument, SearchToken):
+        connection.execute(
+            delete(model).where(model.entity_type == entity_type, model.entity_id == entity_id)
+        )
+
+
+def _after_insert(_mapper, connection, target) -> None:
+    entity_type, fields = INDEXED_FIELDS[type(target)]
+    write_entry(connection, entity_type, target.id, [getattr(target, name) for name in fields])
+
+
+def _after_update(_mapper, connection, target) -> None:
+    entity_type, fields = INDEXED_FIELDS[type(target)]
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in fields):
+        write_entry(connection, entity_type, target.id, [getattr(target, name) for name in fields])
+
+
+def _after_delete(_mapper, connection, target) -> None:
+    remove_entry(connection, INDEXED_FIELDS[type(target)][0], target.id)
+
+
+for _model in INDEXED_FIELDS:
+    event.listen(_model, "after_insert", _after_insert)
+    event.listen(_model, "after_update", _after_update)
+    event.listen(_model, "after_delete", _after_delete)
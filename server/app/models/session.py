@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, BigInteger, DECIMAL
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, BigInteger, DECIMAL, Index, JSON, UniqueConstraint
+from sqlalchemy.orm import declared_attr, relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
 import enum
@@ -21,6 +21,8 @@ class ActivityMode(str, enum.Enum):
 
 class ClassSession(Base):
     __tablename__ = "class_sessions"
+    # Admin session lists: newest first, optionally only active or ended sessions.
+    __table_args__ = (Index("ix_class_sessions_active_start", "is_active", "start_time"),)
 
     id = Column(Integer, primary_key=True, index=True)
     teacher_id = Column(Integer, ForeignKey("users.id"), index=True)
@@ -29,10 +31,12 @@ class ClassSession(Base):
     students_present = Column(Integer, nullable=False, default=1)
     average_engagement = Column(DECIMAL(5, 2), nullable=False, default=0)
     activity_mode = Column(String(20), nullable=False, default=ActivityMode.LECTURE.value)
+    # Set once the session's behavior logs were moved out of behavior_logs (log_archive_service).
+    logs_archive_path = Column(String(500), nullable=True)
     
-    start_time = Column(DateTime(timezone=True), server_default=func.now())
+    start_time = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     end_time = Column(DateTime(timezone=True), nullable=True)
-    is_active = Column(Boolean, default=True, index=True)
+    is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
@@ -43,14 +47,20 @@ class ClassSession(Base):
     logs = relationship("BehaviorLog", back_populates="session", cascade="all, delete-orphan")
     alerts = relationship("Alert", back_populates="session", cascade="all, delete-orphan")
     metrics = relationship("SessionMetrics", back_populates="session", cascade="all, delete-orphan")
+    metrics_5m = relationship("SessionMetrics5m", back_populates="session", cascade="all, delete-orphan")
+    metrics_hourly = relationship("SessionMetricsHourly", back_populates="session", cascade="all, delete-orphan")
+    metrics_daily = relationship("SessionMetricsDaily", back_populates="session", cascade="all, delete-orphan")
     history = relationship("SessionHistory", back_populates="session", cascade="all, delete-orphan")
+    summary = relationship("SessionSummary", back_populates="session", uselist=False, cascade="all, delete-orphan")
 
 class BehaviorLog(Base):
     __tablename__ = "behavior_logs"
+    # Every read is per session and usually a time range; this also serves the foreign key.
+    __table_args__ = (Index("ix_behavior_logs_session_timestamp", "session_id", "timestamp"),)
 
-    id = Column(BigInteger, primary_key=True, index=True)
-    session_id = Column(Integer, ForeignKey("class_sessions.id"), index=True)
-    timestamp = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    id = Column(BigInteger, primary_key=True)
+    session_id = Column(Integer, ForeignKey("class_sessions.id"))
+    timestamp = Column(DateTime(timezone=True), server_default=func.now())
 
     students_present_snapshot = Column(Integer, nullable=True)
 
@@ -61,20 +71,28 @@ class BehaviorLog(Base):
     not_visible = Column(Integer, default=0)
 
     total_detected = Column(Integer, default=0)
+    # Multi-camera sessions only: {"<camera index>": [on_task, sleeping, using_phone, off_task]}.
+    camera_counts = Column(JSON, nullable=True)
 
     session = relationship("ClassSession", back_populates="logs")
 
 class Alert(Base):
     __tablename__ = "alerts"
+    __table_args__ = (
+        # Alert cooldown lookup (alert_service.trigger_alert).
+        Index("ix_alerts_session_type_triggered", "session_id", "alert_type", "triggered_at"),
+        # Unread and critical unread counts of the dashboard.
+        Index("ix_alerts_read_severity_session", "is_read", "severity", "session_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    session_id = Column(Integer, ForeignKey("class_sessions.id"), index=True)
+    session_id = Column(Integer, ForeignKey("class_sessions.id"))
     
     alert_type = Column(String(50)) # Storing Enum as string for simplicity in DB, or use Enum type
     message = Column(String(255))
     triggered_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     severity = Column(String(20), default=AlertSeverity.WARNING.value, index=True)
-    is_read = Column(Boolean, default=False, index=True)
+    is_read = Column(Boolean, default=False)
     snapshot_url = Column(String(512), nullable=True) # URL to detection screenshot
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
@@ -82,10 +100,12 @@ class Alert(Base):
 
 class SessionMetrics(Base):
     __tablename__ = "session_metrics"
+    # One minute window per session and minute.
+    __table_args__ = (UniqueConstraint("session_id", "window_start", name="uq_session_metrics_session_window"),)
 
-    id = Column(BigInteger, primary_key=True, index=True)
-    session_id = Column(Integer, ForeignKey("class_sessions.id"), index=True)
-    window_start = Column(DateTime(timezone=True), nullable=False, index=True)
+    id = Column(BigInteger, primary_key=True)
+    session_id = Column(Integer, ForeignKey("class_sessions.id"))
+    window_start = Column(DateTime(timezone=True), nullable=False)
     window_end = Column(DateTime(timezone=True), nullable=False)
 
     total_detected = Column(Integer, nullable=False, default=0)
@@ -100,6 +120,97 @@ class SessionMetrics(Base):
 
     session = relationship("ClassSession", back_populates="metrics")
 
+class _SessionMetricsRollup:
+    """Coarser rollup of SessionMetrics minute windows (see rollup_service).
+
+    Stores sums over the minute windows of the bucket rather than averages so buckets
+    cascade exactly (5-minute -> hourly -> daily); averages are ``*_sum / minute_count``.
+    Academic dimensions are copied from the session so range queries need no joins.
+    """
+
+    id = Column(BigInteger, primary_key=True, index=True)
+    bucket_start = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    teacher_id = Column(Integer, nullable=True, index=True)
+    section_id = Column(Integer, nullable=True, index=True)
+    subject_id = Column(Integer, nullable=True, index=True)
+    major_id = Column(Integer, nullable=True, index=True)
+    department_id = Column(Integer, nullable=True, index=True)
+    activity_mode = Column(String(20), nullable=True)
+
+    minute_count = Column(Integer, nullable=False, default=0)
+    total_detected = Column(BigInteger, nullable=False, default=0)
+    on_task_sum = Column(DECIMAL(12, 2), nullable=False, default=0)
+    using_phone_sum = Column(DECIMAL(12, 2), nullable=False, default=0)
+    sleeping_sum = Column(DECIMAL(12, 2), nullable=False, default=0)
+    off_task_sum = Column(DECIMAL(12, 2), nullable=False, default=0)
+    not_visible_sum = Column(DECIMAL(12, 2), nullable=False, default=0)
+    engagement_sum = Column(DECIMAL(12, 2), nullable=False, default=0)
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    @declared_attr
+    def session_id(cls):
+        return Column(Integer, ForeignKey("class_sessions.id"), nullable=False, index=True)
+
+
+class SessionMetrics5m(_SessionMetricsRollup, Base):
+    __tablename__ = "session_metrics_5m"
+    __table_args__ = (UniqueConstraint("session_id", "bucket_start", name="uq_session_metrics_5m_bucket"),)
+
+    session = relationship("ClassSession", back_populates="metrics_5m")
+
+
+class SessionMetricsHourly(_SessionMetricsRollup, Base):
+    __tablename__ = "session_metrics_hourly"
+    __table_args__ = (UniqueConstraint("session_id", "bucket_start", name="uq_session_metrics_hourly_bucket"),)
+
+    session = relationship("ClassSession", back_populates="metrics_hourly")
+
+
+class SessionMetricsDaily(_SessionMetricsRollup, Base):
+    __tablename__ = "session_metrics_daily"
+    __table_args__ = (UniqueConstraint("session_id", "bucket_start", name="uq_session_metrics_daily_bucket"),)
+
+    session = relationship("ClassSession", back_populates="metrics_daily")
+
+class SessionSummary(Base):
+    """Statistics of an ended session, frozen when it stops (see session_summary_service)."""
+
+    __tablename__ = "session_summaries"
+
+    id = Column(Integer, primary_key=True, index=True)
+    session_id = Column(Integer, ForeignKey("class_sessions.id"), nullable=False, unique=True, index=True)
+    finalized_at = Column(DateTime(timezone=True), server_default=func.now())
+    duration_seconds = Column(Integer, nullable=False, default=0)
+
+    log_count = Column(Integer, nullable=False, default=0)
+    minute_count = Column(Integer, nullable=False, default=0)
+    max_students_detected = Column(Integer, nullable=False, default=0)
+    on_task_avg = Column(DECIMAL(7, 2), nullable=False, default=0)
+    using_phone_avg = Column(DECIMAL(7, 2), nullable=False, default=0)
+    sleeping_avg = Column(DECIMAL(7, 2), nullable=False, default=0)
+    off_task_avg = Column(DECIMAL(7, 2), nullable=False, default=0)
+    not_visible_avg = Column(DECIMAL(7, 2), nullable=False, default=0)
+
+    # Visible-student engagement (teacher views) and headcount engagement (admin views).
+    average_engagement = Column(DECIMAL(5, 2), nullable=False, default=0)
+    headcount_average_engagement = Column(DECIMAL(5, 2), nullable=False, default=0)
+    peak_engagement = Column(DECIMAL(5, 2), nullable=True)
+    peak_engagement_at = Column(DateTime(timezone=True), nullable=True)
+    lowest_engagement = Column(DECIMAL(5, 2), nullable=True)
+    lowest_engagement_at = Column(DateTime(timezone=True), nullable=True)
+
+    alert_count = Column(Integer, nullable=False, default=0)
+    critical_alert_count = Column(Integer, nullable=False, default=0)
+    alerts_by_type = Column(JSON, nullable=True)
+    # Student-seconds spent in each behavior (plus not_visible).
+    time_in_state = Column(JSON, nullable=True)
+    # Downsampled minute engagement: [[minutes since start, score], ...].
+    engagement_curve = Column(JSON, nullable=True)
+    engagement_weights = Column(JSON, nullable=True)
+
+    session = relationship("ClassSession", back_populates="summary")
+
 class SessionHistory(Base):
     __tablename__ = "session_history"
 
@@ -45,7 +45,6 @@ class ClassroomRepository:
         )
         return (
             db.query(Subject)
-            .options(joinedload(Subject.major).joinedload(Major.department).joinedload(Department.college))
             .options(
                 joinedload(Subject.section_assignments).joinedload(SectionSubjectAssignment.section).joinedload(ClassSection.teacher)
             )
@@ -65,7 +64,7 @@ class ClassroomRepository:
             .distinct()
             .subquery()
         )
-        query = db.query(Subject).options(joinedload(Subject.major).joinedload(Major.department).joinedload(Department.college))
+        query = db.query(Subject)
         if with_sections:
             query = query.options(
                 joinedload(Subject.section_assignments).joinedload(SectionSubjectAssignment.section).joinedload(ClassSection.teacher),
@@ -89,7 +88,6 @@ class ClassroomRepository:
             db.query(ClassSection)
             .join(SectionSubjectAssignment, SectionSubjectAssignment.section_id == ClassSection.id)
             .options(joinedload(ClassSection.teacher))
-            .options(joinedload(ClassSection.major).joinedload(Major.department).joinedload(Department.college))
             .options(joinedload(ClassSection.subject_assignments).joinedload(SectionSubjectAssignment.subject))
             .options(joinedload(ClassSection.subject_assignments).joinedload(SectionSubjectAssignment.teacher))
             .filter(SectionSubjectAssignment.subject_id == subject_id)
@@ -103,7 +101,6 @@ class ClassroomRepository:
             db.query(ClassSection)
             .join(SectionSubjectAssignment, SectionSubjectAssignment.section_id == ClassSection.id)
             .options(joinedload(ClassSection.teacher))
-            .options(joinedload(ClassSection.major).joinedload(Major.department).joinedload(Department.college))
             .options(joinedload(ClassSection.subject_assignments).joinedload(SectionSubjectAssignment.subject))
             .filter(_teacher_visibility_filter(teacher_id))
             .distinct()
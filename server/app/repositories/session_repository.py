@@ -1,8 +1,7 @@
 from typing import Iterable
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session
 from sqlalchemy import func
 
-from app.models.classroom import ClassSection, Department, Major
 from app.models.session import ClassSession, BehaviorLog, Alert
 
 
@@ -21,21 +20,6 @@ class SessionRepository:
             query = query.filter(ClassSession.teacher_id == teacher_id)
         return query.first()
 
-    @staticmethod
-    def list_sessions(db: Session, teacher_id: int, include_active: bool, limit: int) -> list[ClassSession]:
-        query = db.query(ClassSession).options(
-            joinedload(ClassSession.subject),
-            joinedload(ClassSession.section)
-            .joinedload(ClassSection.major)
-            .joinedload(Major.department)
-            .joinedload(Department.college),
-        ).filter(ClassSession.teacher_id == teacher_id)
-
-        if not include_active:
-            query = query.filter(ClassSession.is_active == False)
-
-        return query.order_by(ClassSession.start_time.desc()).limit(limit).all()
-
     @staticmethod
     def aggregate_behavior(db: Session, session_ids: Iterable[int]):
         ids = list(session_ids)
@@ -66,10 +66,13 @@ class AdminSessionSummary(BaseModel):
     not_visible: float = 0.0
     college_id: Optional[int] = None
     college_name: Optional[str] = None
+    college_logo_path: Optional[str] = None
     department_id: Optional[int] = None
     department_name: Optional[str] = None
+    department_code: Optional[str] = None
     major_id: Optional[int] = None
     major_name: Optional[str] = None
+    major_code: Optional[str] = None
 
 class AdminAlertSummary(BaseModel):
     id: int
@@ -102,18 +105,24 @@ class AdminDashboardResponse(BaseModel):
     recent_alerts: list[AdminAlertSummary]
 
 class PaginatedUsersResponse(BaseModel):
-    total: int
+    # Only computed when requested with include_total=true.
+    total: Optional[int] = None
     items: list[AdminUser]
+    next_cursor: Optional[str] = None
 
 
 class PaginatedSessionsResponse(BaseModel):
-    total: int
+    # Only computed when requested with include_total=true.
+    total: Optional[int] = None
     items: list[AdminSessionSummary]
+    next_cursor: Optional[str] = None
 
 
 class PaginatedAlertsResponse(BaseModel):
-    total: int
+    # Only computed when requested with include_total=true.
+    total: Optional[int] = None
     items: list[AdminAlertSummary]
+    next_cursor: Optional[str] = None
 
 
 class AdminModelSelectionRequest(BaseModel):
@@ -154,6 +163,55 @@ class AdminMetricPoint(BaseModel):
     engagement_score: float
 
 
+class AdminTrendPoint(BaseModel):
+    bucket_start: datetime
+    bucket_end: datetime
+    minutes: int
+    total_detected: int
+    on_task_avg: float
+    using_phone_avg: float
+    sleeping_avg: float
+    off_task_avg: float
+    not_visible_avg: float
+    engagement_score: float
+
+
+class AdminEngagementTrendResponse(BaseModel):
+    resolution_seconds: int
+    source_resolution_seconds: int
+    points: list[AdminTrendPoint]
+
+
+class AdminSearchResponse(BaseModel):
+    query: str
+    # Ranked ids per entity type: user, subject, section, session.
+    results: dict[str, list[int]]
+
+
+class AdminSessionFinalSummary(BaseModel):
+    finalized_at: Optional[datetime] = None
+    duration_seconds: int
+    log_count: int
+    minute_count: int
+    max_students_detected: int
+    on_task_avg: float
+    using_phone_avg: float
+    sleeping_avg: float
+    off_task_avg: float
+    not_visible_avg: float
+    average_engagement: float
+    headcount_average_engagement: float
+    peak_engagement: Optional[float] = None
+    peak_engagement_at: Optional[datetime] = None
+    lowest_engagement: Optional[float] = None
+    lowest_engagement_at: Optional[datetime] = None
+    alert_count: int
+    critical_alert_count: int
+    alerts_by_type: dict[str, int] = Field(default_factory=dict)
+    time_in_state: dict[str, float] = Field(default_factory=dict)
+    engagement_curve: list[list[float]] = Field(default_factory=list)
+
+
 class AdminSessionDetail(BaseModel):
     session: AdminSessionSummary
     total_logs: int
@@ -161,6 +219,43 @@ class AdminSessionDetail(BaseModel):
     unread_alerts: int
     logs: list[AdminBehaviorLogPoint]
     metrics_rollup: list[AdminMetricPoint]
+    summary: Optional[AdminSessionFinalSummary] = None
+
+
+class AdminRescoreRequest(BaseModel):
+    confidence_threshold: float = Field(ge=0.0, le=1.0)
+
+
+class AdminRescoreResponse(BaseModel):
+    session_id: int
+    confidence_threshold: float
+    ticks: int
+    logs_updated: int
+    metric_windows: int
+    average_engagement: float
+
+
+class AdminVideoAnalysisResult(BaseModel):
+    session_id: int
+    samples: int
+    video_seconds: float
+    elapsed_seconds: float
+    frames_per_second: float
+    metric_windows: int
+    average_engagement: float
+
+
+class AdminVideoAnalysisJob(BaseModel):
+    job_id: str
+    session_id: int
+    status: str
+    processed: int
+    total: int
+    frames_per_second: float
+    error: Optional[str] = None
+    result: Optional[AdminVideoAnalysisResult] = None
+    started_at: datetime
+    finished_at: Optional[datetime] = None
 
 
 class AdminServerLogEntry(BaseModel):
@@ -176,6 +271,20 @@ class AdminServerLogsResponse(BaseModel):
     items: list[AdminServerLogEntry]
 
 
+class AdminCompressionEncodingStats(BaseModel):
+    responses: int
+    bytes_in: int
+    bytes_out: int
+    bytes_saved: int
+    cpu_seconds: float
+
+
+class AdminCompressionMetrics(BaseModel):
+    # Totals of this worker process since it started.
+    available_encodings: list[str]
+    encodings: dict[str, AdminCompressionEncodingStats]
+
+
 class AdminAuditLogEntry(BaseModel):
     id: int
     actor_user_id: Optional[int] = None
@@ -193,8 +302,10 @@ class AdminAuditLogEntry(BaseModel):
 
 
 class PaginatedAuditLogsResponse(BaseModel):
-    total: int
+    # Only computed when requested with include_total=true.
+    total: Optional[int] = None
     items: list[AdminAuditLogEntry]
+    next_cursor: Optional[str] = None
 
 
 class AdminTeacherSummary(BaseModel):
@@ -567,6 +678,21 @@ class AdminSettingsDetection(BaseModel):
     detection_confidence_threshold: float
     detection_imgsz: int
     alert_cooldown_minutes: int
+    tile_rows: int = 2
+    tile_cols: int = 2
+    tile_overlap_ratio: float = 0.2
+    tile_imgsz: int = 640
+    camera_tile_grids: dict[str, dict[str, int]] = Field(default_factory=dict)
+    server_camera_indices: list[int] = Field(default_factory=list)
+    camera_regions: dict[str, str] = Field(default_factory=dict)
+    camera_region_merge: str = "max"
+    store_raw_detections: bool = False
+    tracking_enabled: bool = False
+    tracking_iou_threshold: float = 0.3
+    tracking_switch_ticks: int = 2
+    tracking_max_missed_ticks: int = 2
+    inference_slots: int = 1
+    inference_deadline_seconds: float = 2.0
 
 
 class AdminDetectionBox(BaseModel):
@@ -595,6 +721,7 @@ class AdminSettingsEngagementWeights(BaseModel):
 
 class AdminSettingsAdminOps(BaseModel):
     enable_admin_log_stream: bool
+    behavior_log_retention_days: int
 
 class AdminSettingsExamProctoring(BaseModel):
     phone_count_threshold: int
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field, root_validator
 from datetime import datetime
-from typing import Optional, List
+from typing import Dict, Literal, Optional, List
 from enum import Enum
 
 class ActivityMode(str, Enum):
@@ -31,13 +31,27 @@ class BehaviorLogBase(BaseModel):
         from_attributes = True
 
 class BehaviorLogCreate(BehaviorLogBase):
-    pass
+    # Multi-camera ticks: camera index -> [on_task, sleeping, using_phone, off_task].
+    camera_counts: Optional[Dict[str, List[int]]] = None
+
+class BehaviorLogBatchItem(BehaviorLogCreate):
+    captured_at: datetime
+
+class BehaviorLogBatch(BaseModel):
+    ticks: List[BehaviorLogBatchItem] = Field(..., max_length=500)
+
+class BehaviorLogBatchResult(BaseModel):
+    accepted: int
+    duplicates: int
+    # Per tick, in request order: "accepted" or "duplicate".
+    statuses: List[Literal["accepted", "duplicate"]] = []
 
 class BehaviorLog(BehaviorLogBase):
     id: int
     session_id: int
     timestamp: datetime
     total_detected: int
+    camera_counts: Optional[Dict[str, List[int]]] = None
 
     class Config:
         from_attributes = True
@@ -139,9 +153,31 @@ class AlertHistory(BaseModel):
         from_attributes = True
 
 # -- AI Model Management --
+class ModelClassEvaluation(BaseModel):
+    precision: Optional[float] = None
+    recall: Optional[float] = None
+    support: int = 0
+    predicted: int = 0
+    count_mae: Optional[float] = None
+    count_bias: Optional[float] = None
+
+class ModelEvaluation(BaseModel):
+    imgsz: int
+    confidence_threshold: float
+    iou_threshold: float
+    frames: int
+    macro_precision: Optional[float] = None
+    macro_recall: Optional[float] = None
+    count_mae: Optional[float] = None
+    cpu_fps: Optional[float] = None
+    classes: Dict[str, ModelClassEvaluation] = {}
+    dataset: Optional[str] = None
+    evaluated_at: datetime
+
 class ModelOption(BaseModel):
     file_name: str
     is_current: bool = False
+    evaluations: List[ModelEvaluation] = []
 
 class ModelSelectionRequest(BaseModel):
     file_name: str
@@ -0,0 +1,179 @@
+"""In-process cache of the academic hierarchy: colleges, departments, majors, sections, subjects.
+
+Listings and serializers used to join ``ClassSection → Major → Department → College``
+(or walk the same chain of relationships) for every row just to print names, codes
+and logos. The hierarchy changes only when someone edits it, so each process keeps a
+snapshot of it, loaded with one query per table, and serializers resolve those display
+fields by id.
+
+``invalidate`` is called after every commit that creates, updates or deletes one of
+these rows; it bumps the version and drops the snapshots. A snapshot loaded while an
+invalidation happened is not installed, so a slow load cannot re-install stale data.
+Other worker processes do not see the invalidation: their snapshot is reloaded after
+``HIERARCHY_CACHE_TTL_SECONDS``, or as soon as a caller asks for an id it does not hold
+(e.g. a section created through another worker). Snapshots are kept per engine and
+shared between requests: never mutate them.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, Iterable, Mapping, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.classroom import ClassSection, College, Department, Major, Subject
+
+HIERARCHY_CACHE_TTL_SECONDS = 60.0
+# Unknown ids (rows deleted since) must not turn every request into a reload.
+MISS_RELOAD_INTERVAL_SECONDS = 1.0
+
+MAJOR_FIELDS = (
+    "major_id",
+    "major_name",
+    "major_code",
+    "major_cover_image_url",
+    "department_id",
+    "department_name",
+    "department_code",
+    "department_cover_image_url",
+    "college_id",
+    "college_name",
+    "college_acronym",
+    "college_logo_path",
+)
+_NO_MAJOR: Mapping[str, Any] = dict.fromkeys(MAJOR_FIELDS)
+
+
+@dataclass(frozen=True, slots=True)
+class Hierarchy:
+    version: int
+    loaded_at: float
+    colleges: dict[int, dict[str, Any]]
+    departments: dict[int, dict[str, Any]]
+    # Keyed by major id: MAJOR_FIELDS of the major, its department and college.
+    majors: dict[int, dict[str, Any]]
+    sections: dict[int, dict[str, Any]]
+    subjects: dict[int, dict[str, Any]]
+
+    def major(self, major_id: Optional[int]) -> Mapping[str, Any]:
+        """MAJOR_FIELDS of ``major_id``; all None when there is no such major."""
+        return self.majors.get(major_id, _NO_MAJOR)
+
+    def college(self, college_id: Optional[int]) -> Optional[dict[str, Any]]:
+        return self.colleges.get(college_id)
+
+    def department(self, department_id: Optional[int]) -> Optional[dict[str, Any]]:
+        return self.departments.get(department_id)
+
+    def section(self, section_id: Optional[int]) -> Optional[dict[str, Any]]:
+        return self.sections.get(section_id)
+
+    def subject(self, subject_id: Optional[int]) -> Optional[dict[str, Any]]:
+        return self.subjects.get(subject_id)
+
+    def _missing(self, major_ids: Iterable, section_ids: Iterable, subject_ids: Iterable) -> bool:
+        for ids, known in ((major_ids, self.majors), (section_ids, self.sections), (subject_ids, self.subjects)):
+            if any(entity_id is not None and entity_id not in known for entity_id in ids):
+                return True
+        return False
+
+
+_snapshots: "weakref.WeakKeyDictionary[Any, Hierarchy]" = weakref.WeakKeyDictionary()
+_version = 0
+_lock = threading.Lock()
+
+
+def _load(db: Session, version: int) -> Hierarchy:
+    colleges = {
+        college_id: {"id": college_id, "name": name, "acronym": acronym, "logo_path": logo_path}
+        for college_id, name, acronym, logo_path in db.query(
+            College.id, College.name, College.acronym, College.logo_path
+        )
+    }
+    departments = {
+        department_id: {
+            "id": department_id,
+            "college_id": college_id,
+            "name": name,
+            "code": code,
+            "cover_image_url": cover_image_url,
+        }
+        for department_id, college_id, name, code, cover_image_url in db.query(
+            Department.id, Department.college_id, Department.name, Department.code, Department.cover_image_url
+        )
+    }
+    majors = {}
+    for major_id, department_id, name, code, cover_image_url in db.query(
+        Major.id, Major.department_id, Major.name, Major.code, Major.cover_image_url
+    ):
+        department = departments.get(department_id) or {}
+        college = colleges.get(department.get("college_id")) or {}
+        majors[major_id] = {
+            "major_id": major_id,
+            "major_name": name,
+            "major_code": code,
+            "major_cover_image_url": cover_image_url,
+            "department_id": department.get("id"),
+            "department_name": department.get("name"),
+            "department_code": department.get("code"),
+            "department_cover_image_url": department.get("cover_image_url"),
+            "college_id": college.get("id"),
+            "college_name": college.get("name"),
+            "college_acronym": college.get("acronym"),
+            "college_logo_path": college.get("logo_path"),
+        }
+    sections = {
+        section_id: {"id": section_id, "name": name, "major_id": major_id}
+        for section_id, name, major_id in db.query(ClassSection.id, ClassSection.name, ClassSection.major_id)
+    }
+    subjects = {
+        subject_id: {"id": subject_id, "name": name, "code": code, "major_id": major_id}
+        for subject_id, name, code, major_id in db.query(Subject.id, Subject.name, Subject.code, Subject.major_id)
+    }
+    return Hierarchy(version, time.monotonic(), colleges, departments, majors, sections, subjects)
+
+
+def _engine_of(db: Session):
+    bind = db.get_bind()
+    return getattr(bind, "engine", bind)
+
+
+def snapshot(
+    db: Session,
+    *,
+    major_ids: Iterable[Optional[int]] = (),
+    section_ids: Iterable[Optional[int]] = (),
+    subject_ids: Iterable[Optional[int]] = (),
+) -> Hierarchy:
+    """Current hierarchy, loaded through ``db`` when missing, expired or lacking one of the given ids."""
+    engine = _engine_of(db)
+    with _lock:
+        current = _snapshots.get(engine)
+        computed_version = _version
+    if current is not None:
+        age = time.monotonic() - current.loaded_at
+        if age < HIERARCHY_CACHE_TTL_SECONDS and (
+            age < MISS_RELOAD_INTERVAL_SECONDS or not current._missing(major_ids, section_ids, subject_ids)
+        ):
+            return current
+    loaded = _load(db, computed_version)
+    with _lock:
+        if computed_version == _version:
+            _snapshots[engine] = loaded
+    return loaded
+
+
+def version() -> int:
+    with _lock:
+        return _version
+
+
+def invalidate() -> None:
+    global _version
+    with _lock:
+        _version += 1
+        _snapshots.clear()
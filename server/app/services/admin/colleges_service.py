@@ -11,15 +11,16 @@ from app.core.pagination import clamp_pagination
 from app.models.classroom import ClassSection, College, Department, Major, Subject
 from app.models.session import ClassSession
 from app.models.user import User
-from app.services import audit_service
+from app.services import academic_hierarchy, audit_service, catalog_cache
 from app.services.admin.security_service import verify_admin_password_or_401
 
 
-def _serialize_department(row: Department) -> dict[str, Any]:
+def _serialize_department(row: Department, hierarchy: academic_hierarchy.Hierarchy) -> dict[str, Any]:
+    college = hierarchy.college(row.college_id)
     return {
         "id": row.id,
         "college_id": row.college_id,
-        "college_name": row.college.name if row.college else None,
+        "college_name": college["name"] if college else None,
         "name": row.name,
         "code": row.code,
         "cover_image_url": row.cover_image_url,
@@ -27,15 +28,15 @@ def _serialize_department(row: Department) -> dict[str, Any]:
     }
 
 
-def _serialize_major(row: Major) -> dict[str, Any]:
-    department = row.department
-    college = department.college if department else None
+def _serialize_major(row: Major, hierarchy: academic_hierarchy.Hierarchy) -> dict[str, Any]:
+    department = hierarchy.department(row.department_id)
+    college = hierarchy.college(department["college_id"]) if department else None
     return {
         "id": row.id,
         "department_id": row.department_id,
-        "department_name": department.name if department else None,
-        "college_id": college.id if college else None,
-        "college_name": college.name if college else None,
+        "department_name": department["name"] if department else None,
+        "college_id": college["id"] if college else None,
+        "college_name": college["name"] if college else None,
         "name": row.name,
         "code": row.code,
         "cover_image_url": row.cover_image_url,
@@ -110,6 +111,8 @@ def create_college(db: Session, payload: dict[str, Any], actor_user_id: int) ->
         details={"name": name, "acronym": acronym, "logo_path": logo_path},
     )
     db.commit()
+    academic_hierarchy.invalidate()
+    catalog_cache.invalidate()
     db.refresh(college)
     return college
 
@@ -143,6 +146,8 @@ def update_college(db: Session, college_id: int, payload: dict[str, Any], actor_
         details=payload,
     )
     db.commit()
+    academic_hierarchy.invalidate()
+    catalog_cache.invalidate()
     db.refresh(college)
     return college
 
@@ -170,6 +175,8 @@ def delete_college(db: Session, college_id: int, actor_user_id: int, confirm_pas
         details={"name": college.name},
     )
     db.commit()
+    academic_hierarchy.invalidate()
+    catalog_cache.invalidate()
     return {"message": "College deleted successfully"}
 
 
@@ -181,14 +188,15 @@ def list_departments(
     q: Optional[str] = None,
 ) -> dict[str, Any]:
     skip, limit = clamp_pagination(skip, limit)
-    query = db.query(Department).options(joinedload(Department.college))
+    query = db.query(Department)
     if college_id is not None:
         query = query.filter(Department.college_id == college_id)
     if q:
         query = query.filter(Department.name.ilike(f"%{q}%") | Department.code.ilike(f"%{q}%"))
     total = query.count()
     rows = query.order_by(Department.name.asc()).offset(skip).limit(limit).all()
-    return {"total": total, "items": [_serialize_department(row) for row in rows]}
+    hierarchy = academic_hierarchy.snapshot(db)
+    return {"total": total, "items": [_serialize_department(row, hierarchy) for row in rows]}
 
 
 def create_department(db: Session, payload: dict[str, Any], actor_user_id: int) -> dict[str, Any]:
@@ -226,12 +234,14 @@ def create_department(db: Session, payload: dict[str, Any], actor_user_id: int)
         details={"college_id": college_id, "name": name, "code": code, "cover_image_url": cover_image_url},
     )
     db.commit()
+    academic_hierarchy.invalidate()
+    catalog_cache.invalidate()
     db.refresh(row)
-    return _serialize_department(row)
+    return _serialize_department(row, academic_hierarchy.snapshot(db))
 
 
 def update_department(db: Session, department_id: int, payload: dict[str, Any], actor_user_id: int) -> dict[str, Any]:
-    row = db.query(Department).options(joinedload(Department.college)).filter(Department.id == department_id).first()
+    row = db.query(Department).filter(Department.id == department_id).first()
     if not row:
         raise HTTPException(status_code=404, detail="Department not found.")
 
@@ -278,8 +288,10 @@ def update_department(db: Session, department_id: int, payload: dict[str, Any],
         details=payload,
     )
     db.commit()
+    academic_hierarchy.invalidate()
+    catalog_cache.invalidate()
     db.refresh(row)
-    return _serialize_department(row)
+    return _serialize_department(row, academic_hierarchy.snapshot(db))
 
 
 def delete_department(db: Session, department_id: int, actor_user_id: int, confirm_password: str) -> dict[str, Any]:
@@ -302,6 +314,8 @@ def delete_department(db: Session, department_id: int, actor_user_id: int, confi
         details={"name": row.name},
     )
     db.commit()
+    academic_hierarchy.invalidate()
+    catalog_cache.invalidate()
     return {"message": "Department deleted successfully"}
 
 
@@ -314,18 +328,17 @@ def list_majors(
     q: Optional[str] = None,
 ) -> dict[str, Any]:
     skip, limit = clamp_pagination(skip, limit)
-    query = db.query(Major).join(Department, Major.department_id == Department.id).options(
-        joinedload(Major.department).joinedload(Department.college)
-    )
+    query = db.query(Major)
     if college_id:
-        query = query.filter(Department.college_id == college_id)
+        query = query.join(Department, Major.department_id == Department.id).filter(Department.college_id == college_id)
     if department_id:
         query = query.filter(Major.department_id == department_id)
     if q:
         query = query.filter(Major.name.ilike(f"%{q}%") | Major.code.ilike(f"%{q}%"))
     total = query.count()
     rows = query.order_by(Major.name.asc()).offset(skip).limit(limit).all()
-    return {"total": total, "items": [_serialize_major(row) for row in rows]}
+    hierarchy = academic_hierarchy.snapshot(db)
+    return {"total": total, "items": [_serialize_major(row, hierarchy) for row in rows]}
 
 
 def create_major(db: Session, payload: dict[str, Any], actor_user_id: int) -> dict[str, Any]:
@@ -340,12 +353,7 @@ def create_major(db: Session, payload: dict[str, Any], actor_user_id: int) -> di
     if not code:
         raise HTTPException(status_code=400, detail="Major code is required.")
 
-    department = (
-        db.query(Department)
-        .options(joinedload(Department.college))
-        .filter(Department.id == int(department_id))
-        .first()
-    )
+    department = db.query(Department).filter(Department.id == int(department_id)).first()
     if not department:
         raise HTTPException(status_code=404, detail="Department not found.")
 
@@ -377,22 +385,14 @@ def create_major(db: Session, payload: dict[str, Any], actor_user_id: int) -> di
         details={"department_id": department_id, "name": name, "code": code, "cover_image_url": cover_image_url},
     )
     db.commit()
-    row = (
-        db.query(Major)
-        .options(joinedload(Major.department).joinedload(Department.college))
-        .filter(Major.id == row.id)
-        .first()
-    )
-    return _serialize_major(row)
+    academic_hierarchy.invalidate()
+    catalog_cache.invalidate()
+    db.refresh(row)
+    return _serialize_major(row, academic_hierarchy.snapshot(db))
 
 
 def update_major(db: Session, major_id: int, payload: dict[str, Any], actor_user_id: int) -> dict[str, Any]:
-    row = (
-        db.query(Major)
-        .options(joinedload(Major.department).joinedload(Department.college))
-        .filter(Major.id == major_id)
-        .first()
-    )
+    row = db.query(Major).filter(Major.id == major_id).first()
     if not row:
         raise HTTPException(status_code=404, detail="Major not found.")
 
@@ -455,13 +455,10 @@ def update_major(db: Session, major_id: int, payload: dict[str, Any], actor_user
         details=payload,
     )
     db.commit()
-    row = (
-        db.query(Major)
-        .options(joinedload(Major.department).joinedload(Department.college))
-        .filter(Major.id == major_id)
-        .first()
-    )
-    return _serialize_major(row)
+    academic_hierarchy.invalidate()
+    catalog_cache.invalidate()
+    db.refresh(row)
+    return _serialize_major(row, academic_hierarchy.snapshot(db))
 
 
 def delete_major(db: Session, major_id: int, actor_user_id: int, confirm_password: str) -> dict[str, Any]:
@@ -487,6 +484,8 @@ def delete_major(db: Session, major_id: int, actor_user_id: int, confirm_passwor
         details={"name": row.name, "code": row.code},
     )
     db.commit()
+    academic_hierarchy.invalidate()
+    catalog_cache.invalidate()
     return {"message": "Major deleted successfully"}
 
 
@@ -504,7 +503,6 @@ def get_college_details(db: Session, college_id: int) -> dict[str, Any]:
     teacher_ids = [t.id for t in teachers]
     departments = (
         db.query(Department)
-        .options(joinedload(Department.college))
         .filter(Department.college_id == college_id)
         .order_by(Department.name.asc())
         .all()
@@ -512,7 +510,6 @@ def get_college_details(db: Session, college_id: int) -> dict[str, Any]:
     majors = (
         db.query(Major)
         .join(Department, Major.department_id == Department.id)
-        .options(joinedload(Major.department).joinedload(Department.college))
         .filter(Department.college_id == college_id)
         .order_by(Major.name.asc())
         .all()
@@ -545,6 +542,7 @@ def get_college_details(db: Session, college_id: int) -> dict[str, Any]:
         or 0
     )
 
+    hierarchy = academic_hierarchy.snapshot(db)
     return {
         "id": college.id,
         "name": college.name,
@@ -561,10 +559,10 @@ def get_college_details(db: Session, college_id: int) -> dict[str, Any]:
             for t in teachers
         ],
         "departments_count": len(departments),
-        "departments": [_serialize_department(d) for d in departments],
+        "departments": [_serialize_department(d, hierarchy) for d in departments],
         "total_sessions": total_sessions,
         "active_sessions": active_sessions_count,
         "avg_sessions_per_teacher": round(avg_sessions_per_teacher, 1),
         "majors_count": len(majors),
-        "majors": [_serialize_major(m) for m in majors],
+        "majors": [_serialize_major(m, hierarchy) for m in majors],
     }
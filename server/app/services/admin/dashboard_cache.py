@@ -0,0 +1,62 @@
+"""In-process cache of the admin dashboard payload, keyed by its filter tuple.
+
+Admins keep the dashboard open with a 5 second auto-refresh, and every load used to
+rerun all of its queries for the selected filters. Entries live for
+``DASHBOARD_CACHE_TTL_SECONDS`` (bounding how stale live engagement figures get) and
+are all dropped by ``invalidate`` when something the dashboard counts changes: a
+session starts or stops, an alert is raised or read.
+
+A payload computed while an invalidation happened is not stored (``put`` checks the
+generation it was computed under), so a slow miss cannot re-install stale data.
+Cached payloads are shared between requests and must not be mutated.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Hashable
+
+DASHBOARD_CACHE_TTL_SECONDS = 5.0
+MAX_ENTRIES = 256
+
+_entries: dict[Hashable, tuple[float, dict[str, Any]]] = {}
+_generation = 0
+_lock = threading.Lock()
+
+
+def generation() -> int:
+    with _lock:
+        return _generation
+
+
+def get(key: Hashable) -> dict[str, Any] | None:
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None:
+            return None
+        expires_at, payload = entry
+        if expires_at <= time.monotonic():
+            _entries.pop(key, None)
+            return None
+        return payload
+
+
+def put(key: Hashable, payload: dict[str, Any], computed_generation: int) -> None:
+    with _lock:
+        if computed_generation != _generation:
+            return
+        if len(_entries) >= MAX_ENTRIES:
+            now = time.monotonic()
+            for stale in [k for k, (expires_at, _) in _entries.items() if expires_at <= now]:
+                del _entries[stale]
+            if len(_entries) >= MAX_ENTRIES:
+                _entries.clear()
+        _entries[key] = (time.monotonic() + DASHBOARD_CACHE_TTL_SECONDS, payload)
+
+
+def invalidate() -> None:
+    global _generation
+    with _lock:
+        _generation += 1
+        _entries.clear()
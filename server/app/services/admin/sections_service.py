@@ -4,16 +4,16 @@ from typing import Any, Optional
 import json
 
 from fastapi import HTTPException
-from sqlalchemy import func
+from sqlalchemy import and_, case, false, func, not_, or_
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, aliased, contains_eager, joinedload
 
 from app.constants import DEFAULT_PAGE_SIZE
 from app.core.pagination import clamp_pagination
 from app.models.classroom import ClassSection, Department, Major, SectionSubjectAssignment, Subject
 from app.models.session import ClassSession
 from app.models.user import User
-from app.services import notification_service
+from app.services import academic_hierarchy, catalog_cache, notification_service, search_service
 from app.services.admin.security_service import verify_admin_password_or_401
 from app.validators.session import validate_subject_name
 
@@ -36,12 +36,7 @@ def _ensure_teacher(db: Session, teacher_id: int) -> User:
 def _ensure_major(db: Session, major_id: Optional[int]) -> Major:
     if major_id is None:
         raise HTTPException(status_code=400, detail="major_id is required")
-    major = (
-        db.query(Major)
-        .options(joinedload(Major.department).joinedload(Department.college))
-        .filter(Major.id == int(major_id))
-        .first()
-    )
+    major = db.query(Major).filter(Major.id == int(major_id)).first()
     if not major:
         raise HTTPException(status_code=404, detail="Major not found")
     return major
@@ -73,10 +68,16 @@ def _resolve_assignment(
     return None
 
 
-def _serialize_section(row: ClassSection, assignment: Optional[SectionSubjectAssignment] = None) -> dict[str, Any]:
-    major = row.major
-    department = major.department if major else None
-    college = department.college if department else None
+def _hierarchy(db: Session, major_ids) -> academic_hierarchy.Hierarchy:
+    return academic_hierarchy.snapshot(db, major_ids=major_ids)
+
+
+def _serialize_section(
+    row: ClassSection,
+    assignment: Optional[SectionSubjectAssignment],
+    hierarchy: academic_hierarchy.Hierarchy,
+) -> dict[str, Any]:
+    major = hierarchy.major(row.major_id)
     teacher = assignment.teacher if assignment and assignment.teacher else row.teacher
     teacher_id = assignment.teacher_id if assignment else row.teacher_id
     subject = assignment.subject if assignment else None
@@ -86,11 +87,11 @@ def _serialize_section(row: ClassSection, assignment: Optional[SectionSubjectAss
         "subject_id": subject.id if subject else None,
         "subject_name": subject.name if subject else "unassigned",
         "major_id": row.major_id,
-        "major_name": major.name if major else None,
-        "department_id": department.id if department else None,
-        "department_name": department.name if department else None,
-        "college_id": college.id if college else None,
-        "college_name": college.name if college else None,
+        "major_name": major["major_name"],
+        "department_id": major["department_id"],
+        "department_name": major["department_name"],
+        "college_id": major["college_id"],
+        "college_name": major["college_name"],
         "year_level": row.year_level,
         "section_code": row.section_code,
         "section_letter": row.section_code,
@@ -102,7 +103,7 @@ def _serialize_section(row: ClassSection, assignment: Optional[SectionSubjectAss
     }
 
 
-def _class_status(assignment: SectionSubjectAssignment) -> str:
+def _class_status(assignment: SectionSubjectAssignment, hierarchy: academic_hierarchy.Hierarchy) -> str:
     section = assignment.section
     subject = assignment.subject
     if not section or not subject:
@@ -110,7 +111,7 @@ def _class_status(assignment: SectionSubjectAssignment) -> str:
     if section.major_id != subject.major_id:
         return "invalid_mapping"
 
-    section_department_id = section.major.department_id if section.major else None
+    section_department_id = hierarchy.major(section.major_id)["department_id"]
     teacher = assignment.teacher
     if assignment.teacher_id is None:
         return "unassigned_teacher"
@@ -119,22 +120,23 @@ def _class_status(assignment: SectionSubjectAssignment) -> str:
     return "assigned"
 
 
-def _serialize_class_assignment(assignment: SectionSubjectAssignment) -> dict[str, Any]:
+def _serialize_class_assignment(
+    assignment: SectionSubjectAssignment, hierarchy: academic_hierarchy.Hierarchy
+) -> dict[str, Any]:
     section = assignment.section
     subject = assignment.subject
     teacher = assignment.teacher
-    major = section.major if section else None
-    department = major.department if major else None
-    subject_major = subject.major if subject else None
+    major = hierarchy.major(section.major_id if section else None)
+    subject_major = hierarchy.major(subject.major_id if subject else None)
     return {
         "id": assignment.id,
         "section": {
             "id": section.id if section else 0,
             "name": section.name if section else "Unknown section",
             "major_id": section.major_id if section else None,
-            "major_name": major.name if major else None,
-            "department_id": department.id if department else None,
-            "department_name": department.name if department else None,
+            "major_name": major["major_name"],
+            "department_id": major["department_id"],
+            "department_name": major["department_name"],
             "year_level": section.year_level if section else None,
             "section_code": section.section_code if section else None,
         },
@@ -143,7 +145,7 @@ def _serialize_class_assignment(assignment: SectionSubjectAssignment) -> dict[st
             "name": subject.name if subject else "Unknown subject",
             "code": subject.code if subject else None,
             "major_id": subject.major_id if subject else None,
-            "major_name": subject_major.name if subject_major else None,
+            "major_name": subject_major["major_name"],
         },
         "teacher": {
             "id": teacher.id if teacher else None,
@@ -152,18 +154,27 @@ def _serialize_class_assignment(assignment: SectionSubjectAssignment) -> dict[st
             "department_id": teacher.department_id if teacher else None,
             "profile_picture_url": teacher.profile_picture_url if teacher else None,
         },
-        "status": _class_status(assignment),
+        "status": _class_status(assignment, hierarchy),
         "created_at": assignment.created_at,
         "updated_at": assignment.updated_at,
     }
 
 
+def _class_hierarchy(db: Session, assignment: SectionSubjectAssignment) -> academic_hierarchy.Hierarchy:
+    return _hierarchy(
+        db,
+        [
+            assignment.section.major_id if assignment.section else None,
+            assignment.subject.major_id if assignment.subject else None,
+        ],
+    )
+
+
 def _ensure_section(db: Session, section_id: int) -> ClassSection:
     section = (
         db.query(ClassSection)
         .options(
-            joinedload(ClassSection.major).joinedload(Major.department).joinedload(Department.college),
-            joinedload(ClassSection.subject_assignments).joinedload(SectionSubjectAssignment.subject).joinedload(Subject.major),
+            joinedload(ClassSection.subject_assignments).joinedload(SectionSubjectAssignment.subject),
             joinedload(ClassSection.subject_assignments).joinedload(SectionSubjectAssignment.teacher),
         )
         .filter(ClassSection.id == section_id)
@@ -178,11 +189,8 @@ def _ensure_class_assignment(db: Session, assignment_id: int) -> SectionSubjectA
     assignment = (
         db.query(SectionSubjectAssignment)
         .options(
-            joinedload(SectionSubjectAssignment.section)
-            .joinedload(ClassSection.major)
-            .joinedload(Major.department)
-            .joinedload(Department.college),
-            joinedload(SectionSubjectAssignment.subject).joinedload(Subject.major),
+            joinedload(SectionSubjectAssignment.section),
+            joinedload(SectionSubjectAssignment.subject),
             joinedload(SectionSubjectAssignment.teacher),
         )
         .filter(SectionSubjectAssignment.id == assignment_id)
@@ -228,48 +236,78 @@ def list_sections(
     department_id: Optional[int] = None,
     major_id: Optional[int] = None,
 ) -> dict[str, Any]:
+    """One row per (section, subject assignment), or per section without assignments."""
     skip, limit = clamp_pagination(skip, limit)
+    assignment_teacher = aliased(User)
+    section_teacher = aliased(User)
     query = (
-        db.query(ClassSection)
-        .join(Major, ClassSection.major_id == Major.id)
-        .join(Department, Major.department_id == Department.id)
-        .options(
-            joinedload(ClassSection.major).joinedload(Major.department).joinedload(Department.college),
-            joinedload(ClassSection.teacher),
-            joinedload(ClassSection.subject_assignments).joinedload(SectionSubjectAssignment.subject),
-            joinedload(ClassSection.subject_assignments).joinedload(SectionSubjectAssignment.teacher),
-        )
+        db.query(ClassSection, SectionSubjectAssignment)
+        .outerjoin(SectionSubjectAssignment, SectionSubjectAssignment.section_id == ClassSection.id)
+        .outerjoin(Subject, SectionSubjectAssignment.subject_id == Subject.id)
+        .outerjoin(assignment_teacher, SectionSubjectAssignment.teacher_id == assignment_teacher.id)
+        .outerjoin(section_teacher, ClassSection.teacher_id == section_teacher.id)
     )
     if major_id:
         query = query.filter(ClassSection.major_id == major_id)
+    if department_id or college_id:
+        query = query.join(Major, ClassSection.major_id == Major.id)
     if department_id:
         query = query.filter(Major.department_id == department_id)
     if college_id:
-        query = query.filter(Department.college_id == college_id)
+        query = query.join(Department, Major.department_id == Department.id).filter(Department.college_id == college_id)
+    if q and q.strip():
+        # The teacher shown is the assignment's, falling back to the section's (_serialize_section).
+        shown_teacher_id = case(
+            (assignment_teacher.id.isnot(None), assignment_teacher.id), else_=section_teacher.id
+        )
+        clauses = [
+            search_service.id_filter(db, "section", q, ClassSection.id),
+            search_service.id_filter(db, "subject", q, Subject.id),
+            search_service.id_filter(db, "user", q, shown_teacher_id),
+        ]
+        # Missing subjects and teachers are listed as "unassigned".
+        if q.strip().lower() in "unassigned":
+            clauses += [Subject.id.is_(None), shown_teacher_id.is_(None)]
+        query = query.filter(or_(*clauses))
+
+    total = query.count()
+    rows = (
+        query.options(
+            contains_eager(ClassSection.teacher.of_type(section_teacher)),
+            contains_eager(SectionSubjectAssignment.subject),
+            contains_eager(SectionSubjectAssignment.teacher.of_type(assignment_teacher)),
+        )
+        .order_by(ClassSection.created_at.desc(), ClassSection.id.desc(), SectionSubjectAssignment.id.asc())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+    hierarchy = _hierarchy(db, [section.major_id for section, _ in rows])
+    return {"total": total, "items": [_serialize_section(section, assignment, hierarchy) for section, assignment in rows]}
 
-    sections = query.order_by(ClassSection.created_at.desc(), ClassSection.id.desc()).all()
 
-    expanded: list[dict[str, Any]] = []
-    for section in sections:
-        if section.subject_assignments:
-            for assignment in section.subject_assignments:
-                expanded.append(_serialize_section(section, assignment))
-        else:
-            expanded.append(_serialize_section(section, None))
-
-    if q:
-        pattern = q.strip().lower()
-        expanded = [
-            row
-            for row in expanded
-            if pattern in (row["name"] or "").lower()
-            or pattern in (row["subject_name"] or "").lower()
-            or pattern in (row["teacher_username"] or "").lower()
-            or pattern in (row["teacher_fullname"] or "").lower()
-        ]
+def _class_status_filter(status: str, teacher):
+    """SQL predicate selecting assignments whose _class_status matches ``status``.
 
-    total = len(expanded)
-    return {"total": total, "items": expanded[skip : skip + limit]}
+    ``needs_setup`` selects everything that is not ``assigned``. Expects the query to join
+    ClassSection, Major, Subject (outer) and ``teacher`` (outer, the assignment's teacher).
+    """
+    mapping_invalid = or_(Subject.id.is_(None), ClassSection.major_id.is_distinct_from(Subject.major_id))
+    teacher_invalid = and_(
+        SectionSubjectAssignment.teacher_id.isnot(None),
+        Major.department_id.isnot(None),
+        teacher.department_id.is_distinct_from(Major.department_id),
+    )
+    invalid = or_(mapping_invalid, teacher_invalid)
+    unassigned = and_(not_(mapping_invalid), SectionSubjectAssignment.teacher_id.is_(None))
+    assigned = and_(not_(invalid), SectionSubjectAssignment.teacher_id.isnot(None))
+    predicates = {
+        "assigned": assigned,
+        "unassigned_teacher": unassigned,
+        "invalid_mapping": invalid,
+        "needs_setup": not_(assigned),
+    }
+    return predicates.get(status, false())
 
 
 def list_classes(
@@ -284,66 +322,53 @@ def list_classes(
     status: Optional[str] = None,
 ) -> dict[str, Any]:
     skip, limit = clamp_pagination(skip, limit)
+    teacher = aliased(User)
     query = (
         db.query(SectionSubjectAssignment)
         .join(ClassSection, SectionSubjectAssignment.section_id == ClassSection.id)
         .join(Major, ClassSection.major_id == Major.id)
-        .join(Department, Major.department_id == Department.id)
-        .options(
-            joinedload(SectionSubjectAssignment.section)
-            .joinedload(ClassSection.major)
-            .joinedload(Major.department)
-            .joinedload(Department.college),
-            joinedload(SectionSubjectAssignment.subject).joinedload(Subject.major),
-            joinedload(SectionSubjectAssignment.teacher),
-        )
+        .outerjoin(Subject, SectionSubjectAssignment.subject_id == Subject.id)
+        .outerjoin(teacher, SectionSubjectAssignment.teacher_id == teacher.id)
     )
     if major_id is not None:
         query = query.filter(ClassSection.major_id == major_id)
     if department_id is not None:
         query = query.filter(Major.department_id == department_id)
     if college_id is not None:
-        query = query.filter(Department.college_id == college_id)
+        query = query.join(Department, Major.department_id == Department.id).filter(Department.college_id == college_id)
     if teacher_id is not None:
         query = query.filter(SectionSubjectAssignment.teacher_id == teacher_id)
-
-    rows = query.order_by(SectionSubjectAssignment.updated_at.desc(), SectionSubjectAssignment.id.desc()).all()
-    pattern = q.strip().lower() if q else ""
+    if q and q.strip():
+        query = query.filter(
+            or_(
+                search_service.id_filter(db, "section", q, ClassSection.id),
+                search_service.id_filter(db, "subject", q, Subject.id),
+                search_service.id_filter(db, "user", q, teacher.id),
+                # Majors are a small catalogue and not indexed.
+                Major.name.ilike(f"%{q.strip()}%"),
+            )
+        )
     status_filter = (status or "").strip().lower()
-    items: list[dict[str, Any]] = []
-    for row in rows:
-        serialized = _serialize_class_assignment(row)
-        if pattern:
-            teacher = serialized["teacher"]
-            section = serialized["section"]
-            subject_item = serialized["subject"]
-            major_name = section.get("major_name") or ""
-            haystack = " ".join(
-                [
-                    section.get("name") or "",
-                    section.get("section_code") or "",
-                    subject_item.get("name") or "",
-                    subject_item.get("code") or "",
-                    teacher.get("username") or "",
-                    teacher.get("fullname") or "",
-                    major_name,
-                ]
-            ).lower()
-            if pattern not in haystack:
-                continue
-
-        if status_filter:
-            current_status = serialized["status"]
-            if status_filter == "needs_setup":
-                if current_status == "assigned":
-                    continue
-            elif current_status != status_filter:
-                continue
-
-        items.append(serialized)
-
-    total = len(items)
-    return {"total": total, "items": items[skip : skip + limit]}
+    if status_filter:
+        query = query.filter(_class_status_filter(status_filter, teacher))
+
+    total = query.count()
+    rows = (
+        query.options(
+            contains_eager(SectionSubjectAssignment.section),
+            contains_eager(SectionSubjectAssignment.subject),
+            contains_eager(SectionSubjectAssignment.teacher.of_type(teacher)),
+        )
+        .order_by(SectionSubjectAssignment.updated_at.desc(), SectionSubjectAssignment.id.desc())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+    hierarchy = _hierarchy(
+        db,
+        [row.section.major_id for row in rows if row.section] + [row.subject.major_id for row in rows if row.subject],
+    )
+    return {"total": total, "items": [_serialize_class_assignment(row, hierarchy) for row in rows]}
 
 
 def create_section(db: Session, payload: dict[str, Any]) -> dict[str, Any]:
@@ -410,11 +435,12 @@ def create_section(db: Session, payload: dict[str, Any]) -> dict[str, Any]:
         )
 
     db.commit()
+    academic_hierarchy.invalidate()
+    catalog_cache.invalidate()
     db.refresh(row)
     row = (
         db.query(ClassSection)
         .options(
-            joinedload(ClassSection.major).joinedload(Major.department).joinedload(Department.college),
             joinedload(ClassSection.teacher),
             joinedload(ClassSection.subject_assignments).joinedload(SectionSubjectAssignment.subject),
             joinedload(ClassSection.subject_assignments).joinedload(SectionSubjectAssignment.teacher),
@@ -423,14 +449,13 @@ def create_section(db: Session, payload: dict[str, Any]) -> dict[str, Any]:
         .first()
     )
     assignment = row.subject_assignments[0] if row.subject_assignments else None
-    return _serialize_section(row, assignment)
+    return _serialize_section(row, assignment, _hierarchy(db, [row.major_id]))
 
 
 def update_section(db: Session, section_id: int, payload: dict[str, Any]) -> dict[str, Any]:
     row = (
         db.query(ClassSection)
         .options(
-            joinedload(ClassSection.major).joinedload(Major.department).joinedload(Department.college),
             joinedload(ClassSection.teacher),
             joinedload(ClassSection.subject_assignments).joinedload(SectionSubjectAssignment.subject),
             joinedload(ClassSection.subject_assignments).joinedload(SectionSubjectAssignment.teacher),
@@ -505,11 +530,12 @@ def update_section(db: Session, section_id: int, payload: dict[str, Any]) -> dic
     except IntegrityError:
         db.rollback()
         raise HTTPException(status_code=400, detail="Section already exists for this major/year/section code")
+    academic_hierarchy.invalidate()
+    catalog_cache.invalidate()
     db.refresh(row)
     row = (
         db.query(ClassSection)
         .options(
-            joinedload(ClassSection.major).joinedload(Major.department).joinedload(Department.college),
             joinedload(ClassSection.teacher),
             joinedload(ClassSection.subject_assignments).joinedload(SectionSubjectAssignment.subject),
             joinedload(ClassSection.subject_assignments).joinedload(SectionSubjectAssignment.teacher),
@@ -518,14 +544,13 @@ def update_section(db: Session, section_id: int, payload: dict[str, Any]) -> dic
         .first()
     )
     assignment = _resolve_assignment(db, row, int(subject_id) if subject_id is not None else None)
-    return _serialize_section(row, assignment)
+    return _serialize_section(row, assignment, _hierarchy(db, [row.major_id]))
 
 
 def unassign_section_teacher(db: Session, section_id: int, subject_id: Optional[int] = None) -> dict[str, Any]:
     row = (
         db.query(ClassSection)
         .options(
-            joinedload(ClassSection.major).joinedload(Major.department).joinedload(Department.college),
             joinedload(ClassSection.teacher),
             joinedload(ClassSection.subject_assignments).joinedload(SectionSubjectAssignment.subject),
             joinedload(ClassSection.subject_assignments).joinedload(SectionSubjectAssignment.teacher),
@@ -545,11 +570,11 @@ def unassign_section_teacher(db: Session, section_id: int, subject_id: Optional[
         db.add(row)
 
     db.commit()
+    catalog_cache.invalidate()
     db.refresh(row)
     row = (
         db.query(ClassSection)
         .options(
-            joinedload(ClassSection.major).joinedload(Major.department).joinedload(Department.college),
             joinedload(ClassSection.teacher),
             joinedload(ClassSection.subject_assignments).joinedload(SectionSubjectAssignment.subject),
             joinedload(ClassSection.subject_assignments).joinedload(SectionSubjectAssignment.teacher),
@@ -558,7 +583,7 @@ def unassign_section_teacher(db: Session, section_id: int, subject_id: Optional[
         .first()
     )
     assignment = _resolve_assignment(db, row, subject_id)
-    return _serialize_section(row, assignment)
+    return _serialize_section(row, assignment, _hierarchy(db, [row.major_id]))
 
 
 def delete_section(db: Session, section_id: int, actor_user_id: int, confirm_password: str) -> dict[str, Any]:
@@ -573,6 +598,8 @@ def delete_section(db: Session, section_id: int, actor_user_id: int, confirm_pas
     db.query(SectionSubjectAssignment).filter(SectionSubjectAssignment.section_id == section_id).delete()
     db.delete(row)
     db.commit()
+    academic_hierarchy.invalidate()
+    catalog_cache.invalidate()
     return {"message": "Section deleted"}
 
 
@@ -689,13 +716,16 @@ def create_class(db: Session, payload: dict[str, Any]) -> dict[str, Any]:
             # Keep explicit rollback behavior clear when this function creates the section in-process.
             pass
         raise
+    if created_section or subject_id is None:
+        academic_hierarchy.invalidate()
+    catalog_cache.invalidate()
 
     assignment = _ensure_class_assignment(db, assignment.id)
     if teacher:
         _notify_teacher_assignment(db, teacher=teacher, section=assignment.section, subject=assignment.subject)
         db.commit()
         assignment = _ensure_class_assignment(db, assignment.id)
-    return _serialize_class_assignment(assignment)
+    return _serialize_class_assignment(assignment, _class_hierarchy(db, assignment))
 
 
 def update_class(db: Session, class_assignment_id: int, payload: dict[str, Any]) -> dict[str, Any]:
@@ -730,6 +760,7 @@ def update_class(db: Session, class_assignment_id: int, payload: dict[str, Any])
 
     db.add(assignment)
     db.commit()
+    catalog_cache.invalidate()
     assignment = _ensure_class_assignment(db, assignment.id)
     if teacher_for_notification:
         _notify_teacher_assignment(
@@ -740,7 +771,7 @@ def update_class(db: Session, class_assignment_id: int, payload: dict[str, Any])
         )
         db.commit()
         assignment = _ensure_class_assignment(db, assignment.id)
-    return _serialize_class_assignment(assignment)
+    return _serialize_class_assignment(assignment, _class_hierarchy(db, assignment))
 
 
 def delete_class(db: Session, class_assignment_id: int) -> dict[str, Any]:
@@ -749,6 +780,7 @@ def delete_class(db: Session, class_assignment_id: int) -> dict[str, Any]:
         raise HTTPException(status_code=404, detail="Class assignment not found")
     db.delete(assignment)
     db.commit()
+    catalog_cache.invalidate()
     return {"message": "Class assignment removed"}
 
 
@@ -762,7 +794,6 @@ def assign_section_teacher(
     section = (
         db.query(ClassSection)
         .options(
-            joinedload(ClassSection.major).joinedload(Major.department).joinedload(Department.college),
             joinedload(ClassSection.subject_assignments).joinedload(SectionSubjectAssignment.subject),
             joinedload(ClassSection.subject_assignments).joinedload(SectionSubjectAssignment.teacher),
             joinedload(ClassSection.teacher),
@@ -806,12 +837,12 @@ def assign_section_teacher(
         ),
     )
     db.commit()
+    catalog_cache.invalidate()
     db.refresh(section)
 
     section = (
         db.query(ClassSection)
         .options(
-            joinedload(ClassSection.major).joinedload(Major.department).joinedload(Department.college),
             joinedload(ClassSection.subject_assignments).joinedload(SectionSubjectAssignment.subject),
             joinedload(ClassSection.subject_assignments).joinedload(SectionSubjectAssignment.teacher),
             joinedload(ClassSection.teacher),
@@ -820,4 +851,4 @@ def assign_section_teacher(
         .first()
     )
     assignment = _resolve_assignment(db, section, subject_id)
-    return _serialize_section(section, assignment)
+    return _serialize_section(section, assignment, _hierarchy(db, [section.major_id]))
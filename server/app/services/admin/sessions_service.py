@@ -1,9 +1,9 @@
-from datetime import date, datetime, time, timedelta
+from datetime import date, datetime, time, timedelta, timezone
 from typing import Any, Optional
 
 from fastapi import HTTPException
-from sqlalchemy import func, or_, cast, String
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import case, func, true
+from sqlalchemy.orm import Session
 
 from app.models.session import (
     Alert,
@@ -13,15 +13,30 @@ from app.models.session import (
     ClassSession,
     SessionHistory,
     SessionMetrics,
+    SessionSummary,
 )
 from app.models.classroom import ClassSection, Department, Major
 from app.models.user import User
-from app.services.admin import settings_service
-from app.services import audit_service, detector_service
+from app.services.admin import dashboard_cache, settings_service
+from app.services import (
+    alert_service,
+    audit_service,
+    detector_service,
+    engagement_service,
+    event_hub,
+    live_session_store,
+    log_archive_service,
+    raw_detection_service,
+    rollup_service,
+    search_service,
+    session_read_model,
+    session_summary_service,
+    video_analysis_service,
+)
 from app.core.logging import get_recent_server_logs
 from app.utils.datetime import utc_now
 from app.constants import DEFAULT_PAGE_SIZE
-from app.core.pagination import clamp_pagination
+from app.core.pagination import clamp_pagination, keyset_page
 
 
 def _to_float(value: Any) -> float:
@@ -91,36 +106,30 @@ def _avg_engagement_from_logs(
     - Includes not_visible penalty if configured (default 0).
     Returns a value clamped to [0, 100].
     """
-    rows = (
-        db.query(
-            BehaviorLog.on_task,
-            BehaviorLog.using_phone,
-            BehaviorLog.sleeping,
-            BehaviorLog.off_task,
-            BehaviorLog.not_visible,
-            BehaviorLog.students_present_snapshot,
-        )
-        .filter(BehaviorLog.session_id == session_id)
-        .all()
+    rows = log_archive_service.log_rows(
+        db,
+        session_id,
+        ("on_task", "using_phone", "sleeping", "off_task", "not_visible", "students_present_snapshot"),
     )
     if not rows:
         return 0.0
 
     total_score = 0.0
     count = 0
-    w_not_visible = weights.get("not_visible", 0.0)
     for on_task, using_phone, sleeping, off_task, not_visible, snapshot in rows:
         sp = snapshot if snapshot and snapshot > 0 else session_students_present
-        if sp <= 0:
-            continue
-        raw_score = (
-            (weights["on_task"] * _to_float(on_task))
-            - (weights["using_phone"] * _to_float(using_phone))
-            - (weights["sleeping"] * _to_float(sleeping))
-            - (weights["off_task"] * _to_float(off_task))
-            - (w_not_visible * _to_float(not_visible))
+        score = engagement_service._headcount_engagement_percent(
+            _to_float(on_task),
+            _to_float(using_phone),
+            _to_float(sleeping),
+            _to_float(off_task),
+            _to_float(not_visible),
+            sp or 0,
+            weights,
         )
-        total_score += max(0.0, min(100.0, (raw_score / sp) * 100))
+        if score is None:
+            continue
+        total_score += score
         count += 1
 
     if count == 0:
@@ -128,19 +137,41 @@ def _avg_engagement_from_logs(
     return round(total_score / count, 2)
 
 
+def _session_engagement(db: Session, row) -> float:
+    """Headcount engagement of a session_read_model row; active sessions are served from the
+    live store, finalized ones from their summary."""
+    if row.is_active:
+        live = live_session_store.snapshot(row.id)
+        if live is None:
+            # Not hydrated yet (e.g. after a restart).
+            session = db.query(ClassSession).filter(ClassSession.id == row.id).first()
+            live = engagement_service.get_live_snapshot(db, session) if session else None
+        if live is not None:
+            return live["headcount_average_engagement"]
+    elif row.summary_id is not None:
+        return float(row.final_engagement)
+    return _avg_engagement_from_logs(
+        db, row.id, row.students_present, settings_service.get_engagement_weights(db, mode=row.activity_mode)
+    )
+
+
 def recalculate_all_sessions_engagement(db: Session) -> int:
     """Updates the cached average_engagement for every session in the database.
 
-    Used when system-wide engagement weights are updated.
+    Used when system-wide engagement weights are updated. Ended sessions are finalized
+    again, since their summaries were computed with the previous weights.
     """
     sessions = db.query(ClassSession).all()
     count = 0
     for s in sessions:
         if s.activity_mode == "EXAM":
             continue
-        weights = settings_service.get_engagement_weights(db, mode=s.activity_mode)
-        avg = _avg_engagement_from_logs(db, s.id, s.students_present, weights)
-        s.average_engagement = avg
+        if not s.is_active:
+            summary = session_summary_service.finalize_session(db, s.id)
+            s.average_engagement = summary.headcount_average_engagement
+        else:
+            weights = settings_service.get_engagement_weights(db, mode=s.activity_mode)
+            s.average_engagement = _avg_engagement_from_logs(db, s.id, s.students_present, weights)
         db.add(s)
         count += 1
     db.commit()
@@ -189,23 +220,12 @@ def get_dashboard_data(
     date_to: Optional[date] = None,
     activity_mode: Optional[str] = None,
 ) -> dict[str, Any]:
-    weights = settings_service.get_engagement_weights(db)
-    total_users = db.query(func.count(User.id)).scalar() or 0
-    active_users = db.query(func.count(User.id)).filter(User.is_active == True).scalar() or 0
-    session_scope_query = _apply_session_scope_filters(
-        db.query(ClassSession),
-        college_id=college_id,
-        department_id=department_id,
-        major_id=major_id,
-        date_from=date_from,
-        date_to=date_to,
-        activity_mode=activity_mode,
-    )
-    total_subjects = session_scope_query.with_entities(func.count(func.distinct(ClassSession.subject_id))).scalar() or 0
-    total_sections = session_scope_query.with_entities(func.count(func.distinct(ClassSession.section_id))).scalar() or 0
-    active_sessions_count = (
-        session_scope_query.filter(ClassSession.is_active == True).with_entities(func.count(ClassSession.id)).scalar() or 0
-    )
+    cache_key = (college_id, department_id, major_id, date_from, date_to, activity_mode)
+    cached = dashboard_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    generation = dashboard_cache.generation()
+
     scoped_session_ids_subquery = (
         _apply_session_scope_filters(
             db.query(ClassSession.id),
@@ -218,30 +238,14 @@ def get_dashboard_data(
         )
         .subquery()
     )
-    unread_alerts = (
-        db.query(func.count(Alert.id))
-        .filter(
-            Alert.is_read == False, 
-            Alert.session_id.in_(db.query(scoped_session_ids_subquery.c.id)),
-            Alert.alert_type.in_(["SLEEPING", "PHONE", "ENGAGEMENT_DROP"])
-        )
-        .scalar()
-        or 0
-    )
-    critical_unread_alerts = (
-        db.query(func.count(Alert.id))
-        .filter(
-            Alert.is_read == False,
-            Alert.severity == AlertSeverity.CRITICAL.value,
-            Alert.session_id.in_(db.query(scoped_session_ids_subquery.c.id)),
-            Alert.alert_type.in_(["SLEEPING", "PHONE", "ENGAGEMENT_DROP"])
-        )
-        .scalar()
-        or 0
-    )
-    total_teachers = (
+    # All counters in one round trip: three single-row conditional aggregates cross-joined.
+    user_counts = db.query(
+        func.count(User.id).label("total_users"),
+        func.coalesce(func.sum(case((User.is_active == True, 1), else_=0)), 0).label("active_users"),
+    ).subquery()
+    session_counts = (
         _apply_session_scope_filters(
-            db.query(ClassSession.teacher_id).filter(ClassSession.teacher_id.isnot(None)),
+            db.query(ClassSession),
             college_id=college_id,
             department_id=department_id,
             major_id=major_id,
@@ -249,13 +253,39 @@ def get_dashboard_data(
             date_to=date_to,
             activity_mode=activity_mode,
         )
-        .distinct()
-        .count()
+        .with_entities(
+            func.count(func.distinct(ClassSession.subject_id)).label("total_subjects"),
+            func.count(func.distinct(ClassSession.section_id)).label("total_sections"),
+            func.count(func.distinct(ClassSession.teacher_id)).label("total_teachers"),
+            func.coalesce(func.sum(case((ClassSession.is_active == True, 1), else_=0)), 0).label("active_sessions"),
+        )
+        .subquery()
+    )
+    alert_counts = (
+        db.query(
+            func.count(Alert.id).label("unread_alerts"),
+            func.coalesce(
+                func.sum(case((Alert.severity == AlertSeverity.CRITICAL.value, 1), else_=0)), 0
+            ).label("critical_unread_alerts"),
+        )
+        .filter(
+            Alert.is_read == False,
+            Alert.session_id.in_(db.query(scoped_session_ids_subquery.c.id)),
+            Alert.alert_type.in_(["SLEEPING", "PHONE", "ENGAGEMENT_DROP"])
+        )
+        .subquery()
+    )
+    counts = (
+        db.query(user_counts, session_counts, alert_counts)
+        .select_from(user_counts)
+        .join(session_counts, true())
+        .join(alert_counts, true())
+        .one()
     )
 
     active_sessions_raw = (
         _apply_session_scope_filters(
-            db.query(ClassSession),
+            session_read_model.session_query(db),
             college_id=college_id,
             department_id=department_id,
             major_id=major_id,
@@ -263,21 +293,15 @@ def get_dashboard_data(
             date_to=date_to,
             activity_mode=activity_mode,
         )
-        .options(
-            joinedload(ClassSession.subject),
-            joinedload(ClassSession.section).joinedload(ClassSection.major).joinedload(Major.department).joinedload(Department.college),
-            joinedload(ClassSession.teacher),
-        )
         .filter(ClassSession.is_active == True)
         .order_by(ClassSession.start_time.desc())
         .limit(8)
         .all()
     )
-    active_session_ids = [row.id for row in active_sessions_raw]
 
     recent_sessions_raw = (
         _apply_session_scope_filters(
-            db.query(ClassSession),
+            session_read_model.session_query(db),
             college_id=college_id,
             department_id=department_id,
             major_id=major_id,
@@ -285,43 +309,17 @@ def get_dashboard_data(
             date_to=date_to,
             activity_mode=activity_mode,
         )
-        .options(
-            joinedload(ClassSession.subject),
-            joinedload(ClassSession.section).joinedload(ClassSection.major).joinedload(Major.department).joinedload(Department.college),
-            joinedload(ClassSession.teacher),
-        )
         .order_by(ClassSession.start_time.desc())
         .limit(10)
         .all()
     )
-    def _serialize_session(row: ClassSession) -> dict[str, Any]:
-        teacher_username, teacher_fullname = _teacher_name_fields(row.teacher)
-        return {
-            "id": row.id,
-            "teacher_id": row.teacher_id,
-            "teacher_username": teacher_username,
-            "teacher_fullname": teacher_fullname,
-            "subject_id": row.subject_id,
-            "subject_name": row.subject.name if row.subject else "unknown",
-            "section_id": row.section_id,
-            "section_name": row.section.name if row.section else "unknown",
-            "college_id": row.section.major.department.college_id if row.section and row.section.major and row.section.major.department else None,
-            "college_name": row.section.major.department.college.name if row.section and row.section.major and row.section.major.department and row.section.major.department.college else None,
-            "department_id": row.section.major.department_id if row.section and row.section.major else None,
-            "department_name": row.section.major.department.name if row.section and row.section.major and row.section.major.department else None,
-            "major_id": row.section.major_id if row.section else None,
-            "major_name": row.section.major.name if row.section and row.section.major else None,
-            "students_present": row.students_present,
-            "activity_mode": row.activity_mode,
-            "start_time": row.start_time,
-            "end_time": row.end_time,
-            "is_active": row.is_active,
-            "teacher_profile_picture_url": row.teacher.profile_picture_url if row.teacher else None,
-            # Use snapshot-aware per-log average for accuracy
-            "average_engagement": _avg_engagement_from_logs(
-                db, row.id, row.students_present, settings_service.get_engagement_weights(db, mode=row.activity_mode)
-            ),
-        }
+    hierarchy = session_read_model.hierarchy_for(db, [*active_sessions_raw, *recent_sessions_raw])
+
+    def _serialize_session(row) -> dict[str, Any]:
+        item = session_read_model.serialize_session(row, hierarchy, placeholder="unknown")
+        # Use snapshot-aware per-log average for accuracy
+        item["average_engagement"] = _session_engagement(db, row)
+        return item
 
     active_sessions = [_serialize_session(row) for row in active_sessions_raw]
     recent_sessions = [_serialize_session(row) for row in recent_sessions_raw]
@@ -357,21 +355,33 @@ def get_dashboard_data(
             }
         )
 
-    return {
+    payload = {
         "stats": {
-            "total_users": total_users,
-            "active_users": active_users,
-            "total_teachers": total_teachers,
-            "total_subjects": total_subjects,
-            "total_sections": total_sections,
-            "active_sessions": active_sessions_count,
-            "unread_alerts": unread_alerts,
-            "critical_unread_alerts": critical_unread_alerts,
+            "total_users": int(counts.total_users or 0),
+            "active_users": int(counts.active_users or 0),
+            "total_teachers": int(counts.total_teachers or 0),
+            "total_subjects": int(counts.total_subjects or 0),
+            "total_sections": int(counts.total_sections or 0),
+            "active_sessions": int(counts.active_sessions or 0),
+            "unread_alerts": int(counts.unread_alerts or 0),
+            "critical_unread_alerts": int(counts.critical_unread_alerts or 0),
         },
         "active_sessions": active_sessions,
         "recent_sessions": recent_sessions,
         "recent_alerts": recent_alerts,
     }
+    dashboard_cache.put(cache_key, payload, generation)
+    return payload
+
+
+# Keyset order of each list_sessions sort mode: (column, descending), ending with the id.
+SESSION_SORT_KEYS = {
+    "newest": ((ClassSession.start_time, True), (ClassSession.id, True)),
+    "oldest": ((ClassSession.start_time, False), (ClassSession.id, False)),
+    "engagement-high": ((ClassSession.average_engagement, True), (ClassSession.id, True)),
+    "engagement-low": ((ClassSession.average_engagement, False), (ClassSession.id, False)),
+    "students-most": ((ClassSession.students_present, True), (ClassSession.id, True)),
+}
 
 
 def list_sessions(
@@ -390,13 +400,11 @@ def list_sessions(
     search: Optional[str] = None,
     sort: Optional[str] = "newest",
     activity_mode: Optional[str] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
 ) -> dict[str, Any]:
     skip, limit = clamp_pagination(skip, limit, default_limit=DEFAULT_PAGE_SIZE)
-    query = db.query(ClassSession).options(
-        joinedload(ClassSession.teacher),
-        joinedload(ClassSession.subject),
-        joinedload(ClassSession.section).joinedload(ClassSection.major).joinedload(Major.department).joinedload(Department.college),
-    )
+    query = session_read_model.session_query(db)
     if is_active is not None:
         query = query.filter(ClassSession.is_active == is_active)
     if teacher_id is not None:
@@ -416,46 +424,31 @@ def list_sessions(
     )
 
     if search:
-        search_term = f"%{search}%"
-        # We need to ensure we've joined User, Subject, and ClassSection for the filter.
-        # They're already joinedloaded, but for filtering we might need explicit join if not already.
-        # joinedload doesn't always work for filtering in all SQLA versions without explicit join.
-        query = query.join(User, ClassSession.teacher_id == User.id) \
-                     .join(Subject, ClassSession.subject_id == Subject.id) \
-                     .join(ClassSection, ClassSession.section_id == ClassSection.id)
-        
-        query = query.filter(
-            or_(
-                cast(ClassSession.id, String).ilike(search_term),
-                User.username.ilike(search_term),
-                User.fullname.ilike(search_term),
-                Subject.name.ilike(search_term),
-                ClassSection.name.ilike(search_term),
-            )
-        )
+        query = query.filter(search_service.session_filter(db, search))
 
-    # Sort logic
-    if sort == "oldest":
-        query = query.order_by(ClassSession.start_time.asc())
-    elif sort == "engagement-high":
-        query = query.order_by(ClassSession.average_engagement.desc())
-    elif sort == "engagement-low":
-        query = query.order_by(ClassSession.average_engagement.asc())
-    elif sort == "students-most":
-        query = query.order_by(ClassSession.students_present.desc())
-    else: # newest or default
-        query = query.order_by(ClassSession.start_time.desc())
-
-    total = query.count()
-    rows = (
-        query.offset(skip)
-        .limit(limit)
-        .all()
-    )
+    sort = sort if sort in SESSION_SORT_KEYS else "newest"
+    total = query.count() if include_total else None
+    try:
+        rows, next_cursor = keyset_page(
+            query,
+            SESSION_SORT_KEYS[sort],
+            sort=sort,
+            cursor=cursor,
+            limit=limit,
+            skip=skip,
+            key_of=lambda row: [getattr(row, column.key) for column, _ in SESSION_SORT_KEYS[sort]],
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
     weights = settings_service.get_engagement_weights(db)
-    session_ids = [row.id for row in rows]
-    behavior_avgs = {}
+    behavior_avgs = {
+        row.id: averages
+        for row in rows
+        if (averages := session_read_model.final_behavior_averages(row)) is not None
+    }
+    # Sessions never finalized (still running, or ended before summaries existed).
+    session_ids = [row.id for row in rows if row.id not in behavior_avgs]
     if session_ids:
         avg_query = (
             db.query(
@@ -478,10 +471,13 @@ def list_sessions(
                 "off_task": float(res.off_task or 0),
                 "not_visible": float(res.not_visible or 0),
             }
+        for row in rows:
+            if row.logs_archive_path and row.id not in behavior_avgs:
+                behavior_avgs[row.id] = log_archive_service.behavior_averages(row.logs_archive_path)
 
+    hierarchy = session_read_model.hierarchy_for(db, rows)
     items = []
     for row in rows:
-        teacher_username, teacher_fullname = _teacher_name_fields(row.teacher)
         avgs = behavior_avgs.get(row.id, {
             "on_task": 0.0,
             "sleeping": 0.0,
@@ -489,33 +485,8 @@ def list_sessions(
             "off_task": 0.0,
             "not_visible": 0.0,
         })
-        items.append(
-            {
-                "id": row.id,
-                "teacher_id": row.teacher_id,
-                "teacher_username": teacher_username,
-                "teacher_fullname": teacher_fullname,
-                "subject_id": row.subject_id,
-                "subject_name": row.subject.name if row.subject else "unknown",
-                "section_id": row.section_id,
-                "section_name": row.section.name if row.section else "unknown",
-                "college_id": row.section.major.department.college_id if row.section and row.section.major and row.section.major.department else None,
-                "college_name": row.section.major.department.college.name if row.section and row.section.major and row.section.major.department and row.section.major.department.college else None,
-                "department_id": row.section.major.department_id if row.section and row.section.major else None,
-                "department_name": row.section.major.department.name if row.section and row.section.major and row.section.major.department else None,
-                "major_id": row.section.major_id if row.section else None,
-                "major_name": row.section.major.name if row.section and row.section.major else None,
-                "students_present": row.students_present,
-                "start_time": row.start_time,
-                "end_time": row.end_time,
-                "is_active": row.is_active,
-                "activity_mode": row.activity_mode,
-                "teacher_profile_picture_url": row.teacher.profile_picture_url if row.teacher else None,
-                "average_engagement": float(row.average_engagement),
-                **avgs,
-            }
-        )
-    return {"total": total, "items": items}
+        items.append({**session_read_model.serialize_session(row, hierarchy, placeholder="unknown"), **avgs})
+    return {"total": total, "items": items, "next_cursor": next_cursor}
 
 
 def force_stop_session(db: Session, session_id: int, actor_user_id: int) -> ClassSession:
@@ -553,66 +524,125 @@ def force_stop_session(db: Session, session_id: int, actor_user_id: int) -> Clas
             "prev_end_time": prev_end_time.isoformat() if isinstance(prev_end_time, datetime) else None,
         },
     )
+    rollup_service.rebuild_session(db, session.id)
     db.commit()
+    session_summary_service.finalize_after_stop(db, session.id)
+    live_session_store.discard(session.id)
+    dashboard_cache.invalidate()
+    rollup_service.forget(session.id)
+    event_hub.publish(event_hub.session_topic(session.id), "session_ended", {"session_id": session.id})
     db.refresh(session)
     return session
 
 
+def rescore_session(db: Session, session_id: int, confidence_threshold: float, actor_user_id: int) -> dict[str, Any]:
+    result = raw_detection_service.rescore_session(db, session_id, confidence_threshold)
+    live_session_store.discard(session_id)
+    audit_service.write_audit_log(
+        db,
+        actor_user_id=actor_user_id,
+        actor_username=_get_actor_username(db, actor_user_id),
+        action="SESSION_RESCORE",
+        entity_type="ClassSession",
+        entity_id=session_id,
+        details={"confidence_threshold": confidence_threshold, "logs_updated": result["logs_updated"]},
+    )
+    db.commit()
+    return result
+
+
+def start_video_analysis(
+    db: Session,
+    video_path: str,
+    *,
+    section_id: int,
+    subject_id: int,
+    students_present: int,
+    activity_mode: str,
+    teacher_id: Optional[int],
+    recorded_at: Optional[datetime],
+    inference_mode: str,
+    actor_user_id: int,
+) -> dict[str, Any]:
+    video_analysis_service.probe_video(video_path)
+    if inference_mode not in detector_service.INFERENCE_MODES:
+        raise HTTPException(status_code=400, detail="Invalid inference_mode")
+    session = video_analysis_service.create_recorded_session(
+        db,
+        section_id=section_id,
+        subject_id=subject_id,
+        students_present=students_present,
+        activity_mode=activity_mode,
+        teacher_id=teacher_id,
+        start_time=recorded_at,
+    )
+    job = video_analysis_service.start_analysis_job(
+        session.id,
+        video_path,
+        delete_video=True,
+        inference_mode=inference_mode,
+    )
+    audit_service.write_audit_log(
+        db,
+        actor_user_id=actor_user_id,
+        actor_username=_get_actor_username(db, actor_user_id),
+        action="SESSION_VIDEO_ANALYSIS_START",
+        entity_type="ClassSession",
+        entity_id=session.id,
+        details={"job_id": job["job_id"], "inference_mode": inference_mode},
+    )
+    db.commit()
+    return job
+
+
+def get_video_analysis_job(job_id: str) -> dict[str, Any]:
+    job = video_analysis_service.get_analysis_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Video analysis job not found")
+    return job
+
+
 def get_session_detail(
     db: Session,
     session_id: int,
     minutes: int = 120,
     logs_limit: int = 120,
 ) -> dict[str, Any]:
-    session = (
-        db.query(ClassSession)
-        .options(
-            joinedload(ClassSession.teacher),
-            joinedload(ClassSession.subject),
-            joinedload(ClassSession.section).joinedload(ClassSection.major).joinedload(Major.department).joinedload(Department.college),
-        )
-        .filter(ClassSession.id == session_id)
-        .first()
-    )
+    session = session_read_model.get_session_row(db, session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
+    final = None
+    if not session.is_active and session.summary_id is not None:
+        final = db.get(SessionSummary, session.summary_id)
 
-    weights = settings_service.get_engagement_weights(db)
-    summary = {
-        "id": session.id,
-        "teacher_id": session.teacher_id,
-        "teacher_username": _teacher_name_fields(session.teacher)[0],
-        "teacher_fullname": _teacher_name_fields(session.teacher)[1],
-        "subject_id": session.subject_id,
-        "subject_name": session.subject.name if session.subject else "unknown",
-        "section_id": session.section_id,
-        "section_name": session.section.name if session.section else "unknown",
-        "college_id": session.section.major.department.college_id if session.section and session.section.major and session.section.major.department else None,
-        "college_name": session.section.major.department.college.name if session.section and session.section.major and session.section.major.department and session.section.major.department.college else None,
-        "department_id": session.section.major.department_id if session.section and session.section.major else None,
-        "department_name": session.section.major.department.name if session.section and session.section.major and session.section.major.department else None,
-        "major_id": session.section.major_id if session.section else None,
-        "major_name": session.section.major.name if session.section and session.section.major else None,
-        "students_present": session.students_present,
-        "activity_mode": session.activity_mode,
-        "start_time": session.start_time,
-        "end_time": session.end_time,
-        "is_active": session.is_active,
-        "teacher_profile_picture_url": session.teacher.profile_picture_url if session.teacher else None,
-        # Snapshot-aware per-log average for accuracy across headcount changes
-        "average_engagement": _avg_engagement_from_logs(
-            db, session.id, session.students_present, settings_service.get_engagement_weights(db, mode=session.activity_mode)
-        ),
-    }
-
-    logs = (
-        db.query(BehaviorLog)
-        .filter(BehaviorLog.session_id == session_id)
-        .order_by(BehaviorLog.timestamp.desc())
-        .limit(max(10, min(logs_limit, 500)))
-        .all()
+    summary = session_read_model.serialize_session(
+        session, session_read_model.hierarchy_for(db, [session]), placeholder="unknown"
     )
-    logs.reverse()
+    # Snapshot-aware per-log average for accuracy across headcount changes
+    summary["average_engagement"] = _session_engagement(db, session)
+    summary.update(
+        session_read_model.final_behavior_averages(session)
+        or dict.fromkeys(session_read_model.BEHAVIOR_STATES, 0.0)
+    )
+
+    logs_limit = max(10, min(logs_limit, 500))
+    if session.logs_archive_path:
+        archived = log_archive_service.read_archive(session.logs_archive_path)
+        logs = list(archived[-logs_limit:])
+        total_logs = len(archived)
+    else:
+        logs = (
+            db.query(BehaviorLog)
+            .filter(BehaviorLog.session_id == session_id)
+            .order_by(BehaviorLog.timestamp.desc())
+            .limit(logs_limit)
+            .all()
+        )
+        logs.reverse()
+        if final is not None:
+            total_logs = final.log_count
+        else:
+            total_logs = db.query(func.count(BehaviorLog.id)).filter(BehaviorLog.session_id == session_id).scalar() or 0
     logs_points = [
         {
             "timestamp": row.timestamp,
@@ -660,8 +690,10 @@ def get_session_detail(
         for row in metrics_rows
     ]
 
-    total_logs = db.query(func.count(BehaviorLog.id)).filter(BehaviorLog.session_id == session_id).scalar() or 0
-    total_alerts = db.query(func.count(Alert.id)).filter(Alert.session_id == session_id).scalar() or 0
+    if final is not None:
+        total_alerts = final.alert_count
+    else:
+        total_alerts = db.query(func.count(Alert.id)).filter(Alert.session_id == session_id).scalar() or 0
     unread_alerts = (
         db.query(func.count(Alert.id))
         .filter(Alert.session_id == session_id, Alert.is_read == False)
@@ -676,7 +708,83 @@ def get_session_detail(
         "unread_alerts": unread_alerts,
         "logs": logs_points,
         "metrics_rollup": metrics_rollup,
+        "summary": _final_summary_fields(final) if final is not None else None,
+    }
+
+
+def _final_summary_fields(final) -> dict[str, Any]:
+    fields = {
+        name: getattr(final, name)
+        for name in (
+            "finalized_at",
+            "duration_seconds",
+            "log_count",
+            "minute_count",
+            "max_students_detected",
+            "peak_engagement_at",
+            "lowest_engagement_at",
+            "alert_count",
+            "critical_alert_count",
+        )
     }
+    for name in (
+        "on_task_avg",
+        "using_phone_avg",
+        "sleeping_avg",
+        "off_task_avg",
+        "not_visible_avg",
+        "average_engagement",
+        "headcount_average_engagement",
+    ):
+        fields[name] = _to_float(getattr(final, name))
+    fields["peak_engagement"] = float(final.peak_engagement) if final.peak_engagement is not None else None
+    fields["lowest_engagement"] = float(final.lowest_engagement) if final.lowest_engagement is not None else None
+    fields["alerts_by_type"] = final.alerts_by_type or {}
+    fields["time_in_state"] = final.time_in_state or {}
+    fields["engagement_curve"] = final.engagement_curve or []
+    return fields
+
+
+MAX_TREND_POINTS = 2000
+
+
+def get_engagement_trend(
+    db: Session,
+    *,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    resolution_seconds: int = 3600,
+    teacher_id: Optional[int] = None,
+    section_id: Optional[int] = None,
+    subject_id: Optional[int] = None,
+    major_id: Optional[int] = None,
+    department_id: Optional[int] = None,
+    activity_mode: Optional[str] = None,
+) -> dict[str, Any]:
+    """Behavior and engagement trend over a date range, served from the rollup tables."""
+    # Naive bounds are taken as UTC, like the stored timestamps.
+    end = date_to.replace(tzinfo=date_to.tzinfo or timezone.utc) if date_to else utc_now()
+    start = date_from.replace(tzinfo=date_from.tzinfo or timezone.utc) if date_from else end - timedelta(days=7)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="date_from must be before date_to")
+    if resolution_seconds < 60 or resolution_seconds % 60:
+        raise HTTPException(status_code=400, detail="resolution_seconds must be a positive multiple of 60")
+    if (end - start).total_seconds() / resolution_seconds > MAX_TREND_POINTS:
+        raise HTTPException(status_code=400, detail="Range too large for this resolution; use a coarser resolution")
+    return rollup_service.query_trend(
+        db,
+        start,
+        end,
+        resolution_seconds,
+        filters={
+            "teacher_id": teacher_id,
+            "section_id": section_id,
+            "subject_id": subject_id,
+            "major_id": major_id,
+            "department_id": department_id,
+            "activity_mode": activity_mode,
+        },
+    )
 
 
 def list_alerts(
@@ -686,6 +794,8 @@ def list_alerts(
     is_read: Optional[bool] = None,
     severity: Optional[str] = None,
     session_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
 ) -> dict[str, Any]:
     skip, limit = clamp_pagination(skip, limit, default_limit=DEFAULT_PAGE_SIZE)
     query = (
@@ -703,13 +813,19 @@ def list_alerts(
     # Filter only behavioral alerts for admin feed
     query = query.filter(Alert.alert_type.in_(["SLEEPING", "PHONE", "ENGAGEMENT_DROP"]))
 
-    total = query.count()
-    rows = (
-        query.order_by(Alert.triggered_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+    total = query.count() if include_total else None
+    try:
+        rows, next_cursor = keyset_page(
+            query,
+            ((Alert.triggered_at, True), (Alert.id, True)),
+            sort="newest",
+            cursor=cursor,
+            limit=limit,
+            skip=skip,
+            key_of=lambda row: [row[0].triggered_at, row[0].id],
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     items = []
     for alert, session, teacher in rows:
         teacher_username, teacher_fullname = _teacher_name_fields(teacher)
@@ -728,7 +844,7 @@ def list_alerts(
                 "updated_at": alert.updated_at,
             }
         )
-    return {"total": total, "items": items}
+    return {"total": total, "items": items, "next_cursor": next_cursor}
 
 
 def mark_alert_read(db: Session, alert_id: int, actor_user_id: int) -> Alert:
@@ -761,6 +877,7 @@ def mark_alert_read(db: Session, alert_id: int, actor_user_id: int) -> Alert:
     )
     db.commit()
     db.refresh(alert)
+    alert_service.publish_alert_read(alert)
     return alert
 
 
@@ -796,6 +913,8 @@ def list_audit_logs(
     entity_type: str | None = None,
     actor_user_id: int | None = None,
     entity_id: str | None = None,
+    cursor: str | None = None,
+    include_total: bool = False,
 ) -> dict[str, Any]:
     from app.models.audit import AuditLog
 
@@ -810,14 +929,20 @@ def list_audit_logs(
     if entity_id:
         query = query.filter(AuditLog.entity_id == entity_id)
 
-    total = query.count()
-    items = (
-        query.order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
-    return {"total": total, "items": items}
+    total = query.count() if include_total else None
+    try:
+        items, next_cursor = keyset_page(
+            query,
+            ((AuditLog.created_at, True), (AuditLog.id, True)),
+            sort="newest",
+            cursor=cursor,
+            limit=limit,
+            skip=skip,
+            key_of=lambda row: [row.created_at, row.id],
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return {"total": total, "items": items, "next_cursor": next_cursor}
 
 
 def list_server_logs(limit: int = 120) -> dict[str, Any]:
@@ -13,6 +13,7 @@ from app.models.settings import SystemSettings
 from app.models.user import User
 from app.core import security
 from app.services import audit_service
+from app.utils.detection import CAMERA_MERGE_MODES
 
 
 _DEFAULT_SETTINGS: dict[str, Any] = {
@@ -25,6 +26,31 @@ _DEFAULT_SETTINGS: dict[str, Any] = {
         "detection_confidence_threshold": env_settings.DETECTION_CONFIDENCE_THRESHOLD,
         "detection_imgsz": env_settings.DETECTION_IMGSZ,
         "alert_cooldown_minutes": getattr(env_settings, "ALERT_COOLDOWN_MINUTES", 5),
+        # Tiled inference (opt-in per session): default grid, per-camera overrides
+        # keyed by camera index, e.g. {"0": {"rows": 3, "cols": 2}}.
+        "tile_rows": 2,
+        "tile_cols": 2,
+        "tile_overlap_ratio": 0.2,
+        "tile_imgsz": 640,
+        "camera_tile_grids": {},
+        # Multi-camera sessions: cameras used when a session does not pick its own
+        # (empty = server_camera_index only), and how overlapping cameras are merged.
+        # camera_regions maps camera index -> region name; cameras sharing a region are
+        # combined with camera_region_merge ("max" or "sum"), regions are summed.
+        "server_camera_indices": [],
+        "camera_regions": {},
+        "camera_region_merge": "max",
+        # Persist boxes/confidences per tick so sessions can be re-scored offline.
+        "store_raw_detections": False,
+        # IoU tracker with behavior hysteresis; smooths counts so longer intervals stay stable.
+        "tracking_enabled": False,
+        "tracking_iou_threshold": 0.3,
+        "tracking_switch_ticks": 2,
+        "tracking_max_missed_ticks": 2,
+        # Concurrent inference calls across all live detectors, and how long a tick may
+        # wait for a slot and run before that detector degrades (lower imgsz, skipped ticks).
+        "inference_slots": 1,
+        "inference_deadline_seconds": 2.0,
     },
     "engagement_weights": {
         "LECTURE": {
@@ -65,6 +91,9 @@ _DEFAULT_SETTINGS: dict[str, Any] = {
     },
     "admin_ops": {
         "enable_admin_log_stream": getattr(env_settings, "ENABLE_ADMIN_LOG_STREAM", False),
+        # Behavior logs of sessions ended this many days ago are moved to per-session
+        # archives by scripts/compact_behavior_logs.py (0 = keep everything in the table).
+        "behavior_log_retention_days": 90,
     },
 }
 
@@ -109,6 +138,7 @@ def _deep_merge(base: dict[str, Any], overrides: dict[str, Any]) -> dict[str, An
     return merged
 
 
+def _sanitize_overrides(payload: dict[str, Any]) -> dict[str, Any]:
     sanitized: dict[str, Any] = {}
     for section, allowed_keys in _ALLOWED_KEYS.items():
         if section not in payload or not isinstance(payload[section], dict):
@@ -142,6 +172,45 @@ def _validate_effective(effective: dict[str, Any]) -> None:
         raise ValueError("detection_imgsz must be between 320 and 1280.")
     if not (1 <= int(detection["alert_cooldown_minutes"]) <= 120):
         raise ValueError("alert_cooldown_minutes must be between 1 and 120.")
+    _validate_tile_grid(int(detection["tile_rows"]), int(detection["tile_cols"]), "default tile grid")
+    if not (0.0 <= float(detection["tile_overlap_ratio"]) <= 0.5):
+        raise ValueError("tile_overlap_ratio must be between 0.0 and 0.5.")
+    if not (320 <= int(detection["tile_imgsz"]) <= 1280):
+        raise ValueError("tile_imgsz must be between 320 and 1280.")
+    camera_tile_grids = detection["camera_tile_grids"]
+    if not isinstance(camera_tile_grids, dict):
+        raise ValueError("camera_tile_grids must be an object keyed by camera index.")
+    for camera_key, grid in camera_tile_grids.items():
+        if not str(camera_key).isdigit() or not isinstance(grid, dict):
+            raise ValueError("camera_tile_grids entries must map a camera index to {rows, cols}.")
+        _validate_tile_grid(int(grid.get("rows", 0)), int(grid.get("cols", 0)), f"tile grid for camera {camera_key}")
+    camera_indices = detection["server_camera_indices"]
+    if not isinstance(camera_indices, list) or len(camera_indices) > 4:
+        raise ValueError("server_camera_indices must be a list of at most 4 camera indexes.")
+    if any(not (0 <= int(index) <= 10) for index in camera_indices):
+        raise ValueError("server_camera_indices entries must be between 0 and 10.")
+    camera_regions = detection["camera_regions"]
+    if not isinstance(camera_regions, dict) or any(
+        not str(key).isdigit() or not isinstance(region, str) or not region.strip()
+        for key, region in camera_regions.items()
+    ):
+        raise ValueError("camera_regions must map a camera index to a region name.")
+    if detection["camera_region_merge"] not in CAMERA_MERGE_MODES:
+        raise ValueError(f"camera_region_merge must be one of: {', '.join(CAMERA_MERGE_MODES)}.")
+    if not isinstance(detection["store_raw_detections"], bool):
+        raise ValueError("store_raw_detections must be true or false.")
+    if not isinstance(detection["tracking_enabled"], bool):
+        raise ValueError("tracking_enabled must be true or false.")
+    if not (0.05 <= float(detection["tracking_iou_threshold"]) <= 0.95):
+        raise ValueError("tracking_iou_threshold must be between 0.05 and 0.95.")
+    if not (1 <= int(detection["tracking_switch_ticks"]) <= 10):
+        raise ValueError("tracking_switch_ticks must be between 1 and 10.")
+    if not (0 <= int(detection["tracking_max_missed_ticks"]) <= 10):
+        raise ValueError("tracking_max_missed_ticks must be between 0 and 10.")
+    if not (1 <= int(detection["inference_slots"]) <= 16):
+        raise ValueError("inference_slots must be between 1 and 16.")
+    if not (0.2 <= float(detection["inference_deadline_seconds"]) <= 30):
+        raise ValueError("inference_deadline_seconds must be between 0.2 and 30.")
 
     weights_by_mode = effective["engagement_weights"]
     for mode, weights in weights_by_mode.items():
@@ -163,6 +232,8 @@ def _validate_effective(effective: dict[str, Any]) -> None:
     admin_ops = effective["admin_ops"]
     if not isinstance(admin_ops["enable_admin_log_stream"], bool):
         raise ValueError("enable_admin_log_stream must be true or false.")
+    if not (0 <= int(admin_ops["behavior_log_retention_days"]) <= 3650):
+        raise ValueError("behavior_log_retention_days must be between 0 and 3650.")
 
     exam_proctoring = effective["exam_proctoring"]
     if not (1 <= int(exam_proctoring["phone_count_threshold"]) <= 50):
@@ -175,6 +246,11 @@ def _validate_effective(effective: dict[str, Any]) -> None:
         raise ValueError("access_token_expire_minutes must be between 5 and 43200.")
 
 
+def _validate_tile_grid(rows: int, cols: int, label: str) -> None:
+    if not (1 <= rows <= 4 and 1 <= cols <= 4):
+        raise ValueError(f"{label} must have between 1 and 4 rows and columns.")
+
+
 def _apply_log_stream_setting(enabled: bool) -> None:
     global _last_applied_log_stream
     if _last_applied_log_stream is None or _last_applied_log_stream != enabled:
@@ -242,9 +318,12 @@ def update_settings(db: Session, payload: dict[str, Any], actor_user_id: int | N
 
     # If engagement weights were updated, trigger a recalculation of all session engagement caches
     if reset or "engagement_weights" in payload:
+        from app.services import live_session_store
         from app.services.admin import sessions_service
         # Recalculate all session engagement based on the new weights
         sessions_service.recalculate_all_sessions_engagement(db)
+        # Live session state holds per-log scores computed with the old weights.
+        live_session_store.clear()
 
     effective["integrations"] = _integration_status()
     _cache_effective(effective)
@@ -11,6 +11,7 @@ from app.constants import DEFAULT_PAGE_SIZE
 from app.core.pagination import clamp_pagination
 from app.models.classroom import ClassSection, Department, Major, SectionSubjectAssignment, Subject
 from app.models.session import ClassSession
+from app.services import academic_hierarchy, catalog_cache, search_service
 from app.validators.session import validate_subject_name
 from app.services.admin.security_service import verify_admin_password_or_401
 
@@ -37,7 +38,7 @@ def _subject_teacher_fields_from_assignments(subject: Subject) -> tuple[int | No
     return (None, "multiple", f"{len(teachers)} teachers", None)
 
 
-def _serialize_subject(row: Subject) -> dict[str, Any]:
+def _serialize_subject(row: Subject, hierarchy: academic_hierarchy.Hierarchy) -> dict[str, Any]:
     teacher_id, teacher_username, teacher_fullname, teacher_profile_picture_url = _subject_teacher_fields_from_assignments(row)
     section_names: list[str] = []
     seen_sections: set[int] = set()
@@ -46,9 +47,7 @@ def _serialize_subject(row: Subject) -> dict[str, Any]:
             seen_sections.add(assignment.section.id)
             section_names.append(assignment.section.name)
 
-    major = row.major
-    department = major.department if major else None
-    college = department.college if department else None
+    major = hierarchy.major(row.major_id)
     return {
         "id": row.id,
         "name": row.name,
@@ -62,11 +61,11 @@ def _serialize_subject(row: Subject) -> dict[str, Any]:
         "sections_count": len(section_names),
         "section_names": section_names,
         "major_id": row.major_id,
-        "major_name": major.name if major else None,
-        "department_id": department.id if department else None,
-        "department_name": department.name if department else None,
-        "college_id": college.id if college else None,
-        "college_name": college.name if college else None,
+        "major_name": major["major_name"],
+        "department_id": major["department_id"],
+        "department_name": major["department_name"],
+        "college_id": major["college_id"],
+        "college_name": major["college_name"],
         "created_at": row.created_at,
     }
 
@@ -108,27 +107,26 @@ def list_subjects(
     skip, limit = clamp_pagination(skip, limit)
     query = (
         db.query(Subject)
-        .join(Major, Subject.major_id == Major.id)
-        .join(Department, Major.department_id == Department.id)
         .options(
-            joinedload(Subject.major).joinedload(Major.department).joinedload(Department.college),
             joinedload(Subject.section_assignments).joinedload(SectionSubjectAssignment.section).joinedload(ClassSection.teacher),
             joinedload(Subject.section_assignments).joinedload(SectionSubjectAssignment.teacher),
         )
     )
     if q:
-        pattern = f"%{q.strip()}%"
-        query = query.filter((Subject.name.ilike(pattern)) | (Subject.code.ilike(pattern)))
+        query = query.filter(search_service.id_filter(db, "subject", q, Subject.id))
     if major_id is not None:
         query = query.filter(Subject.major_id == major_id)
+    if department_id is not None or college_id is not None:
+        query = query.join(Major, Subject.major_id == Major.id)
     if department_id is not None:
         query = query.filter(Major.department_id == department_id)
     if college_id is not None:
-        query = query.filter(Department.college_id == college_id)
+        query = query.join(Department, Major.department_id == Department.id).filter(Department.college_id == college_id)
 
     total = query.count()
     rows = query.order_by(Subject.created_at.desc(), Subject.id.desc()).offset(skip).limit(limit).all()
-    return {"total": total, "items": [_serialize_subject(row) for row in rows]}
+    hierarchy = academic_hierarchy.snapshot(db, major_ids=[row.major_id for row in rows])
+    return {"total": total, "items": [_serialize_subject(row, hierarchy) for row in rows]}
 
 
 def create_subject(db: Session, payload: dict[str, Any]) -> dict[str, Any]:
@@ -159,19 +157,20 @@ def create_subject(db: Session, payload: dict[str, Any]) -> dict[str, Any]:
     )
     db.add(row)
     db.commit()
+    academic_hierarchy.invalidate()
+    catalog_cache.invalidate()
     db.refresh(row)
 
     row = (
         db.query(Subject)
         .options(
-            joinedload(Subject.major).joinedload(Major.department).joinedload(Department.college),
             joinedload(Subject.section_assignments).joinedload(SectionSubjectAssignment.section).joinedload(ClassSection.teacher),
             joinedload(Subject.section_assignments).joinedload(SectionSubjectAssignment.teacher),
         )
         .filter(Subject.id == row.id)
         .first()
     )
-    return _serialize_subject(row)
+    return _serialize_subject(row, academic_hierarchy.snapshot(db, major_ids=[row.major_id]))
 
 
 def update_subject(db: Session, subject_id: int, payload: dict[str, Any]) -> dict[str, Any]:
@@ -180,7 +179,6 @@ def update_subject(db: Session, subject_id: int, payload: dict[str, Any]) -> dic
     row = (
         db.query(Subject)
         .options(
-            joinedload(Subject.major).joinedload(Major.department).joinedload(Department.college),
             joinedload(Subject.section_assignments).joinedload(SectionSubjectAssignment.section).joinedload(ClassSection.teacher),
             joinedload(Subject.section_assignments).joinedload(SectionSubjectAssignment.teacher),
         )
@@ -249,19 +247,20 @@ def update_subject(db: Session, subject_id: int, payload: dict[str, Any]) -> dic
     except IntegrityError:
         db.rollback()
         raise HTTPException(status_code=400, detail="Subject name or code already exists for this major")
+    academic_hierarchy.invalidate()
+    catalog_cache.invalidate()
     db.refresh(row)
 
     row = (
         db.query(Subject)
         .options(
-            joinedload(Subject.major).joinedload(Major.department).joinedload(Department.college),
             joinedload(Subject.section_assignments).joinedload(SectionSubjectAssignment.section).joinedload(ClassSection.teacher),
             joinedload(Subject.section_assignments).joinedload(SectionSubjectAssignment.teacher),
         )
         .filter(Subject.id == subject_id)
         .first()
     )
-    return _serialize_subject(row)
+    return _serialize_subject(row, academic_hierarchy.snapshot(db, major_ids=[row.major_id]))
 
 
 def delete_subject(db: Session, subject_id: int, actor_user_id: int, confirm_password: str) -> dict[str, Any]:
@@ -283,4 +282,6 @@ def delete_subject(db: Session, subject_id: int, actor_user_id: int, confirm_pas
         raise HTTPException(status_code=400, detail="Delete related section assignments first")
     db.delete(row)
     db.commit()
+    academic_hierarchy.invalidate()
+    catalog_cache.invalidate()
     return {"message": "Subject deleted"}
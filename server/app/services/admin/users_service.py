@@ -6,11 +6,11 @@ from sqlalchemy.orm import Session, joinedload
 
 from app.core import security
 from app.constants import DEFAULT_PAGE_SIZE, MIN_PASSWORD_LENGTH, UserRole
-from app.core.pagination import clamp_pagination
+from app.core.pagination import clamp_pagination, keyset_page
 from app.models.user import User
 from app.models.classroom import College, Department
 from app.repositories.user_repository import UserRepository
-from app.services import audit_service, notification_service
+from app.services import audit_service, catalog_cache, notification_service, search_service
 from app.services.admin.security_service import verify_admin_password_or_401
 from app.utils.datetime import utc_now
 
@@ -67,31 +67,32 @@ def list_users(
     q: Optional[str] = None,
     is_active: Optional[bool] = None,
     is_superuser: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
 ) -> dict[str, Any]:
     skip, limit = clamp_pagination(skip, limit)
     query = db.query(User)
     if q:
-        pattern = f"%{q.strip()}%"
-        query = query.filter(
-            (User.username.like(pattern))
-            | (User.email.like(pattern))
-            | (User.fullname.like(pattern))
-            | (User.firstname.like(pattern))
-            | (User.lastname.like(pattern))
-        )
+        query = query.filter(search_service.id_filter(db, "user", q, User.id))
     if is_active is not None:
         query = query.filter(User.is_active == is_active)
     if is_superuser is not None:
         query = query.filter(User.is_superuser == is_superuser)
 
-    total = query.count()
-    items = (
-        query.order_by(User.id.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
-    return {"total": total, "items": items}
+    total = query.count() if include_total else None
+    try:
+        items, next_cursor = keyset_page(
+            query,
+            ((User.id, True),),
+            sort="newest",
+            cursor=cursor,
+            limit=limit,
+            skip=skip,
+            key_of=lambda row: [row.id],
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return {"total": total, "items": items, "next_cursor": next_cursor}
 
 
 def list_teachers(
@@ -110,14 +111,7 @@ def list_teachers(
         .filter(User.is_superuser == False, User.role == UserRole.TEACHER.value)
     )
     if q:
-        pattern = f"%{q.strip()}%"
-        query = query.filter(
-            (User.username.like(pattern))
-            | (User.email.like(pattern))
-            | (User.fullname.like(pattern))
-            | (User.firstname.like(pattern))
-            | (User.lastname.like(pattern))
-        )
+        query = query.filter(search_service.id_filter(db, "user", q, User.id))
     if is_active is not None:
         query = query.filter(User.is_active == is_active)
     if college_id is not None:
@@ -267,6 +261,8 @@ def update_user(db: Session, user_id: int, payload: dict[str, Any], actor_user_i
         },
     )
     db.commit()
+    # Catalogue sections show the teacher's username.
+    catalog_cache.invalidate()
     db.refresh(user)
     return user
 
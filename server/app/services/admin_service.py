@@ -6,9 +6,11 @@ reduce startup-time side effects and make dependencies clearer.
 
 from __future__ import annotations
 
+from fastapi import HTTPException
 from sqlalchemy.orm import Session as _Session  # type: ignore
 
 from app.models.session import Alert as _AlertModel
+from app.services import search_service as _search
 from app.services.admin import (
     backup_service as _backup,
     colleges_service as _colleges,
@@ -64,7 +66,11 @@ unassign_section_teacher = _sections.unassign_section_teacher
 get_dashboard_data = _sessions.get_dashboard_data
 list_sessions = _sessions.list_sessions
 get_session_detail = _sessions.get_session_detail
+get_engagement_trend = _sessions.get_engagement_trend
 force_stop_session = _sessions.force_stop_session
+rescore_session = _sessions.rescore_session
+start_video_analysis = _sessions.start_video_analysis
+get_video_analysis_job = _sessions.get_video_analysis_job
 list_alerts = _sessions.list_alerts
 mark_alert_read = _sessions.mark_alert_read
 list_audit_logs = _sessions.list_audit_logs
@@ -104,6 +110,13 @@ def get_dashboard(
     )
 
 
+def search(db: _Session, q: str, types: list[str] | None = None, limit: int = 20):
+    unknown = sorted(set(types or ()) - {*_search.ENTITY_TYPES, "session"})
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown search types: {', '.join(unknown)}")
+    return _search.search_all(db, q, types, limit=max(1, min(limit, 100)))
+
+
 def get_college(db: _Session, college_id: int):
     return get_college_details(db, college_id=college_id)
 
@@ -178,6 +191,9 @@ __all__ = [
     "get_session",
     "get_session_detail",
     "force_stop_session",
+    "rescore_session",
+    "start_video_analysis",
+    "get_video_analysis_job",
     "get_session_alerts",
     "list_alerts",
     "mark_alert_read",
@@ -1,4 +1,4 @@
-from datetime import timedelta
+from datetime import datetime, timedelta
 import logging
 
 from fastapi import HTTPException
@@ -6,7 +6,8 @@ from sqlalchemy.orm import Session
 
 from app.models.session import Alert, AlertHistory, AlertSeverity, AlertType
 from app.repositories.session_repository import SessionRepository
-from app.services.admin import settings_service
+from app.services import event_hub, live_session_store
+from app.services.admin import dashboard_cache, settings_service
 from app.utils.datetime import utc_now
 
 logger = logging.getLogger(__name__)
@@ -19,13 +20,30 @@ def get_alert_or_404(db: Session, alert_id: int, teacher_id: int | None = None)
     return alert
 
 
-def trigger_alert(db: Session, session_id: int, a_type: AlertType, msg: str, severity: AlertSeverity, snapshot_url: str | None = None) -> None:
-    cooldown = settings_service.get_detection_settings(db).get("alert_cooldown_minutes", 5)
-    five_min_ago = utc_now() - timedelta(minutes=max(1, int(cooldown)))
+def trigger_alert(
+    db: Session,
+    session_id: int,
+    a_type: AlertType,
+    msg: str,
+    severity: AlertSeverity,
+    snapshot_url: str | None = None,
+    at: datetime | None = None,
+) -> Alert | None:
+    """Add an alert unless one of the same type is within the cooldown of ``at`` (default: now).
+
+    ``at`` is the capture time of a tick replayed by an edge detector. Ticks older than
+    the cooldown describe a situation that is already over, so they raise no alert.
+    """
+    cooldown_minutes = settings_service.get_detection_settings(db).get("alert_cooldown_minutes", 5)
+    cooldown = timedelta(minutes=max(1, int(cooldown_minutes)))
+    now = utc_now()
+    if at is not None and at < now - cooldown:
+        return None
+    triggered_at = at or now
     recent = db.query(Alert).filter(
         Alert.session_id == session_id,
         Alert.alert_type == a_type.value,
-        Alert.triggered_at >= five_min_ago,
+        Alert.triggered_at >= triggered_at - cooldown,
     ).first()
 
     if not recent:
@@ -34,10 +52,30 @@ def trigger_alert(db: Session, session_id: int, a_type: AlertType, msg: str, sev
             alert_type=a_type.value, 
             message=msg, 
             severity=severity.value,
-            snapshot_url=snapshot_url
+            snapshot_url=snapshot_url,
+            triggered_at=triggered_at,
         )
         db.add(alert)
         logger.warning(f"Alert triggered ({session_id}): {msg}")
+        return alert
+    return None
+
+
+def publish_alerts(alerts: list[dict]) -> None:
+    """Push committed alerts (see trigger_alert) to the session and admin event streams."""
+    if alerts:
+        dashboard_cache.invalidate()
+    for alert in alerts:
+        event_hub.publish(event_hub.session_topic(alert["session_id"]), "alert", alert)
+        event_hub.publish(event_hub.ALERTS_TOPIC, "alert", alert)
+
+
+def publish_alert_read(alert: Alert) -> None:
+    live_session_store.mark_alert_read(alert.session_id, alert.id)
+    dashboard_cache.invalidate()
+    payload = {"id": alert.id, "session_id": alert.session_id}
+    event_hub.publish(event_hub.session_topic(alert.session_id), "alert_read", payload)
+    event_hub.publish(event_hub.ALERTS_TOPIC, "alert_read", payload)
 
 
 def mark_alert_read(db: Session, alert_id: int, user_id: int) -> Alert:
@@ -46,6 +84,7 @@ def mark_alert_read(db: Session, alert_id: int, user_id: int) -> Alert:
     alert.is_read = True
     db.commit()
     db.refresh(alert)
+    publish_alert_read(alert)
     return alert
 
 
@@ -0,0 +1,73 @@
+"""In-process cache of the encoded classroom catalogue responses, with their ETags.
+
+Every client loads the colleges, departments, majors and its own subjects and
+sections on each screen open, and these change a few times a term. Entries hold
+the JSON body (already validated against the response model) and an ETag, keyed by
+route, parameters and the teacher whose assignments scope the list; the router
+answers a matching ``If-None-Match`` with 304 without running the catalogue queries.
+
+The ``version`` counter is bumped by ``invalidate``, which the services call after
+committing anything a catalogue response shows: the academic hierarchy, subject
+and section assignments, teacher names. A body computed while an invalidation
+happened is served once but not stored. The ETag is the version plus a digest of the
+body, so a worker whose counter differs can never send a false 304; other workers
+pick up edits after ``CATALOG_CACHE_TTL_SECONDS``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from typing import Hashable
+
+CATALOG_CACHE_TTL_SECONDS = 30.0
+MAX_ENTRIES = 2048
+
+_entries: dict[Hashable, tuple[float, str, bytes]] = {}
+_version = 0
+_lock = threading.Lock()
+
+
+def version() -> int:
+    with _lock:
+        return _version
+
+
+def etag_for(body: bytes, computed_version: int) -> str:
+    return f'"{computed_version}-{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+def get(key: Hashable) -> tuple[str, bytes] | None:
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None:
+            return None
+        expires_at, etag, body = entry
+        if expires_at <= time.monotonic():
+            _entries.pop(key, None)
+            return None
+        return etag, body
+
+
+def put(key: Hashable, body: bytes, computed_version: int) -> tuple[str, bytes]:
+    """Store ``body`` unless invalidated since ``computed_version``; returns its (etag, body)."""
+    etag = etag_for(body, computed_version)
+    with _lock:
+        if computed_version != _version:
+            return etag, body
+        if len(_entries) >= MAX_ENTRIES:
+            now = time.monotonic()
+            for stale in [k for k, (expires_at, _, _) in _entries.items() if expires_at <= now]:
+                del _entries[stale]
+            if len(_entries) >= MAX_ENTRIES:
+                _entries.clear()
+        _entries[key] = (time.monotonic() + CATALOG_CACHE_TTL_SECONDS, etag, body)
+    return etag, body
+
+
+def invalidate() -> None:
+    global _version
+    with _lock:
+        _version += 1
+        _entries.clear()
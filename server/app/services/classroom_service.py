@@ -13,7 +13,7 @@ from app.core.config import settings
 from app.models.classroom import ClassSection, SectionSubjectAssignment, Subject
 from app.repositories.classroom_repository import ClassroomRepository
 from app.schemas.classroom import SubjectCoverUploadResponse, SubjectUpdate
-from app.services import audit_service
+from app.services import academic_hierarchy, audit_service, catalog_cache
 from app.utils.file import is_valid_image_extension, sanitize_filename
 from app.validators.session import validate_subject_name
 
@@ -26,6 +26,16 @@ def _is_assignment_visible_to_teacher(assignment: SectionSubjectAssignment, teac
     return False
 
 
+def _major_ids(subjects: list[Subject]) -> list[int]:
+    """Majors of ``subjects`` and of their sections, for the hierarchy lookups."""
+    major_ids = [subject.major_id for subject in subjects]
+    for subject in subjects:
+        major_ids.extend(
+            assignment.section.major_id for assignment in subject.section_assignments or [] if assignment.section
+        )
+    return major_ids
+
+
 def read_colleges(db: Session):
     colleges = ClassroomRepository.list_colleges(db)
     return [
@@ -67,7 +77,9 @@ def read_majors(db: Session):
     ]
 
 
-def _format_subject_for_teacher(subject: Subject, teacher_id: int) -> dict[str, Any]:
+def _format_subject_for_teacher(
+    subject: Subject, teacher_id: int, hierarchy: academic_hierarchy.Hierarchy
+) -> dict[str, Any]:
     visible_assignments = [
         assignment
         for assignment in (subject.section_assignments or [])
@@ -78,9 +90,7 @@ def _format_subject_for_teacher(subject: Subject, teacher_id: int) -> dict[str,
         section = assignment.section
         if not section:
             continue
-        major = section.major
-        department = major.department if major else None
-        college = department.college if department else None
+        major = hierarchy.major(section.major_id)
         teacher = assignment.teacher if assignment.teacher else section.teacher
         formatted_sections.append(
             {
@@ -89,36 +99,24 @@ def _format_subject_for_teacher(subject: Subject, teacher_id: int) -> dict[str,
                 "subject_id": subject.id,
                 "teacher_id": teacher.id if teacher else None,
                 "teacher_username": teacher.username if teacher else None,
-                "college_name": college.name if college else None,
-                "department_name": department.name if department else None,
-                "major_name": major.name if major else None,
-                "major_id": major.id if major else None,
+                "college_name": major["college_name"],
+                "department_name": major["department_name"],
+                "major_name": major["major_name"],
+                "major_id": major["major_id"],
                 "year_level": section.year_level,
                 "section_code": section.section_code,
                 "created_at": section.created_at,
             }
         )
 
-    major = subject.major
-    department = major.department if major else None
-    college = department.college if department else None
+    major = hierarchy.major(subject.major_id)
     return {
         "id": subject.id,
         "name": subject.name,
         "teacher_id": None,
         "teacher_username": None,
         "major_id": subject.major_id,
-        "major_name": major.name if major else None,
-        "major_code": major.code if major else None,
-        "major_cover_image_url": major.cover_image_url if major else None,
-        "department_id": department.id if department else None,
-        "department_name": department.name if department else None,
-        "department_code": department.code if department else None,
-        "department_cover_image_url": department.cover_image_url if department else None,
-        "college_id": college.id if college else None,
-        "college_name": college.name if college else None,
-        "college_acronym": college.acronym if college else None,
-        "college_logo_path": college.logo_path if college else None,
+        **{name: major[name] for name in academic_hierarchy.MAJOR_FIELDS if name != "major_id"},
         "code": subject.code,
         "description": subject.description,
         "cover_image_url": subject.cover_image_url,
@@ -131,14 +129,16 @@ def read_subjects(db: Session, teacher_id: int, skip: int, limit: int):
     skip = max(0, skip)
     limit = max(1, min(limit, MAX_PAGE_SIZE))
     subjects = ClassroomRepository.list_subjects(db, teacher_id, skip, limit)
-    return [_format_subject_for_teacher(subject, teacher_id) for subject in subjects]
+    hierarchy = academic_hierarchy.snapshot(db, major_ids=_major_ids(subjects))
+    return [_format_subject_for_teacher(subject, teacher_id, hierarchy) for subject in subjects]
 
 
 def read_subject(db: Session, subject_id: int, teacher_id: int) -> dict[str, Any]:
     subject = ClassroomRepository.get_subject(db, subject_id, teacher_id, with_sections=True)
     if not subject:
         raise HTTPException(status_code=404, detail="Subject not found")
-    return _format_subject_for_teacher(subject, teacher_id)
+    hierarchy = academic_hierarchy.snapshot(db, major_ids=_major_ids([subject]))
+    return _format_subject_for_teacher(subject, teacher_id, hierarchy)
 
 
 def update_subject(db: Session, subject_id: int, subject_in: SubjectUpdate, teacher_id: int) -> Subject:
@@ -180,6 +180,8 @@ def update_subject(db: Session, subject_id: int, subject_in: SubjectUpdate, teac
         },
     )
     db.commit()
+    academic_hierarchy.invalidate()
+    catalog_cache.invalidate()
     return subject
 
 
@@ -263,15 +265,14 @@ def read_sections_by_subject(db: Session, subject_id: int, teacher_id: int):
     if not subject:
         raise HTTPException(status_code=404, detail="Subject not found")
     sections = ClassroomRepository.list_sections_by_subject(db, subject_id)
+    hierarchy = academic_hierarchy.snapshot(db, major_ids=[section.major_id for section in sections])
     visible_sections: list[dict[str, Any]] = []
     for section in sections:
         for assignment in section.subject_assignments or []:
             if assignment.subject_id != subject_id:
                 continue
             if _is_assignment_visible_to_teacher(assignment, teacher_id):
-                major = section.major
-                department = major.department if major else None
-                college = department.college if department else None
+                major = hierarchy.major(section.major_id)
                 teacher = assignment.teacher if assignment.teacher else section.teacher
                 visible_sections.append(
                     {
@@ -280,10 +281,10 @@ def read_sections_by_subject(db: Session, subject_id: int, teacher_id: int):
                         "subject_id": subject_id,
                         "teacher_id": teacher.id if teacher else None,
                         "teacher_username": teacher.username if teacher else None,
-                        "college_name": college.name if college else None,
-                        "department_name": department.name if department else None,
-                        "major_name": major.name if major else None,
-                        "major_id": major.id if major else None,
+                        "college_name": major["college_name"],
+                        "department_name": major["department_name"],
+                        "major_name": major["major_name"],
+                        "major_id": major["major_id"],
                         "year_level": section.year_level,
                         "section_code": section.section_code,
                         "created_at": section.created_at,
@@ -297,11 +298,10 @@ def read_sections(db: Session, teacher_id: int, skip: int, limit: int):
     skip = max(0, skip)
     limit = max(1, min(limit, MAX_PAGE_SIZE))
     sections = ClassroomRepository.list_sections(db, teacher_id, skip, limit)
+    hierarchy = academic_hierarchy.snapshot(db, major_ids=[section.major_id for section in sections])
     formatted = []
     for section in sections:
-        major = section.major
-        department = major.department if major else None
-        college = department.college if department else None
+        major = hierarchy.major(section.major_id)
         # Return one row per section with no subject binding in this endpoint.
         formatted.append(
             {
@@ -310,10 +310,10 @@ def read_sections(db: Session, teacher_id: int, skip: int, limit: int):
                 "subject_id": None,
                 "teacher_id": section.teacher_id,
                 "teacher_username": section.teacher.username if section.teacher else None,
-                "college_name": college.name if college else None,
-                "department_name": department.name if department else None,
-                "major_name": major.name if major else None,
-                "major_id": major.id if major else None,
+                "college_name": major["college_name"],
+                "department_name": major["department_name"],
+                "major_name": major["major_name"],
+                "major_id": major["major_id"],
                 "year_level": section.year_level,
                 "section_code": section.section_code,
                 "created_at": section.created_at,
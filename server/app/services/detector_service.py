@@ -1,5 +1,6 @@
 import os
 import asyncio
+import importlib.util
 from pathlib import Path
 import logging
 import threading
@@ -26,8 +27,20 @@ from app.core.config import settings
 from app.db.database import SessionLocal
 from app.models.session import ClassSession
 from app.schemas.session import BehaviorLogCreate
+from app.services import model_evaluation_service, raw_detection_service
 from app.services.admin import settings_service
 from app.services.snapshot_service import snapshot_service
+from app.utils.detection import (
+    Detections,
+    count_behaviors,
+    detections_from_result,
+    merge_camera_counts,
+    merge_tile_detections,
+    pack_camera_counts,
+    tile_frame,
+)
+from app.utils.admission import InferenceAdmissionController
+from app.utils.tracking import BehaviorTracker
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +55,10 @@ _last_snapshot_time: dict[int, float] = {}
 _snapshot_lock = threading.Lock()
 SNAPSHOT_COOLDOWN_SECONDS = 30
 
+INFERENCE_MODE_SINGLE = "single"
+INFERENCE_MODE_TILED = "tiled"
+INFERENCE_MODES = (INFERENCE_MODE_SINGLE, INFERENCE_MODE_TILED)
+
 _server_root = Path(__file__).resolve().parents[2]
 _initial_model_path = Path(MODEL_PATH)
 _current_model_path = (
@@ -49,15 +66,21 @@ _current_model_path = (
 ).resolve()
 _weights_dir = _current_model_path.parent
 
+# .onnx weights are INT8/FP32 exports for CPU-only machines (scripts/quantize_model.py).
+WEIGHT_SUFFIXES = (".pt", ".onnx")
 
-def _empty_behavior_counts() -> dict[str, int]:
-    return {
-        "on_task": 0,
-        "sleeping": 0,
-        "using_phone": 0,
-        "off_task": 0,
-        "not_visible": 0,
-    }
+# All live detectors share one model; inference calls are admitted by weighted fair
+# queueing on activity_mode so an EXAM session is not delayed by lecture sessions.
+_admission = InferenceAdmissionController()
+
+# Degradation ladder for a detector that misses its inference deadline, indexed by
+# level: image size scale, whether tiling is dropped, and how many ticks are skipped.
+# The level rises on every miss and falls after DEGRADE_RECOVERY_TICKS on-time ticks.
+DEGRADE_IMGSZ_SCALES = (1.0, 0.75, 0.5, 0.5)
+DEGRADE_DROP_TILING = (False, False, True, True)
+DEGRADE_TICK_STRIDES = (1, 1, 1, 2)
+DEGRADE_RECOVERY_TICKS = 5
+MIN_DEGRADED_IMGSZ = 320
 
 
 def _runtime_detection_settings() -> dict[str, Any]:
@@ -72,7 +95,7 @@ def _get_model() -> YOLO:
             if _model is None:
                 if not _current_model_path.exists():
                     raise RuntimeError(f"Model not found at {_current_model_path}")
-                _model = YOLO(str(_current_model_path))
+                _model = YOLO(str(_current_model_path), task="detect")
     return _model
 
 
@@ -80,7 +103,7 @@ def _list_weight_files() -> list[Path]:
     if not _weights_dir.exists():
         return []
     return sorted(
-        [p for p in _weights_dir.iterdir() if p.is_file() and p.suffix.lower() == ".pt"],
+        [p for p in _weights_dir.iterdir() if p.is_file() and p.suffix.lower() in WEIGHT_SUFFIXES],
         key=lambda p: p.name.lower(),
     )
 
@@ -103,9 +126,17 @@ def build_model_selection_response() -> dict:
     _ensure_current_model_exists()
     files = _list_weight_files()
     current_name = _current_model_path.name
+    evaluations = model_evaluation_service.get_evaluations(_weights_dir)
     return {
         "current_model_file": current_name,
-        "models": [{"file_name": p.name, "is_current": p.name == current_name} for p in files],
+        "models": [
+            {
+                "file_name": p.name,
+                "is_current": p.name == current_name,
+                "evaluations": evaluations.get(p.name, []),
+            }
+            for p in files
+        ],
     }
 
 
@@ -113,8 +144,10 @@ def select_model_file(file_name: str) -> dict:
     global _current_model_path, _model
 
     requested = Path(file_name).name
-    if not requested.lower().endswith(".pt"):
-        raise ValueError("Only .pt files are allowed.")
+    if not requested.lower().endswith(WEIGHT_SUFFIXES):
+        raise ValueError("Only .pt and .onnx files are allowed.")
+    if requested.lower().endswith(".onnx") and importlib.util.find_spec("onnxruntime") is None:
+        raise ValueError("onnxruntime is not installed on the server; .onnx models cannot be loaded.")
 
     candidate = (_weights_dir / requested).resolve()
     if candidate.parent != _weights_dir.resolve():
@@ -129,7 +162,112 @@ def select_model_file(file_name: str) -> dict:
     return build_model_selection_response()
 
 
-def detect_counts_from_image_bytes(raw: bytes) -> dict[str, int]:
+def _tile_grid_for_camera(detection_settings: dict[str, Any], camera_index: int) -> tuple[int, int]:
+    grids = detection_settings.get("camera_tile_grids") or {}
+    grid = grids.get(str(camera_index)) or {}
+    rows = int(grid.get("rows", detection_settings.get("tile_rows", 2)))
+    cols = int(grid.get("cols", detection_settings.get("tile_cols", 2)))
+    return rows, cols
+
+
+def _infer_detections(
+    model: YOLO,
+    frame: np.ndarray,
+    detection_settings: dict[str, Any],
+    inference_mode: str = INFERENCE_MODE_SINGLE,
+    camera_index: int | None = None,
+) -> Detections:
+    """Run the model on a frame and return full-frame detections.
+
+    Tiled mode splits the frame into an overlapping grid (configured per camera),
+    runs every tile as one batch at ``tile_imgsz`` and merges boxes with cross-tile
+    NMS, so small students at the back of large rooms are seen at a higher effective
+    resolution without raising ``detection_imgsz`` for every classroom.
+    """
+    return _infer_detections_batch(model, [frame], detection_settings, inference_mode, camera_index)[0]
+
+
+def _infer_detections_batch(
+    model: YOLO,
+    frames: list[np.ndarray],
+    detection_settings: dict[str, Any],
+    inference_mode: str = INFERENCE_MODE_SINGLE,
+    camera_index: int | None = None,
+) -> list[Detections]:
+    """Batched variant of _infer_detections: one model call for all frames (and tiles)."""
+    if not frames:
+        return []
+    if inference_mode != INFERENCE_MODE_TILED:
+        results = model(frames, imgsz=int(detection_settings["detection_imgsz"]), verbose=False)
+        return [detections_from_result(result) for result in results]
+
+    if camera_index is None:
+        camera_index = int(detection_settings["server_camera_index"])
+    rows, cols = _tile_grid_for_camera(detection_settings, camera_index)
+    overlap = float(detection_settings.get("tile_overlap_ratio", 0.2))
+    all_tiles: list[np.ndarray] = []
+    frame_offsets: list[list[tuple[int, int]]] = []
+    for frame in frames:
+        tiles, offsets = tile_frame(frame, rows, cols, overlap)
+        all_tiles.extend(tiles)
+        frame_offsets.append(offsets)
+    results = model(all_tiles, imgsz=int(detection_settings.get("tile_imgsz", 640)), verbose=False)
+    per_tile = [detections_from_result(result) for result in results]
+
+    merged: list[Detections] = []
+    start = 0
+    for offsets in frame_offsets:
+        merged.append(merge_tile_detections(per_tile[start : start + len(offsets)], offsets))
+        start += len(offsets)
+    return merged
+
+
+def _degraded_settings(
+    detection_settings: dict[str, Any], inference_mode: str, level: int
+) -> tuple[dict[str, Any], str, float]:
+    """Settings, inference mode and tick interval for a detector at a degradation level."""
+    interval = float(detection_settings["detect_interval_seconds"])
+    if level <= 0:
+        return detection_settings, inference_mode, interval
+    level = min(level, len(DEGRADE_IMGSZ_SCALES) - 1)
+    scale = DEGRADE_IMGSZ_SCALES[level]
+    degraded = dict(detection_settings)
+    for key in ("detection_imgsz", "tile_imgsz"):
+        size = int(detection_settings.get(key, 640))
+        degraded[key] = max(min(size, MIN_DEGRADED_IMGSZ), int(size * scale) // 32 * 32)
+    mode = INFERENCE_MODE_SINGLE if DEGRADE_DROP_TILING[level] else inference_mode
+    return degraded, mode, interval * DEGRADE_TICK_STRIDES[level]
+
+
+def _session_activity_mode(session_id: int) -> str | None:
+    db = SessionLocal()
+    try:
+        session = db.query(ClassSession).filter(ClassSession.id == session_id).first()
+        return session.activity_mode if session else None
+    finally:
+        db.close()
+
+
+def _draw_detections(frame: np.ndarray, detections: Detections, names: dict[int, str], threshold: float) -> np.ndarray:
+    annotated = frame.copy()
+    for cls_id, conf, box in zip(detections.cls.tolist(), detections.conf.tolist(), detections.boxes.tolist()):
+        if conf < threshold:
+            continue
+        x1, y1, x2, y2 = (int(v) for v in box)
+        cv2.rectangle(annotated, (x1, y1), (x2, y2), (0, 200, 0), 2)
+        cv2.putText(
+            annotated,
+            f"{names.get(cls_id, cls_id)} {conf:.2f}",
+            (x1, max(0, y1 - 6)),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            0.5,
+            (0, 200, 0),
+            1,
+        )
+    return annotated
+
+
+def detect_counts_from_image_bytes(raw: bytes, inference_mode: str = INFERENCE_MODE_SINGLE) -> dict[str, int]:
     image_array = np.frombuffer(raw, dtype=np.uint8)
     frame = cv2.imdecode(image_array, cv2.IMREAD_COLOR)
     if frame is None:
@@ -137,19 +275,8 @@ def detect_counts_from_image_bytes(raw: bytes) -> dict[str, int]:
 
     model = _get_model()
     detection_settings = _runtime_detection_settings()
-    results = model(frame, imgsz=int(detection_settings["detection_imgsz"]), verbose=False)
-
-    counts = _empty_behavior_counts()
-    threshold = detection_settings["detection_confidence_threshold"]
-    for box in results[0].boxes:
-        cls_id = int(box.cls[0])
-        conf = float(box.conf[0])
-        if conf < threshold:
-            continue
-        class_name = str(model.names[cls_id]).strip()
-        if class_name in counts:
-            counts[class_name] += 1
-    return counts
+    detections = _infer_detections(model, frame, detection_settings, inference_mode)
+    return count_behaviors(detections, model.names, detection_settings["detection_confidence_threshold"])
 
 
 def test_detection(raw: bytes) -> list[dict]:
@@ -182,7 +309,62 @@ def test_detection(raw: bytes) -> list[dict]:
     return detections
 
 
-def _run_webcam_detector(session_id: int, stop_event: threading.Event, process_log_fn: Callable) -> None:
+class _CameraStage:
+    """Capture stage of one camera: frames are grabbed continuously so the stream stays
+    current, but only decoded when a tick actually needs them."""
+
+    def __init__(self, camera_index: int) -> None:
+        self.index = camera_index
+        self.cap = cv2.VideoCapture(camera_index)
+        self.grabbed = False
+
+    def is_opened(self) -> bool:
+        return self.cap.isOpened()
+
+    def grab(self) -> bool:
+        self.grabbed = self.cap.grab()
+        return self.grabbed
+
+    def retrieve(self) -> np.ndarray | None:
+        if not self.grabbed:
+            return None
+        ret, frame = self.cap.retrieve()
+        return frame if ret else None
+
+    def release(self) -> None:
+        self.cap.release()
+
+
+def _session_camera_indices(detection_settings: dict[str, Any], cameras: list[int] | None) -> list[int]:
+    indices = cameras or detection_settings.get("server_camera_indices") or [detection_settings["server_camera_index"]]
+    return list(dict.fromkeys(int(index) for index in indices))
+
+
+def _infer_cameras(
+    model: YOLO,
+    frames: dict[int, np.ndarray],
+    detection_settings: dict[str, Any],
+    inference_mode: str,
+) -> dict[int, Detections]:
+    """Detections per camera; single mode runs all cameras as one batch."""
+    if inference_mode != INFERENCE_MODE_TILED:
+        indices = list(frames)
+        results = _infer_detections_batch(model, [frames[i] for i in indices], detection_settings, inference_mode)
+        return dict(zip(indices, results))
+    # Tiled mode: each camera has its own grid, so one batch (of its tiles) per camera.
+    return {
+        index: _infer_detections(model, frame, detection_settings, inference_mode, index)
+        for index, frame in frames.items()
+    }
+
+
+def _run_webcam_detector(
+    session_id: int,
+    stop_event: threading.Event,
+    process_log_fn: Callable,
+    inference_mode: str = INFERENCE_MODE_SINGLE,
+    cameras: list[int] | None = None,
+) -> None:
     detection_settings = _runtime_detection_settings()
     if not detection_settings["server_camera_enabled"]:
         logger.warning(f"Detector not started for session {session_id}: SERVER_CAMERA_ENABLED=false")
@@ -194,14 +376,29 @@ def _run_webcam_detector(session_id: int, stop_event: threading.Event, process_l
         logger.error(f"Detector failed to load model for session {session_id}: {exc}")
         return
 
-    cap = cv2.VideoCapture(detection_settings["server_camera_index"])
-    if not cap.isOpened():
-        logger.error(
-            f"Detector failed to open webcam index {detection_settings['server_camera_index']} for session {session_id}"
-        )
+    stages = []
+    for camera_index in _session_camera_indices(detection_settings, cameras):
+        stage = _CameraStage(camera_index)
+        if stage.is_opened():
+            stages.append(stage)
+        else:
+            logger.error(f"Detector failed to open webcam index {camera_index} for session {session_id}")
+            stage.release()
+    if not stages:
         return
+    multi_camera = len(stages) > 1
+
+    try:
+        activity_mode = _session_activity_mode(session_id)
+    except Exception as exc:
+        logger.error(f"Detector failed to load session {session_id}: {exc}")
+        activity_mode = None
 
+    trackers: dict[int, BehaviorTracker] = {}
     last_send_time = 0.0
+    degrade_level = 0
+    on_time_ticks = 0
+    inference_cost = 0.2
     try:
         while not stop_event.is_set():
             with _detectors_lock:
@@ -213,40 +410,90 @@ def _run_webcam_detector(session_id: int, stop_event: threading.Event, process_l
                 logger.info(f"Detector heartbeat expired for session {session_id}. Stopping.")
                 break
 
-            ret, frame = cap.read()
-            if not ret:
+            if not sum(stage.grab() for stage in stages):
                 time.sleep(0.2)
                 continue
 
+            tick_settings, tick_mode, interval = _degraded_settings(detection_settings, inference_mode, degrade_level)
             current_time = time.time()
-            if current_time - last_send_time < detection_settings["detect_interval_seconds"]:
+            if current_time - last_send_time < interval:
+                continue
+            frames = {stage.index: frame for stage in stages if (frame := stage.retrieve()) is not None}
+            if not frames:
                 continue
 
-            results = model(frame, imgsz=int(detection_settings["detection_imgsz"]), verbose=False)
+            _admission.set_slots(int(detection_settings["inference_slots"]))
+            deadline = current_time + float(detection_settings["inference_deadline_seconds"])
+            if not _admission.acquire(session_id, activity_mode, inference_cost, deadline):
+                # No slot before the deadline: skip this tick rather than report a stale frame.
+                degrade_level = min(degrade_level + 1, len(DEGRADE_IMGSZ_SCALES) - 1)
+                on_time_ticks = 0
+                last_send_time = current_time
+                logger.info(f"Detector for session {session_id} skipped a tick; degradation level {degrade_level}")
+                continue
+            try:
+                inference_started = time.time()
+                detections_by_camera = _infer_cameras(model, frames, tick_settings, tick_mode)
+            finally:
+                _admission.release()
+            finished = time.time()
+            inference_cost = 0.7 * inference_cost + 0.3 * (finished - inference_started)
+            if finished > deadline:
+                degrade_level = min(degrade_level + 1, len(DEGRADE_IMGSZ_SCALES) - 1)
+                on_time_ticks = 0
+            elif degrade_level:
+                on_time_ticks += 1
+                if on_time_ticks >= DEGRADE_RECOVERY_TICKS:
+                    degrade_level -= 1
+                    on_time_ticks = 0
+
+            threshold = detection_settings["detection_confidence_threshold"]
             if detection_settings["server_camera_preview"]:
                 try:
-                    annotated = results[0].plot()
-                    cv2.imshow("TeachTrack Detector", annotated)
+                    for camera_index, detections in detections_by_camera.items():
+                        annotated = _draw_detections(frames[camera_index], detections, model.names, threshold)
+                        cv2.imshow(f"TeachTrack Detector - camera {camera_index}", annotated)
                     if cv2.waitKey(1) & 0xFF == ord("q"):
                         break
                 except Exception as exc:
                     logger.error(f"Preview error for session {session_id}: {exc}")
 
-            counts = _empty_behavior_counts()
+            per_camera: dict[int, dict[str, int]] = {}
+            for camera_index, detections in detections_by_camera.items():
+                if detection_settings.get("tracking_enabled"):
+                    tracker = trackers.get(camera_index)
+                    if tracker is None:
+                        tracker = trackers[camera_index] = BehaviorTracker(
+                            iou_threshold=float(detection_settings["tracking_iou_threshold"]),
+                            switch_ticks=int(detection_settings["tracking_switch_ticks"]),
+                            max_missed_ticks=int(detection_settings["tracking_max_missed_ticks"]),
+                        )
+                    per_camera[camera_index] = tracker.update(detections, model.names, threshold)
+                else:
+                    trackers.clear()
+                    per_camera[camera_index] = count_behaviors(detections, model.names, threshold)
+
+            if multi_camera:
+                counts = merge_camera_counts(
+                    per_camera, detection_settings["camera_regions"], detection_settings["camera_region_merge"]
+                )
+                log_data = BehaviorLogCreate(**counts, camera_counts=pack_camera_counts(per_camera))
+            else:
+                counts = next(iter(per_camera.values()))
+                log_data = BehaviorLogCreate(**counts)
+
+            # Phone snapshots come from the camera that sees the most phones.
+            phone_camera = max(per_camera, key=lambda index: per_camera[index]["using_phone"])
+            frame = frames[phone_camera]
+            detections = detections_by_camera[phone_camera]
             phone_detections = []
-            for box in results[0].boxes:
-                cls_id = int(box.cls[0])
-                conf = float(box.conf[0])
-                if conf < detection_settings["detection_confidence_threshold"]:
-                    continue
-                class_name = str(model.names[cls_id]).strip()
-                if class_name in counts:
-                    counts[class_name] += 1
-                    if class_name == "using_phone" and snapshot_service.is_configured():
-                        bbox = box.xyxy[0].cpu().numpy().tolist()  # [x1, y1, x2, y2]
-                        phone_detections.append({"bbox": bbox, "label": "Phone", "confidence": conf})
-
-            log_data = BehaviorLogCreate(**counts)
+            if per_camera[phone_camera]["using_phone"] and snapshot_service.is_configured():
+                for cls_id, conf, bbox in zip(
+                    detections.cls.tolist(), detections.conf.tolist(), detections.boxes.tolist()
+                ):
+                    if conf < threshold or str(model.names[cls_id]).strip() != "using_phone":
+                        continue
+                    phone_detections.append({"bbox": bbox, "label": "Phone", "confidence": conf})
 
             if phone_detections and snapshot_service.is_configured():
                 should_upload = False
@@ -289,17 +536,39 @@ def _run_webcam_detector(session_id: int, stop_event: threading.Event, process_l
                     except Exception as exc:
                         logger.error(f"Failed to capture snapshot for session {session_id}: {exc}")
 
+            # Exam sessions are discarded when they end and can never be re-scored.
+            store_raw_detections = detection_settings.get("store_raw_detections") and activity_mode != "EXAM"
             db = SessionLocal()
+            log_id = None
             try:
-                process_log_fn(db, session_id, log_data)
+                log = process_log_fn(db, session_id, log_data)
+                if store_raw_detections:
+                    log_id = getattr(log, "id", None)
             except Exception as exc:
                 logger.error(f"Detector failed to log metrics for session {session_id}: {exc}")
             finally:
                 db.close()
 
+            if store_raw_detections:
+                try:
+                    for camera_index, camera_detections in detections_by_camera.items():
+                        raw_detection_service.append_tick(
+                            session_id,
+                            log_id,
+                            current_time,
+                            camera_detections,
+                            frames[camera_index].shape,
+                            model.names,
+                            camera_index=camera_index if multi_camera else None,
+                        )
+                except Exception as exc:
+                    logger.error(f"Failed to store raw detections for session {session_id}: {exc}")
+
             last_send_time = current_time
     finally:
-        cap.release()
+        _admission.forget(session_id)
+        for stage in stages:
+            stage.release()
         if detection_settings["server_camera_preview"]:
             try:
                 cv2.destroyAllWindows()
@@ -307,10 +576,19 @@ def _run_webcam_detector(session_id: int, stop_event: threading.Event, process_l
                 pass
 
 
-def start_webcam_detector(session_id: int, process_log_fn: Callable) -> str:
+def start_webcam_detector(
+    session_id: int,
+    process_log_fn: Callable,
+    inference_mode: str = INFERENCE_MODE_SINGLE,
+    cameras: list[int] | None = None,
+) -> str:
     detection_settings = _runtime_detection_settings()
     if not detection_settings["server_camera_enabled"]:
         raise ValueError("Server camera disabled by SERVER_CAMERA_ENABLED")
+    if inference_mode not in INFERENCE_MODES:
+        raise ValueError(f"inference_mode must be one of: {', '.join(INFERENCE_MODES)}")
+    if cameras is not None and (not cameras or len(cameras) > 4 or any(not (0 <= c <= 10) for c in cameras)):
+        raise ValueError("cameras must list 1 to 4 camera indexes between 0 and 10")
 
     with _detectors_lock:
         existing = _detectors.get(session_id)
@@ -321,10 +599,16 @@ def start_webcam_detector(session_id: int, process_log_fn: Callable) -> str:
         stop_event = threading.Event()
         thread = threading.Thread(
             target=_run_webcam_detector,
-            args=(session_id, stop_event, process_log_fn),
+            args=(session_id, stop_event, process_log_fn, inference_mode, cameras),
             daemon=True,
         )
-        _detectors[session_id] = {"thread": thread, "stop": stop_event, "last_heartbeat": time.time()}
+        _detectors[session_id] = {
+            "thread": thread,
+            "stop": stop_event,
+            "last_heartbeat": time.time(),
+            "inference_mode": inference_mode,
+            "cameras": _session_camera_indices(detection_settings, cameras),
+        }
         thread.start()
     return "started"
 
@@ -1,12 +1,20 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
-from sqlalchemy import func
+import numpy as np
+from sqlalchemy import func, insert
 from sqlalchemy.orm import Session
 
 from app.models.session import Alert, AlertSeverity, AlertType, BehaviorLog, ClassSession, SessionHistory, SessionMetrics as SessionMetricsModel
-from app.schemas.session import BehaviorLogCreate
-from app.services import alert_service, session_lifecycle_service
+from app.schemas.session import BehaviorLogBatchItem, BehaviorLogCreate
+from app.services import (
+    alert_service,
+    event_hub,
+    live_session_store,
+    log_archive_service,
+    rollup_service,
+    session_lifecycle_service,
+)
 from app.services.admin import settings_service
 from app.utils.datetime import utc_now
 
@@ -44,6 +52,28 @@ def _weighted_engagement_percent(
     return max(0.0, min(100.0, percent))
 
 
+def _headcount_engagement_percent(
+    on_task: int,
+    using_phone: int,
+    sleeping: int,
+    off_task: int,
+    not_visible: int,
+    students_present: int,
+    weights: dict[str, float],
+) -> float | None:
+    """Per-log engagement normalised by the headcount (admin views); None without a headcount."""
+    if students_present <= 0:
+        return None
+    raw_score = (
+        (weights["on_task"] * on_task)
+        - (weights["using_phone"] * using_phone)
+        - (weights["sleeping"] * sleeping)
+        - (weights["off_task"] * off_task)
+        - (weights.get("not_visible", 0.0) * not_visible)
+    )
+    return max(0.0, min(100.0, (raw_score / students_present) * 100))
+
+
 def _avg_engagement_from_snapshot_logs(
     db: Session,
     session_id: int,
@@ -54,19 +84,19 @@ def _avg_engagement_from_snapshot_logs(
     Normalizes scores based on visible students only.
     Returns a value in [0, 100].
     """
-    rows = (
-        db.query(
-            BehaviorLog.on_task,
-            BehaviorLog.using_phone,
-            BehaviorLog.sleeping,
-            BehaviorLog.off_task,
-            BehaviorLog.not_visible,
-            BehaviorLog.students_present_snapshot,
-            BehaviorLog.total_detected,
-            BehaviorLog.timestamp,
-        )
-        .filter(BehaviorLog.session_id == session_id)
-        .all()
+    rows = log_archive_service.log_rows(
+        db,
+        session_id,
+        (
+            "on_task",
+            "using_phone",
+            "sleeping",
+            "off_task",
+            "not_visible",
+            "students_present_snapshot",
+            "total_detected",
+            "timestamp",
+        ),
     )
     if not rows:
         return 0.0
@@ -99,8 +129,10 @@ def process_behavior_log(
     session_id: int,
     log_in: BehaviorLogCreate,
     teacher_id: int | None = None,
-) -> None:
+    timestamp: datetime | None = None,
+) -> BehaviorLog:
     session = session_lifecycle_service.get_active_session_or_404(db, session_id, teacher_id)
+    _ensure_live_state(db, session)
     
     # Extract snapshot URL if available (added by detector service)
     snapshot_url = getattr(log_in, '_snapshot_url', None)
@@ -122,14 +154,33 @@ def process_behavior_log(
         off_task=log_in.off_task,
         not_visible=not_visible,
         total_detected=total,
+        camera_counts=log_in.camera_counts,
         # Snapshot the current headcount so the engagement formula stays
         # accurate even if the teacher changes students_present later.
         students_present_snapshot=session.students_present,
     )
+    if timestamp is not None:
+        log.timestamp = timestamp
     db.add(log)
     db.flush()
 
     weights = settings_service.get_engagement_weights(db, mode=session.activity_mode)
+    score = (
+        _weighted_engagement_percent(
+            on_task=log_in.on_task,
+            using_phone=log_in.using_phone,
+            sleeping=log_in.sleeping,
+            off_task=log_in.off_task,
+            total_detected=total,
+            weights=weights,
+        )
+        if total > 0
+        else None
+    )
+    headcount_score = _headcount_engagement_percent(
+        log_in.on_task, log_in.using_phone, log_in.sleeping, log_in.off_task, not_visible, session.students_present, weights
+    )
+    alerts = []
     
     # --- Mode-Aware Alerts ---
     
@@ -140,13 +191,14 @@ def process_behavior_log(
         # Strict Phone Count Check - ONLY phone alerts for exam mode
         if log_in.using_phone >= proctor_configs["phone_count_threshold"]:
             msg = f"EXAM ALERT: Phone usage detected! {log_in.using_phone} student(s)."
-            alert_service.trigger_alert(db, session_id, AlertType.PHONE, msg, AlertSeverity.CRITICAL, snapshot_url=snapshot_url)
+            alerts.append(alert_service.trigger_alert(db, session_id, AlertType.PHONE, msg, AlertSeverity.CRITICAL, snapshot_url=snapshot_url, at=timestamp))
             
         # For EXAM mode, we don't save engagement averages. Keep at zero.
         session.average_engagement = 0.0
         db.add(session)
         db.commit()
-        return  # End processing for exams (No permanent engagement saved)
+        _publish_live_log(session_id, log, score, headcount_score, alerts)
+        return log  # End processing for exams (No permanent engagement saved)
 
     # Standard Mode Logic (Lecture, Study, Collaboration)
     
@@ -156,14 +208,14 @@ def process_behavior_log(
         ratio = log_in.sleeping / total
         if ratio > sleeping_threshold:
             msg = f"High sleeping detected [{session.activity_mode}]: {log_in.sleeping} students ({int(ratio*100)}%)."
-            alert_service.trigger_alert(db, session_id, AlertType.SLEEPING, msg, AlertSeverity.WARNING, snapshot_url=None)
+            alerts.append(alert_service.trigger_alert(db, session_id, AlertType.SLEEPING, msg, AlertSeverity.WARNING, snapshot_url=None, at=timestamp))
 
     # Phone usage spike:
     if total > 0 and total >= 5 and log_in.using_phone > 0:
         ratio = log_in.using_phone / total
         if ratio > 0.2:
             msg = f"Phone usage spike: {log_in.using_phone} students ({int(ratio*100)}%)."
-            alert_service.trigger_alert(db, session_id, AlertType.PHONE, msg, AlertSeverity.WARNING, snapshot_url=snapshot_url)
+            alerts.append(alert_service.trigger_alert(db, session_id, AlertType.PHONE, msg, AlertSeverity.WARNING, snapshot_url=snapshot_url, at=timestamp))
 
     # Off-task alerts:
     if session.activity_mode != "COLLABORATION" and total >= 5 and log_in.off_task > 0:
@@ -183,22 +235,205 @@ def process_behavior_log(
     if total >= 5 and weighted_engagement < 40:
         severity = AlertSeverity.CRITICAL if weighted_engagement < 25 else AlertSeverity.WARNING
         msg = f"Engagement drop [{session.activity_mode}]: {int(weighted_engagement)}% weighted engagement."
-        alert_service.trigger_alert(db, session_id, AlertType.ENGAGEMENT_DROP, msg, severity, snapshot_url=None)
+        alerts.append(alert_service.trigger_alert(db, session_id, AlertType.ENGAGEMENT_DROP, msg, severity, snapshot_url=None, at=timestamp))
 
     _update_session_metrics(db, session_id, log.timestamp)
+    closed_window = rollup_service.note_minute(session_id, _floor_to_minute(log.timestamp))
+    if closed_window is not None:
+        rollup_service.refresh_minute(db, session, closed_window)
     
-    # Recalculate and cache overall session engagement for performant sorting in admin views
-    session.average_engagement = _avg_engagement_from_snapshot_logs(db, session_id, weights)
+    # Cache overall session engagement for performant sorting in admin views; the live
+    # store keeps the running average so this does not re-read every log of the session.
+    average = live_session_store.average_engagement_after(session_id, score)
+    if average is None:
+        average = _avg_engagement_from_snapshot_logs(db, session_id, weights)
+    session.average_engagement = average
     db.add(session)
     
     db.commit()
+    _publish_live_log(session_id, log, score, headcount_score, alerts)
+    return log
 
 
-def get_session_metrics_response(db: Session, session_id: int, teacher_id: int) -> dict[str, Any]:
-    session = session_lifecycle_service.get_session_or_404(db, session_id, teacher_id)
+def _serialize_log(log: BehaviorLog) -> dict[str, Any]:
+    return {
+        "id": log.id,
+        "session_id": log.session_id,
+        "timestamp": log.timestamp,
+        "on_task": log.on_task or 0,
+        "sleeping": log.sleeping or 0,
+        "using_phone": log.using_phone or 0,
+        "off_task": log.off_task or 0,
+        "not_visible": log.not_visible or 0,
+        "total_detected": log.total_detected or 0,
+        "camera_counts": log.camera_counts,
+    }
+
+
+def _serialize_alert(alert: Alert) -> dict[str, Any]:
+    return {
+        "id": alert.id,
+        "session_id": alert.session_id,
+        "alert_type": alert.alert_type,
+        "message": alert.message,
+        "triggered_at": alert.triggered_at,
+        "severity": alert.severity,
+        "is_read": bool(alert.is_read),
+        "snapshot_url": alert.snapshot_url,
+    }
 
-    logs = db.query(BehaviorLog).filter(BehaviorLog.session_id == session_id).order_by(BehaviorLog.timestamp.desc()).limit(20).all()
-    logs.reverse()
+
+def _ensure_live_state(db: Session, session: ClassSession) -> None:
+    """Hydrate the live store for an active session from the database if it is not tracked yet."""
+    if not session.is_active or live_session_store.is_tracked(session.id):
+        return
+    weights = settings_service.get_engagement_weights(db, mode=session.activity_mode)
+    state = live_session_store.LiveSessionState(
+        session_id=session.id,
+        teacher_id=session.teacher_id,
+        activity_mode=session.activity_mode,
+        students_present=session.students_present,
+    )
+    logs = (
+        db.query(BehaviorLog)
+        .filter(BehaviorLog.session_id == session.id)
+        .order_by(BehaviorLog.timestamp.asc(), BehaviorLog.id.asc())
+        .all()
+    )
+    for log in logs:
+        state.recent_logs.append(_serialize_log(log))
+        state.last_log_id = max(state.last_log_id, log.id)
+        if (log.total_detected or 0) > 0:
+            state.score_sum += _weighted_engagement_percent(
+                on_task=log.on_task or 0,
+                using_phone=log.using_phone or 0,
+                sleeping=log.sleeping or 0,
+                off_task=log.off_task or 0,
+                total_detected=log.total_detected,
+                weights=weights,
+            )
+            state.score_count += 1
+        headcount = log.students_present_snapshot if log.students_present_snapshot else session.students_present
+        headcount_score = _headcount_engagement_percent(
+            log.on_task or 0,
+            log.using_phone or 0,
+            log.sleeping or 0,
+            log.off_task or 0,
+            log.not_visible or 0,
+            headcount or 0,
+            weights,
+        )
+        if headcount_score is not None:
+            state.headcount_score_sum += headcount_score
+            state.headcount_score_count += 1
+    unread = db.query(Alert).filter(Alert.session_id == session.id, Alert.is_read == False).all()
+    state.unread_alerts = {alert.id: _serialize_alert(alert) for alert in unread}
+    live_session_store.put(state)
+
+
+def _publish_live_log(
+    session_id: int,
+    log: BehaviorLog,
+    score: float | None,
+    headcount_score: float | None,
+    alerts: list[Alert | None],
+) -> None:
+    serialized = _serialize_log(log)
+    live_session_store.record_log(session_id, serialized, score, headcount_score)
+    live = live_session_store.snapshot(session_id)
+    event_hub.publish(
+        event_hub.session_topic(session_id),
+        "log",
+        {"log": serialized, "average_engagement": live["average_engagement"] if live else None},
+    )
+    triggered = [_serialize_alert(alert) for alert in alerts if alert is not None]
+    if triggered:
+        live_session_store.add_alerts(session_id, triggered)
+        alert_service.publish_alerts(triggered)
+
+
+def get_live_snapshot(db: Session, session: ClassSession) -> dict[str, Any] | None:
+    """Live state of an active session (hydrated on first use); None for ended sessions."""
+    if not session.is_active:
+        return None
+    _ensure_live_state(db, session)
+    return live_session_store.snapshot(session.id)
+
+
+def _to_utc_second(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.replace(tzinfo=None, microsecond=0)
+
+
+def process_behavior_log_batch(
+    db: Session,
+    session_id: int,
+    items: list[BehaviorLogBatchItem],
+    teacher_id: int | None = None,
+) -> dict[str, Any]:
+    """Ingest ticks captured by an edge detector, in order, at their capture time.
+
+    Edge clients deliver at least once (a batch is resent when its response is lost),
+    so ticks whose capture second already has a log in this session are skipped.
+    ``statuses`` holds ``accepted`` or ``duplicate`` for each tick, in request order.
+    """
+    session_lifecycle_service.get_active_session_or_404(db, session_id, teacher_id)
+    if not items:
+        return {"accepted": 0, "duplicates": 0, "statuses": []}
+
+    now = utc_now()
+    captured = [min(_to_utc_second(item.captured_at), _to_utc_second(now)) for item in items]
+    existing = {
+        _to_utc_second(row[0])
+        for row in db.query(BehaviorLog.timestamp)
+        .filter(
+            BehaviorLog.session_id == session_id,
+            BehaviorLog.timestamp >= min(captured),
+            BehaviorLog.timestamp < max(captured) + timedelta(seconds=1),
+        )
+        .all()
+    }
+
+    statuses = []
+    for item, captured_at in zip(items, captured):
+        if captured_at in existing:
+            statuses.append("duplicate")
+            continue
+        existing.add(captured_at)
+        log_in = BehaviorLogCreate(**item.model_dump(exclude={"captured_at"}))
+        process_behavior_log(db, session_id, log_in, teacher_id, timestamp=captured_at.replace(tzinfo=timezone.utc))
+        statuses.append("accepted")
+    accepted = statuses.count("accepted")
+    return {"accepted": accepted, "duplicates": len(items) - accepted, "statuses": statuses}
+
+
+def get_session_metrics_response(db: Session, session_id: int, teacher_id: int) -> dict[str, Any]:
+    live = live_session_store.snapshot(session_id)
+    if live is None or live["teacher_id"] != teacher_id:
+        session = session_lifecycle_service.get_session_or_404(db, session_id, teacher_id)
+        live = get_live_snapshot(db, session)
+    if live is not None:
+        return {
+            "session_id": session_id,
+            "students_present": live["students_present"],
+            "total_logs": len(live["recent_logs"]),
+            "average_engagement": live["average_engagement"],
+            "recent_logs": live["recent_logs"],
+            "alerts": live["unread_alerts"],
+        }
+
+    if session.logs_archive_path:
+        logs = list(log_archive_service.read_archive(session.logs_archive_path)[-live_session_store.LIVE_POINTS:])
+    else:
+        logs = (
+            db.query(BehaviorLog)
+            .filter(BehaviorLog.session_id == session_id)
+            .order_by(BehaviorLog.timestamp.desc(), BehaviorLog.id.desc())
+            .limit(live_session_store.LIVE_POINTS)
+            .all()
+        )
+        logs.reverse()
 
     alerts = db.query(Alert).filter(Alert.session_id == session_id, Alert.is_read == False).all()
 
@@ -318,3 +553,126 @@ def _update_session_metrics(db: Session, session_id: int, log_time: datetime) ->
     metrics.off_task_avg = round(off_task_sum / log_count, 2)
     metrics.not_visible_avg = round(not_visible_sum / log_count, 2)
     metrics.engagement_score = engagement_score
+
+
+def bulk_insert_behavior_logs(db: Session, session: ClassSession, rows: list[dict[str, Any]]) -> int:
+    """Insert many timestamped behavior logs in one executemany round trip.
+
+    Each row carries ``timestamp`` plus the four observed behavior counts; derived
+    columns follow process_behavior_log. No alerts are raised and no rollups are
+    touched, so callers backfilling history should finish with rebuild_session_metrics.
+    """
+    if not rows:
+        return 0
+    students_present = session.students_present or 0
+    mappings = []
+    for row in rows:
+        observed = row["on_task"] + row["sleeping"] + row["using_phone"] + row["off_task"]
+        mappings.append(
+            {
+                "session_id": session.id,
+                "timestamp": row["timestamp"],
+                "on_task": row["on_task"],
+                "sleeping": row["sleeping"],
+                "using_phone": row["using_phone"],
+                "off_task": row["off_task"],
+                "not_visible": max(0, students_present - observed),
+                "total_detected": observed,
+                "students_present_snapshot": students_present,
+            }
+        )
+    db.execute(insert(BehaviorLog), mappings)
+    return len(mappings)
+
+
+def rebuild_session_metrics(db: Session, session_id: int) -> int:
+    """Recompute every minute rollup, its coarser rollups and the cached session average.
+
+    Mirrors _update_session_metrics and _avg_engagement_from_snapshot_logs but loads
+    the session's logs once and aggregates them with numpy, so re-scoring a whole
+    session does not issue one query per window. Returns the number of windows kept.
+    """
+    session = db.query(ClassSession).filter(ClassSession.id == session_id).first()
+    if not session or session.activity_mode == "EXAM":
+        return 0
+
+    rows = log_archive_service.log_rows(
+        db,
+        session_id,
+        ("timestamp", "on_task", "using_phone", "sleeping", "off_task", "not_visible", "total_detected"),
+    )
+    existing = {
+        row.window_start.replace(tzinfo=None): row
+        for row in db.query(SessionMetricsModel).filter(SessionMetricsModel.session_id == session_id).all()
+    }
+
+    values = np.array([[r[i] or 0 for i in range(1, 7)] for r in rows], dtype=np.float64).reshape(-1, 6)
+    on_task, using_phone, sleeping, off_task, not_visible, total = values.T
+    valid = total > 0
+    weights = settings_service.get_engagement_weights(db, mode=session.activity_mode)
+    raw_score = (
+        weights["on_task"] * on_task
+        - weights["using_phone"] * using_phone
+        - weights["sleeping"] * sleeping
+        - weights["off_task"] * off_task
+    )
+    scores = np.clip(np.divide(raw_score * 100, total, out=np.zeros_like(total), where=valid), 0.0, 100.0)
+
+    window_keys: dict[datetime, int] = {}
+    window_starts: list[datetime] = []
+    group = np.empty(len(rows), dtype=np.int64)
+    for i, row in enumerate(rows):
+        start = _floor_to_minute(row[0])
+        key = start.replace(tzinfo=None)
+        if key not in window_keys:
+            window_keys[key] = len(window_starts)
+            window_starts.append(start)
+        group[i] = window_keys[key]
+
+    windows = len(window_starts)
+    g = group[valid]
+    log_count = np.bincount(g, minlength=windows)
+    sums = {
+        name: np.bincount(g, weights=column[valid], minlength=windows)
+        for name, column in (
+            ("on_task", on_task),
+            ("using_phone", using_phone),
+            ("sleeping", sleeping),
+            ("off_task", off_task),
+            ("not_visible", not_visible),
+            ("total", total),
+            ("score", scores),
+        )
+    }
+
+    kept = 0
+    for index, window_start in enumerate(window_starts):
+        key = window_start.replace(tzinfo=None)
+        count = int(log_count[index])
+        metrics = existing.pop(key, None)
+        if count == 0:
+            if metrics is not None:
+                db.delete(metrics)
+            continue
+        if metrics is None:
+            metrics = SessionMetricsModel(
+                session_id=session_id,
+                window_start=window_start,
+                window_end=window_start + timedelta(minutes=1),
+            )
+            db.add(metrics)
+        metrics.total_detected = int(sums["total"][index])
+        metrics.on_task_avg = round(float(sums["on_task"][index]) / count, 2)
+        metrics.using_phone_avg = round(float(sums["using_phone"][index]) / count, 2)
+        metrics.sleeping_avg = round(float(sums["sleeping"][index]) / count, 2)
+        metrics.off_task_avg = round(float(sums["off_task"][index]) / count, 2)
+        metrics.not_visible_avg = round(float(sums["not_visible"][index]) / count, 2)
+        metrics.engagement_score = round(float(sums["score"][index]) / count, 2)
+        kept += 1
+    for stale in existing.values():
+        db.delete(stale)
+
+    session.average_engagement = round(float(scores[valid].mean()), 2) if valid.any() else 0.0
+    db.add(session)
+    rollup_service.rebuild_session(db, session_id)
+    return kept
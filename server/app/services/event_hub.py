@@ -0,0 +1,144 @@
+"""In-process publish/subscribe hub behind the Server-Sent Events endpoints.
+
+Publishers are synchronous (request handlers in the threadpool, detector threads);
+subscribers are SSE responses on the event loop. ``publish`` encodes an event once,
+appends it to every subscriber of the topic and wakes the subscriber's loop with
+``call_soon_threadsafe``. Each subscriber has a bounded buffer: when a slow client
+falls ``SUBSCRIBER_QUEUE_SIZE`` events behind, the oldest events are dropped and the
+client receives a ``resync`` event telling it to refetch once instead of the backlog.
+
+Topics:
+    session:<id>   behavior logs, alerts and alert reads of one session, session end
+    alerts         every new alert, for the admin-wide alert stream
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from collections import deque
+from typing import Any, AsyncIterator
+
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+
+SUBSCRIBER_QUEUE_SIZE = 256
+HEARTBEAT_SECONDS = 15.0
+ALERTS_TOPIC = "alerts"
+
+
+def session_topic(session_id: int) -> str:
+    return f"session:{int(session_id)}"
+
+
+def format_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data), separators=(',', ':'))}\n\n"
+
+
+class Subscription:
+    def __init__(self, topic: str, loop: asyncio.AbstractEventLoop) -> None:
+        self.topic = topic
+        self.loop = loop
+        self.buffer: deque[str] = deque(maxlen=SUBSCRIBER_QUEUE_SIZE)
+        self.overflowed = False
+        self.wakeup = asyncio.Event()
+
+    def push(self, message: str) -> None:
+        # Called with _lock held, from any thread.
+        if len(self.buffer) == self.buffer.maxlen:
+            self.overflowed = True
+        self.buffer.append(message)
+        self.loop.call_soon_threadsafe(self.wakeup.set)
+
+    def drain(self) -> list[str]:
+        with _lock:
+            messages = list(self.buffer)
+            self.buffer.clear()
+            if self.overflowed:
+                self.overflowed = False
+                messages = [format_event("resync", {"reason": "subscriber queue overflow"})]
+            self.wakeup.clear()
+        return messages
+
+
+_subscriptions: dict[str, set[Subscription]] = {}
+_lock = threading.Lock()
+
+
+def subscribe(topic: str) -> Subscription:
+    subscription = Subscription(topic, asyncio.get_running_loop())
+    with _lock:
+        _subscriptions.setdefault(topic, set()).add(subscription)
+    return subscription
+
+
+def unsubscribe(subscription: Subscription) -> None:
+    with _lock:
+        subscribers = _subscriptions.get(subscription.topic)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                _subscriptions.pop(subscription.topic, None)
+
+
+def subscriber_count(topic: str) -> int:
+    with _lock:
+        return len(_subscriptions.get(topic, ()))
+
+
+def publish(topic: str, event: str, data: Any) -> None:
+    """Deliver an event to the topic's subscribers; cheap no-op when nobody listens."""
+    with _lock:
+        subscribers = list(_subscriptions.get(topic, ()))
+        if not subscribers:
+            return
+        message = format_event(event, data)
+        for subscription in subscribers:
+            try:
+                subscription.push(message)
+            except RuntimeError:
+                # The subscriber's loop is closed (server shutting down).
+                _subscriptions.get(topic, set()).discard(subscription)
+
+
+def _is_final(message: str) -> bool:
+    return message.startswith("event: session_ended\n")
+
+
+async def stream(
+    subscription: Subscription,
+    is_disconnected,
+    initial: list[str] | None = None,
+    heartbeat_seconds: float = HEARTBEAT_SECONDS,
+) -> AsyncIterator[str]:
+    """SSE body: initial events, then published events, with comment pings when idle."""
+    try:
+        for message in initial or []:
+            yield message
+            if _is_final(message):
+                return
+        while True:
+            try:
+                await asyncio.wait_for(subscription.wakeup.wait(), timeout=heartbeat_seconds)
+            except asyncio.TimeoutError:
+                if await is_disconnected():
+                    break
+                yield ": ping\n\n"
+                continue
+            for message in subscription.drain():
+                yield message
+                if _is_final(message):
+                    return
+    finally:
+        unsubscribe(subscription)
+
+
+def streaming_response(subscription: Subscription, request: Request, initial: list[str] | None = None) -> StreamingResponse:
+    return StreamingResponse(
+        stream(subscription, request.is_disconnected, initial),
+        media_type="text/event-stream",
+        # Proxies must not buffer or cache the stream.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,152 @@
+"""In-process live state of active sessions, kept current by the ingestion path.
+
+Teacher monitors poll ``GET /sessions/{id}/metrics`` and the admin dashboard lists
+active sessions every few seconds. Instead of re-reading the latest logs and unread
+alerts and re-averaging engagement over every log of the session on each poll, those
+reads are served from here for active sessions:
+
+- state is hydrated from the database the first time an active session is touched
+  (including after a restart),
+- behavior logs and alert changes are applied after they are committed,
+- state is dropped when the session ends or engagement weights change.
+
+Ended sessions are always read from the database. The store is per process, which
+matches how the API is deployed (a single uvicorn process that also runs detectors).
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+LIVE_POINTS = 20
+
+
+@dataclass
+class LiveSessionState:
+    session_id: int
+    teacher_id: int | None
+    activity_mode: str
+    students_present: int
+    recent_logs: deque = field(default_factory=lambda: deque(maxlen=LIVE_POINTS))
+    unread_alerts: dict[int, dict[str, Any]] = field(default_factory=dict)
+    last_log_id: int = 0
+    # Running sums of per-log scores: visible-student engagement (teacher monitor and the
+    # cached ClassSession.average_engagement) and headcount engagement (admin views).
+    score_sum: float = 0.0
+    score_count: int = 0
+    headcount_score_sum: float = 0.0
+    headcount_score_count: int = 0
+
+    @property
+    def average_engagement(self) -> float:
+        return round(self.score_sum / self.score_count, 2) if self.score_count else 0.0
+
+    @property
+    def headcount_average_engagement(self) -> float:
+        if not self.headcount_score_count:
+            return 0.0
+        return round(self.headcount_score_sum / self.headcount_score_count, 2)
+
+
+_states: dict[int, LiveSessionState] = {}
+_lock = threading.Lock()
+
+
+def put(state: LiveSessionState) -> None:
+    """Install hydrated state unless another thread already did."""
+    with _lock:
+        _states.setdefault(state.session_id, state)
+
+
+def is_tracked(session_id: int) -> bool:
+    with _lock:
+        return session_id in _states
+
+
+def snapshot(session_id: int) -> dict[str, Any] | None:
+    with _lock:
+        state = _states.get(session_id)
+        if state is None:
+            return None
+        recent_logs = list(state.recent_logs)
+        unread_alerts = [state.unread_alerts[alert_id] for alert_id in sorted(state.unread_alerts)]
+        return {
+            "session_id": state.session_id,
+            "teacher_id": state.teacher_id,
+            "activity_mode": state.activity_mode,
+            "students_present": state.students_present,
+            "latest_counts": recent_logs[-1] if recent_logs else None,
+            "recent_logs": recent_logs,
+            "unread_alerts": unread_alerts,
+            "unread_alert_count": len(unread_alerts),
+            "unread_critical_count": sum(1 for alert in unread_alerts if alert["severity"] == "CRITICAL"),
+            "average_engagement": state.average_engagement,
+            "headcount_average_engagement": state.headcount_average_engagement,
+        }
+
+
+def average_engagement_after(session_id: int, score: float | None) -> float | None:
+    """Session average if one more log with ``score`` were recorded; None when untracked."""
+    with _lock:
+        state = _states.get(session_id)
+        if state is None:
+            return None
+        if score is None:
+            return state.average_engagement
+        return round((state.score_sum + score) / (state.score_count + 1), 2)
+
+
+def record_log(
+    session_id: int,
+    log: dict[str, Any],
+    score: float | None,
+    headcount_score: float | None,
+) -> None:
+    """Apply one committed behavior log; ``score`` is None for logs that do not count."""
+    with _lock:
+        state = _states.get(session_id)
+        if state is None or log["id"] <= state.last_log_id:
+            return
+        state.last_log_id = log["id"]
+        state.recent_logs.append(log)
+        if len(state.recent_logs) > 1 and state.recent_logs[-2]["timestamp"] > log["timestamp"]:
+            # Edge batches can deliver ticks captured before the latest one.
+            ordered = sorted(state.recent_logs, key=lambda row: row["timestamp"])
+            state.recent_logs.clear()
+            state.recent_logs.extend(ordered)
+        if score is not None:
+            state.score_sum += score
+            state.score_count += 1
+        if headcount_score is not None:
+            state.headcount_score_sum += headcount_score
+            state.headcount_score_count += 1
+
+
+def add_alerts(session_id: int, alerts: list[dict[str, Any]]) -> None:
+    with _lock:
+        state = _states.get(session_id)
+        if state is None:
+            return
+        for alert in alerts:
+            if not alert["is_read"]:
+                state.unread_alerts[alert["id"]] = alert
+
+
+def mark_alert_read(session_id: int, alert_id: int) -> None:
+    with _lock:
+        state = _states.get(session_id)
+        if state is not None:
+            state.unread_alerts.pop(alert_id, None)
+
+
+def discard(session_id: int) -> None:
+    with _lock:
+        _states.pop(session_id, None)
+
+
+def clear() -> None:
+    with _lock:
+        _states.clear()
@@ -0,0 +1,322 @@
+"""Tiered retention for ``behavior_logs``: compact ended sessions into per-session archives.
+
+Sessions that ended more than ``admin_ops.behavior_log_retention_days`` ago have their
+raw logs written to one compressed NumPy archive each (``session_<id>.npz`` under
+``BEHAVIOR_LOG_ARCHIVE_DIR``, one array per column). The archive is written atomically
+and then verified:
+
+- read back, it must hold exactly the rows still in the database;
+- the minute windows (SessionMetrics) recomputed from it must match the stored ones;
+  the coarser rollups are rebuilt from them if they do not cover the same minutes.
+
+Only then is ``ClassSession.logs_archive_path`` recorded and the rows deleted in
+chunks; a later run finishes the deletion if it was interrupted. From that point the archive is the source of truth for the session's logs:
+readers go through ``log_rows`` / ``load_session_logs``, which read the archive when
+the session has one and the table otherwise. Re-scoring rewrites the archive in place.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Sequence
+
+import numpy as np
+from sqlalchemy import exists, func, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.session import BehaviorLog, ClassSession, SessionMetrics, SessionMetricsDaily
+from app.services import rollup_service
+from app.utils.datetime import to_naive_utc, utc_now
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FORMAT_VERSION = 1
+DELETE_CHUNK_SIZE = 5000
+COUNT_COLUMNS = ("on_task", "sleeping", "using_phone", "off_task", "not_visible", "total_detected")
+LOG_COLUMNS = ("id", "session_id", "timestamp", *COUNT_COLUMNS, "students_present_snapshot", "camera_counts")
+_BEHAVIOR_AVERAGES = ("on_task", "using_phone", "sleeping", "off_task", "not_visible")
+
+_EPOCH = datetime(1970, 1, 1)
+_server_root = Path(__file__).resolve().parents[2]
+
+
+@dataclass(slots=True)
+class ArchivedLog:
+    """A behavior log read back from an archive; same attributes as BehaviorLog."""
+
+    id: int
+    session_id: int
+    timestamp: datetime
+    on_task: int
+    sleeping: int
+    using_phone: int
+    off_task: int
+    not_visible: int
+    total_detected: int
+    students_present_snapshot: int | None
+    camera_counts: dict[str, list[int]] | None
+
+
+def _archive_dir() -> Path:
+    configured = Path(settings.BEHAVIOR_LOG_ARCHIVE_DIR)
+    return configured if configured.is_absolute() else (_server_root / configured)
+
+
+def _archive_file(name: str) -> Path:
+    return _archive_dir() / name
+
+
+def _to_micros(value: datetime) -> int:
+    return (to_naive_utc(value) - _EPOCH) // timedelta(microseconds=1)
+
+
+def _write_archive(session_id: int, logs: Sequence[Any]) -> str:
+    """Write ``logs`` (BehaviorLog-like, ordered) to the session's archive; returns its name."""
+    name = f"session_{int(session_id)}.npz"
+    path = _archive_file(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    columns: dict[str, np.ndarray] = {
+        "format_version": np.array(ARCHIVE_FORMAT_VERSION, dtype=np.int32),
+        "session_id": np.array(session_id, dtype=np.int64),
+        "id": np.array([log.id for log in logs], dtype=np.int64),
+        "timestamp_us": np.array([_to_micros(log.timestamp) for log in logs], dtype=np.int64),
+        "students_present_snapshot": np.array(
+            [log.students_present_snapshot if log.students_present_snapshot is not None else -1 for log in logs],
+            dtype=np.int32,
+        ),
+        "camera_counts": np.array(
+            [json.dumps(log.camera_counts) if log.camera_counts is not None else "" for log in logs],
+            dtype=np.str_,
+        ),
+    }
+    for name_ in COUNT_COLUMNS:
+        columns[name_] = np.array([getattr(log, name_) or 0 for log in logs], dtype=np.int32)
+    tmp = path.with_suffix(".tmp.npz")
+    np.savez_compressed(tmp, **columns)
+    os.replace(tmp, path)
+    return name
+
+
+@lru_cache(maxsize=16)
+def _read_archive(path: str, mtime_ns: int) -> tuple[ArchivedLog, ...]:
+    with np.load(path, allow_pickle=False) as data:
+        if int(data["format_version"]) != ARCHIVE_FORMAT_VERSION:
+            raise ValueError(f"Unrecognised behavior log archive: {path}")
+        session_id = int(data["session_id"])
+        counts = {name: data[name].tolist() for name in COUNT_COLUMNS}
+        snapshots = data["students_present_snapshot"].tolist()
+        cameras = data["camera_counts"].tolist()
+        return tuple(
+            ArchivedLog(
+                id=log_id,
+                session_id=session_id,
+                timestamp=_EPOCH + timedelta(microseconds=micros),
+                students_present_snapshot=snapshots[i] if snapshots[i] >= 0 else None,
+                camera_counts=json.loads(cameras[i]) if cameras[i] else None,
+                **{name: counts[name][i] for name in COUNT_COLUMNS},
+            )
+            for i, (log_id, micros) in enumerate(zip(data["id"].tolist(), data["timestamp_us"].tolist()))
+        )
+
+
+def read_archive(name: str) -> tuple[ArchivedLog, ...]:
+    """All logs of an archive, ordered by (timestamp, id). Cached until the file changes."""
+    path = _archive_file(name)
+    return _read_archive(str(path), path.stat().st_mtime_ns)
+
+
+def load_session_logs(db: Session, session_id: int) -> tuple[ArchivedLog, ...] | None:
+    """Archived logs of a session, or None when its logs are still in the table."""
+    name = db.query(ClassSession.logs_archive_path).filter(ClassSession.id == session_id).scalar()
+    return read_archive(name) if name else None
+
+
+def log_rows(db: Session, session_id: int, columns: Sequence[str]) -> list[tuple]:
+    """``columns`` of every log of a session, from its archive or from behavior_logs."""
+    archived = load_session_logs(db, session_id)
+    if archived is not None:
+        return [tuple(getattr(log, name) for name in columns) for log in archived]
+    return (
+        db.query(*(getattr(BehaviorLog, name) for name in columns))
+        .filter(BehaviorLog.session_id == session_id)
+        .all()
+    )
+
+
+def behavior_averages(name: str) -> dict[str, float]:
+    """Per-log averages of the behavior counts of an archive (admin session lists)."""
+    logs = read_archive(name)
+    if not logs:
+        return dict.fromkeys(_BEHAVIOR_AVERAGES, 0.0)
+    return {column: sum(getattr(log, column) for log in logs) / len(logs) for column in _BEHAVIOR_AVERAGES}
+
+
+def update_archived_logs(db: Session, session_id: int, updates: list[dict[str, Any]]) -> int:
+    """Apply BehaviorLog-style update mappings (keyed by ``id``) to a session's archive."""
+    archived = load_session_logs(db, session_id)
+    if archived is None:
+        raise ValueError(f"Session {session_id} has no behavior log archive")
+    by_id = {update["id"]: update for update in updates}
+    logs = [
+        ArchivedLog(**{name: by_id.get(log.id, {}).get(name, getattr(log, name)) for name in LOG_COLUMNS})
+        for log in archived
+    ]
+    _write_archive(session_id, logs)
+    return sum(1 for log in archived if log.id in by_id)
+
+
+def _minute_averages(logs: Sequence[Any]) -> dict[datetime, dict[str, float]]:
+    # Same windowing as engagement_service._update_session_metrics.
+    windows: dict[datetime, list[Any]] = {}
+    for log in logs:
+        if (log.total_detected or 0) > 0:
+            key = to_naive_utc(log.timestamp).replace(second=0, microsecond=0)
+            windows.setdefault(key, []).append(log)
+    return {
+        key: {name: round(sum(getattr(log, name) or 0 for log in rows) / len(rows), 2) for name in _BEHAVIOR_AVERAGES}
+        for key, rows in windows.items()
+    }
+
+
+def _verify(db: Session, session: ClassSession, db_logs: Sequence[BehaviorLog], archived: Sequence[ArchivedLog]) -> None:
+    if [log.id for log in archived] != [log.id for log in db_logs]:
+        raise ValueError("archive rows differ from behavior_logs")
+    for name in COUNT_COLUMNS:
+        if sum(getattr(log, name) for log in archived) != sum(getattr(log, name) or 0 for log in db_logs):
+            raise ValueError(f"archive {name} total differs from behavior_logs")
+
+    expected = _minute_averages(archived)
+    stored = {
+        to_naive_utc(row.window_start): row
+        for row in db.query(SessionMetrics).filter(SessionMetrics.session_id == session.id).all()
+    }
+    if set(expected) != set(stored):
+        raise ValueError(f"{len(expected)} minute windows in the logs, {len(stored)} in session_metrics")
+    for key, averages in expected.items():
+        row = stored[key]
+        for name, value in averages.items():
+            if abs(float(getattr(row, f"{name}_avg") or 0) - value) > 0.011:
+                raise ValueError(f"session_metrics window {key:%Y-%m-%d %H:%M} {name} does not match the logs")
+
+    rolled_minutes = (
+        db.query(func.coalesce(func.sum(SessionMetricsDaily.minute_count), 0))
+        .filter(SessionMetricsDaily.session_id == session.id)
+        .scalar()
+    )
+    if int(rolled_minutes) != len(stored):
+        rollup_service.rebuild_session(db, session.id)
+        db.flush()
+
+
+def delete_archived_logs(db: Session, session_id: int) -> int:
+    """Delete the behavior_logs rows of an archived session in chunks, committing each.
+
+    Resumable: an interrupted run leaves the remaining rows for the next one to delete.
+    """
+    deleted = 0
+    while True:
+        ids = [
+            row[0]
+            for row in db.query(BehaviorLog.id)
+            .filter(BehaviorLog.session_id == session_id)
+            .order_by(BehaviorLog.id.asc())
+            .limit(DELETE_CHUNK_SIZE)
+            .all()
+        ]
+        if not ids:
+            return deleted
+        deleted += db.query(BehaviorLog).filter(BehaviorLog.id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
+
+
+def compact_session(db: Session, session: ClassSession) -> dict[str, Any]:
+    """Archive, verify and delete the behavior logs of one ended session.
+
+    A session that already has an archive but still has rows in behavior_logs (an
+    earlier run stopped while deleting) only has those rows deleted; the archive is
+    kept as is. Raises ValueError (leaving the table untouched) when the session is not
+    eligible or verification fails.
+    """
+    if session.is_active:
+        raise ValueError("session is still active")
+    if session.logs_archive_path:
+        name = session.logs_archive_path
+        deleted = delete_archived_logs(db, session.id)
+        if not deleted:
+            raise ValueError("session is already archived")
+        logger.info(f"Deleted {deleted} remaining behavior logs of session {session.id} (archived in {name})")
+        size = _archive_file(name).stat().st_size
+        return {"session_id": session.id, "logs": 0, "deleted": deleted, "archive": name, "bytes": size, "resumed": True}
+
+    db_logs = (
+        db.query(BehaviorLog)
+        .filter(BehaviorLog.session_id == session.id)
+        .order_by(BehaviorLog.timestamp.asc(), BehaviorLog.id.asc())
+        .all()
+    )
+    name = _write_archive(session.id, db_logs)
+    try:
+        _verify(db, session, db_logs, read_archive(name))
+    except ValueError:
+        db.rollback()
+        _archive_file(name).unlink(missing_ok=True)
+        raise
+
+    session.logs_archive_path = name
+    db.add(session)
+    db.commit()
+    for log in db_logs:
+        db.expunge(log)
+
+    deleted = delete_archived_logs(db, session.id)
+    size = _archive_file(name).stat().st_size
+    logger.info(f"Archived {len(db_logs)} behavior logs of session {session.id} to {name} ({size} bytes)")
+    return {"session_id": session.id, "logs": len(db_logs), "deleted": deleted, "archive": name, "bytes": size}
+
+
+def compact_ended_sessions(
+    db: Session,
+    retention_days: int | None = None,
+    limit: int | None = None,
+    session_ids: Sequence[int] | None = None,
+) -> list[dict[str, Any]]:
+    """Compact every session that ended more than ``retention_days`` ago (0 disables).
+
+    Also finishes archived sessions whose rows were not all deleted by an earlier run.
+    """
+    from app.services.admin import settings_service
+
+    if retention_days is None:
+        retention_days = int(settings_service.get_admin_ops_settings(db)["behavior_log_retention_days"])
+    query = db.query(ClassSession).filter(
+        ClassSession.is_active == False,  # noqa: E712
+        or_(
+            ClassSession.logs_archive_path.is_(None),
+            exists().where(BehaviorLog.session_id == ClassSession.id),
+        ),
+    )
+    if session_ids:
+        query = query.filter(ClassSession.id.in_(list(session_ids)))
+    elif retention_days <= 0:
+        return []
+    if retention_days > 0:
+        query = query.filter(ClassSession.end_time < utc_now() - timedelta(days=retention_days))
+    query = query.order_by(ClassSession.end_time.asc())
+    if limit:
+        query = query.limit(limit)
+
+    results = []
+    for session in query.all():
+        try:
+            results.append(compact_session(db, session))
+        except ValueError as exc:
+            logger.warning(f"Skipped archiving behavior logs of session {session.id}: {exc}")
+            results.append({"session_id": session.id, "skipped": str(exc)})
+    return results
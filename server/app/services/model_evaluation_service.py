@@ -0,0 +1,237 @@
+"""Accuracy and CPU throughput evaluation of detector weight files.
+
+Evaluates weights against a frame set labelled in YOLO format (``<stem>.txt`` next to
+each image, in a ``labels/`` folder beside it, or in a sibling ``labels/`` folder of an
+``images/`` folder). Class ids in label files are resolved through ``classes.txt`` or
+``data.yaml`` of the dataset when present, otherwise through each model's own names.
+
+Results are kept in ``model_evaluations.json`` in the weights directory, keyed by file
+name and tagged with the file's size and mtime, so the admin model picker only shows
+results for the exact file that was evaluated.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import cv2
+import numpy as np
+import yaml
+from ultralytics import YOLO
+
+from app.utils.datetime import utc_now
+from app.utils.detection import BEHAVIOR_CLASSES, box_iou, detections_from_result
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".bmp"}
+EVALUATIONS_FILE_NAME = "model_evaluations.json"
+
+_store_lock = threading.Lock()
+
+
+@dataclass
+class LabelledFrame:
+    image_path: Path
+    label_path: Path
+
+
+def _label_path_for(image_path: Path) -> Path | None:
+    candidates = [
+        image_path.with_suffix(".txt"),
+        image_path.parent / "labels" / f"{image_path.stem}.txt",
+    ]
+    if image_path.parent.name == "images":
+        candidates.append(image_path.parent.parent / "labels" / f"{image_path.stem}.txt")
+    return next((p for p in candidates if p.exists()), None)
+
+
+def load_dataset(frames_dir: Path) -> list[LabelledFrame]:
+    frames = []
+    for image_path in sorted(p for p in frames_dir.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES):
+        label_path = _label_path_for(image_path)
+        if label_path is not None:
+            frames.append(LabelledFrame(image_path=image_path, label_path=label_path))
+    return frames
+
+
+def load_dataset_names(frames_dir: Path) -> dict[int, str] | None:
+    for directory in (frames_dir, frames_dir.parent):
+        classes_txt = directory / "classes.txt"
+        if classes_txt.exists():
+            lines = [line.strip() for line in classes_txt.read_text().splitlines() if line.strip()]
+            return dict(enumerate(lines))
+        data_yaml = directory / "data.yaml"
+        if data_yaml.exists():
+            names = (yaml.safe_load(data_yaml.read_text()) or {}).get("names")
+            if isinstance(names, list):
+                return dict(enumerate(names))
+            if isinstance(names, dict):
+                return {int(k): v for k, v in names.items()}
+    return None
+
+
+def _read_labels(label_path: Path, width: int, height: int, names: dict[int, str]) -> tuple[list[str], np.ndarray]:
+    classes: list[str] = []
+    boxes: list[list[float]] = []
+    for line in label_path.read_text().splitlines():
+        parts = line.split()
+        if len(parts) < 5:
+            continue
+        name = str(names.get(int(parts[0]), "")).strip()
+        if name not in BEHAVIOR_CLASSES:
+            continue
+        cx, cy, w, h = (float(v) for v in parts[1:5])
+        classes.append(name)
+        boxes.append([(cx - w / 2) * width, (cy - h / 2) * height, (cx + w / 2) * width, (cy + h / 2) * height])
+    return classes, np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+
+
+def _match_class(pred_boxes: np.ndarray, pred_conf: np.ndarray, gt_boxes: np.ndarray, iou_threshold: float) -> int:
+    """Greedy highest-confidence-first matching; returns the number of true positives."""
+    if len(pred_boxes) == 0 or len(gt_boxes) == 0:
+        return 0
+    ious = box_iou(pred_boxes, gt_boxes)
+    matched = np.zeros(len(gt_boxes), dtype=bool)
+    tp = 0
+    for i in np.argsort(-pred_conf, kind="stable"):
+        candidates = np.where(~matched, ious[i], -1.0)
+        j = int(candidates.argmax())
+        if candidates[j] >= iou_threshold:
+            matched[j] = True
+            tp += 1
+    return tp
+
+
+def _ratio(numerator: int, denominator: int) -> float | None:
+    return round(numerator / denominator, 4) if denominator else None
+
+
+def evaluate_weights(
+    weights_path: Path,
+    frames: list[LabelledFrame],
+    imgsz: int,
+    confidence_threshold: float,
+    iou_threshold: float = 0.5,
+    dataset_names: dict[int, str] | None = None,
+) -> dict[str, Any]:
+    model = YOLO(str(weights_path), task="detect")
+    names = {int(k): str(v).strip() for k, v in model.names.items()}
+    label_names = dataset_names or names
+
+    width = len(BEHAVIOR_CLASSES)
+    tp = np.zeros(width, dtype=np.int64)
+    pred_total = np.zeros(width, dtype=np.int64)
+    gt_total = np.zeros(width, dtype=np.int64)
+    count_errors: list[np.ndarray] = []
+    inference_seconds = 0.0
+    evaluated = 0
+
+    for index, item in enumerate(frames):
+        frame = cv2.imread(str(item.image_path))
+        if frame is None:
+            continue
+        if index == 0:
+            model(frame, imgsz=imgsz, device="cpu", verbose=False)  # warm-up, not timed
+        start = time.perf_counter()
+        result = model(frame, imgsz=imgsz, device="cpu", verbose=False)[0]
+        inference_seconds += time.perf_counter() - start
+        detections = detections_from_result(result)
+        detections = detections.filter(detections.conf >= confidence_threshold)
+
+        height, frame_width = frame.shape[:2]
+        gt_classes, gt_boxes = _read_labels(item.label_path, frame_width, height, label_names)
+        gt_slots = np.array([BEHAVIOR_CLASSES.index(name) for name in gt_classes], dtype=np.int64)
+        pred_slots = np.array(
+            [BEHAVIOR_CLASSES.index(names.get(c, "")) if names.get(c, "") in BEHAVIOR_CLASSES else -1
+             for c in detections.cls.tolist()],
+            dtype=np.int64,
+        )
+
+        frame_pred = np.bincount(pred_slots[pred_slots >= 0], minlength=width)
+        frame_gt = np.bincount(gt_slots, minlength=width)
+        for slot in range(width):
+            if frame_pred[slot] == 0 or frame_gt[slot] == 0:
+                continue
+            mask = pred_slots == slot
+            tp[slot] += _match_class(detections.boxes[mask], detections.conf[mask], gt_boxes[gt_slots == slot], iou_threshold)
+        pred_total += frame_pred
+        gt_total += frame_gt
+        count_errors.append(frame_pred - frame_gt)
+        evaluated += 1
+
+    errors = np.asarray(count_errors, dtype=np.float64).reshape(-1, width)
+    classes: dict[str, Any] = {}
+    for slot, name in enumerate(BEHAVIOR_CLASSES):
+        classes[name] = {
+            "precision": _ratio(int(tp[slot]), int(pred_total[slot])),
+            "recall": _ratio(int(tp[slot]), int(gt_total[slot])),
+            "support": int(gt_total[slot]),
+            "predicted": int(pred_total[slot]),
+            "count_mae": round(float(np.abs(errors[:, slot]).mean()), 3) if evaluated else None,
+            "count_bias": round(float(errors[:, slot].mean()), 3) if evaluated else None,
+        }
+    precisions = [c["precision"] for c in classes.values() if c["precision"] is not None]
+    recalls = [c["recall"] for c in classes.values() if c["recall"] is not None]
+    return {
+        "imgsz": imgsz,
+        "confidence_threshold": confidence_threshold,
+        "iou_threshold": iou_threshold,
+        "frames": evaluated,
+        "macro_precision": round(float(np.mean(precisions)), 4) if precisions else None,
+        "macro_recall": round(float(np.mean(recalls)), 4) if recalls else None,
+        "count_mae": round(float(np.abs(errors).sum(axis=1).mean()), 3) if evaluated else None,
+        "cpu_fps": round(evaluated / inference_seconds, 2) if inference_seconds > 0 else None,
+        "classes": classes,
+        "evaluated_at": utc_now().isoformat(),
+    }
+
+
+def _fingerprint(weights_path: Path) -> dict[str, int]:
+    stat = weights_path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _store_path(weights_dir: Path) -> Path:
+    return weights_dir / EVALUATIONS_FILE_NAME
+
+
+def _read_store(weights_dir: Path) -> dict[str, Any]:
+    path = _store_path(weights_dir)
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_evaluation(weights_path: Path, result: dict[str, Any], dataset: str | None = None) -> None:
+    """Store one (file, imgsz) result, replacing any earlier result for that pair."""
+    with _store_lock:
+        store = _read_store(weights_path.parent)
+        fingerprint = _fingerprint(weights_path)
+        entry = store.get(weights_path.name)
+        if not entry or entry.get("fingerprint") != fingerprint:
+            entry = {"fingerprint": fingerprint, "results": []}
+        results = [r for r in entry["results"] if r.get("imgsz") != result["imgsz"]]
+        results.append({**result, "dataset": dataset})
+        entry["results"] = sorted(results, key=lambda r: r["imgsz"])
+        store[weights_path.name] = entry
+        tmp_path = _store_path(weights_path.parent).with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(store, indent=2))
+        tmp_path.replace(_store_path(weights_path.parent))
+
+
+def get_evaluations(weights_dir: Path) -> dict[str, list[dict[str, Any]]]:
+    """Stored results per file name, skipping files changed since they were evaluated."""
+    store = _read_store(weights_dir)
+    evaluations = {}
+    for file_name, entry in store.items():
+        path = weights_dir / file_name
+        if path.exists() and entry.get("fingerprint") == _fingerprint(path):
+            evaluations[file_name] = entry.get("results", [])
+    return evaluations
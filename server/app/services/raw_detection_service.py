@@ -0,0 +1,283 @@
+"""Append-only per-session store of raw detector output.
+
+Each session gets one binary file under ``RAW_DETECTIONS_DIR``. The file starts with a
+small header carrying the model class names, followed by one record per detector tick:
+
+    <q log_id> <d unix timestamp> <H n>  cls:uint8[n]  conf:float16[n]  boxes:float16[n, 4]
+
+Boxes are stored normalised to the frame size (xyxy in [0, 1]), so a tick with 20
+students costs ~240 bytes. Keeping boxes and confidences lets past sessions be
+re-scored for a new confidence threshold without re-running the model.
+
+Multi-camera sessions write one file per camera (``session_<id>_cam<index>.ttdet``);
+ticks of different cameras share the log_id of the BehaviorLog they were merged into.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import struct
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.session import BehaviorLog, ClassSession
+from app.utils.detection import BEHAVIOR_CLASSES, Detections, merge_camera_counts, pack_camera_counts
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"TTDT"
+_VERSION = 1
+_FILE_HEADER = struct.Struct("<4sBI")
+_TICK_HEADER = struct.Struct("<qdH")
+
+_server_root = Path(__file__).resolve().parents[2]
+_write_lock = threading.Lock()
+
+
+@dataclass
+class RawDetectionTicks:
+    """All stored ticks of a session, flattened into numpy columns."""
+
+    names: dict[int, str]
+    log_ids: np.ndarray
+    timestamps: np.ndarray
+    tick_index: np.ndarray
+    cls: np.ndarray
+    conf: np.ndarray
+    boxes: np.ndarray
+
+
+def _store_dir() -> Path:
+    configured = Path(settings.RAW_DETECTIONS_DIR)
+    return configured if configured.is_absolute() else (_server_root / configured)
+
+
+def session_store_path(session_id: int, camera_index: int | None = None) -> Path:
+    if camera_index is None:
+        return _store_dir() / f"session_{int(session_id)}.ttdet"
+    return _store_dir() / f"session_{int(session_id)}_cam{int(camera_index)}.ttdet"
+
+
+def session_camera_indices(session_id: int) -> list[int]:
+    """Cameras with their own raw detection file for a multi-camera session."""
+    prefix = f"session_{int(session_id)}_cam"
+    return sorted(
+        int(path.stem[len(prefix):])
+        for path in _store_dir().glob(f"{prefix}*.ttdet")
+        if path.stem[len(prefix):].isdigit()
+    )
+
+
+def delete_session_files(session_id: int) -> int:
+    """Delete every raw detection file of a session (all cameras); returns how many existed.
+
+    Called wherever a session row is deleted, so no detections outlive their session and
+    a session reusing the id never appends to a file with another session's header.
+    """
+    paths = [session_store_path(session_id)]
+    paths += [session_store_path(session_id, index) for index in session_camera_indices(session_id)]
+    removed = 0
+    with _write_lock:
+        for path in paths:
+            if path.exists():
+                path.unlink()
+                removed += 1
+    return removed
+
+
+def append_tick(
+    session_id: int,
+    log_id: int | None,
+    timestamp: float,
+    detections: Detections,
+    frame_shape: tuple[int, ...],
+    names: dict[int, str],
+    camera_index: int | None = None,
+) -> None:
+    height, width = frame_shape[:2]
+    count = min(len(detections), 0xFFFF)
+    scale = np.array([width, height, width, height], dtype=np.float32)
+    boxes = np.clip(detections.boxes[:count] / scale, 0.0, 1.0).astype(np.float16)
+    record = b"".join(
+        [
+            _TICK_HEADER.pack(int(log_id) if log_id is not None else -1, float(timestamp), count),
+            detections.cls[:count].astype(np.uint8).tobytes(),
+            detections.conf[:count].astype(np.float16).tobytes(),
+            boxes.tobytes(),
+        ]
+    )
+
+    path = session_store_path(session_id, camera_index)
+    with _write_lock:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        is_new = not path.exists() or path.stat().st_size == 0
+        with path.open("ab") as handle:
+            if is_new:
+                names_blob = json.dumps({str(k): str(v) for k, v in names.items()}).encode("utf-8")
+                handle.write(_FILE_HEADER.pack(_MAGIC, _VERSION, len(names_blob)))
+                handle.write(names_blob)
+            handle.write(record)
+
+
+def read_session_ticks(session_id: int, camera_index: int | None = None) -> RawDetectionTicks | None:
+    path = session_store_path(session_id, camera_index)
+    if not path.exists():
+        return None
+    raw = path.read_bytes()
+    if len(raw) < _FILE_HEADER.size:
+        return None
+    magic, version, names_len = _FILE_HEADER.unpack_from(raw, 0)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError(f"Unrecognised raw detection file: {path}")
+    offset = _FILE_HEADER.size
+    names = {int(k): v for k, v in json.loads(raw[offset : offset + names_len].decode("utf-8")).items()}
+    offset += names_len
+
+    log_ids: list[int] = []
+    timestamps: list[float] = []
+    counts: list[int] = []
+    cls_parts: list[np.ndarray] = []
+    conf_parts: list[np.ndarray] = []
+    box_parts: list[np.ndarray] = []
+    total = len(raw)
+    while offset + _TICK_HEADER.size <= total:
+        log_id, timestamp, count = _TICK_HEADER.unpack_from(raw, offset)
+        body = count * (1 + 2 + 8)
+        start = offset + _TICK_HEADER.size
+        if start + body > total:
+            # Torn trailing record from an interrupted write; everything before it is valid.
+            break
+        cls_parts.append(np.frombuffer(raw, dtype=np.uint8, count=count, offset=start))
+        conf_parts.append(np.frombuffer(raw, dtype=np.float16, count=count, offset=start + count))
+        box_parts.append(
+            np.frombuffer(raw, dtype=np.float16, count=count * 4, offset=start + count * 3).reshape(count, 4)
+        )
+        log_ids.append(log_id)
+        timestamps.append(timestamp)
+        counts.append(count)
+        offset = start + body
+
+    tick_counts = np.asarray(counts, dtype=np.int64)
+    return RawDetectionTicks(
+        names=names,
+        log_ids=np.asarray(log_ids, dtype=np.int64),
+        timestamps=np.asarray(timestamps, dtype=np.float64),
+        tick_index=np.repeat(np.arange(len(counts), dtype=np.int64), tick_counts),
+        cls=np.concatenate(cls_parts) if cls_parts else np.zeros(0, dtype=np.uint8),
+        conf=np.concatenate(conf_parts) if conf_parts else np.zeros(0, dtype=np.float16),
+        boxes=np.concatenate(box_parts) if box_parts else np.zeros((0, 4), dtype=np.float16),
+    )
+
+
+def count_ticks(ticks: RawDetectionTicks, confidence_threshold: float) -> np.ndarray:
+    """Return a (ticks x behaviors) count matrix in ``BEHAVIOR_CLASSES`` order."""
+    tick_total = int(ticks.log_ids.shape[0])
+    slots = np.full(256, -1, dtype=np.int64)
+    for cls_id, name in ticks.names.items():
+        name = str(name).strip()
+        if 0 <= cls_id < 256 and name in BEHAVIOR_CLASSES:
+            slots[cls_id] = BEHAVIOR_CLASSES.index(name)
+
+    cls_slots = slots[ticks.cls.astype(np.int64)]
+    mask = (ticks.conf.astype(np.float32) >= confidence_threshold) & (cls_slots >= 0)
+    width = len(BEHAVIOR_CLASSES)
+    flat = np.bincount(
+        ticks.tick_index[mask] * width + cls_slots[mask],
+        minlength=tick_total * width,
+    )
+    return flat.reshape(tick_total, width)
+
+
+def _merged_camera_rows(
+    session_id: int, cameras: list[int], confidence_threshold: float
+) -> tuple[int, dict[int, tuple[list[int], dict[str, list[int]]]]]:
+    """Per log_id: merged counts in ``BEHAVIOR_CLASSES`` order and the packed per-camera breakdown."""
+    from app.services.admin import settings_service
+
+    detection = settings_service.get_detection_settings()
+    per_log: dict[int, dict[int, dict[str, int]]] = {}
+    tick_total = 0
+    for camera_index in cameras:
+        ticks = read_session_ticks(session_id, camera_index)
+        if ticks is None:
+            continue
+        tick_total += int(ticks.log_ids.shape[0])
+        for log_id, row in zip(ticks.log_ids.tolist(), count_ticks(ticks, confidence_threshold).tolist()):
+            per_log.setdefault(log_id, {})[camera_index] = dict(zip(BEHAVIOR_CLASSES, row))
+    rows = {}
+    for log_id, per_camera in per_log.items():
+        merged = merge_camera_counts(per_camera, detection["camera_regions"], detection["camera_region_merge"])
+        rows[log_id] = ([merged[name] for name in BEHAVIOR_CLASSES], pack_camera_counts(per_camera))
+    return tick_total, rows
+
+
+def rescore_session(db: Session, session_id: int, confidence_threshold: float) -> dict[str, Any]:
+    """Recompute BehaviorLog counts and rollups of a session from its stored detections."""
+    from app.services import engagement_service, log_archive_service, session_summary_service
+
+    if not (0.0 <= confidence_threshold <= 1.0):
+        raise HTTPException(status_code=400, detail="confidence_threshold must be between 0.0 and 1.0.")
+    session = db.query(ClassSession).filter(ClassSession.id == session_id).first()
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    ticks = read_session_ticks(session_id)
+    cameras = session_camera_indices(session_id)
+    if ticks is None and not cameras:
+        raise HTTPException(status_code=404, detail="No raw detections stored for this session")
+
+    if ticks is not None:
+        tick_total = int(ticks.log_ids.shape[0])
+        rows_by_log = {
+            log_id: (row, None) for log_id, row in zip(ticks.log_ids.tolist(), count_ticks(ticks, confidence_threshold).tolist())
+        }
+    else:
+        tick_total, rows_by_log = _merged_camera_rows(session_id, cameras, confidence_threshold)
+    snapshots = dict(log_archive_service.log_rows(db, session_id, ("id", "students_present_snapshot")))
+    updates = []
+    for log_id, (row, camera_counts) in rows_by_log.items():
+        if log_id not in snapshots:
+            continue
+        # Same derivation as engagement_service.process_behavior_log.
+        on_task, sleeping, using_phone, off_task, _ = row
+        observed = on_task + sleeping + using_phone + off_task
+        students_present = snapshots[log_id] or session.students_present or 0
+        update = {
+            "id": log_id,
+            "on_task": on_task,
+            "sleeping": sleeping,
+            "using_phone": using_phone,
+            "off_task": off_task,
+            "not_visible": max(0, students_present - observed),
+            "total_detected": observed,
+        }
+        if camera_counts is not None:
+            update["camera_counts"] = camera_counts
+        updates.append(update)
+    if updates and session.logs_archive_path:
+        log_archive_service.update_archived_logs(db, session_id, updates)
+    elif updates:
+        db.bulk_update_mappings(BehaviorLog, updates)
+        db.flush()
+    windows = engagement_service.rebuild_session_metrics(db, session_id)
+    session_summary_service.finalize_session(db, session_id)
+    db.commit()
+    logger.info(
+        f"Re-scored session {session_id} at threshold {confidence_threshold}: "
+        f"{len(updates)} logs, {windows} metric windows"
+    )
+    return {
+        "session_id": session_id,
+        "confidence_threshold": confidence_threshold,
+        "ticks": tick_total,
+        "logs_updated": len(updates),
+        "metric_windows": windows,
+        "average_engagement": float(session.average_engagement or 0),
+    }
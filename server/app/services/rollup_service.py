@@ -0,0 +1,324 @@
+"""Multi-resolution rollups of the per-minute SessionMetrics windows.
+
+SessionMetrics holds one row per session minute. For long-range analytics three
+coarser tables are kept, each built from the one below it:
+
+    session_metrics        1 minute   (maintained by engagement_service)
+    session_metrics_5m     5 minutes  <- minute windows
+    session_metrics_hourly 1 hour     <- 5-minute buckets
+    session_metrics_daily  1 day      <- hourly buckets (one row per session-day, UTC)
+
+Rollup rows store sums over their minute windows plus ``minute_count``, so every level
+is an exact re-aggregation of the previous one and averages are minute-weighted.
+
+Maintenance is incremental: when a session's minute window closes (the next log falls
+in a later minute, or a late edge log re-touches an earlier one), the 5-minute, hourly
+and daily buckets containing it are recomputed from the level below, a handful of rows
+each. When a session stops or its minute windows are rebuilt (rescore, video analysis),
+all of its rollups are rebuilt in one pass. ``scripts/backfill_rollups.py`` does the
+same for existing sessions.
+
+Range queries (``query_trend``) read from the coarsest table whose bucket evenly
+divides the requested resolution.
+"""
+
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Iterable
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.classroom import ClassSection, Major
+from app.models.session import (
+    ClassSession,
+    SessionMetrics,
+    SessionMetrics5m,
+    SessionMetricsDaily,
+    SessionMetricsHourly,
+)
+from app.utils.datetime import to_naive_utc
+
+MINUTE_SECONDS = 60
+# (bucket seconds, table), finest first; each level is built from the previous one.
+ROLLUP_LEVELS = (
+    (300, SessionMetrics5m),
+    (3600, SessionMetricsHourly),
+    (86400, SessionMetricsDaily),
+)
+SUM_FIELDS = (
+    "minute_count",
+    "total_detected",
+    "on_task_sum",
+    "using_phone_sum",
+    "sleeping_sum",
+    "off_task_sum",
+    "not_visible_sum",
+    "engagement_sum",
+)
+DIMENSIONS = ("teacher_id", "section_id", "subject_id", "major_id", "department_id", "activity_mode")
+
+_EPOCH = datetime(1970, 1, 1)
+
+# Latest minute window seen per active session, to detect when a window closes.
+_open_windows: dict[int, datetime] = {}
+_lock = threading.Lock()
+
+
+def floor_bucket(dt: datetime, seconds: int) -> datetime:
+    """Start of the UTC-aligned bucket of ``seconds`` containing ``dt`` (tzinfo kept)."""
+    offset = int((to_naive_utc(dt) - _EPOCH).total_seconds()) % seconds
+    return dt.replace(microsecond=0) - timedelta(seconds=offset)
+
+
+def source_level(resolution_seconds: int) -> int:
+    """Bucket size of the coarsest table that can serve ``resolution_seconds`` exactly."""
+    best = MINUTE_SECONDS
+    for seconds, _ in ROLLUP_LEVELS:
+        if seconds <= resolution_seconds and resolution_seconds % seconds == 0:
+            best = seconds
+    return best
+
+
+def aggregate(rows: Iterable[dict[str, Any]], seconds: int) -> dict[datetime, dict[str, Any]]:
+    """Sum rows (``bucket_start`` plus SUM_FIELDS) into buckets of ``seconds``, keyed naive."""
+    buckets: dict[datetime, dict[str, Any]] = {}
+    for row in rows:
+        start = floor_bucket(row["bucket_start"], seconds)
+        bucket = buckets.get(to_naive_utc(start))
+        if bucket is None:
+            bucket = buckets[to_naive_utc(start)] = {"bucket_start": start, **dict.fromkeys(SUM_FIELDS, 0)}
+        for name in SUM_FIELDS:
+            bucket[name] += row[name] or 0
+    return buckets
+
+
+def _minute_sums(row: SessionMetrics) -> dict[str, Any]:
+    return {
+        "bucket_start": row.window_start,
+        "minute_count": 1,
+        "total_detected": row.total_detected or 0,
+        "on_task_sum": float(row.on_task_avg or 0),
+        "using_phone_sum": float(row.using_phone_avg or 0),
+        "sleeping_sum": float(row.sleeping_avg or 0),
+        "off_task_sum": float(row.off_task_avg or 0),
+        "not_visible_sum": float(row.not_visible_avg or 0),
+        "engagement_sum": float(row.engagement_score or 0),
+    }
+
+
+def _rollup_sums(row) -> dict[str, Any]:
+    sums = {name: float(getattr(row, name) or 0) for name in SUM_FIELDS}
+    sums["minute_count"] = int(sums["minute_count"])
+    sums["total_detected"] = int(sums["total_detected"])
+    sums["bucket_start"] = row.bucket_start
+    return sums
+
+
+def session_dimensions(session: ClassSession) -> dict[str, Any]:
+    major = session.section.major if session.section else None
+    return {
+        "teacher_id": session.teacher_id,
+        "section_id": session.section_id,
+        "subject_id": session.subject_id,
+        "major_id": major.id if major else None,
+        "department_id": major.department_id if major else None,
+        "activity_mode": session.activity_mode,
+    }
+
+
+def _write_bucket(row, sums: dict[str, Any], dimensions: dict[str, Any]) -> None:
+    for name, value in dimensions.items():
+        setattr(row, name, value)
+    row.minute_count = sums["minute_count"]
+    row.total_detected = sums["total_detected"]
+    for name in SUM_FIELDS[2:]:
+        setattr(row, name, round(sums[name], 2))
+
+
+def _sync_level(db: Session, model, session_id: int, buckets: dict[datetime, dict[str, Any]], existing, dimensions) -> None:
+    """Make the session's rows of ``model`` in the covered range match ``buckets``."""
+    current = {to_naive_utc(row.bucket_start): row for row in existing}
+    for key, sums in buckets.items():
+        row = current.pop(key, None)
+        if row is None:
+            row = model(session_id=session_id, bucket_start=sums["bucket_start"])
+            db.add(row)
+        _write_bucket(row, sums, dimensions)
+    for stale in current.values():
+        db.delete(stale)
+
+
+def refresh_minute(db: Session, session: ClassSession, window_start: datetime) -> None:
+    """Recompute the 5-minute, hourly and daily buckets containing one minute window.
+
+    Flushes as it goes (sessions are created with autoflush off) so each level reads
+    the one just written. The caller commits.
+    """
+    dimensions = session_dimensions(session)
+    db.flush()
+    previous_seconds = MINUTE_SECONDS
+    for seconds, model in ROLLUP_LEVELS:
+        start = floor_bucket(window_start, seconds)
+        end = start + timedelta(seconds=seconds)
+        if previous_seconds == MINUTE_SECONDS:
+            source = [
+                _minute_sums(row)
+                for row in db.query(SessionMetrics).filter(
+                    SessionMetrics.session_id == session.id,
+                    SessionMetrics.window_start >= start,
+                    SessionMetrics.window_start < end,
+                )
+            ]
+        else:
+            source_model = dict(ROLLUP_LEVELS)[previous_seconds]
+            source = [
+                _rollup_sums(row)
+                for row in db.query(source_model).filter(
+                    source_model.session_id == session.id,
+                    source_model.bucket_start >= start,
+                    source_model.bucket_start < end,
+                )
+            ]
+        existing = db.query(model).filter(
+            model.session_id == session.id,
+            model.bucket_start >= start,
+            model.bucket_start < end,
+        ).all()
+        _sync_level(db, model, session.id, aggregate(source, seconds), existing, dimensions)
+        db.flush()
+        previous_seconds = seconds
+
+
+def rebuild_session(db: Session, session_id: int) -> dict[str, int]:
+    """Rebuild every rollup of one session from its minute windows. The caller commits."""
+    session = db.query(ClassSession).filter(ClassSession.id == session_id).first()
+    if session is None:
+        return {}
+    db.flush()
+    dimensions = session_dimensions(session)
+    rows = [
+        _minute_sums(row)
+        for row in db.query(SessionMetrics).filter(SessionMetrics.session_id == session_id)
+    ]
+    counts: dict[str, int] = {}
+    for seconds, model in ROLLUP_LEVELS:
+        buckets = aggregate(rows, seconds)
+        existing = db.query(model).filter(model.session_id == session_id).all()
+        _sync_level(db, model, session_id, buckets, existing, dimensions)
+        counts[model.__tablename__] = len(buckets)
+        rows = list(buckets.values())
+    return counts
+
+
+def note_minute(session_id: int, window_start: datetime) -> datetime | None:
+    """Record that ``window_start`` received a log; return a minute window that is now closed.
+
+    That is the previously open window when the session moves on to a later minute, or
+    ``window_start`` itself when a late (edge batch) log lands in an earlier minute.
+    """
+    window = to_naive_utc(window_start)
+    with _lock:
+        previous = _open_windows.get(session_id)
+        if previous is None or window > previous:
+            _open_windows[session_id] = window
+            return previous
+    return window if window < previous else None
+
+
+def forget(session_id: int) -> None:
+    with _lock:
+        _open_windows.pop(session_id, None)
+
+
+def _finalize(bucket: dict[str, Any], resolution_seconds: int) -> dict[str, Any]:
+    minutes = bucket["minute_count"]
+
+    def avg(name: str) -> float:
+        return round(bucket[name] / minutes, 2) if minutes else 0.0
+
+    return {
+        "bucket_start": bucket["bucket_start"],
+        "bucket_end": bucket["bucket_start"] + timedelta(seconds=resolution_seconds),
+        "minutes": minutes,
+        "total_detected": bucket["total_detected"],
+        "on_task_avg": avg("on_task_sum"),
+        "using_phone_avg": avg("using_phone_sum"),
+        "sleeping_avg": avg("sleeping_sum"),
+        "off_task_avg": avg("off_task_sum"),
+        "not_visible_avg": avg("not_visible_sum"),
+        "engagement_score": avg("engagement_sum"),
+    }
+
+
+def query_trend(
+    db: Session,
+    start: datetime,
+    end: datetime,
+    resolution_seconds: int,
+    filters: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Minute-weighted behavior averages per ``resolution_seconds`` bucket in [start, end).
+
+    ``filters`` maps DIMENSIONS to required values (None entries are ignored). Buckets
+    are aligned to UTC, so ``start`` is floored to the resolution.
+    """
+    filters = {name: value for name, value in (filters or {}).items() if value is not None}
+    seconds = source_level(resolution_seconds)
+    # Stored bucket starts are naive UTC.
+    start = floor_bucket(to_naive_utc(start), resolution_seconds)
+    end = to_naive_utc(end)
+
+    if seconds == MINUTE_SECONDS:
+        bucket_column = SessionMetrics.window_start
+        columns = [
+            func.count(SessionMetrics.id),
+            func.sum(SessionMetrics.total_detected),
+            func.sum(SessionMetrics.on_task_avg),
+            func.sum(SessionMetrics.using_phone_avg),
+            func.sum(SessionMetrics.sleeping_avg),
+            func.sum(SessionMetrics.off_task_avg),
+            func.sum(SessionMetrics.not_visible_avg),
+            func.sum(SessionMetrics.engagement_score),
+        ]
+        query = db.query(bucket_column, *columns).join(ClassSession, ClassSession.id == SessionMetrics.session_id)
+        if "major_id" in filters or "department_id" in filters:
+            query = query.join(ClassSection, ClassSection.id == ClassSession.section_id)
+        if "department_id" in filters:
+            query = query.join(Major, Major.id == ClassSection.major_id)
+        dimension_columns = {
+            "teacher_id": ClassSession.teacher_id,
+            "section_id": ClassSession.section_id,
+            "subject_id": ClassSession.subject_id,
+            "major_id": ClassSection.major_id,
+            "department_id": Major.department_id,
+            "activity_mode": ClassSession.activity_mode,
+        }
+    else:
+        model = dict(ROLLUP_LEVELS)[seconds]
+        bucket_column = model.bucket_start
+        query = db.query(bucket_column, *(func.sum(getattr(model, name)) for name in SUM_FIELDS))
+        dimension_columns = {name: getattr(model, name) for name in DIMENSIONS}
+
+    for name, value in filters.items():
+        query = query.filter(dimension_columns[name] == value)
+    query = query.filter(bucket_column >= start, bucket_column < end).group_by(bucket_column)
+
+    rows = (
+        {"bucket_start": row[0], **{name: float(value or 0) for name, value in zip(SUM_FIELDS, row[1:])}}
+        for row in query.all()
+    )
+    buckets = aggregate(rows, resolution_seconds)
+    points = []
+    for key in sorted(buckets):
+        bucket = buckets[key]
+        bucket["minute_count"] = int(bucket["minute_count"])
+        bucket["total_detected"] = int(bucket["total_detected"])
+        points.append(_finalize(bucket, resolution_seconds))
+    return {
+        "resolution_seconds": resolution_seconds,
+        "source_resolution_seconds": seconds,
+        "points": points,
+    }
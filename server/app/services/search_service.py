@@ -0,0 +1,179 @@
+"""Indexed admin search over users, subjects, class sections and sessions.
+
+Admin lists used to search with ``ilike('%term%')`` across joined columns, which no
+index can serve. Users, subjects and sections now have an entry in the search index
+(app.models.search, maintained by mapper events on insert/update/delete). Queries are
+tokenised like the documents and every term must match the start of a word:
+
+- on MySQL, terms of at least ``FULLTEXT_MIN_TOKEN`` characters go through the FULLTEXT
+  index in boolean mode (``+term*``), ranked by relevance;
+- otherwise (other databases, shorter terms) each term is a prefix range scan on
+  ``search_tokens``; exact word matches rank above prefix matches.
+
+Sessions are not indexed themselves: a session matches when its id equals a numeric
+term or its teacher, subject or section matches, so renaming a teacher needs no
+session reindexing. ``scripts/benchmark_search.py`` compares this with the previous
+``ilike`` queries; ``scripts/rebuild_search_index.py`` (re)builds the index.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+from sqlalchemy import and_, case, func, insert, or_, select, true
+from sqlalchemy.orm import Session
+
+from app.models.search import INDEXED_FIELDS, SearchDocument, SearchToken
+from app.models.session import ClassSession
+from app.utils.search import index_entries, tokenize
+
+ENTITY_TYPES = ("user", "subject", "section")
+# innodb_ft_min_token_size default; shorter terms are not in the FULLTEXT index.
+FULLTEXT_MIN_TOKEN = 3
+SEARCH_RESULT_LIMIT = 1000
+# Entities per multi-row insert when (re)building the index.
+INDEX_BATCH_SIZE = 500
+
+_MODELS = {entity_type: model for model, (entity_type, _) in INDEXED_FIELDS.items()}
+
+
+def _uses_fulltext(db: Session, terms: list[str]) -> bool:
+    return db.get_bind().dialect.name == "mysql" and all(len(term) >= FULLTEXT_MIN_TOKEN for term in terms)
+
+
+def _fulltext_search(db: Session, entity_type: str, terms: list[str], limit: int) -> list[int]:
+    match = SearchDocument.content.match(" ".join(f"+{term}*" for term in terms))
+    rows = (
+        db.query(SearchDocument.entity_id, match.label("score"))
+        .filter(SearchDocument.entity_type == entity_type, match)
+        .order_by(match.desc(), SearchDocument.entity_id.desc())
+        .limit(limit)
+        .all()
+    )
+    return [row[0] for row in rows]
+
+
+def _token_search(db: Session, entity_type: str, terms: list[str], limit: int) -> list[int]:
+    scores: dict[int, int] | None = None
+    for term in dict.fromkeys(terms):
+        rows = (
+            db.query(SearchToken.entity_id, func.max(case((SearchToken.token == term, 2), else_=1)))
+            .filter(SearchToken.entity_type == entity_type, SearchToken.token.like(f"{term}%"))
+            .group_by(SearchToken.entity_id)
+            .all()
+        )
+        matched = {entity_id: int(score) for entity_id, score in rows}
+        if scores is None:
+            scores = matched
+        else:
+            scores = {entity_id: score + matched[entity_id] for entity_id, score in scores.items() if entity_id in matched}
+        if not scores:
+            return []
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+    return [entity_id for entity_id, _ in ranked[:limit]]
+
+
+def search(db: Session, entity_type: str, text: str | None, limit: int = SEARCH_RESULT_LIMIT) -> list[int]:
+    """Ids of ``entity_type`` entities matching every word of ``text``, best first."""
+    if entity_type not in _MODELS:
+        raise ValueError(f"Unknown search entity type: {entity_type}")
+    terms = tokenize(text)
+    if not terms:
+        return []
+    if _uses_fulltext(db, terms):
+        return _fulltext_search(db, entity_type, terms, limit)
+    return _token_search(db, entity_type, terms, limit)
+
+
+def id_filter(db: Session, entity_type: str, text: str | None, column):
+    """Predicate keeping rows whose ``column`` is a matching id, for list search boxes.
+
+    Unranked and unlimited: built from index subqueries so the list query keeps its
+    own ordering and pagination. Text without any word (e.g. only punctuation) does
+    not filter.
+    """
+    if entity_type not in _MODELS:
+        raise ValueError(f"Unknown search entity type: {entity_type}")
+    terms = tokenize(text)
+    if not terms:
+        return true()
+    if _uses_fulltext(db, terms):
+        match = SearchDocument.content.match(" ".join(f"+{term}*" for term in terms))
+        return column.in_(
+            select(SearchDocument.entity_id).where(SearchDocument.entity_type == entity_type, match)
+        )
+    return and_(
+        *(
+            column.in_(
+                select(SearchToken.entity_id).where(
+                    SearchToken.entity_type == entity_type, SearchToken.token.like(f"{term}%")
+                )
+            )
+            for term in dict.fromkeys(terms)
+        )
+    )
+
+
+def session_filter(db: Session, text: str | None):
+    """Predicate on ClassSession for a search box: id, teacher, subject or section match."""
+    text = (text or "").strip()
+    if not tokenize(text):
+        return true()
+    clauses = []
+    if text.isdigit():
+        clauses.append(ClassSession.id == int(text))
+    clauses.extend(
+        id_filter(db, entity_type, text, column)
+        for entity_type, column in (
+            ("user", ClassSession.teacher_id),
+            ("subject", ClassSession.subject_id),
+            ("section", ClassSession.section_id),
+        )
+    )
+    return or_(*clauses)
+
+
+def search_sessions(db: Session, text: str | None, limit: int = SEARCH_RESULT_LIMIT) -> list[int]:
+    """Ids of matching sessions, newest first."""
+    if not tokenize(text):
+        return []
+    rows = (
+        db.query(ClassSession.id)
+        .filter(session_filter(db, text))
+        .order_by(ClassSession.start_time.desc(), ClassSession.id.desc())
+        .limit(limit)
+        .all()
+    )
+    return [row[0] for row in rows]
+
+
+def search_all(db: Session, text: str | None, types: Iterable[str] | None = None, limit: int = 20) -> dict[str, Any]:
+    """Ranked ids per entity type (``session`` included) for the admin search API."""
+    types = list(types or (*ENTITY_TYPES, "session"))
+    results: dict[str, list[int]] = {}
+    for entity_type in types:
+        if entity_type == "session":
+            results["session"] = search_sessions(db, text, limit)
+        else:
+            results[entity_type] = search(db, entity_type, text, limit)
+    return {"query": text or "", "results": results}
+
+
+def rebuild_index(db: Session, entity_types: Iterable[str] | None = None) -> dict[str, int]:
+    """Rewrite the index entries of every entity of ``entity_types``. The caller commits."""
+    counts: dict[str, int] = {}
+    connection = db.connection()
+    for entity_type in entity_types or ENTITY_TYPES:
+        model = _MODELS[entity_type]
+        fields = INDEXED_FIELDS[model][1]
+        columns = [model.id, *(getattr(model, name) for name in fields)]
+        for model_ in (SearchDocument, SearchToken):
+            db.query(model_).filter(model_.entity_type == entity_type).delete(synchronize_session=False)
+        rows = db.query(*columns).order_by(model.id.asc()).all()
+        for start in range(0, len(rows), INDEX_BATCH_SIZE):
+            documents, tokens = index_entries(entity_type, rows[start : start + INDEX_BATCH_SIZE])
+            if documents:
+                connection.execute(insert(SearchDocument), documents)
+                connection.execute(insert(SearchToken), tokens)
+        counts[entity_type] = len(rows)
+    return counts
@@ -9,8 +9,8 @@ from app.models.session import ClassSession, SessionHistory
 from app.models.classroom import ClassSection, SectionSubjectAssignment, Subject
 from app.repositories.session_repository import SessionRepository
 from app.schemas.session import SessionCreate, Session as SessionSchema
-from app.services import audit_service
-from app.services.admin import settings_service
+from app.services import audit_service, event_hub, live_session_store, raw_detection_service, rollup_service, session_read_model
+from app.services.admin import dashboard_cache, settings_service
 from app.utils.datetime import utc_now
 
 logger = logging.getLogger(__name__)
@@ -72,63 +72,11 @@ def start_session(db: Session, session_in: SessionCreate, current_user) -> Sessi
         },
     )
     db.commit()
+    dashboard_cache.invalidate()
     logger.info(f"Session started: ID {session.id} teacher={current_user.username}")
     
-    # Re-query the session with all required relationships
-    session_with_relations = db.query(ClassSession).filter(ClassSession.id == session.id).first()
-    
-    # Convert to SessionSchema with required fields
-    return SessionSchema(
-        id=session_with_relations.id,
-        subject_id=session_with_relations.subject_id,
-        section_id=session_with_relations.section_id,
-        subject_name=session_with_relations.subject.name if session_with_relations.subject else "Unknown",
-        section_name=session_with_relations.section.name if session_with_relations.section else "Unknown",
-        college_id=(
-            session_with_relations.section.major.department.college_id
-            if session_with_relations.section and session_with_relations.section.major and session_with_relations.section.major.department
-            else None
-        ),
-        college_name=(
-            session_with_relations.section.major.department.college.name
-            if session_with_relations.section
-            and session_with_relations.section.major
-            and session_with_relations.section.major.department
-            and session_with_relations.section.major.department.college
-            else None
-        ),
-        college_logo_path=(
-            session_with_relations.section.major.department.college.logo_path
-            if session_with_relations.section
-            and session_with_relations.section.major
-            and session_with_relations.section.major.department
-            and session_with_relations.section.major.department.college
-            else None
-        ),
-        department_id=(
-            session_with_relations.section.major.department_id
-            if session_with_relations.section and session_with_relations.section.major
-            else None
-        ),
-        department_name=(
-            session_with_relations.section.major.department.name
-            if session_with_relations.section and session_with_relations.section.major and session_with_relations.section.major.department
-            else None
-        ),
-        department_code=(
-            session_with_relations.section.major.department.code
-            if session_with_relations.section and session_with_relations.section.major and session_with_relations.section.major.department
-            else None
-        ),
-        major_id=session_with_relations.section.major_id if session_with_relations.section else None,
-        major_name=session_with_relations.section.major.name if session_with_relations.section and session_with_relations.section.major else None,
-        major_code=session_with_relations.section.major.code if session_with_relations.section and session_with_relations.section.major else None,
-        start_time=session_with_relations.start_time,
-        end_time=session_with_relations.end_time,
-        is_active=session_with_relations.is_active,
-        activity_mode=session_with_relations.activity_mode,
-        average_engagement=float(session_with_relations.average_engagement) if session_with_relations.average_engagement else 0.0
-    )
+    row = session_read_model.get_session_row(db, session.id)
+    return SessionSchema(**session_read_model.serialize_session(row, session_read_model.hierarchy_for(db, [row])))
 
 
 def stop_session(db: Session, session_id: int, current_user, stop_detector_fn) -> SessionSchema:
@@ -151,65 +99,24 @@ def stop_session(db: Session, session_id: int, current_user, stop_detector_fn) -
     # Refresh to pick up the changes for the rest of the function
     db.refresh(session)
     stop_detector_fn(session_id)
+    live_session_store.discard(session_id)
+    dashboard_cache.invalidate()
+    event_hub.publish(event_hub.session_topic(session_id), "session_ended", {"session_id": session_id})
+    rollup_service.forget(session_id)
 
     if session.activity_mode == "EXAM":
         # For exam sessions, return a final session object before deletion
         # This allows the Flutter app to properly close monitoring
-        final_session_data = {
-            "id": session.id,
-            "subject_id": session.subject_id,
-            "section_id": session.section_id,
-            "subject_name": session.subject.name if session.subject else "Unknown",
-            "section_name": session.section.name if session.section else "Unknown",
-            "college_id": (
-                session.section.major.department.college_id
-                if session.section and session.section.major and session.section.major.department
-                else None
-            ),
-            "college_name": (
-                session.section.major.department.college.name
-                if session.section
-                and session.section.major
-                and session.section.major.department
-                and session.section.major.department.college
-                else None
-            ),
-            "college_logo_path": (
-                session.section.major.department.college.logo_path
-                if session.section
-                and session.section.major
-                and session.section.major.department
-                and session.section.major.department.college
-                else None
-            ),
-            "department_id": (
-                session.section.major.department_id
-                if session.section and session.section.major
-                else None
-            ),
-            "department_name": (
-                session.section.major.department.name
-                if session.section and session.section.major and session.section.major.department
-                else None
-            ),
-            "department_code": (
-                session.section.major.department.code
-                if session.section and session.section.major and session.section.major.department
-                else None
-            ),
-            "major_id": session.section.major_id if session.section else None,
-            "major_name": session.section.major.name if session.section and session.section.major else None,
-            "major_code": session.section.major.code if session.section and session.section.major else None,
-            "start_time": session.start_time,
-            "end_time": utc_now(),  # Set end time for final response
-            "is_active": False,  # Mark as inactive
-            "activity_mode": session.activity_mode,
-            "average_engagement": float(session.average_engagement) if session.average_engagement else 0.0
-        }
+        row = session_read_model.get_session_row(db, session.id)
+        final_session_data = session_read_model.serialize_session(row, session_read_model.hierarchy_for(db, [row]))
+        final_session_data["end_time"] = utc_now()  # Set end time for final response
+        final_session_data["is_active"] = False  # Mark as inactive
         
         # Now delete the session
         db.delete(session)
         db.commit()
+        raw_detection_service.delete_session_files(session_id)
+        dashboard_cache.invalidate()
         audit_service.write_audit_log(
             db,
             actor_user_id=current_user.id,
@@ -224,8 +131,14 @@ def stop_session(db: Session, session_id: int, current_user, stop_detector_fn) -
         # Return the final session data for Flutter app to properly close monitoring
         return SessionSchema(**final_session_data)
 
+    # Close out the last minute window in the 5-minute/hourly/daily rollups.
+    rollup_service.rebuild_session(db, session_id)
     # Commit the status change first to ensure it sticks
     db.commit()
+    # Imported here: session_summary_service depends on engagement_service, which imports this module.
+    from app.services import session_summary_service
+
+    session_summary_service.finalize_after_stop(db, session_id)
     
     _record_session_history(db, session, current_user.id, "END")
     audit_service.write_audit_log(
@@ -242,190 +155,33 @@ def stop_session(db: Session, session_id: int, current_user, stop_detector_fn) -
         },
     )
     db.commit()
-    db.refresh(session)
-    
-    # Re-query the session with all required relationships
-    session_with_relations = db.query(ClassSession).filter(ClassSession.id == session.id).first()
-    
-    # Convert to SessionSchema with required fields
-    return SessionSchema(
-        id=session_with_relations.id,
-        subject_id=session_with_relations.subject_id,
-        section_id=session_with_relations.section_id,
-        subject_name=session_with_relations.subject.name if session_with_relations.subject else "Unknown",
-        section_name=session_with_relations.section.name if session_with_relations.section else "Unknown",
-        college_id=(
-            session_with_relations.section.major.department.college_id
-            if session_with_relations.section and session_with_relations.section.major and session_with_relations.section.major.department
-            else None
-        ),
-        college_name=(
-            session_with_relations.section.major.department.college.name
-            if session_with_relations.section
-            and session_with_relations.section.major
-            and session_with_relations.section.major.department
-            and session_with_relations.section.major.department.college
-            else None
-        ),
-        college_logo_path=(
-            session_with_relations.section.major.department.college.logo_path
-            if session_with_relations.section
-            and session_with_relations.section.major
-            and session_with_relations.section.major.department
-            and session_with_relations.section.major.department.college
-            else None
-        ),
-        department_id=(
-            session_with_relations.section.major.department_id
-            if session_with_relations.section and session_with_relations.section.major
-            else None
-        ),
-        department_name=(
-            session_with_relations.section.major.department.name
-            if session_with_relations.section and session_with_relations.section.major and session_with_relations.section.major.department
-            else None
-        ),
-        department_code=(
-            session_with_relations.section.major.department.code
-            if session_with_relations.section and session_with_relations.section.major and session_with_relations.section.major.department
-            else None
-        ),
-        major_id=session_with_relations.section.major_id if session_with_relations.section else None,
-        major_name=session_with_relations.section.major.name if session_with_relations.section and session_with_relations.section.major else None,
-        major_code=session_with_relations.section.major.code if session_with_relations.section and session_with_relations.section.major else None,
-        start_time=session_with_relations.start_time,
-        end_time=session_with_relations.end_time,
-        is_active=session_with_relations.is_active,
-        activity_mode=session_with_relations.activity_mode,
-        average_engagement=float(session_with_relations.average_engagement) if session_with_relations.average_engagement else 0.0
-    )
+    row = session_read_model.get_session_row(db, session.id)
+    return SessionSchema(**session_read_model.serialize_session(row, session_read_model.hierarchy_for(db, [row])))
 
 
 def get_active_session_for_teacher(db: Session, teacher_id: int) -> SessionSchema:
-    session = db.query(ClassSession).filter(
-        ClassSession.teacher_id == teacher_id,
-        ClassSession.is_active == True,
-    ).order_by(ClassSession.start_time.desc()).first()
-
-    if not session:
-        raise HTTPException(status_code=404, detail="No active session")
-    
-    # Convert to SessionSchema with required fields
-    return SessionSchema(
-        id=session.id,
-        subject_id=session.subject_id,
-        section_id=session.section_id,
-        subject_name=session.subject.name if session.subject else "Unknown",
-        section_name=session.section.name if session.section else "Unknown",
-        college_id=(
-            session.section.major.department.college_id
-            if session.section and session.section.major and session.section.major.department
-            else None
-        ),
-        college_name=(
-            session.section.major.department.college.name
-            if session.section
-            and session.section.major
-            and session.section.major.department
-            and session.section.major.department.college
-            else None
-        ),
-        college_logo_path=(
-            session.section.major.department.college.logo_path
-            if session.section
-            and session.section.major
-            and session.section.major.department
-            and session.section.major.department.college
-            else None
-        ),
-        department_id=(
-            session.section.major.department_id
-            if session.section and session.section.major
-            else None
-        ),
-        department_name=(
-            session.section.major.department.name
-            if session.section and session.section.major and session.section.major.department
-            else None
-        ),
-        department_code=(
-            session.section.major.department.code
-            if session.section and session.section.major and session.section.major.department
-            else None
-        ),
-        major_id=session.section.major_id if session.section else None,
-        major_name=session.section.major.name if session.section and session.section.major else None,
-        major_code=session.section.major.code if session.section and session.section.major else None,
-        start_time=session.start_time,
-        end_time=session.end_time,
-        is_active=session.is_active,
-        activity_mode=session.activity_mode,
-        average_engagement=float(session.average_engagement) if session.average_engagement else 0.0
+    row = (
+        session_read_model.session_query(db)
+        .filter(ClassSession.teacher_id == teacher_id, ClassSession.is_active == True)
+        .order_by(ClassSession.start_time.desc())
+        .first()
     )
+    if not row:
+        raise HTTPException(status_code=404, detail="No active session")
+    return SessionSchema(**session_read_model.serialize_session(row, session_read_model.hierarchy_for(db, [row])))
 
 
 def list_session_summaries(db: Session, teacher_id: int, include_active: bool, limit: int) -> list[dict[str, Any]]:
-    sessions = SessionRepository.list_sessions(
-        db,
-        teacher_id=teacher_id,
-        include_active=include_active,
-        limit=max(1, min(limit, 200)),
-    )
+    query = session_read_model.session_query(db).filter(ClassSession.teacher_id == teacher_id)
+    if not include_active:
+        query = query.filter(ClassSession.is_active == False)
+    rows = query.order_by(ClassSession.start_time.desc()).limit(max(1, min(limit, 200))).all()
+    hierarchy = session_read_model.hierarchy_for(db, rows)
     summaries = []
-    for session in sessions:
-        summaries.append(
-            {
-                "id": session.id,
-                "subject_id": session.subject_id,
-                "section_id": session.section_id,
-                "subject_name": session.subject.name if session.subject else "Unknown",
-                "section_name": session.section.name if session.section else "Unknown",
-                "college_id": (
-                    session.section.major.department.college_id
-                    if session.section and session.section.major and session.section.major.department
-                    else None
-                ),
-                "college_name": (
-                    session.section.major.department.college.name
-                    if session.section
-                    and session.section.major
-                    and session.section.major.department
-                    and session.section.major.department.college
-                    else None
-                ),
-                "college_logo_path": (
-                    session.section.major.department.college.logo_path
-                    if session.section
-                    and session.section.major
-                    and session.section.major.department
-                    and session.section.major.department.college
-                    else None
-                ),
-                "department_id": (
-                    session.section.major.department_id
-                    if session.section and session.section.major
-                    else None
-                ),
-                "department_name": (
-                    session.section.major.department.name
-                    if session.section and session.section.major and session.section.major.department
-                    else None
-                ),
-                "department_code": (
-                    session.section.major.department.code
-                    if session.section and session.section.major and session.section.major.department
-                    else None
-                ),
-                "major_id": session.section.major_id if session.section else None,
-                "major_name": session.section.major.name if session.section and session.section.major else None,
-                "major_code": session.section.major.code if session.section and session.section.major else None,
-                "start_time": session.start_time,
-                "end_time": session.end_time,
-                "is_active": session.is_active,
-                "activity_mode": session.activity_mode,
-                "average_engagement": round(float(session.average_engagement), 2) if session.average_engagement else 0.0,
-            }
-        )
+    for row in rows:
+        summary = session_read_model.serialize_session(row, hierarchy)
+        summary["average_engagement"] = round(summary["average_engagement"], 2)
+        summaries.append(summary)
     return summaries
 
 
@@ -0,0 +1,135 @@
+"""Read model of a class session with its teacher and academic hierarchy, for API responses.
+
+Session lists and details (teacher history, active session, stop; admin dashboard,
+session list and detail) all return the same fields: the session columns plus names
+from its subject, section, major, department, college and teacher. Loading them as
+ORM objects meant joined or lazy loads of six entities per session and walking
+``session.section.major.department.college`` again for every field.
+
+``session_query`` selects the session and teacher columns in one query and returns
+plain rows (no entities, no identity map); ``serialize_session`` turns a row into the
+response dict, resolving subject, section, major, department and college by id from
+the cached academic hierarchy (``hierarchy_for``). The joined tables are aliased so
+callers can still add their own joins on the plain models (admin scope filters).
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy.orm import Query, Session, aliased
+
+from app.models.session import ClassSession, SessionSummary
+from app.models.user import User
+from app.services import academic_hierarchy
+
+_teacher = aliased(User, name="read_teacher")
+_summary = aliased(SessionSummary, name="read_summary")
+
+BEHAVIOR_STATES = ("on_task", "sleeping", "using_phone", "off_task", "not_visible")
+_HIERARCHY_FIELDS = (
+    "college_id",
+    "college_name",
+    "college_logo_path",
+    "department_id",
+    "department_name",
+    "department_code",
+    "major_id",
+    "major_name",
+    "major_code",
+)
+_PASSTHROUGH_FIELDS = (
+    "students_present",
+    "activity_mode",
+    "start_time",
+    "end_time",
+    "is_active",
+)
+
+SESSION_COLUMNS = (
+    ClassSession.id,
+    ClassSession.teacher_id,
+    ClassSession.subject_id,
+    ClassSession.section_id,
+    ClassSession.students_present,
+    ClassSession.activity_mode,
+    ClassSession.start_time,
+    ClassSession.end_time,
+    ClassSession.is_active,
+    ClassSession.average_engagement,
+    ClassSession.logs_archive_path,
+    _teacher.id.label("teacher_user_id"),
+    _teacher.username.label("teacher_username"),
+    _teacher.fullname.label("teacher_fullname"),
+    _teacher.profile_picture_url.label("teacher_profile_picture_url"),
+    # Frozen statistics of a finalized session (session_summary_service).
+    _summary.id.label("summary_id"),
+    _summary.headcount_average_engagement.label("final_engagement"),
+    *(getattr(_summary, f"{name}_avg").label(f"final_{name}_avg") for name in BEHAVIOR_STATES),
+)
+
+
+def session_query(db: Session) -> Query:
+    """Rows of SESSION_COLUMNS, one per ClassSession; filter and order like a session query."""
+    return (
+        db.query(*SESSION_COLUMNS)
+        .select_from(ClassSession)
+        .outerjoin(_teacher, ClassSession.teacher_id == _teacher.id)
+        .outerjoin(_summary, _summary.session_id == ClassSession.id)
+    )
+
+
+def get_session_row(db: Session, session_id: int, teacher_id: int | None = None):
+    query = session_query(db).filter(ClassSession.id == session_id)
+    if teacher_id is not None:
+        query = query.filter(ClassSession.teacher_id == teacher_id)
+    return query.first()
+
+
+def hierarchy_for(db: Session, rows) -> academic_hierarchy.Hierarchy:
+    """Hierarchy snapshot holding the subjects and sections of ``rows``."""
+    rows = [row for row in rows if row is not None]
+    return academic_hierarchy.snapshot(
+        db,
+        section_ids=[row._mapping["section_id"] for row in rows],
+        subject_ids=[row._mapping["subject_id"] for row in rows],
+    )
+
+
+def final_behavior_averages(row) -> dict[str, float] | None:
+    """Per-log behavior averages frozen in the summary of an ended session, if finalized."""
+    values = row._mapping
+    if values["is_active"] or values["summary_id"] is None:
+        return None
+    return {name: float(values[f"final_{name}_avg"] or 0) for name in BEHAVIOR_STATES}
+
+
+def serialize_session(
+    row, hierarchy: academic_hierarchy.Hierarchy, placeholder: str = "Unknown"
+) -> dict[str, Any]:
+    """Response fields of a session row; ``placeholder`` names a missing subject, section or teacher."""
+    # Mapping lookups: label attribute access on a Row costs ~10x more per field.
+    values = row._mapping
+    if values["teacher_user_id"] is None:
+        teacher_username, teacher_fullname = placeholder.lower(), None
+    else:
+        teacher_username = values["teacher_username"]
+        teacher_fullname = (values["teacher_fullname"] or "").strip() or teacher_username
+    subject = hierarchy.subjects.get(values["subject_id"])
+    section = hierarchy.sections.get(values["section_id"])
+    major = hierarchy.major(section["major_id"] if section else None)
+    average_engagement = values["average_engagement"]
+    return {
+        "id": values["id"],
+        "teacher_id": values["teacher_id"],
+        "teacher_username": teacher_username,
+        "teacher_fullname": teacher_fullname,
+        "teacher_profile_picture_url": values["teacher_profile_picture_url"],
+        "subject_id": values["subject_id"],
+        "subject_name": subject["name"] if subject else placeholder,
+        "section_id": values["section_id"],
+        "section_name": section["name"] if section else placeholder,
+        **{name: major[name] for name in _HIERARCHY_FIELDS},
+        **{name: values[name] for name in _PASSTHROUGH_FIELDS},
+        "average_engagement": float(average_engagement) if average_engagement else 0.0,
+    }
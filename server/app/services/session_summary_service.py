@@ -0,0 +1,186 @@
+"""Finalization of ended sessions into a frozen SessionSummary row.
+
+While a session runs its statistics change with every log; once it ends they do not,
+yet admin lists, the dashboard and the session detail used to recompute averages from
+every raw log on each request. ``finalize_session`` runs once when a session stops
+(teacher stop or admin force stop) and stores everything those views need:
+
+- per-log behavior averages and the largest detected headcount,
+- visible-student and headcount engagement averages,
+- peak and lowest minute engagement with their times,
+- alert counts (total, critical, by type),
+- time in state: student-seconds per behavior, each log weighted by the gap to the
+  next one (capped, so pauses do not count),
+- a digest of the engagement curve (minute scores averaged down to CURVE_POINTS).
+
+Views read the summary for ended sessions and only fall back to the logs for sessions
+that were never finalized. A summary is recomputed only when its inputs change:
+re-scoring the session or changing the engagement weights.
+"""
+
+from __future__ import annotations
+
+import logging
+import statistics
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.session import Alert, AlertSeverity, ClassSession, SessionMetrics, SessionSummary
+from app.services import engagement_service, log_archive_service
+from app.services.admin import settings_service
+from app.utils.datetime import to_naive_utc
+
+logger = logging.getLogger(__name__)
+
+CURVE_POINTS = 60
+STATES = ("on_task", "sleeping", "using_phone", "off_task", "not_visible")
+# A gap longer than this many median tick intervals is a pause, not time in state.
+MAX_GAP_INTERVALS = 3
+
+
+def _time_in_state(rows: list[tuple]) -> dict[str, float]:
+    """Student-seconds per state; rows are (timestamp, *STATES) ordered by timestamp."""
+    seconds = dict.fromkeys(STATES, 0.0)
+    if not rows:
+        return seconds
+    times = [to_naive_utc(row[0]) for row in rows]
+    gaps = [(later - earlier).total_seconds() for earlier, later in zip(times, times[1:])]
+    typical = statistics.median(gaps) if gaps else 0.0
+    cap = typical * MAX_GAP_INTERVALS
+    for index, row in enumerate(rows):
+        weight = min(gaps[index], cap) if index < len(gaps) else typical
+        for name, count in zip(STATES, row[1:]):
+            seconds[name] += (count or 0) * weight
+    return {name: round(value, 1) for name, value in seconds.items()}
+
+
+def _curve_digest(session_start: datetime | None, windows: list[SessionMetrics]) -> list[list[float]]:
+    """Minute engagement averaged into at most CURVE_POINTS consecutive groups."""
+    if not windows:
+        return []
+    origin = to_naive_utc(session_start or windows[0].window_start)
+    group = -(-len(windows) // CURVE_POINTS)
+    digest = []
+    for start in range(0, len(windows), group):
+        chunk = windows[start : start + group]
+        offset = (to_naive_utc(chunk[0].window_start) - origin).total_seconds() / 60
+        score = sum(float(row.engagement_score or 0) for row in chunk) / len(chunk)
+        digest.append([round(offset, 1), round(score, 2)])
+    return digest
+
+
+def compute_summary(db: Session, session: ClassSession) -> dict[str, Any]:
+    weights = settings_service.get_engagement_weights(db, mode=session.activity_mode)
+    rows = sorted(
+        log_archive_service.log_rows(
+            db,
+            session.id,
+            ("timestamp", *STATES, "total_detected", "students_present_snapshot"),
+        ),
+        key=lambda row: to_naive_utc(row[0]),
+    )
+
+    sums = dict.fromkeys(STATES, 0.0)
+    visible_scores: list[float] = []
+    headcount_scores: list[float] = []
+    max_detected = 0
+    for timestamp, on_task, sleeping, using_phone, off_task, not_visible, total, snapshot in rows:
+        on_task, sleeping, using_phone, off_task, not_visible, total = (
+            on_task or 0, sleeping or 0, using_phone or 0, off_task or 0, not_visible or 0, total or 0
+        )
+        for name, value in zip(STATES, (on_task, sleeping, using_phone, off_task, not_visible)):
+            sums[name] += value
+        max_detected = max(max_detected, total)
+        if total > 0:
+            visible_scores.append(
+                engagement_service._weighted_engagement_percent(on_task, using_phone, sleeping, off_task, total, weights)
+            )
+        headcount = engagement_service._headcount_engagement_percent(
+            on_task,
+            using_phone,
+            sleeping,
+            off_task,
+            not_visible,
+            snapshot if snapshot and snapshot > 0 else session.students_present or 0,
+            weights,
+        )
+        if headcount is not None:
+            headcount_scores.append(headcount)
+
+    windows = (
+        db.query(SessionMetrics)
+        .filter(SessionMetrics.session_id == session.id)
+        .order_by(SessionMetrics.window_start.asc())
+        .all()
+    )
+    peak = max(windows, key=lambda row: float(row.engagement_score or 0), default=None)
+    lowest = min(windows, key=lambda row: float(row.engagement_score or 0), default=None)
+
+    alerts_by_type = dict(
+        db.query(Alert.alert_type, func.count(Alert.id))
+        .filter(Alert.session_id == session.id)
+        .group_by(Alert.alert_type)
+        .all()
+    )
+    critical = (
+        db.query(func.count(Alert.id))
+        .filter(Alert.session_id == session.id, Alert.severity == AlertSeverity.CRITICAL.value)
+        .scalar()
+        or 0
+    )
+
+    duration = 0
+    if session.start_time and session.end_time:
+        duration = max(0, int((to_naive_utc(session.end_time) - to_naive_utc(session.start_time)).total_seconds()))
+    count = len(rows)
+    return {
+        "duration_seconds": duration,
+        "log_count": count,
+        "minute_count": len(windows),
+        "max_students_detected": max_detected,
+        **{f"{name}_avg": round(sums[name] / count, 2) if count else 0.0 for name in STATES},
+        "average_engagement": round(sum(visible_scores) / len(visible_scores), 2) if visible_scores else 0.0,
+        "headcount_average_engagement": (
+            round(sum(headcount_scores) / len(headcount_scores), 2) if headcount_scores else 0.0
+        ),
+        "peak_engagement": float(peak.engagement_score) if peak else None,
+        "peak_engagement_at": peak.window_start if peak else None,
+        "lowest_engagement": float(lowest.engagement_score) if lowest else None,
+        "lowest_engagement_at": lowest.window_start if lowest else None,
+        "alert_count": sum(alerts_by_type.values()),
+        "critical_alert_count": int(critical),
+        "alerts_by_type": {str(key): int(value) for key, value in alerts_by_type.items()},
+        "time_in_state": _time_in_state([(row[0], *row[1:6]) for row in rows]),
+        "engagement_curve": _curve_digest(session.start_time, windows),
+        "engagement_weights": weights,
+    }
+
+
+def finalize_session(db: Session, session_id: int) -> SessionSummary | None:
+    """Compute and store the summary of an ended session. The caller commits."""
+    session = db.query(ClassSession).filter(ClassSession.id == session_id).first()
+    if session is None or session.is_active:
+        return None
+    values = compute_summary(db, session)
+    summary = session.summary
+    if summary is None:
+        summary = SessionSummary(session_id=session.id)
+        session.summary = summary
+    for name, value in values.items():
+        setattr(summary, name, value)
+    summary.finalized_at = func.now()
+    db.add(summary)
+    return summary
+
+
+def finalize_after_stop(db: Session, session_id: int) -> None:
+    """Finalize inline right after a stop was committed; views fall back to logs on failure."""
+    try:
+        finalize_session(db, session_id)
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.exception(f"Failed to finalize session {session_id}")
@@ -8,7 +8,7 @@ from app.core import security
 from app.core.config import settings
 from app.repositories.user_repository import UserRepository
 from app.schemas.user import PasswordChange, UserUpdate
-from app.services import audit_service
+from app.services import audit_service, catalog_cache
 from app.constants import MAX_PROFILE_PICTURE_SIZE_MB, MIN_PASSWORD_LENGTH
 from app.utils.file import is_valid_image_extension, sanitize_filename
 
@@ -68,6 +68,8 @@ def update_user_me(db: Session, data: UserUpdate, current_user):
         },
     )
     db.commit()
+    # Catalogue sections show the teacher's username.
+    catalog_cache.invalidate()
     db.refresh(current_user)
     return current_user
 
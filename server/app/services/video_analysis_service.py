@@ -0,0 +1,312 @@
+"""Offline analysis of recorded lectures.
+
+A video is sampled at the detection interval, run through the detector in batches and
+written into a new (already ended) ClassSession: one BehaviorLog per sample, stamped
+with the recording start plus the sample offset, then minute rollups and the cached
+session engagement are rebuilt in one pass. Alerts are not raised for recordings.
+
+Used by ``scripts/analyze_video.py`` and by the admin video-analysis job.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import cv2
+import numpy as np
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.db.database import SessionLocal
+from app.models.classroom import ClassSection, SectionSubjectAssignment, Subject
+from app.models.session import ActivityMode, BehaviorLog, ClassSession
+from app.services import detector_service, engagement_service, raw_detection_service, session_summary_service
+from app.utils.datetime import utc_now
+from app.utils.detection import count_behaviors
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 8
+# Below this gap, grabbing (demux + decode without colour conversion) beats a seek,
+# which has to restart decoding from the previous keyframe.
+SEEK_MIN_SKIP_SECONDS = 2.0
+# Finished jobs (and their results) are kept this long for the admin UI to poll.
+JOB_RETENTION = timedelta(hours=6)
+
+_jobs: dict[str, dict[str, Any]] = {}
+_jobs_lock = threading.Lock()
+
+ProgressFn = Callable[[int, int, float], None]
+
+
+def probe_video(video_path: str | Path) -> tuple[float, int]:
+    """Return (fps, frame_count) of a readable video or raise HTTP 400."""
+    cap = cv2.VideoCapture(str(video_path))
+    try:
+        if not cap.isOpened():
+            raise HTTPException(status_code=400, detail="Could not open video file")
+        fps = float(cap.get(cv2.CAP_PROP_FPS) or 0.0)
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+    finally:
+        cap.release()
+    if fps <= 0:
+        raise HTTPException(status_code=400, detail="Could not read FPS from video")
+    return fps, frame_count
+
+
+def iter_sampled_frames(
+    cap: cv2.VideoCapture,
+    fps: float,
+    interval_seconds: float,
+    frame_count: int = 0,
+    seek: bool = True,
+) -> Iterator[tuple[float, np.ndarray]]:
+    """Yield (offset_seconds, frame) every ``interval_seconds`` of video.
+
+    Only sampled frames are retrieved. Skipped frames are either jumped over with a
+    container seek (long gaps) or advanced with ``grab()`` (short gaps), so they are
+    never colour-converted into numpy arrays.
+    """
+    step = max(1, int(round(interval_seconds * fps)))
+    seek_min_skip = max(1, int(round(SEEK_MIN_SKIP_SECONDS * fps)))
+    position = 0
+    index = 0
+    while frame_count <= 0 or index < frame_count:
+        skip = index - position
+        if seek and skip >= seek_min_skip and cap.set(cv2.CAP_PROP_POS_FRAMES, index):
+            position = index
+        while position < index:
+            if not cap.grab():
+                return
+            position += 1
+        ok, frame = cap.read()
+        if not ok or frame is None:
+            return
+        position += 1
+        yield index / fps, frame
+        index += step
+
+
+def create_recorded_session(
+    db: Session,
+    *,
+    section_id: int,
+    subject_id: int,
+    students_present: int,
+    activity_mode: str = ActivityMode.LECTURE.value,
+    teacher_id: int | None = None,
+    start_time: datetime | None = None,
+) -> ClassSession:
+    if students_present <= 0:
+        raise HTTPException(status_code=400, detail="students_present must be greater than 0")
+    if activity_mode not in {mode.value for mode in ActivityMode}:
+        raise HTTPException(status_code=400, detail="Invalid activity_mode")
+    if activity_mode == ActivityMode.EXAM.value:
+        raise HTTPException(status_code=400, detail="EXAM sessions are not kept and cannot be analysed offline")
+    section = db.query(ClassSection).filter(ClassSection.id == section_id).first()
+    if not section:
+        raise HTTPException(status_code=404, detail="Section not found")
+    subject = db.query(Subject).filter(Subject.id == subject_id).first()
+    if not subject:
+        raise HTTPException(status_code=404, detail="Subject not found")
+    if section.major_id != subject.major_id:
+        raise HTTPException(status_code=400, detail="Section and subject must belong to the same major")
+    assignment = (
+        db.query(SectionSubjectAssignment)
+        .filter(
+            SectionSubjectAssignment.section_id == section.id,
+            SectionSubjectAssignment.subject_id == subject.id,
+        )
+        .first()
+    )
+    if not assignment:
+        raise HTTPException(status_code=400, detail="Selected subject is not assigned to the selected section")
+    teacher_id = teacher_id if teacher_id is not None else assignment.teacher_id
+    if teacher_id is None:
+        raise HTTPException(status_code=400, detail="teacher_id is required when the subject has no assigned teacher")
+
+    session = ClassSession(
+        teacher_id=teacher_id,
+        section_id=section.id,
+        subject_id=subject.id,
+        students_present=students_present,
+        activity_mode=activity_mode,
+        start_time=start_time or utc_now(),
+        is_active=False,
+    )
+    db.add(session)
+    db.commit()
+    db.refresh(session)
+    return session
+
+
+def analyze_video_into_session(
+    db: Session,
+    session: ClassSession,
+    video_path: str | Path,
+    *,
+    inference_mode: str = detector_service.INFERENCE_MODE_SINGLE,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    interval_seconds: float | None = None,
+    seek: bool = True,
+    progress_fn: ProgressFn | None = None,
+) -> dict[str, Any]:
+    if inference_mode not in detector_service.INFERENCE_MODES:
+        raise HTTPException(status_code=400, detail="Invalid inference_mode")
+    fps, frame_count = probe_video(video_path)
+    detection_settings = detector_service._runtime_detection_settings()
+    interval = float(interval_seconds or detection_settings["detect_interval_seconds"])
+    if interval <= 0:
+        raise HTTPException(status_code=400, detail="interval_seconds must be greater than 0")
+    threshold = detection_settings["detection_confidence_threshold"]
+    model = detector_service._get_model()
+
+    step = max(1, int(round(interval * fps)))
+    total_samples = (frame_count + step - 1) // step if frame_count > 0 else 0
+    start_time = session.start_time
+    batch_size = max(1, int(batch_size))
+
+    processed = 0
+    last_offset = 0.0
+    started = time.perf_counter()
+
+    def flush(batch: list[tuple[float, np.ndarray]]) -> None:
+        nonlocal processed, last_offset
+        frames = [frame for _, frame in batch]
+        detections = detector_service._infer_detections_batch(model, frames, detection_settings, inference_mode)
+        rows = []
+        for (offset, _), frame_detections in zip(batch, detections):
+            counts = count_behaviors(frame_detections, model.names, threshold)
+            rows.append({"timestamp": start_time + timedelta(seconds=offset), **counts})
+        engagement_service.bulk_insert_behavior_logs(db, session, rows)
+        db.commit()
+        processed += len(batch)
+        last_offset = batch[-1][0]
+        if progress_fn is not None:
+            progress_fn(processed, total_samples, processed / max(time.perf_counter() - started, 1e-9))
+
+    cap = cv2.VideoCapture(str(video_path))
+    try:
+        batch: list[tuple[float, np.ndarray]] = []
+        for sample in iter_sampled_frames(cap, fps, interval, frame_count, seek=seek):
+            batch.append(sample)
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+    finally:
+        cap.release()
+
+    elapsed = time.perf_counter() - started
+    duration = frame_count / fps if frame_count > 0 else last_offset + interval
+    session.end_time = start_time + timedelta(seconds=duration)
+    windows = engagement_service.rebuild_session_metrics(db, session.id)
+    db.add(session)
+    db.flush()
+    session_summary_service.finalize_session(db, session.id)
+    db.commit()
+    logger.info(
+        f"Analysed video into session {session.id}: {processed} samples in {elapsed:.1f}s "
+        f"({processed / max(elapsed, 1e-9):.2f} frames/s)"
+    )
+    return {
+        "session_id": session.id,
+        "samples": processed,
+        "video_seconds": round(duration, 2),
+        "elapsed_seconds": round(elapsed, 2),
+        "frames_per_second": round(processed / max(elapsed, 1e-9), 2),
+        "metric_windows": windows,
+        "average_engagement": float(session.average_engagement or 0),
+    }
+
+
+def delete_recorded_session(db: Session, session_id: int) -> None:
+    db.rollback()
+    db.query(BehaviorLog).filter(BehaviorLog.session_id == session_id).delete(synchronize_session=False)
+    session = db.query(ClassSession).filter(ClassSession.id == session_id).first()
+    if session:
+        db.delete(session)
+    db.commit()
+    raw_detection_service.delete_session_files(session_id)
+
+
+def _run_analysis_job(job_id: str, session_id: int, video_path: str, options: dict[str, Any], delete_video: bool) -> None:
+    def report(processed: int, total: int, frames_per_second: float) -> None:
+        with _jobs_lock:
+            _jobs[job_id].update(processed=processed, total=total, frames_per_second=round(frames_per_second, 2))
+
+    db = SessionLocal()
+    try:
+        session = db.query(ClassSession).filter(ClassSession.id == session_id).first()
+        if not session:
+            raise HTTPException(status_code=404, detail="Session not found")
+        result = analyze_video_into_session(db, session, video_path, progress_fn=report, **options)
+        with _jobs_lock:
+            _jobs[job_id].update(status="completed", result=result, finished_at=utc_now())
+    except Exception as exc:
+        detail = exc.detail if isinstance(exc, HTTPException) else str(exc)
+        logger.error(f"Video analysis job {job_id} failed: {detail}")
+        try:
+            delete_recorded_session(db, session_id)
+        except Exception as cleanup_exc:
+            logger.error(f"Failed to remove partial session {session_id}: {cleanup_exc}")
+        with _jobs_lock:
+            _jobs[job_id].update(status="failed", error=detail, finished_at=utc_now())
+    finally:
+        db.close()
+        if delete_video:
+            Path(video_path).unlink(missing_ok=True)
+
+
+def start_analysis_job(
+    session_id: int,
+    video_path: str | Path,
+    *,
+    delete_video: bool = False,
+    **options: Any,
+) -> dict[str, Any]:
+    """Analyse a video into an existing recorded session on a background thread."""
+    job_id = uuid.uuid4().hex
+    job = {
+        "job_id": job_id,
+        "session_id": session_id,
+        "status": "running",
+        "processed": 0,
+        "total": 0,
+        "frames_per_second": 0.0,
+        "error": None,
+        "result": None,
+        "started_at": utc_now(),
+        "finished_at": None,
+    }
+    with _jobs_lock:
+        _prune_jobs()
+        _jobs[job_id] = job
+    thread = threading.Thread(
+        target=_run_analysis_job,
+        args=(job_id, session_id, str(video_path), options, delete_video),
+        daemon=True,
+    )
+    thread.start()
+    return dict(job)
+
+
+def _prune_jobs() -> None:
+    # Caller holds _jobs_lock.
+    cutoff = utc_now() - JOB_RETENTION
+    for job_id in [job_id for job_id, job in _jobs.items() if job["finished_at"] and job["finished_at"] < cutoff]:
+        del _jobs[job_id]
+
+
+def get_analysis_job(job_id: str) -> dict[str, Any] | None:
+    with _jobs_lock:
+        _prune_jobs()
+        job = _jobs.get(job_id)
+        return dict(job) if job else None
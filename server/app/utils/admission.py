@@ -0,0 +1,96 @@
+"""Weighted fair admission of inference calls shared by all live detectors.
+
+Every detector asks for a slot before running the model. Waiting requests are granted
+in start-time fair queueing order: each request is tagged with a virtual finish time
+``max(virtual_now, session's last finish) + cost / weight``, and the smallest tag goes
+first. A session with twice the weight therefore gets twice the inference time under
+contention, an idle session does not bank credit, and a busy session cannot starve the
+others. Requests carry a deadline; a request still queued at its deadline is refused so
+the caller can skip that tick instead of running late.
+"""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from dataclasses import dataclass
+
+# Share of inference time under contention, by ClassSession.activity_mode.
+ACTIVITY_MODE_WEIGHTS = {
+    "EXAM": 8.0,
+    "LECTURE": 4.0,
+    "STUDY": 2.0,
+    "COLLABORATION": 1.0,
+}
+
+
+@dataclass
+class _Request:
+    session_id: int
+    start_tag: float
+    finish_tag: float
+    deadline: float
+    order: int
+
+
+class InferenceAdmissionController:
+    def __init__(self, slots: int = 1) -> None:
+        self.slots = max(1, slots)
+        self._in_use = 0
+        self._virtual_time = 0.0
+        self._last_finish: dict[int, float] = {}
+        self._waiting: list[_Request] = []
+        self._order = itertools.count()
+        self._cond = threading.Condition()
+
+    def set_slots(self, slots: int) -> None:
+        with self._cond:
+            self.slots = max(1, slots)
+            self._cond.notify_all()
+
+    def _next(self, now: float) -> _Request | None:
+        live = [r for r in self._waiting if r.deadline > now]
+        return min(live, key=lambda r: (r.finish_tag, r.order), default=None)
+
+    def acquire(self, session_id: int, activity_mode: str | None, cost_seconds: float, deadline: float) -> bool:
+        """Block until a slot is granted (True) or ``deadline`` (time.time()) passes (False)."""
+        weight = ACTIVITY_MODE_WEIGHTS.get(activity_mode or "", 1.0)
+        with self._cond:
+            start = max(self._virtual_time, self._last_finish.get(session_id, 0.0))
+            request = _Request(
+                session_id=session_id,
+                start_tag=start,
+                finish_tag=start + max(cost_seconds, 1e-3) / weight,
+                deadline=deadline,
+                order=next(self._order),
+            )
+            self._waiting.append(request)
+            try:
+                while True:
+                    now = time.time()
+                    if now >= deadline:
+                        return False
+                    if self._in_use < self.slots and self._next(now) is request:
+                        self._in_use += 1
+                        self._virtual_time = max(self._virtual_time, request.start_tag)
+                        self._last_finish[session_id] = request.finish_tag
+                        return True
+                    self._cond.wait(timeout=deadline - now)
+            finally:
+                self._waiting.remove(request)
+                # Wake the others: the head may have changed even if no slot was taken.
+                self._cond.notify_all()
+
+    def release(self) -> None:
+        with self._cond:
+            self._in_use = max(0, self._in_use - 1)
+            self._cond.notify_all()
+
+    def forget(self, session_id: int) -> None:
+        with self._cond:
+            self._last_finish.pop(session_id, None)
+
+    def stats(self) -> dict[str, int]:
+        with self._cond:
+            return {"slots": self.slots, "in_use": self._in_use, "waiting": len(self._waiting)}
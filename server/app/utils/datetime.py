@@ -9,6 +9,13 @@ def utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
 
+def to_naive_utc(value: datetime) -> datetime:
+    """Drop tzinfo after converting to UTC; naive values are assumed to be UTC already."""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
 def from_timestamp(timestamp: float) -> datetime:
     """Convert timestamp to UTC datetime."""
     return datetime.fromtimestamp(timestamp, timezone.utc)
@@ -0,0 +1,219 @@
+"""Detection array helpers shared by the detector, tooling scripts and re-scoring jobs."""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+BEHAVIOR_CLASSES: tuple[str, ...] = ("on_task", "sleeping", "using_phone", "off_task", "not_visible")
+# Behaviors a camera can observe; not_visible is derived from the headcount per tick.
+OBSERVED_BEHAVIORS: tuple[str, ...] = BEHAVIOR_CLASSES[:4]
+CAMERA_MERGE_MODES: tuple[str, ...] = ("max", "sum")
+
+
+@dataclass
+class Detections:
+    """Column-oriented detections for one frame (xyxy boxes in frame pixels)."""
+
+    cls: np.ndarray
+    conf: np.ndarray
+    boxes: np.ndarray
+
+    @classmethod
+    def empty(cls) -> "Detections":
+        return cls(
+            cls=np.zeros(0, dtype=np.int32),
+            conf=np.zeros(0, dtype=np.float32),
+            boxes=np.zeros((0, 4), dtype=np.float32),
+        )
+
+    def __len__(self) -> int:
+        return int(self.cls.shape[0])
+
+    def filter(self, mask: np.ndarray) -> "Detections":
+        return Detections(cls=self.cls[mask], conf=self.conf[mask], boxes=self.boxes[mask])
+
+
+def detections_from_result(result) -> Detections:
+    """Convert one Ultralytics result into numpy columns without per-box Python loops."""
+    boxes = getattr(result, "boxes", None)
+    if boxes is None or len(boxes) == 0:
+        return Detections.empty()
+    return Detections(
+        cls=boxes.cls.cpu().numpy().astype(np.int32),
+        conf=boxes.conf.cpu().numpy().astype(np.float32),
+        boxes=boxes.xyxy.cpu().numpy().astype(np.float32),
+    )
+
+
+def count_behaviors(
+    detections: Detections,
+    names: dict[int, str],
+    threshold: float,
+) -> dict[str, int]:
+    """Count detections per behavior class at the given confidence threshold."""
+    counts = {name: 0 for name in BEHAVIOR_CLASSES}
+    if len(detections) == 0:
+        return counts
+    kept = detections.cls[detections.conf >= threshold]
+    if kept.size == 0:
+        return counts
+    ids, totals = np.unique(kept, return_counts=True)
+    for cls_id, total in zip(ids.tolist(), totals.tolist()):
+        class_name = str(names.get(cls_id, "")).strip()
+        if class_name in counts:
+            counts[class_name] += int(total)
+    return counts
+
+
+def merge_camera_counts(
+    per_camera: dict[int, dict[str, int]],
+    camera_regions: dict[str, str] | None = None,
+    region_merge: str = "max",
+) -> dict[str, int]:
+    """Merge per-camera behavior counts into the counts of one tick.
+
+    Cameras mapped to the same region in ``camera_regions`` watch overlapping seats, so
+    their counts are combined with ``region_merge`` ("max" per behavior, or "sum").
+    Cameras without a region are a region of their own. Regions are then summed.
+    """
+    regions: dict[str, list[dict[str, int]]] = {}
+    for camera_index, counts in per_camera.items():
+        region = (camera_regions or {}).get(str(camera_index)) or f"camera:{camera_index}"
+        regions.setdefault(region, []).append(counts)
+    merged = {name: 0 for name in BEHAVIOR_CLASSES}
+    combine = max if region_merge == "max" else sum
+    for members in regions.values():
+        for name in OBSERVED_BEHAVIORS:
+            merged[name] += int(combine(counts.get(name, 0) for counts in members))
+    return merged
+
+
+def pack_camera_counts(per_camera: dict[int, dict[str, int]]) -> dict[str, list[int]]:
+    """Compact per-camera breakdown: camera index -> counts in ``OBSERVED_BEHAVIORS`` order."""
+    return {
+        str(camera_index): [int(counts.get(name, 0)) for name in OBSERVED_BEHAVIORS]
+        for camera_index, counts in sorted(per_camera.items())
+    }
+
+
+def tile_frame(
+    frame: np.ndarray,
+    rows: int,
+    cols: int,
+    overlap: float,
+) -> tuple[list[np.ndarray], list[tuple[int, int]]]:
+    """Split a frame into a rows x cols grid of overlapping tiles.
+
+    Returns the tile views and the (x, y) offset of each tile so detections can be
+    mapped back to full-frame coordinates. Tiles on the last row/column are shifted
+    inwards so every tile has the same size and stays inside the frame.
+    """
+    height, width = frame.shape[:2]
+    rows = max(1, int(rows))
+    cols = max(1, int(cols))
+    overlap = min(max(float(overlap), 0.0), 0.9)
+
+    tile_w = min(width, int(math.ceil(width / (cols - (cols - 1) * overlap))))
+    tile_h = min(height, int(math.ceil(height / (rows - (rows - 1) * overlap))))
+    xs = _tile_starts(width, tile_w, cols)
+    ys = _tile_starts(height, tile_h, rows)
+
+    tiles: list[np.ndarray] = []
+    offsets: list[tuple[int, int]] = []
+    for y in ys:
+        for x in xs:
+            tiles.append(frame[y : y + tile_h, x : x + tile_w])
+            offsets.append((x, y))
+    return tiles, offsets
+
+
+def _tile_starts(length: int, tile: int, count: int) -> list[int]:
+    if count <= 1 or tile >= length:
+        return [0]
+    step = (length - tile) / (count - 1)
+    return [int(round(i * step)) for i in range(count)]
+
+
+def merge_tile_detections(
+    per_tile: list[Detections],
+    offsets: list[tuple[int, int]],
+    iou_threshold: float = 0.5,
+    ios_threshold: float = 0.85,
+) -> Detections:
+    """Shift per-tile detections into frame coordinates and apply cross-tile NMS."""
+    if not per_tile:
+        return Detections.empty()
+    shifted = []
+    for dets, (x, y) in zip(per_tile, offsets):
+        if len(dets) == 0:
+            continue
+        shift = np.array([x, y, x, y], dtype=np.float32)
+        shifted.append(Detections(cls=dets.cls, conf=dets.conf, boxes=dets.boxes + shift))
+    if not shifted:
+        return Detections.empty()
+    merged = Detections(
+        cls=np.concatenate([d.cls for d in shifted]),
+        conf=np.concatenate([d.conf for d in shifted]),
+        boxes=np.concatenate([d.boxes for d in shifted]),
+    )
+    keep = nms(merged, iou_threshold=iou_threshold, ios_threshold=ios_threshold)
+    return merged.filter(keep)
+
+
+def nms(
+    detections: Detections,
+    iou_threshold: float = 0.5,
+    ios_threshold: float | None = None,
+) -> np.ndarray:
+    """Class-aware greedy NMS returning the indices to keep (highest confidence first).
+
+    ``ios_threshold`` additionally suppresses boxes whose intersection covers most of
+    the smaller box, which is how a student cut in half at a tile border shows up.
+    """
+    count = len(detections)
+    if count == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    boxes = detections.boxes.astype(np.float32)
+    # Offset boxes per class so boxes of different classes never overlap.
+    span = float(boxes.max()) + 1.0
+    shifted = boxes + (detections.cls.astype(np.float32) * span)[:, None]
+    x1, y1, x2, y2 = shifted.T
+    areas = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+
+    order = np.argsort(-detections.conf, kind="stable")
+    keep: list[int] = []
+    while order.size > 0:
+        i = int(order[0])
+        keep.append(i)
+        rest = order[1:]
+        if rest.size == 0:
+            break
+        iw = np.clip(np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest]), 0, None)
+        ih = np.clip(np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest]), 0, None)
+        inter = iw * ih
+        union = areas[i] + areas[rest] - inter
+        iou = np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
+        suppress = iou > iou_threshold
+        if ios_threshold is not None:
+            smaller = np.minimum(areas[i], areas[rest])
+            ios = np.where(smaller > 0, inter / np.maximum(smaller, 1e-9), 0.0)
+            suppress |= ios > ios_threshold
+        order = rest[~suppress]
+    return np.asarray(keep, dtype=np.int64)
+
+
+def box_iou(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU matrix (len(a) x len(b)) of xyxy boxes."""
+    a = np.asarray(a, dtype=np.float32).reshape(-1, 4)
+    b = np.asarray(b, dtype=np.float32).reshape(-1, 4)
+    iw = np.clip(np.minimum(a[:, None, 2], b[None, :, 2]) - np.maximum(a[:, None, 0], b[None, :, 0]), 0, None)
+    ih = np.clip(np.minimum(a[:, None, 3], b[None, :, 3]) - np.maximum(a[:, None, 1], b[None, :, 1]), 0, None)
+    inter = iw * ih
+    area_a = np.clip(a[:, 2] - a[:, 0], 0, None) * np.clip(a[:, 3] - a[:, 1], 0, None)
+    area_b = np.clip(b[:, 2] - b[:, 0], 0, None) * np.clip(b[:, 3] - b[:, 1], 0, None)
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import re
+from typing import Iterable, Sequence
+
+# Longest token kept in the search index; longer words are truncated (prefix search still finds them).
+MAX_TOKEN_LENGTH = 64
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: str | None) -> list[str]:
+    """Lower-cased alphanumeric words of ``text``, in order, duplicates kept."""
+    if not text:
+        return []
+    return [token[:MAX_TOKEN_LENGTH] for token in _TOKEN_RE.findall(text.lower())]
+
+
+def document_tokens(values: Iterable[str | None]) -> list[str]:
+    """Distinct tokens of all ``values``, in first-seen order."""
+    seen: dict[str, None] = {}
+    for value in values:
+        for token in tokenize(value):
+            seen.setdefault(token, None)
+    return list(seen)
+
+
+def index_entries(entity_type: str, rows: Iterable[Sequence]) -> tuple[list[dict], list[dict]]:
+    """search_documents and search_tokens rows for ``rows`` of (entity id, *searchable values)."""
+    documents: list[dict] = []
+    tokens: list[dict] = []
+    for entity_id, *values in rows:
+        words = document_tokens(values)
+        if not words:
+            continue
+        documents.append({"entity_type": entity_type, "entity_id": entity_id, "content": " ".join(words)})
+        tokens.extend({"entity_type": entity_type, "entity_id": entity_id, "token": word} for word in words)
+    return documents, tokens
@@ -0,0 +1,89 @@
+"""Lightweight IoU tracker that smooths per-student behavior across detector ticks.
+
+Students barely move in a classroom, so greedy IoU association between consecutive
+ticks is enough to follow them even at multi-second detection intervals. Each track
+keeps a stable behavior that only switches after the new behavior has been seen on
+``switch_ticks`` consecutive ticks, and a track missed by the detector keeps counting
+for up to ``max_missed_ticks`` ticks. Counts reported from the tracks therefore do not
+flicker when one student alternates between on_task and off_task, or is missed once.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.utils.detection import BEHAVIOR_CLASSES, Detections, box_iou
+
+
+@dataclass
+class Track:
+    box: np.ndarray
+    behavior: str
+    candidate: str | None = None
+    candidate_hits: int = 0
+    missed: int = 0
+
+
+class BehaviorTracker:
+    def __init__(self, iou_threshold: float = 0.3, switch_ticks: int = 2, max_missed_ticks: int = 2) -> None:
+        self.iou_threshold = iou_threshold
+        self.switch_ticks = max(1, switch_ticks)
+        self.max_missed_ticks = max(0, max_missed_ticks)
+        self.tracks: list[Track] = []
+
+    def _observe(self, track: Track, behavior: str) -> None:
+        if behavior == track.behavior:
+            track.candidate, track.candidate_hits = None, 0
+            return
+        if behavior == track.candidate:
+            track.candidate_hits += 1
+        else:
+            track.candidate, track.candidate_hits = behavior, 1
+        if track.candidate_hits >= self.switch_ticks:
+            track.behavior, track.candidate, track.candidate_hits = behavior, None, 0
+
+    def update(self, detections: Detections, names: dict[int, str], confidence_threshold: float) -> dict[str, int]:
+        """Feed one tick of detections and return the smoothed behavior counts."""
+        labels = [str(names.get(int(c), "")).strip() for c in detections.cls.tolist()]
+        keep = np.array(
+            [label in BEHAVIOR_CLASSES for label in labels], dtype=bool
+        ) & (detections.conf >= confidence_threshold)
+        boxes = detections.boxes[keep]
+        behaviors = [label for label, kept in zip(labels, keep.tolist()) if kept]
+
+        matched_tracks: set[int] = set()
+        matched_dets: set[int] = set()
+        if self.tracks and len(boxes):
+            ious = box_iou(np.stack([t.box for t in self.tracks]), boxes)
+            # Greedy association, best overlaps first.
+            for flat in np.argsort(-ious, axis=None):
+                ti, di = divmod(int(flat), ious.shape[1])
+                if ious[ti, di] < self.iou_threshold:
+                    break
+                if ti in matched_tracks or di in matched_dets:
+                    continue
+                matched_tracks.add(ti)
+                matched_dets.add(di)
+                track = self.tracks[ti]
+                track.box = boxes[di]
+                track.missed = 0
+                self._observe(track, behaviors[di])
+
+        survivors = []
+        for index, track in enumerate(self.tracks):
+            if index not in matched_tracks:
+                track.missed += 1
+                if track.missed > self.max_missed_ticks:
+                    continue
+            survivors.append(track)
+        for di in range(len(boxes)):
+            if di not in matched_dets:
+                survivors.append(Track(box=boxes[di], behavior=behaviors[di]))
+        self.tracks = survivors
+
+        counts = {name: 0 for name in BEHAVIOR_CLASSES}
+        for track in self.tracks:
+            counts[track.behavior] += 1
+        return counts
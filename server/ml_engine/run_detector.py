@@ -1,17 +1,27 @@
 from __future__ import annotations
 
 import argparse
+import json
 import os
+import queue
+import threading
 import time
+from datetime import datetime, timezone
 from pathlib import Path
 
 import cv2
 import requests
+from requests.adapters import HTTPAdapter
 from ultralytics import YOLO
 
 DEFAULT_MODEL_PATH = Path(__file__).resolve().parent / "weights" / "Track_1.0.pt"
+DEFAULT_SPOOL_DIR = Path(__file__).resolve().parent / "spool"
 DEFAULT_API_BASE = "http://127.0.0.1:8000/api/v1"
 
+# Responses that will never succeed on retry; those ticks are dropped instead of spooled.
+PERMANENT_FAILURE_STATUSES = {400, 404, 409, 422}
+MAX_BACKOFF_SECONDS = 30.0
+
 
 def _env_int(name: str, default: int) -> int:
     raw = os.getenv(name)
@@ -34,6 +44,190 @@ def normalize_api_url(raw_url: str | None) -> str:
     return f"http://{value}".rstrip("/")
 
 
+class TickJournal:
+    """Append-only on-disk journal of ticks the API has not acknowledged yet.
+
+    Ticks are stored as JSON lines in ``session_<id>.jsonl``. The byte offset of the
+    first unacknowledged tick lives next to it in ``.offset`` and is replaced
+    atomically after every acknowledged batch, so ticks are replayed in capture order
+    and a crash re-sends at most one batch (the API skips duplicates).
+    """
+
+    def __init__(self, directory: Path, session_id: int) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        self.path = directory / f"session_{session_id}.jsonl"
+        self.offset_path = directory / f"session_{session_id}.offset"
+        self.offset = 0
+        if self.offset_path.exists():
+            try:
+                self.offset = int(self.offset_path.read_text().strip() or 0)
+            except ValueError:
+                self.offset = 0
+        self._drop_torn_tail()
+        self.pending = self._count_pending()
+
+    def _drop_torn_tail(self) -> None:
+        if not self.path.exists():
+            return
+        raw = self.path.read_bytes()
+        if raw and not raw.endswith(b"\n"):
+            # Interrupted write: keep only complete lines.
+            with self.path.open("r+b") as handle:
+                handle.truncate(raw.rfind(b"\n") + 1)
+
+    def _count_pending(self) -> int:
+        if not self.path.exists():
+            return 0
+        with self.path.open("rb") as handle:
+            handle.seek(self.offset)
+            return sum(1 for _ in handle)
+
+    def append(self, ticks: list[dict]) -> None:
+        if not ticks:
+            return
+        data = "".join(json.dumps(tick, separators=(",", ":")) + "\n" for tick in ticks)
+        with self.path.open("a", encoding="utf-8") as handle:
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        self.pending += len(ticks)
+
+    def peek(self, limit: int) -> tuple[list[dict], int]:
+        """Return up to ``limit`` of the oldest pending ticks and the offset after them."""
+        ticks: list[dict] = []
+        end = self.offset
+        if not self.path.exists():
+            return ticks, end
+        with self.path.open("rb") as handle:
+            handle.seek(self.offset)
+            for line in handle:
+                end += len(line)
+                if line.strip():
+                    ticks.append(json.loads(line))
+                if len(ticks) >= limit:
+                    break
+        return ticks, end
+
+    def ack(self, end_offset: int, count: int) -> None:
+        self.pending = max(0, self.pending - count)
+        if self.pending == 0:
+            # Everything delivered: start a fresh journal instead of growing forever.
+            self.path.unlink(missing_ok=True)
+            self.offset_path.unlink(missing_ok=True)
+            self.offset = 0
+            return
+        self.offset = end_offset
+        tmp_path = self.offset_path.with_suffix(".offset.tmp")
+        tmp_path.write_text(str(end_offset))
+        os.replace(tmp_path, self.offset_path)
+
+
+class TickSender(threading.Thread):
+    """Delivers ticks to the API off the capture thread.
+
+    Uses one keep-alive HTTP session and posts ticks in batches. While the API is
+    unreachable (or the journal still has a backlog) new ticks go to the journal
+    behind the backlog, which is replayed in order with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        journal: TickJournal,
+        token: str | None,
+        batch_size: int,
+        timeout: tuple[float, float] = (3.0, 10.0),
+    ) -> None:
+        super().__init__(name="tick-sender", daemon=True)
+        self.endpoint = endpoint
+        self.journal = journal
+        self.batch_size = max(1, batch_size)
+        self.timeout = timeout
+        self.ticks: queue.Queue[dict] = queue.Queue()
+        self.stop_event = threading.Event()
+        self.http = requests.Session()
+        self.http.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+        self.http.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+        if token:
+            self.http.headers["Authorization"] = f"Bearer {token}"
+        self._failures = 0
+        self._next_attempt = 0.0
+
+    def submit(self, tick: dict) -> None:
+        self.ticks.put(tick)
+
+    def stop(self, timeout: float = 15.0) -> None:
+        self.stop_event.set()
+        self.join(timeout)
+
+    def _drain(self, wait: float) -> list[dict]:
+        batch: list[dict] = []
+        try:
+            batch.append(self.ticks.get(timeout=wait))
+            while len(batch) < self.batch_size:
+                batch.append(self.ticks.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+
+    def _post(self, batch: list[dict]) -> bool:
+        """Send a batch. True when the API is done with it (accepted or rejected for good)."""
+        try:
+            response = self.http.post(self.endpoint, json={"ticks": batch}, timeout=self.timeout)
+        except requests.RequestException as exc:
+            print(f"ERROR request failed: {exc}")
+            return False
+        if response.status_code == 200:
+            result = response.json()
+            print(f"OK sent {result.get('accepted', len(batch))} tick(s)")
+            return True
+        if response.status_code in PERMANENT_FAILURE_STATUSES:
+            print(f"ERROR {response.status_code}, dropping {len(batch)} tick(s): {response.text}")
+            return True
+        print(f"ERROR {response.status_code}: {response.text}")
+        return False
+
+    def _record_result(self, delivered: bool) -> None:
+        if delivered:
+            self._failures = 0
+            self._next_attempt = 0.0
+            return
+        self._failures += 1
+        delay = min(MAX_BACKOFF_SECONDS, 2.0 ** (self._failures - 1))
+        self._next_attempt = time.monotonic() + delay
+        print(f"API unavailable, spooling to {self.journal.path} (retry in {delay:.0f}s)")
+
+    def _step(self, wait: float) -> None:
+        batch = self._drain(wait)
+        can_send = time.monotonic() >= self._next_attempt
+        if batch:
+            if self.journal.pending or not can_send:
+                self.journal.append(batch)
+            else:
+                delivered = self._post(batch)
+                if not delivered:
+                    self.journal.append(batch)
+                self._record_result(delivered)
+                return
+
+        if self.journal.pending and time.monotonic() >= self._next_attempt:
+            spooled, end_offset = self.journal.peek(self.batch_size)
+            delivered = self._post(spooled)
+            if delivered:
+                self.journal.ack(end_offset, len(spooled))
+            self._record_result(delivered)
+
+    def run(self) -> None:
+        try:
+            while not self.stop_event.is_set():
+                self._step(wait=0.5)
+            # Shutdown: one last delivery attempt, everything else stays in the journal.
+            while not self.ticks.empty():
+                self._step(wait=0.0)
+        finally:
+            self.http.close()
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Run real-time classroom behavior detection and send logs to API."
@@ -80,6 +274,24 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--no-window", action="store_true", help="Disable OpenCV preview window"
     )
+    parser.add_argument(
+        "--token",
+        type=str,
+        default=os.getenv("DETECTOR_API_TOKEN"),
+        help="Bearer token of the teacher account (default: DETECTOR_API_TOKEN env)",
+    )
+    parser.add_argument(
+        "--spool-dir",
+        type=Path,
+        default=Path(os.getenv("DETECTOR_SPOOL_DIR") or DEFAULT_SPOOL_DIR),
+        help="Directory of the on-disk journal for undelivered ticks",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=_env_int("DETECTOR_BATCH_SIZE", 50),
+        help="Maximum ticks per API request (default: 50)",
+    )
     return parser.parse_args()
 
 
@@ -92,6 +304,9 @@ def run_detection(
     inference_imgsz: int,
     camera_index: int,
     show_window: bool,
+    token: str | None = None,
+    spool_dir: Path = DEFAULT_SPOOL_DIR,
+    batch_size: int = 50,
 ) -> None:
     print("CAPSTONE CLASSROOM BEHAVIOR DETECTOR v1.0")
     print("---------------------------------------------")
@@ -108,6 +323,7 @@ def run_detection(
     print(f"Confidence threshold: {confidence_threshold}")
     print(f"Send interval: {interval_seconds}s")
     print(f"Inference image size: {inference_imgsz}")
+    print(f"Spool: {spool_dir}")
 
     try:
         model = YOLO(str(model_file))
@@ -120,9 +336,14 @@ def run_detection(
         print(f"ERROR: Could not open webcam index {camera_index}")
         return
 
+    journal = TickJournal(spool_dir, session_id)
+    if journal.pending:
+        print(f"Replaying {journal.pending} spooled tick(s) from a previous run")
+    sender = TickSender(f"{api_url}/sessions/{session_id}/logs/batch", journal, token, batch_size)
+    sender.start()
+
     print("Starting detection loop. Press 'q' in preview window to stop.")
     last_send_time = 0.0
-    endpoint = f"{api_url}/sessions/{session_id}/log"
 
     try:
         while True:
@@ -157,16 +378,8 @@ def run_detection(
                     if class_name in counts:
                         counts[class_name] += 1
 
-                try:
-                    response = requests.post(endpoint, json=counts, timeout=8)
-                    if response.status_code == 200:
-                        print(f"OK sent: {counts}")
-                    elif response.status_code == 404:
-                        print(f"ERROR session {session_id} not found/inactive")
-                    else:
-                        print(f"ERROR {response.status_code}: {response.text}")
-                except requests.RequestException as exc:
-                    print(f"ERROR request failed: {exc}")
+                counts["captured_at"] = datetime.now(timezone.utc).isoformat()
+                sender.submit(counts)
 
                 last_send_time = current_time
 
@@ -178,6 +391,9 @@ def run_detection(
     finally:
         cap.release()
         cv2.destroyAllWindows()
+        sender.stop()
+        if journal.pending:
+            print(f"{journal.pending} tick(s) left in {journal.path}; they are sent on the next run")
 
 
 if __name__ == "__main__":
@@ -191,4 +407,7 @@ if __name__ == "__main__":
         inference_imgsz=args.imgsz,
         camera_index=args.camera,
         show_window=not args.no_window,
+        token=args.token,
+        spool_dir=args.spool_dir,
+        batch_size=args.batch_size,
     )
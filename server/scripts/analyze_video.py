@@ -0,0 +1,102 @@
+"""Analyse a recorded lecture into a new (ended) class session.
+
+Frames are sampled at the detection interval (or --interval), run through the current
+detector model in batches and stored as timestamped behavior logs with minute rollups,
+exactly as if the session had been monitored live (without alerts).
+
+Run from the /server directory:
+    python scripts/analyze_video.py --video lecture.mp4 --section-id 3 --subject-id 7 --students-present 32
+    python scripts/analyze_video.py --video lecture.mp4 --section-id 3 --subject-id 7 --students-present 32 \
+        --recorded-at 2024-09-02T08:00:00+08:00 --batch-size 16 --inference-mode tiled
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+
+from fastapi import HTTPException  # noqa: E402
+
+from app.db.database import SessionLocal  # noqa: E402
+from app.services import detector_service, video_analysis_service  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Analyse a recorded lecture video into a class session.")
+    parser.add_argument("--video", type=Path, required=True, help="Path to the video file.")
+    parser.add_argument("--section-id", type=int, required=True)
+    parser.add_argument("--subject-id", type=int, required=True)
+    parser.add_argument("--students-present", type=int, required=True)
+    parser.add_argument("--activity-mode", default="LECTURE", help="LECTURE, STUDY or COLLABORATION.")
+    parser.add_argument("--teacher-id", type=int, default=None, help="Defaults to the assigned teacher.")
+    parser.add_argument(
+        "--recorded-at",
+        type=datetime.fromisoformat,
+        default=None,
+        help="ISO timestamp of the first frame (default: now).",
+    )
+    parser.add_argument("--interval", type=float, default=None, help="Seconds between samples (default: setting).")
+    parser.add_argument("--batch-size", type=int, default=video_analysis_service.DEFAULT_BATCH_SIZE)
+    parser.add_argument("--inference-mode", choices=detector_service.INFERENCE_MODES, default="single")
+    parser.add_argument("--no-seek", action="store_true", help="Grab through skipped frames instead of seeking.")
+    return parser.parse_args()
+
+
+def _print_progress(processed: int, total: int, frames_per_second: float) -> None:
+    of_total = f"/{total}" if total else ""
+    print(f"\r  {processed}{of_total} frames  {frames_per_second:.2f} frames/s", end="", flush=True)
+
+
+def main() -> None:
+    args = parse_args()
+    video_path = args.video.resolve()
+    if not video_path.exists():
+        raise SystemExit(f"Video not found: {video_path}")
+
+    db = SessionLocal()
+    session_id = None
+    try:
+        session = video_analysis_service.create_recorded_session(
+            db,
+            section_id=args.section_id,
+            subject_id=args.subject_id,
+            students_present=args.students_present,
+            activity_mode=args.activity_mode.upper(),
+            teacher_id=args.teacher_id,
+            start_time=args.recorded_at,
+        )
+        session_id = session.id
+        print(f"Analysing {video_path.name} into session {session_id}")
+        result = video_analysis_service.analyze_video_into_session(
+            db,
+            session,
+            video_path,
+            inference_mode=args.inference_mode,
+            batch_size=args.batch_size,
+            interval_seconds=args.interval,
+            seek=not args.no_seek,
+            progress_fn=_print_progress,
+        )
+    except (Exception, KeyboardInterrupt) as exc:
+        print()
+        if session_id is not None:
+            video_analysis_service.delete_recorded_session(db, session_id)
+        detail = exc.detail if isinstance(exc, HTTPException) else repr(exc)
+        raise SystemExit(f"Video analysis failed: {detail}")
+    finally:
+        db.close()
+
+    print()
+    print(
+        f"Session {result['session_id']}: {result['samples']} samples over {result['video_seconds']:.0f}s of video, "
+        f"{result['metric_windows']} windows, engagement {result['average_engagement']:.2f}% "
+        f"({result['elapsed_seconds']:.1f}s, {result['frames_per_second']:.2f} frames/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
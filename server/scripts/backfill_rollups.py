@@ -0,0 +1,59 @@
+"""Build the 5-minute, hourly and daily session metrics rollups for existing sessions.
+
+Rollups are maintained as sessions run; this fills them for sessions recorded before
+the rollup tables existed, or rebuilds them after minute windows were edited by hand.
+
+Run from the /server directory:
+    python scripts/backfill_rollups.py
+    python scripts/backfill_rollups.py --session-id 12 --session-id 13
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+os.chdir(ROOT_DIR)
+
+from app.db.database import SessionLocal  # noqa: E402
+from app.models.session import ClassSession  # noqa: E402
+from app.services import rollup_service  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Backfill session metrics rollups.")
+    parser.add_argument("--session-id", type=int, action="append", default=[], help="Session to rebuild (repeatable).")
+    parser.add_argument("--batch-size", type=int, default=50, help="Sessions per commit.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    db = SessionLocal()
+    try:
+        session_ids = args.session_id or [
+            row[0] for row in db.query(ClassSession.id).order_by(ClassSession.id.asc()).all()
+        ]
+        if not session_ids:
+            print("No sessions to backfill.")
+            return
+        start = time.perf_counter()
+        totals: dict[str, int] = {}
+        for index, session_id in enumerate(session_ids, start=1):
+            for table, count in rollup_service.rebuild_session(db, session_id).items():
+                totals[table] = totals.get(table, 0) + count
+            if index % args.batch_size == 0:
+                db.commit()
+                print(f"Processed {index}/{len(session_ids)} sessions...")
+        db.commit()
+        elapsed = time.perf_counter() - start
+        summary = ", ".join(f"{table}: {count}" for table, count in totals.items())
+        print(f"Backfilled {len(session_ids)} sessions in {elapsed:.1f}s ({summary}).")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Compare response_model serialization with FastJSONResponse on the heaviest admin endpoints.
+
+Loads the payloads once through admin_service against the configured database:
+
+    session_detail      the session with most behavior logs, logs_limit=500
+    sessions            admin session list, one full page
+    classes             admin class assignments, one full page
+    engagement_trend    hourly engagement trend of the last --days days
+
+and reports per payload and path the median time to turn the service output into
+the response body, and the body size:
+
+    model       what FastAPI does for ``response_model``: validate the payload,
+                dump it to JSON-compatible Python, encode with ``json``
+    fast        FastJSONResponse: encode the payload as is (orjson when installed)
+    columns     FastJSONResponse of the ``layout=columns`` variant (time series only)
+
+Run from the /server directory:
+    python scripts/benchmark_admin_serialization.py
+    python scripts/benchmark_admin_serialization.py --session-id 42 --days 90 --repeat 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import timedelta
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+os.chdir(ROOT_DIR)
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import func  # noqa: E402
+
+from app.constants import MAX_PAGE_SIZE  # noqa: E402
+from app.core import responses  # noqa: E402
+from app.core.responses import FastJSONResponse, columnar  # noqa: E402
+from app.db.database import SessionLocal  # noqa: E402
+from app.models.session import BehaviorLog  # noqa: E402
+from app.schemas.admin import (  # noqa: E402
+    AdminBehaviorLogPoint,
+    AdminEngagementTrendResponse,
+    AdminMetricPoint,
+    AdminSessionDetail,
+    AdminTrendPoint,
+    PaginatedClassAssignmentsResponse,
+    PaginatedSessionsResponse,
+)
+from app.services import admin_service  # noqa: E402
+from app.utils.datetime import utc_now  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark admin response serialization paths.")
+    parser.add_argument("--session-id", type=int, default=None, help="Session detail (default: most logs).")
+    parser.add_argument("--days", type=int, default=30, help="Engagement trend range.")
+    parser.add_argument("--repeat", type=int, default=30)
+    return parser.parse_args()
+
+
+def model_body(adapter: TypeAdapter, payload) -> bytes:
+    return JSONResponse(adapter.dump_python(adapter.validate_python(payload), mode="json")).body
+
+
+def measure(render, repeat: int) -> dict:
+    times = []
+    body = b""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = render()
+        times.append(time.perf_counter() - start)
+    return {"ms": round(statistics.median(times) * 1000, 3), "bytes": len(body)}
+
+
+def main() -> None:
+    args = parse_args()
+    db = SessionLocal()
+    try:
+        session_id = args.session_id
+        if session_id is None:
+            row = (
+                db.query(BehaviorLog.session_id)
+                .group_by(BehaviorLog.session_id)
+                .order_by(func.count(BehaviorLog.id).desc())
+                .first()
+            )
+            if row is None:
+                raise SystemExit("No behavior logs to benchmark.")
+            session_id = row[0]
+        now = utc_now()
+        detail = admin_service.get_session_detail(db, session_id=session_id, logs_limit=500)
+        trend = admin_service.get_engagement_trend(db, date_from=now - timedelta(days=args.days), date_to=now)
+        payloads = {
+            "session_detail": (
+                AdminSessionDetail,
+                detail,
+                {
+                    **detail,
+                    "logs": columnar(detail["logs"], AdminBehaviorLogPoint.model_fields),
+                    "metrics_rollup": columnar(detail["metrics_rollup"], AdminMetricPoint.model_fields),
+                },
+            ),
+            "sessions": (PaginatedSessionsResponse, admin_service.list_sessions(db, limit=MAX_PAGE_SIZE), None),
+            "classes": (PaginatedClassAssignmentsResponse, admin_service.list_classes(db, limit=MAX_PAGE_SIZE), None),
+            "engagement_trend": (
+                AdminEngagementTrendResponse,
+                trend,
+                {**trend, "points": columnar(trend["points"], AdminTrendPoint.model_fields)},
+            ),
+        }
+    finally:
+        db.close()
+
+    report = {
+        "session_id": session_id,
+        "encoder": "orjson" if responses.orjson is not None else "json",
+        "repeat": args.repeat,
+    }
+    for name, (model, payload, columns) in payloads.items():
+        adapter = TypeAdapter(model)
+        result = {
+            "model": measure(lambda: model_body(adapter, payload), args.repeat),
+            "fast": measure(lambda: FastJSONResponse(payload).body, args.repeat),
+        }
+        if columns is not None:
+            result["columns"] = measure(lambda: FastJSONResponse(columns).body, args.repeat)
+        report[name] = result
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
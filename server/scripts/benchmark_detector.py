@@ -0,0 +1,312 @@
+"""Benchmark detector throughput and per-stage latency for hardware sizing.
+
+Frames (a directory of images, or a video sampled at the detection interval) are kept
+in memory as JPEG bytes and replayed by N concurrent streams, each with its own model
+instance, the way the server runs one detector per classroom. Every frame goes through
+the same stages as the live path:
+
+    decode       cv2.imdecode of the JPEG (what /sessions/{id}/detect does per upload)
+    preprocess   Ultralytics letterbox + tensor conversion
+    inference    forward pass
+    postprocess  Ultralytics NMS + conversion to our Detections arrays
+    ingest       behavior counts + the JSON tick payload the edge client sends
+                 (+ the HTTP round trip when --ingest-url is given)
+
+Every combination of --model x --backend x --imgsz x --batch x --threads x --concurrency
+is run, and the report is printed (or written with --output) as JSON, so results can be
+diffed between releases.
+
+Run from the /server directory:
+    python scripts/benchmark_detector.py --frames path/to/frames
+    python scripts/benchmark_detector.py --video lecture.mp4 --imgsz 480 640 --batch 1 4 --concurrency 1 4 \
+        --backend torch onnx --output bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from itertools import product
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+
+import requests  # noqa: E402
+import torch  # noqa: E402
+import ultralytics  # noqa: E402
+from ultralytics import YOLO  # noqa: E402
+from ultralytics.utils import LOGGER as ULTRALYTICS_LOGGER  # noqa: E402
+
+from app.services import detector_service, video_analysis_service  # noqa: E402
+from app.utils.detection import count_behaviors, detections_from_result  # noqa: E402
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".bmp"}
+STAGES = ("decode", "preprocess", "inference", "postprocess", "ingest")
+EXPORT_FORMATS = {"onnx": "onnx", "openvino": "openvino"}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark detector throughput and stage latency.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--frames", type=Path, help="Directory of frames to replay.")
+    source.add_argument("--video", type=Path, help="Video to sample frames from.")
+    parser.add_argument("--video-interval", type=float, default=3.0, help="Seconds between sampled video frames.")
+    parser.add_argument("--max-frames", type=int, default=200, help="Cap on distinct frames loaded (default: 200).")
+    parser.add_argument(
+        "--model",
+        type=Path,
+        nargs="+",
+        default=None,
+        help="Weight files (default: every .pt/.onnx in the weights directory).",
+    )
+    parser.add_argument("--backend", nargs="+", default=["torch"], choices=["torch", *EXPORT_FORMATS])
+    parser.add_argument("--imgsz", type=int, nargs="+", default=[640])
+    parser.add_argument("--batch", type=int, nargs="+", default=[1], help="Frames per model call.")
+    parser.add_argument("--threads", type=int, nargs="+", default=[0], help="Torch intra-op threads (0 = default).")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1], help="Parallel classroom streams.")
+    parser.add_argument("--passes", type=int, default=1, help="Times each stream replays the frame set.")
+    parser.add_argument("--warmup", type=int, default=2, help="Warm-up calls per stream excluded from timing.")
+    parser.add_argument("--confidence", type=float, default=0.5)
+    parser.add_argument("--ingest-url", type=str, default=None, help="Optional batch log endpoint to POST ticks to.")
+    parser.add_argument("--token", type=str, default=os.getenv("DETECTOR_API_TOKEN"))
+    parser.add_argument(
+        "--export-dir",
+        type=Path,
+        default=Path(ROOT_DIR) / ".benchmark_exports",
+        help="Where exported backends are cached (kept out of the weights directory).",
+    )
+    parser.add_argument("--output", type=Path, default=None, help="Write the JSON report here instead of stdout.")
+    return parser.parse_args()
+
+
+def load_frames(args: argparse.Namespace) -> list[bytes]:
+    encoded: list[bytes] = []
+    if args.frames is not None:
+        for path in sorted(p for p in args.frames.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES):
+            frame = cv2.imread(str(path))
+            if frame is not None:
+                encoded.append(cv2.imencode(".jpg", frame)[1].tobytes())
+            if len(encoded) >= args.max_frames:
+                break
+        return encoded
+
+    fps, frame_count = video_analysis_service.probe_video(args.video)
+    cap = cv2.VideoCapture(str(args.video))
+    try:
+        for _, frame in video_analysis_service.iter_sampled_frames(cap, fps, args.video_interval, frame_count):
+            encoded.append(cv2.imencode(".jpg", frame)[1].tobytes())
+            if len(encoded) >= args.max_frames:
+                break
+    finally:
+        cap.release()
+    return encoded
+
+
+def resolve_model(weights: Path, backend: str, imgsz: int, export_dir: Path) -> Path:
+    if backend == "torch":
+        return weights
+    # Export next to a copy of the weights so the admin weights directory stays clean.
+    target_dir = export_dir / f"{weights.stem}_{imgsz}"
+    target_dir.mkdir(parents=True, exist_ok=True)
+    source = target_dir / weights.name
+    if not source.exists():
+        shutil.copy2(weights, source)
+    suffix = "_openvino_model" if backend == "openvino" else ".onnx"
+    exported = target_dir / f"{weights.stem}{suffix}"
+    if not exported.exists():
+        YOLO(str(source)).export(format=EXPORT_FORMATS[backend], imgsz=imgsz, dynamic=True, verbose=False)
+    return exported
+
+
+def percentiles(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0}
+    arr = np.asarray(values, dtype=np.float64)
+    p50, p95, p99 = np.percentile(arr, [50, 95, 99])
+    return {
+        "mean": round(float(arr.mean()), 3),
+        "p50": round(float(p50), 3),
+        "p95": round(float(p95), 3),
+        "p99": round(float(p99), 3),
+    }
+
+
+class Stream(threading.Thread):
+    """One simulated classroom: decode -> batch inference -> ingest, timing each stage."""
+
+    def __init__(self, model_path: Path, frames: list[bytes], config: dict, args: argparse.Namespace) -> None:
+        super().__init__(daemon=True)
+        self.model = YOLO(str(model_path), task="detect")
+        self.frames = frames
+        self.config = config
+        self.args = args
+        self.stage_ms: dict[str, list[float]] = {stage: [] for stage in STAGES}
+        self.total_ms: list[float] = []
+        self.error: str | None = None
+        self.http = requests.Session() if args.ingest_url else None
+        if self.http is not None and args.token:
+            self.http.headers["Authorization"] = f"Bearer {args.token}"
+
+    def _call(self, raw_batch: list[bytes], record: bool) -> None:
+        start = time.perf_counter()
+        decoded = []
+        for raw in raw_batch:
+            decoded.append(cv2.imdecode(np.frombuffer(raw, dtype=np.uint8), cv2.IMREAD_COLOR))
+        decode_ms = (time.perf_counter() - start) * 1000 / len(raw_batch)
+
+        results = self.model(decoded, imgsz=self.config["imgsz"], verbose=False)
+        convert_start = time.perf_counter()
+        detections = [detections_from_result(result) for result in results]
+        convert_ms = (time.perf_counter() - convert_start) * 1000 / len(raw_batch)
+
+        ingest_start = time.perf_counter()
+        ticks = []
+        for frame_detections in detections:
+            counts = count_behaviors(frame_detections, self.model.names, self.args.confidence)
+            counts["captured_at"] = datetime.now(timezone.utc).isoformat()
+            ticks.append(counts)
+        payload = json.dumps({"ticks": ticks})
+        if self.http is not None:
+            self.http.post(
+                self.args.ingest_url,
+                data=payload,
+                headers={"Content-Type": "application/json"},
+                timeout=10,
+            )
+        ingest_ms = (time.perf_counter() - ingest_start) * 1000 / len(raw_batch)
+        batch_ms = (time.perf_counter() - start) * 1000
+
+        if not record:
+            return
+        for result in results:
+            self.stage_ms["decode"].append(decode_ms)
+            self.stage_ms["preprocess"].append(float(result.speed.get("preprocess") or 0.0))
+            self.stage_ms["inference"].append(float(result.speed.get("inference") or 0.0))
+            self.stage_ms["postprocess"].append(float(result.speed.get("postprocess") or 0.0) + convert_ms)
+            self.stage_ms["ingest"].append(ingest_ms)
+            # Every frame of a batch waits for the whole batch.
+            self.total_ms.append(batch_ms)
+
+    def warm_up(self) -> None:
+        for _ in range(self.args.warmup):
+            self._call(self.frames[: self.config["batch"]], record=False)
+
+    def run(self) -> None:
+        batch = self.config["batch"]
+        try:
+            for _ in range(self.args.passes):
+                for index in range(0, len(self.frames), batch):
+                    self._call(self.frames[index : index + batch], record=True)
+        except Exception as exc:
+            self.error = repr(exc)
+        finally:
+            if self.http is not None:
+                self.http.close()
+
+
+def run_config(model_path: Path, frames: list[bytes], config: dict, args: argparse.Namespace) -> dict:
+    if config["threads"] > 0:
+        torch.set_num_threads(config["threads"])
+    streams = [Stream(model_path, frames, config, args) for _ in range(config["concurrency"])]
+    for stream in streams:
+        stream.warm_up()
+
+    start = time.perf_counter()
+    for stream in streams:
+        stream.start()
+    for stream in streams:
+        stream.join()
+    wall = time.perf_counter() - start
+
+    errors = [stream.error for stream in streams if stream.error]
+    processed = sum(len(stream.total_ms) for stream in streams)
+    report = {
+        **config,
+        "frames": processed,
+        "wall_seconds": round(wall, 3),
+        "throughput_fps": round(processed / wall, 3) if wall > 0 else 0.0,
+        "per_stream_fps": round(processed / wall / len(streams), 3) if wall > 0 else 0.0,
+        "latency_ms": {
+            "total": percentiles([v for stream in streams for v in stream.total_ms]),
+            **{
+                stage: percentiles([v for stream in streams for v in stream.stage_ms[stage]])
+                for stage in STAGES
+            },
+        },
+    }
+    if errors:
+        report["errors"] = errors
+    return report
+
+
+def main() -> None:
+    args = parse_args()
+    # Ultralytics logs export/load progress to stdout, which would corrupt the JSON report.
+    ULTRALYTICS_LOGGER.setLevel(logging.WARNING)
+    frames = load_frames(args)
+    if not frames:
+        raise SystemExit("No frames to benchmark.")
+    models = args.model or detector_service._list_weight_files()
+    if not models:
+        raise SystemExit("No weight files found; pass --model.")
+
+    runs = []
+    default_threads = torch.get_num_threads()
+    for weights, backend, imgsz, batch, threads, concurrency in product(
+        models, args.backend, args.imgsz, args.batch, args.threads, args.concurrency
+    ):
+        config = {
+            "model": Path(weights).name,
+            "backend": backend,
+            "imgsz": imgsz,
+            "batch": batch,
+            "threads": threads,
+            "concurrency": concurrency,
+        }
+        print(f"Running {config}", file=sys.stderr)
+        try:
+            model_path = resolve_model(Path(weights), backend, imgsz, args.export_dir)
+            runs.append(run_config(model_path, frames, config, args))
+        except Exception as exc:
+            runs.append({**config, "errors": [repr(exc)]})
+        finally:
+            torch.set_num_threads(default_threads)
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+            "python": platform.python_version(),
+            "torch": torch.__version__,
+            "ultralytics": ultralytics.__version__,
+            "opencv": cv2.__version__,
+        },
+        "source": str(args.frames or args.video),
+        "distinct_frames": len(frames),
+        "passes": args.passes,
+        "runs": runs,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text)
+        print(f"Wrote {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Compare the indexed admin search with the previous ``ilike('%term%')`` queries.
+
+For every term, both paths run against the configured database --repeat times and
+report the median wall time and the ids they match, per entity type:
+
+    ilike_ms / indexed_ms   median query time in milliseconds
+    ilike_hits / indexed_hits
+    overlap                 ids matched by both paths
+    ilike_only              ids only the ilike path finds (infix matches such as
+                            "son" in "Johnson"; the index matches word prefixes)
+
+Run from the /server directory (after scripts/rebuild_search_index.py):
+    python scripts/benchmark_search.py --term santos --term bsit --term 12
+    python scripts/benchmark_search.py --term math --repeat 50 --output search.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+os.chdir(ROOT_DIR)
+
+from sqlalchemy import String, cast, or_  # noqa: E402
+
+from app.db.database import SessionLocal  # noqa: E402
+from app.models.classroom import ClassSection, Subject  # noqa: E402
+from app.models.session import ClassSession  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services import search_service  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark indexed admin search against ilike.")
+    parser.add_argument("--term", action="append", required=True, help="Search text (repeatable).")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per query (default: 20).")
+    parser.add_argument("--output", type=Path, default=None, help="Write the JSON report here instead of stdout.")
+    return parser.parse_args()
+
+
+def ilike_ids(db, entity_type: str, term: str) -> set[int]:
+    pattern = f"%{term}%"
+    if entity_type == "user":
+        columns = (User.username, User.email, User.fullname, User.firstname, User.lastname)
+        query = db.query(User.id).filter(or_(*(column.ilike(pattern) for column in columns)))
+    elif entity_type == "subject":
+        query = db.query(Subject.id).filter(or_(Subject.name.ilike(pattern), Subject.code.ilike(pattern)))
+    elif entity_type == "section":
+        query = db.query(ClassSection.id).filter(
+            or_(ClassSection.name.ilike(pattern), ClassSection.section_code.ilike(pattern))
+        )
+    else:
+        query = (
+            db.query(ClassSession.id)
+            .join(User, ClassSession.teacher_id == User.id)
+            .join(Subject, ClassSession.subject_id == Subject.id)
+            .join(ClassSection, ClassSession.section_id == ClassSection.id)
+            .filter(
+                or_(
+                    cast(ClassSession.id, String).ilike(pattern),
+                    User.username.ilike(pattern),
+                    User.fullname.ilike(pattern),
+                    Subject.name.ilike(pattern),
+                    ClassSection.name.ilike(pattern),
+                )
+            )
+        )
+    return {row[0] for row in query.all()}
+
+
+def indexed_ids(db, entity_type: str, term: str) -> set[int]:
+    if entity_type == "session":
+        return set(search_service.search_sessions(db, term, limit=10**9))
+    return set(search_service.search(db, entity_type, term, limit=10**9))
+
+
+def timed(fn, repeat: int) -> tuple[float, set[int]]:
+    result: set[int] = set()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000, result
+
+
+def main() -> None:
+    args = parse_args()
+    db = SessionLocal()
+    try:
+        runs = []
+        for term in args.term:
+            for entity_type in (*search_service.ENTITY_TYPES, "session"):
+                ilike_ms, ilike = timed(lambda: ilike_ids(db, entity_type, term), args.repeat)
+                indexed_ms, indexed = timed(lambda: indexed_ids(db, entity_type, term), args.repeat)
+                runs.append(
+                    {
+                        "term": term,
+                        "entity_type": entity_type,
+                        "ilike_ms": round(ilike_ms, 3),
+                        "indexed_ms": round(indexed_ms, 3),
+                        "speedup": round(ilike_ms / indexed_ms, 2) if indexed_ms else None,
+                        "ilike_hits": len(ilike),
+                        "indexed_hits": len(indexed),
+                        "overlap": len(ilike & indexed),
+                        "ilike_only": len(ilike - indexed),
+                    }
+                )
+        report = {
+            "dialect": db.get_bind().dialect.name,
+            "repeat": args.repeat,
+            "runs": runs,
+        }
+    finally:
+        db.close()
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
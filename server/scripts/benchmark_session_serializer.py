@@ -0,0 +1,173 @@
+"""Compare ORM-loaded session serialization with the column read model (session_read_model).
+
+Serializes a teacher's session history (up to --limit rows, newest first) both ways
+against the configured database and reports per path:
+
+    queries                 SQL statements issued
+    fetch_ms                median time to run the queries and build the rows
+    serialize_us_per_row    median serialization time per session row
+
+The ORM path is the previous implementation: ClassSession entities with the
+subject, section, major, department and college joined-loaded, fields read by
+walking ``session.section.major.department.college``. The read model path resolves
+the hierarchy from an already loaded academic_hierarchy snapshot, as a running
+server does between edits of the hierarchy.
+
+Run from the /server directory:
+    python scripts/benchmark_session_serializer.py
+    python scripts/benchmark_session_serializer.py --teacher-id 12 --limit 200 --repeat 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+os.chdir(ROOT_DIR)
+
+from sqlalchemy import event, func  # noqa: E402
+from sqlalchemy.orm import joinedload  # noqa: E402
+
+from app.db.database import SessionLocal, engine  # noqa: E402
+from app.models.classroom import ClassSection, Department, Major  # noqa: E402
+from app.models.session import ClassSession  # noqa: E402
+from app.services import academic_hierarchy, session_read_model  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark session serialization paths.")
+    parser.add_argument("--teacher-id", type=int, default=None, help="Teacher (default: the one with most sessions).")
+    parser.add_argument("--limit", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    return parser.parse_args()
+
+
+def orm_rows(db, teacher_id: int, limit: int):
+    return (
+        db.query(ClassSession)
+        .options(
+            joinedload(ClassSession.subject),
+            joinedload(ClassSession.section)
+            .joinedload(ClassSection.major)
+            .joinedload(Major.department)
+            .joinedload(Department.college),
+        )
+        .filter(ClassSession.teacher_id == teacher_id)
+        .order_by(ClassSession.start_time.desc())
+        .limit(limit)
+        .all()
+    )
+
+
+def orm_serialize(session) -> dict:
+    section = session.section
+    major = section.major if section else None
+    department = major.department if major else None
+    college = department.college if department else None
+    return {
+        "id": session.id,
+        "subject_id": session.subject_id,
+        "section_id": session.section_id,
+        "subject_name": session.subject.name if session.subject else "Unknown",
+        "section_name": section.name if section else "Unknown",
+        "college_id": department.college_id if department else None,
+        "college_name": college.name if college else None,
+        "college_logo_path": college.logo_path if college else None,
+        "department_id": major.department_id if major else None,
+        "department_name": department.name if department else None,
+        "department_code": department.code if department else None,
+        "major_id": section.major_id if section else None,
+        "major_name": major.name if major else None,
+        "major_code": major.code if major else None,
+        "start_time": session.start_time,
+        "end_time": session.end_time,
+        "is_active": session.is_active,
+        "activity_mode": session.activity_mode,
+        "average_engagement": round(float(session.average_engagement), 2) if session.average_engagement else 0.0,
+    }
+
+
+def read_model_rows(db, teacher_id: int, limit: int):
+    return (
+        session_read_model.session_query(db)
+        .filter(ClassSession.teacher_id == teacher_id)
+        .order_by(ClassSession.start_time.desc())
+        .limit(limit)
+        .all()
+    )
+
+
+def measure(db, fetch, serialize, teacher_id: int, limit: int, repeat: int) -> dict:
+    statements = []
+
+    def count(*_args) -> None:
+        statements.append(1)
+
+    fetch_times, serialize_times = [], []
+    rows = []
+    for _ in range(repeat):
+        db.expunge_all()
+        statements.clear()
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            start = time.perf_counter()
+            rows = fetch(db, teacher_id, limit)
+            fetch_times.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            for row in rows:
+                serialize(row)
+            serialize_times.append(time.perf_counter() - start)
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+        queries = len(statements)
+    return {
+        "rows": len(rows),
+        "queries": queries,
+        "fetch_ms": round(statistics.median(fetch_times) * 1000, 3),
+        "serialize_us_per_row": round(statistics.median(serialize_times) * 1e6 / max(1, len(rows)), 2),
+    }
+
+
+def main() -> None:
+    args = parse_args()
+    db = SessionLocal()
+    try:
+        teacher_id = args.teacher_id
+        if teacher_id is None:
+            row = (
+                db.query(ClassSession.teacher_id)
+                .group_by(ClassSession.teacher_id)
+                .order_by(func.count(ClassSession.id).desc())
+                .first()
+            )
+            if row is None:
+                raise SystemExit("No sessions to benchmark.")
+            teacher_id = row[0]
+        hierarchy = academic_hierarchy.snapshot(db)
+        report = {
+            "teacher_id": teacher_id,
+            "limit": args.limit,
+            "repeat": args.repeat,
+            "orm": measure(db, orm_rows, orm_serialize, teacher_id, args.limit, args.repeat),
+            "read_model": measure(
+                db,
+                read_model_rows,
+                lambda row: session_read_model.serialize_session(row, hierarchy),
+                teacher_id,
+                args.limit,
+                args.repeat,
+            ),
+        }
+    finally:
+        db.close()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
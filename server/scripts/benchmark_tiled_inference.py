@@ -0,0 +1,157 @@
+"""Compare single-pass and tiled inference on a folder of classroom frames.
+
+Both modes are run at the same pixel budget by default: the tile size is chosen so
+that rows * cols * tile_imgsz^2 ~= imgsz^2, which keeps CPU cost comparable. If YOLO
+label files are present (``<frames>/labels/<stem>.txt`` or ``<stem>.txt`` next to
+the image) the per-class count error against ground truth is reported as well.
+
+Run from the /server directory:
+    python scripts/benchmark_tiled_inference.py --frames path/to/frames --model ml_engine/weights/best.pt
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+
+from ultralytics import YOLO  # noqa: E402
+
+from app.utils.detection import (  # noqa: E402
+    BEHAVIOR_CLASSES,
+    count_behaviors,
+    detections_from_result,
+    merge_tile_detections,
+    tile_frame,
+)
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".bmp"}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark tiled vs single-pass detection.")
+    parser.add_argument("--frames", type=Path, required=True, help="Directory of frames (optionally with YOLO labels).")
+    parser.add_argument("--model", type=Path, required=True, help="Path to YOLO weights.")
+    parser.add_argument("--imgsz", type=int, default=960, help="Single-pass inference size (default: 960).")
+    parser.add_argument("--rows", type=int, default=2, help="Tile grid rows (default: 2).")
+    parser.add_argument("--cols", type=int, default=2, help="Tile grid columns (default: 2).")
+    parser.add_argument("--overlap", type=float, default=0.2, help="Tile overlap ratio (default: 0.2).")
+    parser.add_argument(
+        "--tile-imgsz",
+        type=int,
+        default=None,
+        help="Tile inference size (default: equal pixel budget to --imgsz).",
+    )
+    parser.add_argument("--confidence", type=float, default=0.5, help="Confidence threshold (default: 0.5).")
+    parser.add_argument("--warmup", type=int, default=2, help="Warm-up frames excluded from timing.")
+    return parser.parse_args()
+
+
+def equal_budget_tile_imgsz(imgsz: int, rows: int, cols: int) -> int:
+    size = imgsz / math.sqrt(max(1, rows * cols))
+    return max(32, int(round(size / 32.0)) * 32)
+
+
+def load_ground_truth(image_path: Path, names: dict[int, str]) -> dict[str, int] | None:
+    candidates = [image_path.parent / "labels" / f"{image_path.stem}.txt", image_path.with_suffix(".txt")]
+    label_path = next((p for p in candidates if p.exists()), None)
+    if label_path is None:
+        return None
+    counts = {name: 0 for name in BEHAVIOR_CLASSES}
+    for line in label_path.read_text().splitlines():
+        parts = line.split()
+        if not parts:
+            continue
+        class_name = str(names.get(int(parts[0]), "")).strip()
+        if class_name in counts:
+            counts[class_name] += 1
+    return counts
+
+
+def percentile(values: list[float], q: float) -> float:
+    return float(np.percentile(np.asarray(values), q)) if values else 0.0
+
+
+def summarize(latencies: list[float], errors: list[dict[str, int]]) -> dict:
+    summary = {
+        "frames": len(latencies),
+        "latency_ms": {
+            "mean": round(float(np.mean(latencies)) if latencies else 0.0, 2),
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+        },
+    }
+    if errors:
+        summary["count_mae"] = {
+            name: round(float(np.mean([abs(e[name]) for e in errors])), 3) for name in BEHAVIOR_CLASSES
+        }
+        summary["count_bias"] = {
+            name: round(float(np.mean([e[name] for e in errors])), 3) for name in BEHAVIOR_CLASSES
+        }
+    return summary
+
+
+def main() -> None:
+    args = parse_args()
+    frames = sorted(p for p in args.frames.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+    if not frames:
+        raise SystemExit(f"No frames found in {args.frames}")
+
+    model = YOLO(str(args.model))
+    names = model.names
+    tile_imgsz = args.tile_imgsz or equal_budget_tile_imgsz(args.imgsz, args.rows, args.cols)
+
+    stats = {
+        "single": {"latencies": [], "errors": []},
+        "tiled": {"latencies": [], "errors": []},
+    }
+    for index, path in enumerate(frames):
+        frame = cv2.imread(str(path))
+        if frame is None:
+            continue
+        truth = load_ground_truth(path, names)
+
+        start = time.perf_counter()
+        single = detections_from_result(model(frame, imgsz=args.imgsz, verbose=False)[0])
+        single_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        tiles, offsets = tile_frame(frame, args.rows, args.cols, args.overlap)
+        results = model(tiles, imgsz=tile_imgsz, verbose=False)
+        tiled = merge_tile_detections([detections_from_result(r) for r in results], offsets)
+        tiled_ms = (time.perf_counter() - start) * 1000
+
+        if index < args.warmup:
+            continue
+        for mode, detections, elapsed in (("single", single, single_ms), ("tiled", tiled, tiled_ms)):
+            stats[mode]["latencies"].append(elapsed)
+            if truth is not None:
+                counts = count_behaviors(detections, names, args.confidence)
+                stats[mode]["errors"].append({name: counts[name] - truth[name] for name in BEHAVIOR_CLASSES})
+
+    report = {
+        "model": str(args.model),
+        "frames_dir": str(args.frames),
+        "single": {"imgsz": args.imgsz, **summarize(**stats["single"])},
+        "tiled": {
+            "grid": [args.rows, args.cols],
+            "overlap": args.overlap,
+            "tile_imgsz": tile_imgsz,
+            **summarize(**stats["tiled"]),
+        },
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""Measure CPU saved by sparser inference with tracking against alert stability.
+
+The detector runs once per frame sampled at --base-interval and the detections are
+cached. Each configuration (interval x tracking on/off) then replays every k-th frame,
+so all configurations see identical model output and only differ in how many inference
+calls they pay for and how counts are derived. Reported per configuration:
+
+    cpu_seconds / cpu_saved_pct   process CPU of the inference calls made (+ tracker)
+    count_flicker                 mean sum of |count change| between consecutive ticks
+    alert_onsets_per_hour         how often an alert condition switches on
+    alert_flaps                   alert conditions active for a single tick only
+    alert_agreement               share of baseline ticks whose alert state matches
+
+Alert conditions mirror the LECTURE rules in engagement_service.process_behavior_log.
+The baseline is --base-interval without tracking.
+
+Run from the /server directory:
+    python scripts/benchmark_tracking.py --video lecture.mp4 --model ml_engine/weights/best.pt
+    python scripts/benchmark_tracking.py --video lecture.mp4 --intervals 1 3 5 10 --switch-ticks 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+
+from ultralytics import YOLO  # noqa: E402
+
+from app.services import video_analysis_service  # noqa: E402
+from app.services.admin import settings_service  # noqa: E402
+from app.services.engagement_service import _weighted_engagement_percent  # noqa: E402
+from app.utils.detection import count_behaviors, detections_from_result  # noqa: E402
+from app.utils.tracking import BehaviorTracker  # noqa: E402
+
+ALERTS = ("sleeping", "phone", "engagement_drop")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark tracking vs inference rate.")
+    parser.add_argument("--video", type=Path, required=True, help="Recorded classroom video.")
+    parser.add_argument("--model", type=Path, required=True, help="Weights to run.")
+    parser.add_argument("--base-interval", type=float, default=1.0, help="Densest interval in seconds (default: 1).")
+    parser.add_argument(
+        "--intervals",
+        type=float,
+        nargs="+",
+        default=[1.0, 2.0, 3.0, 5.0],
+        help="Intervals to compare; rounded to multiples of --base-interval.",
+    )
+    parser.add_argument("--imgsz", type=int, default=None, help="Inference size (default: setting).")
+    parser.add_argument("--confidence", type=float, default=None, help="Confidence threshold (default: setting).")
+    parser.add_argument("--iou", type=float, default=0.3, help="Tracker IoU threshold.")
+    parser.add_argument("--switch-ticks", type=int, default=2, help="Tracker behavior hysteresis in ticks.")
+    parser.add_argument("--max-missed-ticks", type=int, default=2, help="Ticks a missed track keeps counting.")
+    parser.add_argument("--max-frames", type=int, default=3600)
+    parser.add_argument("--output", type=Path, default=None, help="Write the JSON report here instead of stdout.")
+    return parser.parse_args()
+
+
+def alert_state(counts: dict[str, int], weights: dict[str, float]) -> tuple[bool, bool, bool]:
+    total = counts["on_task"] + counts["sleeping"] + counts["using_phone"] + counts["off_task"]
+    if total < 5:
+        return (False, False, False)
+    engagement = _weighted_engagement_percent(
+        on_task=counts["on_task"],
+        using_phone=counts["using_phone"],
+        sleeping=counts["sleeping"],
+        off_task=counts["off_task"],
+        total_detected=total,
+        weights=weights,
+    )
+    return (
+        counts["sleeping"] / total > 0.3,
+        counts["using_phone"] / total > 0.2,
+        engagement < 40,
+    )
+
+
+def stability(series: list[dict[str, int]], states: np.ndarray, hours: float) -> dict:
+    matrix = np.array([[c[k] for k in sorted(c)] for c in series], dtype=np.float64)
+    flicker = float(np.abs(np.diff(matrix, axis=0)).sum(axis=1).mean()) if len(matrix) > 1 else 0.0
+    padded = np.vstack([np.zeros((1, states.shape[1]), dtype=bool), states, np.zeros((1, states.shape[1]), dtype=bool)])
+    onsets = (padded[1:-1] & ~padded[:-2]).sum(axis=0)
+    single_tick = (padded[1:-1] & ~padded[:-2] & ~padded[2:]).sum(axis=0)
+    return {
+        "count_flicker": round(flicker, 3),
+        "alert_ticks": {name: int(states[:, i].sum()) for i, name in enumerate(ALERTS)},
+        "alert_onsets_per_hour": {name: round(float(onsets[i]) / hours, 2) for i, name in enumerate(ALERTS)},
+        "alert_flaps": {name: int(single_tick[i]) for i, name in enumerate(ALERTS)},
+    }
+
+
+def main() -> None:
+    args = parse_args()
+    detection = settings_service.get_detection_settings()
+    imgsz = args.imgsz or int(detection["detection_imgsz"])
+    threshold = args.confidence if args.confidence is not None else detection["detection_confidence_threshold"]
+    weights = settings_service.get_engagement_weights(mode="LECTURE")
+
+    model = YOLO(str(args.model), task="detect")
+    fps, frame_count = video_analysis_service.probe_video(args.video)
+    cap = cv2.VideoCapture(str(args.video))
+    cached = []
+    try:
+        for offset, frame in video_analysis_service.iter_sampled_frames(cap, fps, args.base_interval, frame_count):
+            if not cached:
+                model(frame, imgsz=imgsz, verbose=False)  # warm-up
+            cpu_start = time.process_time()
+            detections = detections_from_result(model(frame, imgsz=imgsz, verbose=False)[0])
+            cached.append((offset, detections, time.process_time() - cpu_start))
+            if len(cached) >= args.max_frames:
+                break
+    finally:
+        cap.release()
+    if len(cached) < 2:
+        raise SystemExit("Video too short for a tracking benchmark.")
+    hours = max((cached[-1][0] + args.base_interval) / 3600.0, 1e-9)
+    print(f"Cached detections for {len(cached)} frames", file=sys.stderr)
+
+    baseline_states: np.ndarray | None = None
+    baseline_cpu = 0.0
+    runs = []
+    steps = sorted({1} | {max(1, int(round(interval / args.base_interval))) for interval in args.intervals})
+    for step in steps:
+        for tracking in (False, True):
+            ticks = cached[::step]
+            tracker = BehaviorTracker(args.iou, args.switch_ticks, args.max_missed_ticks) if tracking else None
+            series = []
+            tracker_cpu = 0.0
+            for _, detections, _ in ticks:
+                if tracker is None:
+                    series.append(count_behaviors(detections, model.names, threshold))
+                else:
+                    start = time.process_time()
+                    series.append(tracker.update(detections, model.names, threshold))
+                    tracker_cpu += time.process_time() - start
+            states = np.array([alert_state(counts, weights) for counts in series], dtype=bool)
+            cpu = sum(cpu_seconds for _, _, cpu_seconds in ticks) + tracker_cpu
+
+            if baseline_states is None:
+                baseline_states, baseline_cpu = states, cpu
+            # Hold each tick's alert state until the next tick and compare on the baseline grid.
+            held = np.repeat(states, step, axis=0)[: len(baseline_states)]
+            agreement = float((held == baseline_states[: len(held)]).all(axis=1).mean())
+
+            runs.append(
+                {
+                    "interval_seconds": step * args.base_interval,
+                    "tracking": tracking,
+                    "inference_calls": len(ticks),
+                    "cpu_seconds": round(cpu, 3),
+                    "tracker_cpu_seconds": round(tracker_cpu, 4),
+                    "cpu_saved_pct": round(100.0 * (1 - cpu / baseline_cpu), 1) if baseline_cpu else 0.0,
+                    "alert_agreement": round(agreement, 4),
+                    **stability(series, states, hours),
+                }
+            )
+
+    report = {
+        "video": str(args.video),
+        "model": str(args.model),
+        "imgsz": imgsz,
+        "confidence_threshold": threshold,
+        "tracker": {"iou": args.iou, "switch_ticks": args.switch_ticks, "max_missed_ticks": args.max_missed_ticks},
+        "frames": len(cached),
+        "runs": runs,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
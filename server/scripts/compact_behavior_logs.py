@@ -0,0 +1,69 @@
+"""Move behavior logs of long-ended sessions out of behavior_logs into per-session archives.
+
+Sessions that ended more than `admin_ops.behavior_log_retention_days` ago (admin
+settings, default 90) are archived, verified against their minute rollups and deleted
+from the table in chunks. Safe to run repeatedly, e.g. nightly from cron: a run that
+was interrupted while deleting is finished by the next one.
+
+Run from the /server directory:
+    python scripts/compact_behavior_logs.py
+    python scripts/compact_behavior_logs.py --days 30 --limit 200
+    python scripts/compact_behavior_logs.py --session-id 12
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+os.chdir(ROOT_DIR)
+
+from app.db.database import SessionLocal  # noqa: E402
+from app.services import log_archive_service  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Archive behavior logs of ended sessions.")
+    parser.add_argument("--days", type=int, default=None, help="Override the retention period in days.")
+    parser.add_argument("--limit", type=int, default=None, help="Archive at most this many sessions.")
+    parser.add_argument(
+        "--session-id", type=int, action="append", default=[], help="Archive this ended session now (repeatable)."
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        results = log_archive_service.compact_ended_sessions(
+            db,
+            retention_days=0 if args.session_id else args.days,
+            limit=args.limit,
+            session_ids=args.session_id or None,
+        )
+        if not results:
+            print("No sessions to archive.")
+            return
+        archived = [r for r in results if "skipped" not in r]
+        for result in results:
+            if "skipped" in result:
+                print(f"Session {result['session_id']}: skipped ({result['skipped']})")
+            elif result.get("resumed"):
+                print(f"Session {result['session_id']}: deleted {result['deleted']} remaining logs ({result['archive']})")
+            else:
+                print(f"Session {result['session_id']}: {result['logs']} logs -> {result['archive']} ({result['bytes']} bytes)")
+        elapsed = time.perf_counter() - start
+        print(
+            f"Archived {len(archived)} sessions, {sum(r['logs'] for r in archived)} logs "
+            f"({len(results) - len(archived)} skipped) in {elapsed:.1f}s."
+        )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
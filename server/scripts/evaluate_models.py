@@ -0,0 +1,88 @@
+"""Evaluate detector weight files on a labelled frame set and store the results.
+
+For every weight file and imgsz this reports per-class precision/recall at the
+confidence threshold (IoU >= --iou matching), per-frame count error on the five
+behaviors and CPU frames/sec. Results are saved next to the weights so the admin model
+picker shows them beside each file.
+
+Frames can come from scripts/extract_video_frames.py once labelled in YOLO format.
+
+Run from the /server directory:
+    python scripts/evaluate_models.py --frames path/to/labelled_frames
+    python scripts/evaluate_models.py --frames path/to/labelled_frames --model ml_engine/weights/best.pt --imgsz 480 640
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+
+from app.services import detector_service, model_evaluation_service  # noqa: E402
+from app.services.admin import settings_service  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Evaluate detector weights on a YOLO-labelled frame set.")
+    parser.add_argument("--frames", type=Path, required=True, help="Directory of labelled frames.")
+    parser.add_argument(
+        "--model",
+        type=Path,
+        nargs="+",
+        default=None,
+        help="Weight files (default: every .pt/.onnx in the weights directory).",
+    )
+    parser.add_argument("--imgsz", type=int, nargs="+", default=None, help="Sizes to evaluate (default: setting).")
+    parser.add_argument("--confidence", type=float, default=None, help="Confidence threshold (default: setting).")
+    parser.add_argument("--iou", type=float, default=0.5, help="IoU for a prediction to match a label.")
+    parser.add_argument("--no-save", action="store_true", help="Print results without storing them.")
+    parser.add_argument("--json", action="store_true", help="Also print each result as a JSON line.")
+    return parser.parse_args()
+
+
+def _format(value) -> str:
+    return "   -  " if value is None else f"{value:6.3f}"
+
+
+def main() -> None:
+    args = parse_args()
+    frames = model_evaluation_service.load_dataset(args.frames)
+    if not frames:
+        raise SystemExit(f"No labelled frames found in {args.frames}")
+    dataset_names = model_evaluation_service.load_dataset_names(args.frames)
+
+    detection = settings_service.get_detection_settings()
+    confidence = args.confidence if args.confidence is not None else detection["detection_confidence_threshold"]
+    sizes = args.imgsz or [int(detection["detection_imgsz"])]
+    models = [path.resolve() for path in (args.model or detector_service._list_weight_files())]
+    if not models:
+        raise SystemExit("No weight files found; pass --model.")
+
+    print(f"{len(frames)} labelled frames, confidence {confidence}, IoU {args.iou}")
+    for weights in models:
+        for imgsz in sizes:
+            result = model_evaluation_service.evaluate_weights(
+                weights, frames, imgsz, confidence, args.iou, dataset_names
+            )
+            if not args.no_save:
+                model_evaluation_service.save_evaluation(weights, result, dataset=str(args.frames))
+            print(
+                f"\n{weights.name} @ {imgsz}: P {_format(result['macro_precision'])}  "
+                f"R {_format(result['macro_recall'])}  count MAE {_format(result['count_mae'])}  "
+                f"{result['cpu_fps'] or 0:.2f} fps (CPU)"
+            )
+            for name, stats in result["classes"].items():
+                print(
+                    f"  {name:<12} P {_format(stats['precision'])}  R {_format(stats['recall'])}  "
+                    f"count MAE {_format(stats['count_mae'])}  bias {_format(stats['count_bias'])}  "
+                    f"n={stats['support']}"
+                )
+            if args.json:
+                print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Write the frozen summary (session_summaries) of ended sessions.
+
+Sessions are finalized when they stop; this covers sessions that ended before the
+summaries existed, or recomputes summaries on demand.
+
+Run from the /server directory:
+    python scripts/finalize_sessions.py
+    python scripts/finalize_sessions.py --all
+    python scripts/finalize_sessions.py --session-id 12 --session-id 13
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+os.chdir(ROOT_DIR)
+
+from app.db.database import SessionLocal  # noqa: E402
+from app.models.session import ClassSession, SessionSummary  # noqa: E402
+from app.services import session_summary_service  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Finalize ended sessions into session summaries.")
+    parser.add_argument("--session-id", type=int, action="append", default=[], help="Session to finalize (repeatable).")
+    parser.add_argument("--all", action="store_true", help="Recompute summaries that already exist too.")
+    parser.add_argument("--batch-size", type=int, default=50, help="Sessions per commit.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    db = SessionLocal()
+    try:
+        if args.session_id:
+            session_ids = args.session_id
+        else:
+            query = db.query(ClassSession.id).filter(ClassSession.is_active == False)  # noqa: E712
+            if not args.all:
+                query = query.outerjoin(SessionSummary, SessionSummary.session_id == ClassSession.id).filter(
+                    SessionSummary.id.is_(None)
+                )
+            session_ids = [row[0] for row in query.order_by(ClassSession.id.asc()).all()]
+        if not session_ids:
+            print("No sessions to finalize.")
+            return
+        start = time.perf_counter()
+        finalized = 0
+        for index, session_id in enumerate(session_ids, start=1):
+            if session_summary_service.finalize_session(db, session_id) is not None:
+                finalized += 1
+            if index % args.batch_size == 0:
+                db.commit()
+                print(f"Processed {index}/{len(session_ids)} sessions...")
+        db.commit()
+        print(f"Finalized {finalized}/{len(session_ids)} sessions in {time.perf_counter() - start:.1f}s.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Produce an INT8 ONNX Runtime model for CPU-only classrooms, validated before publishing.
+
+Pipeline:
+    1. export the FP32 weights to ONNX (dynamic input size, so tiled inference still works)
+    2. static post-training quantization (QDQ, per-channel INT8 weights / UINT8
+       activations), calibrated on a sample of our own classroom frames; only the
+       convolutions are quantized and the box-decoding tail (DFL onwards) stays float
+    3. evaluate the FP32 weights and the INT8 model on a held-out, YOLO-labelled set
+    4. publish ``<stem>_int8.onnx`` into the weights directory only if the per-frame count
+       MAE grew by at most --max-mae-increase; otherwise exit non-zero and keep the
+       artifact in the work directory for inspection
+
+The published file shows up in the admin model picker (with its evaluation) and is
+loaded by detector_service like any .pt file.
+
+Requires the optional packages: pip install onnx onnxruntime onnxscript
+
+Run from the /server directory:
+    python scripts/quantize_model.py --model ml_engine/weights/best.pt --calib frames/calib --val frames/val_labelled
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import shutil
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+
+from ultralytics import YOLO  # noqa: E402
+from ultralytics.data.augment import LetterBox  # noqa: E402
+
+from app.services import detector_service, model_evaluation_service  # noqa: E402
+from app.services.admin import settings_service  # noqa: E402
+
+try:
+    import onnx
+    from onnxruntime.quantization import (
+        CalibrationDataReader,
+        CalibrationMethod,
+        QuantFormat,
+        QuantType,
+        quantize_static,
+    )
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+except ImportError:  # pragma: no cover - optional dependency
+    onnx = None
+    CalibrationDataReader = object
+
+CALIBRATION_METHODS = {"minmax": "MinMax", "entropy": "Entropy", "percentile": "Percentile"}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Quantize detector weights to INT8 ONNX and validate them.")
+    parser.add_argument("--model", type=Path, required=True, help="FP32 .pt weights.")
+    parser.add_argument("--calib", type=Path, required=True, help="Directory of calibration frames.")
+    parser.add_argument("--val", type=Path, required=True, help="Held-out frames labelled in YOLO format.")
+    parser.add_argument("--calib-size", type=int, default=200, help="Calibration frames sampled (default: 200).")
+    parser.add_argument("--imgsz", type=int, default=None, help="Calibration/validation size (default: setting).")
+    parser.add_argument("--confidence", type=float, default=None, help="Confidence threshold (default: setting).")
+    parser.add_argument("--calibration-method", choices=sorted(CALIBRATION_METHODS), default="minmax")
+    parser.add_argument(
+        "--max-mae-increase",
+        type=float,
+        default=0.25,
+        help="Largest allowed increase in per-frame count MAE vs FP32 (default: 0.25 students).",
+    )
+    parser.add_argument("--work-dir", type=Path, default=Path(ROOT_DIR) / ".quantization")
+    parser.add_argument("--force", action="store_true", help="Publish even when the accuracy bound is exceeded.")
+    return parser.parse_args()
+
+
+class FrameCalibrationReader(CalibrationDataReader):
+    """Feeds frames preprocessed exactly like Ultralytics ONNX inference (square letterbox)."""
+
+    def __init__(self, frames: list[Path], imgsz: int, input_name: str) -> None:
+        self.frames = iter(frames)
+        self.letterbox = LetterBox(new_shape=(imgsz, imgsz), auto=False, stride=32)
+        self.input_name = input_name
+
+    def get_next(self) -> dict | None:
+        for path in self.frames:
+            frame = cv2.imread(str(path))
+            if frame is None:
+                continue
+            image = self.letterbox(image=frame)[:, :, ::-1].transpose(2, 0, 1)
+            tensor = np.ascontiguousarray(image, dtype=np.float32)[None] / 255.0
+            return {self.input_name: tensor}
+        return None
+
+
+def sample_calibration_frames(directory: Path, size: int) -> list[Path]:
+    frames = sorted(p for p in directory.rglob("*") if p.suffix.lower() in model_evaluation_service.IMAGE_SUFFIXES)
+    random.Random(0).shuffle(frames)
+    return frames[:size]
+
+
+def float_tail_nodes(model: "onnx.ModelProto") -> list[str]:
+    """Nodes from the DFL softmax to the outputs: box decoding that INT8 degrades badly."""
+    consumers: dict[str, list] = {}
+    for node in model.graph.node:
+        for name in node.input:
+            consumers.setdefault(name, []).append(node)
+    excluded: set[str] = set()
+    stack = [node for node in model.graph.node if node.op_type == "Softmax"]
+    while stack:
+        node = stack.pop()
+        if node.name in excluded:
+            continue
+        excluded.add(node.name)
+        for output in node.output:
+            stack.extend(consumers.get(output, []))
+    return sorted(excluded)
+
+
+def export_fp32_onnx(weights: Path, imgsz: int, work_dir: Path) -> Path:
+    source = work_dir / weights.name
+    shutil.copy2(weights, source)
+    exported = Path(YOLO(str(source)).export(format="onnx", imgsz=imgsz, dynamic=True, simplify=True, verbose=False))
+    # Newer torch exporters write weights to a side .data file; fold them back into one file.
+    onnx.save(onnx.load(str(exported)), str(exported), save_as_external_data=False)
+    exported.with_name(f"{exported.name}.data").unlink(missing_ok=True)
+    return exported
+
+
+def quantize(fp32_path: Path, calib_frames: list[Path], imgsz: int, method: str, output: Path) -> Path:
+    prepared = fp32_path.with_name(f"{fp32_path.stem}_prep.onnx")
+    quant_pre_process(str(fp32_path), str(prepared), skip_symbolic_shape=True)
+    fp32_model = onnx.load(str(fp32_path))
+    reader = FrameCalibrationReader(calib_frames, imgsz, fp32_model.graph.input[0].name)
+    quantize_static(
+        str(prepared),
+        str(output),
+        reader,
+        quant_format=QuantFormat.QDQ,
+        op_types_to_quantize=["Conv"],
+        per_channel=True,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        nodes_to_exclude=float_tail_nodes(fp32_model),
+        calibrate_method=getattr(CalibrationMethod, CALIBRATION_METHODS[method]),
+    )
+    # Ultralytics reads class names, stride and task from the metadata; quantization drops it.
+    quantized = onnx.load(str(output))
+    del quantized.metadata_props[:]
+    for prop in fp32_model.metadata_props:
+        quantized.metadata_props.add(key=prop.key, value=prop.value)
+    onnx.save(quantized, str(output))
+    return output
+
+
+def main() -> None:
+    args = parse_args()
+    if onnx is None:
+        raise SystemExit("INT8 quantization needs the optional packages: pip install onnx onnxruntime onnxscript")
+    weights = args.model.resolve()
+    if weights.suffix.lower() != ".pt":
+        raise SystemExit("--model must be a .pt file")
+
+    detection = settings_service.get_detection_settings()
+    imgsz = args.imgsz or int(detection["detection_imgsz"])
+    confidence = args.confidence if args.confidence is not None else detection["detection_confidence_threshold"]
+    calib_frames = sample_calibration_frames(args.calib, args.calib_size)
+    if not calib_frames:
+        raise SystemExit(f"No calibration frames found in {args.calib}")
+    val_frames = model_evaluation_service.load_dataset(args.val)
+    if not val_frames:
+        raise SystemExit(f"No labelled validation frames found in {args.val}")
+    dataset_names = model_evaluation_service.load_dataset_names(args.val)
+
+    work_dir = args.work_dir / f"{weights.stem}_{imgsz}"
+    work_dir.mkdir(parents=True, exist_ok=True)
+    print(f"Exporting {weights.name} to ONNX at {imgsz}px")
+    fp32_onnx = export_fp32_onnx(weights, imgsz, work_dir)
+    print(f"Calibrating on {len(calib_frames)} frames ({args.calibration_method})")
+    int8_path = quantize(fp32_onnx, calib_frames, imgsz, args.calibration_method, work_dir / f"{weights.stem}_int8.onnx")
+
+    print(f"Validating on {len(val_frames)} held-out frames")
+    fp32 = model_evaluation_service.evaluate_weights(weights, val_frames, imgsz, confidence, 0.5, dataset_names)
+    int8 = model_evaluation_service.evaluate_weights(int8_path, val_frames, imgsz, confidence, 0.5, dataset_names)
+    increase = (int8["count_mae"] or 0.0) - (fp32["count_mae"] or 0.0)
+    speedup = (int8["cpu_fps"] or 0.0) / fp32["cpu_fps"] if fp32["cpu_fps"] else 0.0
+    print(f"  FP32: count MAE {fp32['count_mae']}, recall {fp32['macro_recall']}, {fp32['cpu_fps']} fps")
+    print(f"  INT8: count MAE {int8['count_mae']}, recall {int8['macro_recall']}, {int8['cpu_fps']} fps")
+    print(f"  count MAE increase {increase:+.3f} (bound {args.max_mae_increase}), speed-up x{speedup:.2f}")
+
+    if increase > args.max_mae_increase and not args.force:
+        print(f"Refusing to publish: accuracy drop exceeds the bound. Artifact kept at {int8_path}")
+        raise SystemExit(1)
+
+    published = detector_service._weights_dir / int8_path.name
+    published.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy2(int8_path, published)
+    model_evaluation_service.save_evaluation(weights, fp32, dataset=str(args.val))
+    model_evaluation_service.save_evaluation(published, int8, dataset=str(args.val))
+    print(f"Published {published}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Rebuild the admin search index of users, subjects and class sections.
+
+The index is maintained as rows change; this fills it for rows created before the
+search tables existed, or after rows were edited outside the ORM.
+
+Run from the /server directory:
+    python scripts/rebuild_search_index.py
+    python scripts/rebuild_search_index.py --type user --type section
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+os.chdir(ROOT_DIR)
+
+from app.db.database import SessionLocal  # noqa: E402
+from app.services import search_service  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rebuild the admin search index.")
+    parser.add_argument(
+        "--type",
+        choices=search_service.ENTITY_TYPES,
+        action="append",
+        default=[],
+        help="Entity type to rebuild (repeatable, default: all).",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        counts = search_service.rebuild_index(db, args.type or None)
+        db.commit()
+        elapsed = time.perf_counter() - start
+        summary = ", ".join(f"{entity_type}: {count}" for entity_type, count in counts.items())
+        print(f"Rebuilt the search index in {elapsed:.1f}s ({summary}).")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Re-score past sessions from their stored raw detections (no model inference).
+
+Recomputes BehaviorLog counts, minute rollups and the cached session engagement for a
+new confidence threshold. Only sessions recorded with `store_raw_detections` enabled
+can be re-scored.
+
+Run from the /server directory:
+    python scripts/rescore_sessions.py --threshold 0.4 --session-id 12 --session-id 13
+    python scripts/rescore_sessions.py --threshold 0.4 --all
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+os.chdir(ROOT_DIR)
+
+from fastapi import HTTPException  # noqa: E402
+
+from app.db.database import SessionLocal  # noqa: E402
+from app.services import raw_detection_service  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Re-score sessions from stored raw detections.")
+    parser.add_argument("--threshold", type=float, required=True, help="New confidence threshold (0-1).")
+    parser.add_argument("--session-id", type=int, action="append", default=[], help="Session to re-score (repeatable).")
+    parser.add_argument("--all", action="store_true", help="Re-score every session with a raw detection file.")
+    return parser.parse_args()
+
+
+def _stored_session_ids() -> list[int]:
+    store_dir = raw_detection_service.session_store_path(0).parent
+    if not store_dir.exists():
+        return []
+    ids = []
+    for path in store_dir.glob("session_*.ttdet"):
+        suffix = path.stem.split("_", 1)[-1]
+        if suffix.isdigit():
+            ids.append(int(suffix))
+    return sorted(ids)
+
+
+def main() -> None:
+    args = parse_args()
+    session_ids = _stored_session_ids() if args.all else args.session_id
+    if not session_ids:
+        print("No sessions to re-score.")
+        return
+
+    db = SessionLocal()
+    try:
+        for session_id in session_ids:
+            start = time.perf_counter()
+            try:
+                result = raw_detection_service.rescore_session(db, session_id, args.threshold)
+            except HTTPException as exc:
+                db.rollback()
+                print(f"Session {session_id}: skipped ({exc.detail})")
+                continue
+            elapsed = time.perf_counter() - start
+            print(
+                f"Session {session_id}: {result['logs_updated']} logs, {result['metric_windows']} windows, "
+                f"engagement {result['average_engagement']:.2f}% ({elapsed:.2f}s)"
+            )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
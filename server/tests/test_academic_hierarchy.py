@@ -0,0 +1,64 @@
+import unittest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+import app.models  # noqa: F401
+from app.models.classroom import ClassSection, College, Department, Major, Subject
+from app.services import academic_hierarchy
+
+
+class TestAcademicHierarchy(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        college = College(name="College of Science", acronym="CS", logo_path="/cs.png")
+        self.db.add(college)
+        self.db.flush()
+        department = Department(college_id=college.id, name="Mathematics", code="MATH")
+        self.db.add(department)
+        self.db.flush()
+        self.major = Major(department_id=department.id, name="Applied Math", code="BS-AM")
+        self.db.add(self.major)
+        self.db.flush()
+        self.db.add(ClassSection(name="BS-AM-1A", major_id=self.major.id, year_level=1, section_code="A"))
+        self.db.add(Subject(major_id=self.major.id, name="Calculus", code="MATH101"))
+        self.db.commit()
+        academic_hierarchy.invalidate()
+
+    def tearDown(self) -> None:
+        self.db.close()
+        self.engine.dispose()
+
+    def test_major_resolves_department_and_college(self) -> None:
+        hierarchy = academic_hierarchy.snapshot(self.db)
+        major = hierarchy.major(self.major.id)
+        self.assertEqual((major["major_code"], major["department_code"]), ("BS-AM", "MATH"))
+        self.assertEqual((major["college_name"], major["college_logo_path"]), ("College of Science", "/cs.png"))
+        self.assertIsNone(hierarchy.major(None)["college_name"])
+        self.assertIs(academic_hierarchy.snapshot(self.db), hierarchy)
+
+    def test_invalidate_reloads_edits(self) -> None:
+        hierarchy = academic_hierarchy.snapshot(self.db)
+        self.major.name = "Pure Math"
+        self.db.commit()
+        self.assertEqual(academic_hierarchy.snapshot(self.db).major(self.major.id)["major_name"], "Applied Math")
+        academic_hierarchy.invalidate()
+        reloaded = academic_hierarchy.snapshot(self.db)
+        self.assertEqual(reloaded.major(self.major.id)["major_name"], "Pure Math")
+        self.assertGreater(reloaded.version, hierarchy.version)
+
+    def test_unknown_id_reloads_after_miss_interval(self) -> None:
+        academic_hierarchy.snapshot(self.db)
+        section = ClassSection(name="BS-AM-1B", major_id=self.major.id, year_level=1, section_code="B")
+        self.db.add(section)
+        self.db.commit()
+        original = academic_hierarchy.MISS_RELOAD_INTERVAL_SECONDS
+        academic_hierarchy.MISS_RELOAD_INTERVAL_SECONDS = 0.0
+        try:
+            hierarchy = academic_hierarchy.snapshot(self.db, section_ids=[section.id])
+        finally:
+            academic_hierarchy.MISS_RELOAD_INTERVAL_SECONDS = original
+        self.assertEqual(hierarchy.section(section.id)["name"], "BS-AM-1B")
@@ -0,0 +1,43 @@
+import threading
+import time
+import unittest
+
+from app.services.detector_service import _degraded_settings
+from app.utils.admission import InferenceAdmissionController
+
+
+class TestInferenceAdmission(unittest.TestCase):
+    def test_exam_is_granted_before_queued_lectures(self) -> None:
+        controller = InferenceAdmissionController(slots=1)
+        self.assertTrue(controller.acquire(1, "LECTURE", 0.1, time.time() + 1))
+        granted: list[int] = []
+
+        def request(session_id: int, mode: str) -> None:
+            if controller.acquire(session_id, mode, 0.1, time.time() + 2):
+                granted.append(session_id)
+                controller.release()
+
+        threads = [threading.Thread(target=request, args=(2, "LECTURE"))]
+        threads[0].start()
+        time.sleep(0.05)
+        threads.append(threading.Thread(target=request, args=(3, "EXAM")))
+        threads[1].start()
+        time.sleep(0.05)
+        controller.release()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(granted, [3, 2])
+
+    def test_request_is_refused_at_its_deadline(self) -> None:
+        controller = InferenceAdmissionController(slots=1)
+        self.assertTrue(controller.acquire(1, "EXAM", 0.1, time.time() + 1))
+        self.assertFalse(controller.acquire(2, "EXAM", 0.1, time.time() + 0.05))
+        self.assertEqual(controller.stats()["waiting"], 0)
+
+    def test_degradation_ladder(self) -> None:
+        settings = {"detect_interval_seconds": 3, "detection_imgsz": 640, "tile_imgsz": 640}
+        self.assertEqual(_degraded_settings(settings, "tiled", 0), (settings, "tiled", 3.0))
+        level1, mode1, _ = _degraded_settings(settings, "tiled", 1)
+        self.assertEqual((level1["detection_imgsz"], mode1), (480, "tiled"))
+        level3, mode3, interval3 = _degraded_settings(settings, "tiled", 3)
+        self.assertEqual((level3["detection_imgsz"], mode3, interval3), (320, "single", 6.0))
@@ -0,0 +1,83 @@
+import unittest
+from datetime import timedelta
+
+from sqlalchemy import BigInteger, create_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+import app.models  # noqa: F401
+from app.models.session import Alert, BehaviorLog, ClassSession
+from app.models.user import User
+from app.schemas.session import BehaviorLogBatchItem
+from app.services import engagement_service, live_session_store, rollup_service
+from app.utils.datetime import utc_now
+
+
+@compiles(BigInteger, "sqlite")
+def _bigint_as_integer(_type, _compiler, **_kw) -> str:
+    # SQLite only autoincrements INTEGER PRIMARY KEY columns.
+    return "INTEGER"
+
+
+def _item(captured_at, sleeping: int = 0) -> BehaviorLogBatchItem:
+    return BehaviorLogBatchItem(captured_at=captured_at, on_task=6 - sleeping, sleeping=sleeping)
+
+
+class TestBehaviorLogBatch(unittest.TestCase):
+    def setUp(self) -> None:
+        live_session_store.clear()
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        teacher = User(username="teacher")
+        self.db.add(teacher)
+        self.db.flush()
+        self.teacher_id = teacher.id
+        session = ClassSession(teacher_id=teacher.id, students_present=6, activity_mode="LECTURE", is_active=True)
+        self.db.add(session)
+        self.db.commit()
+        self.session_id = session.id
+        self.now = utc_now().replace(microsecond=0)
+
+    def tearDown(self) -> None:
+        rollup_service.forget(self.session_id)
+        live_session_store.clear()
+        self.db.close()
+        self.engine.dispose()
+
+    def _ingest(self, items) -> dict:
+        return engagement_service.process_behavior_log_batch(self.db, self.session_id, items, self.teacher_id)
+
+    def _alert_times(self, alert_type: str) -> list:
+        rows = self.db.query(Alert.triggered_at).filter(Alert.alert_type == alert_type).order_by(Alert.triggered_at)
+        return [row[0].replace(tzinfo=None) for row in rows]
+
+    def test_one_log_per_capture_second(self) -> None:
+        start = self.now - timedelta(seconds=30)
+        items = [
+            _item(start),
+            _item(start + timedelta(milliseconds=400)),
+            _item(start + timedelta(seconds=3)),
+        ]
+        result = self._ingest(items)
+        self.assertEqual(result, {"accepted": 2, "duplicates": 1, "statuses": ["accepted", "duplicate", "accepted"]})
+
+        # A resent batch (lost response) adds nothing; new ticks in it still count.
+        result = self._ingest([*items, _item(start + timedelta(seconds=6))])
+        self.assertEqual(result["statuses"], ["duplicate", "duplicate", "duplicate", "accepted"])
+        self.assertEqual(self.db.query(BehaviorLog).count(), 3)
+
+    def test_replayed_ticks_alert_at_their_capture_time(self) -> None:
+        stale = self.now - timedelta(minutes=30)
+        recent = self.now - timedelta(minutes=2)
+        result = self._ingest([
+            _item(stale, sleeping=4),
+            _item(recent, sleeping=4),
+            # Within the cooldown of the previous alert.
+            _item(recent + timedelta(seconds=3), sleeping=4),
+        ])
+        self.assertEqual(result["accepted"], 3)
+        # The stale minute is over: no alert for it, and it does not start a cooldown.
+        self.assertEqual(self._alert_times("SLEEPING"), [recent.replace(tzinfo=None)])
+        self.assertEqual(self._alert_times("ENGAGEMENT_DROP"), [recent.replace(tzinfo=None)])
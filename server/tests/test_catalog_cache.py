@@ -0,0 +1,74 @@
+import unittest
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api.v1 import deps
+from app.api.v1.routers import classrooms_router
+from app.db.database import Base, get_db
+import app.models  # noqa: F401
+from app.models.classroom import College
+from app.services import catalog_cache
+
+
+class TestCatalogCache(unittest.TestCase):
+    def setUp(self) -> None:
+        catalog_cache.invalidate()
+
+    def test_body_computed_across_an_invalidation_is_not_stored(self) -> None:
+        version = catalog_cache.version()
+        catalog_cache.invalidate()
+        catalog_cache.put(("colleges",), b"[]", version)
+        self.assertIsNone(catalog_cache.get(("colleges",)))
+        etag, _ = catalog_cache.put(("colleges",), b"[]", catalog_cache.version())
+        self.assertEqual(catalog_cache.get(("colleges",)), (etag, b"[]"))
+
+    def test_etag_changes_with_version_and_body(self) -> None:
+        self.assertNotEqual(catalog_cache.etag_for(b"[]", 1), catalog_cache.etag_for(b"[]", 2))
+        self.assertNotEqual(catalog_cache.etag_for(b"[]", 1), catalog_cache.etag_for(b"[{}]", 1))
+
+
+class TestCatalogRoutes(unittest.TestCase):
+    def setUp(self) -> None:
+        catalog_cache.invalidate()
+        self.engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        self.db.add(College(name="College of Science", acronym="CS"))
+        self.db.commit()
+        app = FastAPI()
+        app.include_router(classrooms_router.router)
+        app.dependency_overrides[get_db] = lambda: self.db
+        app.dependency_overrides[deps.get_current_active_user] = lambda: SimpleNamespace(id=1, is_active=True)
+        self.client = TestClient(app)
+        self.statements = 0
+        event.listen(self.engine, "before_cursor_execute", self._count)
+
+    def tearDown(self) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._count)
+        self.db.close()
+        self.engine.dispose()
+
+    def _count(self, *_args) -> None:
+        self.statements += 1
+
+    def test_matching_etag_gets_304_without_queries(self) -> None:
+        first = self.client.get("/colleges")
+        self.assertEqual(first.json()[0]["name"], "College of Science")
+        self.statements = 0
+        revalidated = self.client.get("/colleges", headers={"If-None-Match": first.headers["etag"]})
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(self.statements, 0)
+
+    def test_invalidation_serves_the_edit(self) -> None:
+        etag = self.client.get("/colleges").headers["etag"]
+        self.db.query(College).update({College.name: "College of Arts"})
+        self.db.commit()
+        catalog_cache.invalidate()
+        response = self.client.get("/colleges", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]["name"], "College of Arts")
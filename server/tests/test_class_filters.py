@@ -0,0 +1,161 @@
+"""The SQL status and search filters of list_classes/list_sections against their Python definitions."""
+
+import unittest
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.constants import MAX_PAGE_SIZE
+from app.db.database import Base
+import app.models  # noqa: F401
+from app.models.classroom import ClassSection, College, Department, Major, SectionSubjectAssignment, Subject
+from app.models.search import INDEXED_FIELDS
+from app.models.user import User
+from app.services import academic_hierarchy
+from app.services.admin import sections_service
+from app.utils.search import document_tokens, tokenize
+
+STATUSES = ("assigned", "unassigned_teacher", "invalid_mapping", "needs_setup", "archived")
+QUERIES = ("bsit", "BSIT 1", "calc", "math1", "juan", "cruz", "maria", "applied", "unassigned", "sign", "zzz", "--")
+
+
+class TestClassFilters(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        academic_hierarchy.invalidate()
+        db = self.db
+        college = College(name="College of Computing", acronym="CC")
+        db.add(college)
+        db.flush()
+        it, math = Department(college_id=college.id, name="IT", code="IT"), Department(college_id=college.id, name="Math", code="MA")
+        db.add_all([it, math])
+        db.flush()
+        bsit = Major(department_id=it.id, name="Information Technology", code="BSIT")
+        applied = Major(department_id=it.id, name="Applied Computing", code="BSAC")
+        db.add_all([bsit, applied])
+        db.flush()
+        juan = User(username="jdelacruz", firstname="Juan", lastname="Dela Cruz", department_id=it.id)
+        maria = User(username="msantos", firstname="Maria", lastname="Santos", department_id=math.id)
+        db.add_all([juan, maria])
+        db.flush()
+        sections = [
+            ClassSection(name=f"BSIT-{n}A", major_id=bsit.id, year_level=n, section_code="A") for n in range(1, 7)
+        ]
+        sections.append(ClassSection(name="BSAC-1A", major_id=applied.id, year_level=1, section_code="A", teacher_id=juan.id))
+        # A section without classes, shown by list_sections only.
+        sections.append(ClassSection(name="BSIT-4B", major_id=bsit.id, year_level=4, section_code="B"))
+        db.add_all(sections)
+        db.flush()
+        calculus = Subject(major_id=bsit.id, name="Calculus I", code="MATH101")
+        applied_subject = Subject(major_id=applied.id, name="Applied Statistics", code="STAT201")
+        db.add_all([calculus, applied_subject])
+        db.flush()
+        classes = [
+            (sections[0], calculus.id, juan.id),  # assigned
+            (sections[1], calculus.id, None),  # unassigned_teacher
+            (sections[2], applied_subject.id, juan.id),  # invalid_mapping: subject of another major
+            (sections[3], calculus.id, maria.id),  # invalid_mapping: teacher of another department
+            (sections[4], calculus.id, 999),  # invalid_mapping: teacher deleted
+            (sections[5], 999, juan.id),  # invalid_mapping: subject deleted
+            (sections[6], applied_subject.id, None),  # unassigned_teacher, section teacher shown
+        ]
+        base = datetime(2026, 10, 1, 8)
+        for index, (section, subject_id, teacher_id) in enumerate(classes):
+            # Two classes share an updated_at so the id tiebreak is exercised.
+            updated_at = base + timedelta(minutes=index // 2)
+            db.add(
+                SectionSubjectAssignment(
+                    section_id=section.id, subject_id=subject_id, teacher_id=teacher_id, updated_at=updated_at
+                )
+            )
+        db.commit()
+
+    def tearDown(self) -> None:
+        self.db.close()
+        self.engine.dispose()
+
+    def _matches(self, model, entity_id, text: str) -> bool:
+        """Every word of ``text`` starts a word of the entity's indexed fields (search_service semantics)."""
+        row = self.db.get(model, entity_id) if entity_id else None
+        if row is None:
+            return False
+        words = document_tokens(getattr(row, name) for name in INDEXED_FIELDS[model][1])
+        return all(any(word.startswith(term) for word in words) for term in tokenize(text))
+
+    def _user_id(self, username: str):
+        user = self.db.query(User).filter(User.username == username).first()
+        return user.id if user else None
+
+    def _all_classes(self) -> list[dict]:
+        return sections_service.list_classes(self.db, limit=MAX_PAGE_SIZE)["items"]
+
+    def _assert_same_page(self, listed: dict, expected: list[dict], key=lambda item: item["id"]) -> None:
+        self.assertEqual(listed["total"], len(expected))
+        self.assertEqual([key(item) for item in listed["items"]], [key(item) for item in expected])
+
+    def test_every_status_filter_matches_class_status(self) -> None:
+        everything = self._all_classes()
+        self.assertEqual(
+            sorted({item["status"] for item in everything}), ["assigned", "invalid_mapping", "unassigned_teacher"]
+        )
+        for status in STATUSES:
+            with self.subTest(status=status):
+                if status == "needs_setup":
+                    expected = [item for item in everything if item["status"] != "assigned"]
+                else:
+                    expected = [item for item in everything if item["status"] == status]
+                listed = sections_service.list_classes(self.db, status=status, limit=MAX_PAGE_SIZE)
+                self._assert_same_page(listed, expected)
+                page = sections_service.list_classes(self.db, status=status, skip=1, limit=2)
+                self.assertEqual(page["total"], len(expected))
+                self.assertEqual([item["id"] for item in page["items"]], [item["id"] for item in expected[1:3]])
+
+    def test_class_search_matches_python_definition(self) -> None:
+        everything = self._all_classes()
+        for text in QUERIES:
+            with self.subTest(q=text):
+                expected = [
+                    item
+                    for item in everything
+                    if not tokenize(text)
+                    or self._matches(ClassSection, item["section"]["id"], text)
+                    or self._matches(Subject, item["subject"]["id"], text)
+                    or self._matches(User, item["teacher"]["id"], text)
+                    or text.strip().lower() in (item["section"]["major_name"] or "").lower()
+                ]
+                self._assert_same_page(sections_service.list_classes(self.db, q=text, limit=MAX_PAGE_SIZE), expected)
+                for status in STATUSES:
+                    combined = sections_service.list_classes(self.db, q=text, status=status, limit=MAX_PAGE_SIZE)
+                    self._assert_same_page(
+                        combined,
+                        [
+                            item
+                            for item in expected
+                            if (item["status"] != "assigned" if status == "needs_setup" else item["status"] == status)
+                        ],
+                    )
+
+    def test_section_search_matches_python_definition(self) -> None:
+        everything = sections_service.list_sections(self.db, limit=MAX_PAGE_SIZE)["items"]
+        row_key = lambda item: (item["id"], item["subject_id"], item["teacher_username"])  # noqa: E731
+        self.assertEqual(len(everything), 8)
+        for text in QUERIES:
+            with self.subTest(q=text):
+                needle = text.strip().lower()
+                expected = [
+                    item
+                    for item in everything
+                    if not tokenize(text)
+                    or self._matches(ClassSection, item["id"], text)
+                    or self._matches(Subject, item["subject_id"], text)
+                    or self._matches(User, self._user_id(item["teacher_username"]), text)
+                    or (
+                        needle in "unassigned"
+                        and "unassigned" in (item["subject_name"], item["teacher_username"])
+                    )
+                ]
+                listed = sections_service.list_sections(self.db, q=text, limit=MAX_PAGE_SIZE)
+                self._assert_same_page(listed, expected, row_key)
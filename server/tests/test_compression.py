@@ -0,0 +1,69 @@
+import unittest
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core import compression
+from app.core.compression import CompressionMiddleware, choose_encoding
+
+_POINTS = [{"timestamp": f"2026-05-01T08:00:{i % 60:02d}", "on_task": 3, "sleeping": 1} for i in range(500)]
+
+
+def _app(**options) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, **options)
+
+    @app.get("/points")
+    def points():
+        return _POINTS
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter(["data: x\n\n"] * 200), media_type="text/event-stream")
+
+    @app.get("/archive")
+    def archive():
+        return PlainTextResponse(b"\0" * 4096, media_type="application/zip")
+
+    return app
+
+
+class TestChooseEncoding(unittest.TestCase):
+    def test_respects_quality_values(self) -> None:
+        self.assertEqual(choose_encoding("gzip, deflate"), "gzip")
+        self.assertIsNone(choose_encoding("gzip;q=0, identity"))
+        self.assertIsNone(choose_encoding(""))
+        self.assertEqual(choose_encoding("*;q=0.5"), compression.available_encodings()[0])
+
+
+class TestCompressionMiddleware(unittest.TestCase):
+    def setUp(self) -> None:
+        compression.reset_stats()
+
+    def test_large_json_is_gzipped_and_counted(self) -> None:
+        client = TestClient(_app())
+        response = client.get("/points", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response.headers["vary"])
+        self.assertEqual(response.json(), _POINTS)
+        stats = compression.stats()["gzip"]
+        self.assertEqual(stats["responses"], 1)
+        self.assertGreater(stats["bytes_saved"], stats["bytes_out"])
+
+    def test_threadpool_path_gives_the_same_body(self) -> None:
+        client = TestClient(_app(threadpool_min_size=0))
+        response = client.get("/points", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertEqual(response.json(), _POINTS)
+
+    def test_small_streamed_and_binary_bodies_are_not_compressed(self) -> None:
+        client = TestClient(_app())
+        for path in ("/small", "/stream", "/archive"):
+            response = client.get(path, headers={"Accept-Encoding": "gzip"})
+            self.assertNotIn("content-encoding", response.headers, path)
+        self.assertEqual(compression.stats(), {})
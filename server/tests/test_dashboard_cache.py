@@ -0,0 +1,29 @@
+import unittest
+from unittest import mock
+
+from app.services.admin import dashboard_cache
+
+
+class TestDashboardCache(unittest.TestCase):
+    def setUp(self) -> None:
+        dashboard_cache.invalidate()
+
+    def test_entries_expire_after_ttl(self) -> None:
+        key = (None, None, None, None, None, None)
+        with mock.patch.object(dashboard_cache.time, "monotonic", return_value=100.0):
+            dashboard_cache.put(key, {"stats": {}}, dashboard_cache.generation())
+            self.assertEqual(dashboard_cache.get(key), {"stats": {}})
+        expired = 100.0 + dashboard_cache.DASHBOARD_CACHE_TTL_SECONDS
+        with mock.patch.object(dashboard_cache.time, "monotonic", return_value=expired):
+            self.assertIsNone(dashboard_cache.get(key))
+
+    def test_payload_computed_across_an_invalidation_is_not_stored(self) -> None:
+        key = (1, None, None, None, None, "all")
+        generation = dashboard_cache.generation()
+        dashboard_cache.invalidate()
+        dashboard_cache.put(key, {"stats": {}}, generation)
+        self.assertIsNone(dashboard_cache.get(key))
+        dashboard_cache.put(key, {"stats": {}}, dashboard_cache.generation())
+        self.assertIsNotNone(dashboard_cache.get(key))
+        dashboard_cache.invalidate()
+        self.assertIsNone(dashboard_cache.get(key))
@@ -0,0 +1,72 @@
+import unittest
+
+import numpy as np
+
+from app.utils.detection import (
+    Detections,
+    count_behaviors,
+    merge_camera_counts,
+    merge_tile_detections,
+    nms,
+    pack_camera_counts,
+    tile_frame,
+)
+
+
+NAMES = {0: "on_task", 1: "sleeping", 2: "using_phone", 3: "off_task"}
+
+
+def _dets(rows: list[tuple[int, float, float, float, float, float]]) -> Detections:
+    if not rows:
+        return Detections.empty()
+    arr = np.asarray(rows, dtype=np.float32)
+    return Detections(cls=arr[:, 0].astype(np.int32), conf=arr[:, 1], boxes=arr[:, 2:6])
+
+
+class TestTiling(unittest.TestCase):
+    def test_tiles_cover_frame_with_overlap(self) -> None:
+        frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+        tiles, offsets = tile_frame(frame, rows=2, cols=3, overlap=0.2)
+        self.assertEqual(len(tiles), 6)
+        shapes = {tile.shape for tile in tiles}
+        self.assertEqual(len(shapes), 1)
+        tile_h, tile_w = tiles[0].shape[:2]
+        self.assertEqual(max(x for x, _ in offsets) + tile_w, 1280)
+        self.assertEqual(max(y for _, y in offsets) + tile_h, 720)
+        self.assertLess(offsets[1][0], tile_w)
+
+    def test_merge_removes_cross_tile_duplicates(self) -> None:
+        left = _dets([(0, 0.9, 90, 10, 130, 60)])
+        right = _dets([(0, 0.8, 10, 10, 50, 60), (1, 0.7, 60, 10, 90, 60)])
+        merged = merge_tile_detections([left, right], [(0, 0), (80, 0)])
+        self.assertEqual(len(merged), 2)
+        self.assertEqual(sorted(merged.cls.tolist()), [0, 1])
+
+
+class TestNms(unittest.TestCase):
+    def test_nms_is_class_aware(self) -> None:
+        dets = _dets([(0, 0.9, 0, 0, 10, 10), (1, 0.8, 0, 0, 10, 10), (0, 0.7, 1, 1, 10, 10)])
+        self.assertEqual(nms(dets).tolist(), [0, 1])
+
+    def test_count_behaviors_applies_threshold(self) -> None:
+        dets = _dets([(0, 0.9, 0, 0, 1, 1), (0, 0.4, 0, 0, 1, 1), (2, 0.6, 0, 0, 1, 1), (9, 0.9, 0, 0, 1, 1)])
+        counts = count_behaviors(dets, NAMES, 0.5)
+        self.assertEqual(counts["on_task"], 1)
+        self.assertEqual(counts["using_phone"], 1)
+        self.assertEqual(sum(counts.values()), 2)
+
+
+class TestCameraMerge(unittest.TestCase):
+    def test_cameras_sharing_a_region_are_deduplicated(self) -> None:
+        per_camera = {
+            0: {"on_task": 10, "sleeping": 1, "using_phone": 0, "off_task": 2},
+            1: {"on_task": 8, "sleeping": 2, "using_phone": 1, "off_task": 2},
+            2: {"on_task": 5, "sleeping": 0, "using_phone": 0, "off_task": 1},
+        }
+        merged = merge_camera_counts(per_camera, {"0": "front", "1": "front"}, "max")
+        self.assertEqual(
+            [merged[k] for k in ("on_task", "sleeping", "using_phone", "off_task")], [15, 2, 1, 3]
+        )
+        summed = merge_camera_counts(per_camera, {"0": "front", "1": "front"}, "sum")
+        self.assertEqual(summed["on_task"], 23)
+        self.assertEqual(pack_camera_counts(per_camera)["1"], [8, 2, 1, 2])
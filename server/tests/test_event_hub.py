@@ -0,0 +1,42 @@
+import asyncio
+import threading
+import unittest
+
+from app.services import event_hub
+
+
+async def _never_disconnected() -> bool:
+    return False
+
+
+class TestEventHub(unittest.TestCase):
+    def test_events_published_from_threads_reach_subscribers(self) -> None:
+        async def scenario() -> list[str]:
+            subscription = event_hub.subscribe(event_hub.session_topic(5))
+            body = event_hub.stream(subscription, _never_disconnected, heartbeat_seconds=0.05)
+            self.assertEqual(await body.__anext__(), ": ping\n\n")
+            worker = threading.Thread(target=event_hub.publish, args=(event_hub.session_topic(5), "log", {"id": 1}))
+            worker.start()
+            worker.join()
+            received = [await body.__anext__()]
+            event_hub.publish(event_hub.session_topic(5), "session_ended", {"session_id": 5})
+            received += [message async for message in body]
+            return received
+
+        received = asyncio.run(scenario())
+        self.assertEqual(received[0], 'event: log\ndata: {"id":1}\n\n')
+        self.assertTrue(received[1].startswith("event: session_ended\n"))
+        self.assertEqual(event_hub.subscriber_count(event_hub.session_topic(5)), 0)
+
+    def test_slow_subscriber_gets_resync_instead_of_backlog(self) -> None:
+        async def scenario() -> list[str]:
+            subscription = event_hub.subscribe(event_hub.ALERTS_TOPIC)
+            for index in range(event_hub.SUBSCRIBER_QUEUE_SIZE + 1):
+                event_hub.publish(event_hub.ALERTS_TOPIC, "alert", {"id": index})
+            messages = subscription.drain()
+            event_hub.unsubscribe(subscription)
+            return messages
+
+        messages = asyncio.run(scenario())
+        self.assertEqual(len(messages), 1)
+        self.assertTrue(messages[0].startswith("event: resync\n"))
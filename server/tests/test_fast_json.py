@@ -0,0 +1,37 @@
+import json
+import unittest
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from pydantic import TypeAdapter
+
+from app.core.responses import FastJSONResponse, columnar, dumps
+from app.schemas.admin import AdminBehaviorLogPoint, AdminMetricPoint
+
+
+class TestFastJSON(unittest.TestCase):
+    def test_encodes_like_the_response_model(self) -> None:
+        points = [
+            {
+                "window_start": datetime(2026, 5, 1, 8, 0, 0, 1234),
+                "window_end": datetime(2026, 5, 1, 8, 1, tzinfo=timezone.utc),
+                "on_task_avg": 3.5,
+                "using_phone_avg": 0.25,
+                "sleeping_avg": 1.0,
+                "off_task_avg": 0.0,
+                "not_visible_avg": 0.0,
+                "engagement_score": 71.5,
+            }
+        ]
+        adapter = TypeAdapter(list[AdminMetricPoint])
+        self.assertEqual(json.loads(dumps(points)), json.loads(adapter.dump_json(adapter.validate_python(points))))
+
+    def test_decimals_and_text(self) -> None:
+        body = FastJSONResponse({"name": "Éva", "score": Decimal("12.5")}).body
+        self.assertEqual(json.loads(body), {"name": "Éva", "score": 12.5})
+
+    def test_columnar_keeps_every_field(self) -> None:
+        rows = [dict.fromkeys(AdminBehaviorLogPoint.model_fields, i) for i in range(2)]
+        columns = columnar(rows, AdminBehaviorLogPoint.model_fields)
+        self.assertEqual(columns["on_task"], [0, 1])
+        self.assertEqual(set(columnar([], AdminBehaviorLogPoint.model_fields)), set(AdminBehaviorLogPoint.model_fields))
@@ -0,0 +1,41 @@
+import unittest
+from datetime import datetime, timedelta
+
+from app.services import live_session_store
+
+
+def _log(log_id: int, second: int) -> dict:
+    return {"id": log_id, "timestamp": datetime(2026, 1, 1, 8, 0) + timedelta(seconds=second)}
+
+
+class TestLiveSessionStore(unittest.TestCase):
+    def setUp(self) -> None:
+        live_session_store.clear()
+        live_session_store.put(
+            live_session_store.LiveSessionState(session_id=1, teacher_id=7, activity_mode="LECTURE", students_present=30)
+        )
+
+    def tearDown(self) -> None:
+        live_session_store.clear()
+
+    def test_logs_are_ordered_and_applied_once(self) -> None:
+        live_session_store.record_log(1, _log(1, 10), 80.0, 60.0)
+        live_session_store.record_log(1, _log(2, 5), 40.0, None)
+        live_session_store.record_log(1, _log(2, 5), 40.0, None)
+        state = live_session_store.snapshot(1)
+        self.assertEqual([row["id"] for row in state["recent_logs"]], [2, 1])
+        self.assertEqual(state["average_engagement"], 60.0)
+        self.assertEqual(state["headcount_average_engagement"], 60.0)
+        self.assertEqual(live_session_store.average_engagement_after(1, 90.0), 70.0)
+
+    def test_unread_alert_counters(self) -> None:
+        live_session_store.add_alerts(
+            1,
+            [
+                {"id": 3, "severity": "CRITICAL", "is_read": False},
+                {"id": 4, "severity": "WARNING", "is_read": False},
+            ],
+        )
+        live_session_store.mark_alert_read(1, 3)
+        state = live_session_store.snapshot(1)
+        self.assertEqual((state["unread_alert_count"], state["unread_critical_count"]), (1, 0))
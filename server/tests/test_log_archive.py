@@ -0,0 +1,129 @@
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest import mock
+
+from sqlalchemy import BigInteger, create_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.database import Base
+import app.models  # noqa: F401
+from app.models.session import BehaviorLog, ClassSession, SessionMetrics
+from app.services import log_archive_service, rollup_service
+
+
+@compiles(BigInteger, "sqlite")
+def _bigint_as_integer(_type, _compiler, **_kw) -> str:
+    # SQLite only autoincrements INTEGER PRIMARY KEY columns.
+    return "INTEGER"
+
+
+def _log(log_id: int, seconds: int, camera_counts=None, snapshot=None) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=log_id,
+        session_id=7,
+        timestamp=datetime(2026, 5, 1, 9, 0, tzinfo=timezone.utc) + timedelta(seconds=seconds),
+        on_task=3,
+        sleeping=1,
+        using_phone=0,
+        off_task=1,
+        not_visible=2,
+        total_detected=5,
+        students_present_snapshot=snapshot,
+        camera_counts=camera_counts,
+    )
+
+
+class TestLogArchive(unittest.TestCase):
+    def setUp(self) -> None:
+        self._dir = tempfile.TemporaryDirectory()
+        self._previous = settings.BEHAVIOR_LOG_ARCHIVE_DIR
+        settings.BEHAVIOR_LOG_ARCHIVE_DIR = self._dir.name
+
+    def tearDown(self) -> None:
+        settings.BEHAVIOR_LOG_ARCHIVE_DIR = self._previous
+        self._dir.cleanup()
+
+    def test_round_trip_keeps_every_column(self) -> None:
+        logs = [_log(1, 0, snapshot=7), _log(2, 3, camera_counts={"0": [3, 1, 0, 1]})]
+        name = log_archive_service._write_archive(7, logs)
+        restored = log_archive_service.read_archive(name)
+        self.assertEqual([log.id for log in restored], [1, 2])
+        self.assertEqual(restored[1].timestamp, datetime(2026, 5, 1, 9, 0, 3))
+        self.assertEqual((restored[0].students_present_snapshot, restored[1].students_present_snapshot), (7, None))
+        self.assertEqual((restored[0].camera_counts, restored[1].camera_counts), (None, {"0": [3, 1, 0, 1]}))
+        self.assertEqual(log_archive_service.behavior_averages(name)["not_visible"], 2.0)
+
+    def test_minute_averages_skip_empty_ticks(self) -> None:
+        empty = _log(3, 30)
+        empty.total_detected = 0
+        averages = log_archive_service._minute_averages([_log(1, 0), empty, _log(2, 61)])
+        self.assertEqual(sorted(averages), [datetime(2026, 5, 1, 9, 0), datetime(2026, 5, 1, 9, 1)])
+        self.assertEqual(averages[datetime(2026, 5, 1, 9, 0)]["on_task"], 3.0)
+
+
+class TestCompactSession(unittest.TestCase):
+    def setUp(self) -> None:
+        self._dir = tempfile.TemporaryDirectory()
+        self._previous = settings.BEHAVIOR_LOG_ARCHIVE_DIR
+        settings.BEHAVIOR_LOG_ARCHIVE_DIR = self._dir.name
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        start = datetime(2026, 1, 5, 9, 0)
+        self.db.add(ClassSession(id=7, teacher_id=1, is_active=False, start_time=start, end_time=start + timedelta(hours=1)))
+        logs = [_log(index + 1, index * 20) for index in range(7)]
+        self.db.add_all(BehaviorLog(**vars(log)) for log in logs)
+        for window_start, averages in log_archive_service._minute_averages(logs).items():
+            self.db.add(
+                SessionMetrics(
+                    session_id=7,
+                    window_start=window_start,
+                    window_end=window_start + timedelta(minutes=1),
+                    total_detected=5,
+                    **{f"{name}_avg": value for name, value in averages.items()},
+                )
+            )
+        self.db.flush()
+        rollup_service.rebuild_session(self.db, 7)
+        self.db.commit()
+
+    def tearDown(self) -> None:
+        self.db.close()
+        self.engine.dispose()
+        settings.BEHAVIOR_LOG_ARCHIVE_DIR = self._previous
+        self._dir.cleanup()
+
+    def _remaining(self) -> int:
+        return self.db.query(BehaviorLog).filter(BehaviorLog.session_id == 7).count()
+
+    def test_rerun_finishes_an_interrupted_delete(self) -> None:
+        commit = self.db.commit
+        commits = 0
+
+        def commit_then_fail() -> None:
+            # 1st commit records the archive, 2nd deletes the first chunk; die on the 3rd.
+            nonlocal commits
+            commits += 1
+            if commits == 3:
+                raise RuntimeError("killed")
+            commit()
+
+        with mock.patch.object(log_archive_service, "DELETE_CHUNK_SIZE", 3):
+            with mock.patch.object(self.db, "commit", commit_then_fail), self.assertRaises(RuntimeError):
+                log_archive_service.compact_ended_sessions(self.db, retention_days=30)
+            self.db.rollback()
+            self.assertEqual(self._remaining(), 4)
+            name = self.db.get(ClassSession, 7).logs_archive_path
+            mtime = log_archive_service._archive_file(name).stat().st_mtime_ns
+
+            results = log_archive_service.compact_ended_sessions(self.db, retention_days=30)
+
+        self.assertEqual([(r["session_id"], r["deleted"], r.get("resumed")) for r in results], [(7, 4, True)])
+        self.assertEqual(self._remaining(), 0)
+        self.assertEqual(log_archive_service._archive_file(name).stat().st_mtime_ns, mtime)
+        self.assertEqual([log.id for log in log_archive_service.load_session_logs(self.db, 7)], list(range(1, 8)))
+        self.assertEqual(log_archive_service.compact_ended_sessions(self.db, retention_days=30), [])
@@ -0,0 +1,37 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from app.services import model_evaluation_service
+
+
+class TestModelEvaluation(unittest.TestCase):
+    def test_greedy_matching_counts_each_label_once(self) -> None:
+        preds = np.array([[0, 0, 10, 10], [1, 1, 10, 10], [50, 50, 60, 60]], dtype=np.float32)
+        conf = np.array([0.6, 0.9, 0.8], dtype=np.float32)
+        labels = np.array([[0, 0, 10, 10]], dtype=np.float32)
+        self.assertEqual(model_evaluation_service._match_class(preds, conf, labels, 0.5), 1)
+
+    def test_yolo_labels_are_scaled_and_filtered(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            label = Path(tmp) / "f.txt"
+            label.write_text("0 0.5 0.5 0.2 0.4\n7 0.1 0.1 0.1 0.1\n")
+            classes, boxes = model_evaluation_service._read_labels(label, 100, 50, {0: "sleeping", 7: "person"})
+        self.assertEqual(classes, ["sleeping"])
+        np.testing.assert_allclose(boxes, [[40, 15, 60, 35]])
+
+    def test_results_are_dropped_when_weights_change(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            weights = Path(tmp) / "best.pt"
+            weights.write_bytes(b"v1")
+            model_evaluation_service.save_evaluation(weights, {"imgsz": 640, "cpu_fps": 5.0})
+            model_evaluation_service.save_evaluation(weights, {"imgsz": 640, "cpu_fps": 6.0})
+            stored = model_evaluation_service.get_evaluations(Path(tmp))
+            self.assertEqual([r["cpu_fps"] for r in stored["best.pt"]], [6.0])
+
+            weights.write_bytes(b"v2-retrained")
+            os.utime(weights, ns=(0, 0))
+            self.assertEqual(model_evaluation_service.get_evaluations(Path(tmp)), {})
@@ -0,0 +1,80 @@
+import unittest
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.pagination import decode_cursor, encode_cursor, keyset_page
+from app.db.database import Base
+import app.models  # noqa: F401
+from app.models.session import ClassSession
+from app.services.admin.sessions_service import SESSION_SORT_KEYS
+
+
+class TestCursorPagination(unittest.TestCase):
+    def test_cursor_round_trips_sort_key_values(self) -> None:
+        values = [datetime(2026, 10, 19, 8, 30, 15, 250), Decimal("87.50"), 42]
+        cursor = encode_cursor("newest", values)
+        self.assertNotIn("=", cursor)
+        self.assertEqual(decode_cursor(cursor, "newest", 3), values)
+
+    def test_cursor_is_rejected_for_another_sort_or_when_malformed(self) -> None:
+        cursor = encode_cursor("engagement-high", [Decimal("10.00"), 7])
+        with self.assertRaises(ValueError):
+            decode_cursor(cursor, "engagement-low", 2)
+        with self.assertRaises(ValueError):
+            decode_cursor(cursor, "engagement-high", 3)
+        with self.assertRaises(ValueError):
+            decode_cursor("not a cursor", "newest", 2)
+
+
+class TestKeysetPage(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        start = datetime(2026, 5, 1, 8, 0)
+        # Few distinct values per sort column, so most pages split a run of equal keys.
+        self.db.add_all(
+            ClassSession(
+                id=index + 1,
+                teacher_id=1,
+                start_time=start + timedelta(hours=index % 4),
+                average_engagement=Decimal(("55.50", "70.00")[index % 2]),
+                students_present=index % 3 + 1,
+            )
+            for index in range(23)
+        )
+        self.db.commit()
+
+    def tearDown(self) -> None:
+        self.db.close()
+        self.engine.dispose()
+
+    def test_walks_every_row_once_in_sort_order(self) -> None:
+        for sort, keys in SESSION_SORT_KEYS.items():
+            expected = [
+                row.id
+                for row in self.db.query(ClassSession).order_by(
+                    *[column.desc() if descending else column.asc() for column, descending in keys]
+                )
+            ]
+            for limit in (1, 4, 5, 23, 30):
+                with self.subTest(sort=sort, limit=limit):
+                    seen: list[int] = []
+                    cursor = None
+                    for _ in range(len(expected) + 1):
+                        rows, cursor = keyset_page(
+                            self.db.query(ClassSession),
+                            keys,
+                            sort=sort,
+                            cursor=cursor,
+                            limit=limit,
+                            key_of=lambda row: [getattr(row, column.key) for column, _ in keys],
+                        )
+                        self.assertLessEqual(len(rows), limit)
+                        seen.extend(row.id for row in rows)
+                        if cursor is None:
+                            break
+                    self.assertEqual(seen, expected)
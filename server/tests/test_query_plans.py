@@ -0,0 +1,180 @@
+"""Query-plan regression suite for the hot alert, log and listing queries.
+
+Each test runs the real service code against a seeded in-memory SQLite database,
+captures the SQL it issues and checks ``EXPLAIN QUERY PLAN`` for every statement
+touching the table under test: no full scan of that table and no sort of its rows
+for ORDER BY. Walking an index in order under a LIMIT (newest first lists) is fine.
+A failure means an index the query depends on was dropped or the query stopped
+matching it (see alembic revision b5c7d9e1f3a5).
+"""
+
+import re
+import unittest
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+import app.models  # noqa: F401
+from app.models.notification import Notification
+from app.models.session import Alert, AlertSeverity, AlertType, BehaviorLog, ClassSession, SessionMetrics
+from app.models.user import User
+from app.services import alert_service, log_archive_service, notification_service
+from app.services.admin import sessions_service
+
+_FULL_SCAN = re.compile(r"^SCAN (\w+)( USING (COVERING )?INDEX)?")
+_LIMIT = re.compile(r"\bLIMIT\b", re.IGNORECASE)
+_SORT = "USE TEMP B-TREE FOR ORDER BY"
+
+
+def _seed(db) -> None:
+    start = datetime(2026, 9, 1, 8, 0)
+    teachers = [User(username=f"teacher{i}", email=f"teacher{i}@example.edu") for i in range(4)]
+    db.add_all(teachers)
+    db.flush()
+    log_id = metric_id = 0
+    for index in range(40):
+        started = start + timedelta(hours=index * 3)
+        session = ClassSession(
+            teacher_id=teachers[index % 4].id,
+            students_present=30,
+            start_time=started,
+            end_time=None if index % 10 == 0 else started + timedelta(hours=1),
+            is_active=index % 10 == 0,
+        )
+        db.add(session)
+        db.flush()
+        for minute in range(20):
+            metric_id += 1
+            db.add(
+                SessionMetrics(
+                    id=metric_id,
+                    session_id=session.id,
+                    window_start=started + timedelta(minutes=minute),
+                    window_end=started + timedelta(minutes=minute + 1),
+                )
+            )
+            for second in range(0, 60, 15):
+                log_id += 1
+                db.add(
+                    BehaviorLog(
+                        id=log_id,
+                        session_id=session.id,
+                        timestamp=started + timedelta(minutes=minute, seconds=second),
+                        on_task=20,
+                        total_detected=25,
+                    )
+                )
+        for minute in range(0, 60, 6):
+            db.add(
+                Alert(
+                    session_id=session.id,
+                    alert_type=(AlertType.PHONE if minute % 12 else AlertType.SLEEPING).value,
+                    message="seeded",
+                    severity=(AlertSeverity.CRITICAL if minute % 18 == 0 else AlertSeverity.WARNING).value,
+                    is_read=minute < 36,
+                    triggered_at=started + timedelta(minutes=minute),
+                )
+            )
+    for index in range(200):
+        db.add(
+            Notification(
+                user_id=teachers[index % 4].id,
+                title="Class assigned",
+                body="seeded",
+                is_read=index % 3 != 0,
+                created_at=start + timedelta(minutes=index),
+            )
+        )
+    db.commit()
+    db.execute(text("ANALYZE"))
+
+
+class TestQueryPlans(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.engine = create_engine("sqlite://")
+        Base.metadata.create_all(cls.engine)
+        cls.db = sessionmaker(bind=cls.engine, autoflush=False)()
+        _seed(cls.db)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.db.close()
+        cls.engine.dispose()
+
+    def tearDown(self) -> None:
+        self.db.rollback()
+
+    @contextmanager
+    def _captured(self):
+        statements: list[tuple[str, tuple]] = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                statements.append((statement, parameters))
+
+        event.listen(self.engine, "before_cursor_execute", capture)
+        try:
+            yield statements
+        finally:
+            event.remove(self.engine, "before_cursor_execute", capture)
+
+    def _plans(self, statements, table: str) -> list[tuple[str, list[str]]]:
+        plans = []
+        raw = self.db.connection().connection.driver_connection
+        for statement, parameters in statements:
+            if not re.search(rf"\b{table}\b", statement):
+                continue
+            rows = raw.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+            plans.append((statement, [row[-1] for row in rows]))
+        self.assertTrue(plans, f"no statement on {table} was captured")
+        return plans
+
+    def assertIndexed(self, statements, table: str) -> None:
+        for statement, plan in self._plans(statements, table):
+            for line in plan:
+                match = _FULL_SCAN.match(line)
+                if match and match.group(1) == table:
+                    self.assertTrue(match.group(2) and _LIMIT.search(statement), f"full scan of {table}: {plan}")
+                self.assertNotIn(_SORT, line, f"sort of {table} rows: {plan}")
+
+    def test_alert_cooldown_lookup(self) -> None:
+        session_id = self.db.query(ClassSession.id).filter(ClassSession.is_active == True).first()[0]  # noqa: E712
+        with self._captured() as statements:
+            alert_service.trigger_alert(
+                self.db, session_id, AlertType.PHONE, "Phone usage spike", AlertSeverity.WARNING
+            )
+        self.assertIndexed(statements, "alerts")
+
+    def test_dashboard_unread_alert_counts(self) -> None:
+        with self._captured() as statements:
+            sessions_service.get_dashboard_data(self.db)
+        self.assertIndexed([s for s in statements if "is_read" in s[0]], "alerts")
+
+    def test_admin_session_lists(self) -> None:
+        for is_active in (None, True, False):
+            with self._captured() as statements:
+                sessions_service.list_sessions(self.db, is_active=is_active, limit=10)
+            self.assertIndexed(statements, "class_sessions")
+
+    def test_unread_notifications(self) -> None:
+        user_id = self.db.query(User.id).first()[0]
+        with self._captured() as statements:
+            notification_service.list_user_notifications(self.db, user_id=user_id, unread_only=True)
+        self.assertIndexed(statements, "notifications")
+
+    def test_session_log_reads(self) -> None:
+        session_id = self.db.query(ClassSession.id).filter(ClassSession.is_active == False).first()[0]  # noqa: E712
+        with self._captured() as statements:
+            log_archive_service.log_rows(self.db, session_id, ("timestamp", "on_task"))
+            sessions_service.list_sessions(self.db, is_active=True, limit=10)
+        self.assertIndexed(statements, "behavior_logs")
+
+    def test_minute_window_reads(self) -> None:
+        session_id = self.db.query(ClassSession.id).filter(ClassSession.is_active == False).first()[0]  # noqa: E712
+        with self._captured() as statements:
+            sessions_service.get_session_detail(self.db, session_id)
+        self.assertIndexed(statements, "session_metrics")
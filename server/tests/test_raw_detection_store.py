@@ -0,0 +1,65 @@
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from app.core.config import settings
+from app.services import raw_detection_service
+from app.utils.detection import Detections
+
+
+NAMES = {0: "on_task", 1: "sleeping", 2: "using_phone", 3: "off_task"}
+
+
+class TestRawDetectionStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(settings, "RAW_DETECTIONS_DIR", self._tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self._tmp.cleanup)
+
+    def test_roundtrip_and_rescore_counts(self) -> None:
+        first = Detections(
+            cls=np.array([0, 0, 2], dtype=np.int32),
+            conf=np.array([0.9, 0.35, 0.6], dtype=np.float32),
+            boxes=np.array([[0, 0, 64, 48], [10, 10, 20, 20], [100, 100, 200, 150]], dtype=np.float32),
+        )
+        raw_detection_service.append_tick(7, 101, 1000.0, first, (480, 640, 3), NAMES)
+        raw_detection_service.append_tick(7, 102, 1003.0, Detections.empty(), (480, 640, 3), NAMES)
+
+        ticks = raw_detection_service.read_session_ticks(7)
+        self.assertEqual(ticks.log_ids.tolist(), [101, 102])
+        self.assertEqual(ticks.tick_index.tolist(), [0, 0, 0])
+        np.testing.assert_allclose(ticks.boxes[0].astype(np.float32), [0.0, 0.0, 0.1, 0.1], atol=1e-3)
+
+        strict = raw_detection_service.count_ticks(ticks, 0.5)
+        loose = raw_detection_service.count_ticks(ticks, 0.3)
+        self.assertEqual(strict[0].tolist(), [1, 0, 1, 0, 0])
+        self.assertEqual(loose[0].tolist(), [2, 0, 1, 0, 0])
+        self.assertEqual(loose[1].sum(), 0)
+
+    def test_torn_trailing_record_is_ignored(self) -> None:
+        dets = Detections(
+            cls=np.array([1], dtype=np.int32),
+            conf=np.array([0.8], dtype=np.float32),
+            boxes=np.array([[1, 2, 3, 4]], dtype=np.float32),
+        )
+        raw_detection_service.append_tick(8, 1, 1.0, dets, (10, 10), NAMES)
+        raw_detection_service.append_tick(8, 2, 2.0, dets, (10, 10), NAMES)
+        path = raw_detection_service.session_store_path(8)
+        path.write_bytes(path.read_bytes()[:-3])
+
+        ticks = raw_detection_service.read_session_ticks(8)
+        self.assertEqual(ticks.log_ids.tolist(), [1])
+
+    def test_delete_session_files_removes_every_camera(self) -> None:
+        for session_id, camera_index in ((7, None), (7, 0), (7, 1), (70, None)):
+            raw_detection_service.append_tick(session_id, 1, 1.0, Detections.empty(), (10, 10), NAMES, camera_index)
+
+        self.assertEqual(raw_detection_service.delete_session_files(7), 3)
+        self.assertIsNone(raw_detection_service.read_session_ticks(7))
+        self.assertEqual(raw_detection_service.session_camera_indices(7), [])
+        self.assertIsNotNone(raw_detection_service.read_session_ticks(70))
+        self.assertEqual(raw_detection_service.delete_session_files(7), 0)
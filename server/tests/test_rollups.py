@@ -0,0 +1,39 @@
+import unittest
+from datetime import datetime, timedelta
+
+from app.services import rollup_service
+
+
+def _minute(start: datetime, engagement: float) -> dict:
+    row = dict.fromkeys(rollup_service.SUM_FIELDS, 0)
+    row.update(bucket_start=start, minute_count=1, engagement_sum=engagement)
+    return row
+
+
+class TestRollups(unittest.TestCase):
+    def test_cascaded_buckets_match_direct_aggregation(self) -> None:
+        start = datetime(2026, 10, 19, 8, 58)
+        minutes = [_minute(start + timedelta(minutes=i), float(i % 7)) for i in range(70)]
+        five = rollup_service.aggregate(minutes, 300)
+        hourly = rollup_service.aggregate(five.values(), 3600)
+        self.assertEqual(sorted(hourly), [datetime(2026, 10, 19, h) for h in (8, 9, 10)])
+        direct = rollup_service.aggregate(minutes, 3600)
+        for key, bucket in hourly.items():
+            self.assertEqual(bucket["minute_count"], direct[key]["minute_count"])
+            self.assertAlmostEqual(bucket["engagement_sum"], direct[key]["engagement_sum"])
+
+    def test_coarsest_table_that_divides_the_resolution(self) -> None:
+        self.assertEqual(
+            [rollup_service.source_level(r) for r in (60, 120, 300, 900, 3600, 7200, 86400, 604800, 90)],
+            [60, 60, 300, 300, 3600, 3600, 86400, 86400, 60],
+        )
+
+    def test_window_closes_when_a_later_minute_arrives(self) -> None:
+        t = datetime(2026, 10, 19, 9, 0)
+        rollup_service.forget(1)
+        self.assertIsNone(rollup_service.note_minute(1, t))
+        self.assertIsNone(rollup_service.note_minute(1, t))
+        self.assertEqual(rollup_service.note_minute(1, t + timedelta(minutes=1)), t)
+        # A late edge log re-opens an already closed minute.
+        self.assertEqual(rollup_service.note_minute(1, t), t)
+        rollup_service.forget(1)
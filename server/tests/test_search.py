@@ -0,0 +1,127 @@
+import unittest
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+import app.models  # noqa: F401
+from app.models.classroom import ClassSection, Subject
+from app.models.search import SearchDocument, SearchToken
+from app.models.session import ClassSession
+from app.models.user import User
+from app.services import search_service
+from app.utils.search import MAX_TOKEN_LENGTH, document_tokens, tokenize
+
+
+class TestSearchTokens(unittest.TestCase):
+    def test_tokenize_splits_words_and_lowercases(self) -> None:
+        self.assertEqual(tokenize("  Dela Cruz, Juan-Miguel "), ["dela", "cruz", "juan", "miguel"])
+        self.assertEqual(tokenize("j.santos@school.edu"), ["j", "santos", "school", "edu"])
+        self.assertEqual(tokenize("BSIT_3A"), ["bsit", "3a"])
+        self.assertEqual(tokenize("Peña"), ["peña"])
+        self.assertEqual(tokenize(None), [])
+        self.assertEqual(tokenize("--"), [])
+
+    def test_document_tokens_are_distinct_and_bounded(self) -> None:
+        tokens = document_tokens(["Ana Santos", None, "santos", "ana@x.org", "a" * 100])
+        self.assertEqual(tokens, ["ana", "santos", "x", "org", "a" * MAX_TOKEN_LENGTH])
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        self.teacher = User(username="jdelacruz", firstname="Juan", lastname="Dela Cruz", email="juan@school.edu")
+        self.subject = Subject(major_id=1, name="Calculus I", code="MATH101")
+        self.section = ClassSection(major_id=1, name="BSIT-3A", year_level=3, section_code="A")
+        self.db.add_all([self.teacher, self.subject, self.section])
+        self.db.commit()
+
+    def tearDown(self) -> None:
+        self.db.close()
+        self.engine.dispose()
+
+    def _tokens(self, entity_type: str, entity_id: int) -> set[str]:
+        rows = self.db.query(SearchToken.token).filter_by(entity_type=entity_type, entity_id=entity_id)
+        return {token for (token,) in rows}
+
+    def _ids(self, entity_type: str, model, text: str) -> list[int]:
+        query = self.db.query(model.id).filter(search_service.id_filter(self.db, entity_type, text, model.id))
+        return [entity_id for (entity_id,) in query.order_by(model.id)]
+
+    def test_mapper_events_index_insert_rename_and_delete(self) -> None:
+        self.assertEqual(self._tokens("user", self.teacher.id), {"jdelacruz", "juan", "dela", "cruz", "school", "edu"})
+        self.assertEqual(self._tokens("subject", self.subject.id), {"calculus", "i", "math101"})
+        self.assertEqual(self._tokens("section", self.section.id), {"bsit", "3a", "a"})
+        document = self.db.query(SearchDocument).filter_by(entity_type="subject", entity_id=self.subject.id).one()
+        self.assertEqual(document.content, "calculus i math101")
+
+        self.subject.name = "Linear Algebra"
+        self.section.name = "BSCS-2B"
+        self.db.commit()
+        self.assertEqual(self._tokens("subject", self.subject.id), {"linear", "algebra", "math101"})
+        self.assertEqual(self._tokens("section", self.section.id), {"bscs", "2b", "a"})
+
+        user_id = self.teacher.id
+        self.db.delete(self.teacher)
+        self.db.commit()
+        self.assertEqual(self._tokens("user", user_id), set())
+        self.assertEqual(self.db.query(SearchDocument).filter_by(entity_type="user").count(), 0)
+
+    def test_id_filter_matches_word_prefixes_of_every_term(self) -> None:
+        other = User(username="mreyes", firstname="Maria", lastname="Cruz")
+        self.db.add(other)
+        self.db.commit()
+        self.assertEqual(self._ids("user", User, "cru"), [self.teacher.id, other.id])
+        self.assertEqual(self._ids("user", User, "Cruz, ju"), [self.teacher.id])
+        self.assertEqual(self._ids("user", User, "ruz"), [])
+        self.assertEqual(self._ids("subject", Subject, "math1"), [self.subject.id])
+        self.assertEqual(self._ids("section", ClassSection, "--"), [self.section.id])
+        self.assertEqual(search_service.search(self.db, "user", "cruz"), [other.id, self.teacher.id])
+
+    def test_id_filter_uses_fulltext_on_mysql(self) -> None:
+        db = SimpleNamespace(get_bind=lambda: SimpleNamespace(dialect=mysql.dialect()))
+        long_terms = str(search_service.id_filter(db, "user", "dela cruz", User.id).compile(dialect=mysql.dialect()))
+        self.assertIn("MATCH (search_documents.content) AGAINST", long_terms)
+        self.assertIn("IN BOOLEAN MODE", long_terms)
+        # "ju" is below the FULLTEXT minimum token size.
+        short_term = str(search_service.id_filter(db, "user", "ju cruz", User.id).compile(dialect=mysql.dialect()))
+        self.assertNotIn("MATCH", short_term)
+        self.assertIn("search_tokens.token LIKE", short_term)
+
+    def test_session_filter_matches_numeric_id_or_related_entities(self) -> None:
+        sessions = [
+            ClassSession(teacher_id=self.teacher.id, subject_id=self.subject.id, section_id=self.section.id),
+            ClassSession(teacher_id=9999, subject_id=9999, section_id=9999),
+        ]
+        self.db.add_all(sessions)
+        self.db.commit()
+        first, second = (session.id for session in sessions)
+
+        def matching(text: str) -> list[int]:
+            query = self.db.query(ClassSession.id).filter(search_service.session_filter(self.db, text))
+            return [session_id for (session_id,) in query.order_by(ClassSession.id)]
+
+        self.assertEqual(matching(str(second)), [second])
+        self.assertEqual(matching("calculus"), [first])
+        self.assertEqual(matching("juan"), [first])
+        self.assertEqual(matching("nobody"), [])
+        self.assertEqual(matching(""), [first, second])
+
+    def test_rebuild_index_restores_entries(self) -> None:
+        expected = sorted((d.entity_type, d.entity_id, d.content) for d in self.db.query(SearchDocument))
+        tokens = self.db.query(SearchToken).count()
+        self.db.query(SearchDocument).delete()
+        self.db.query(SearchToken).delete()
+        self.db.commit()
+        self.assertEqual(self._ids("user", User, "juan"), [])
+
+        counts = search_service.rebuild_index(self.db)
+        self.db.commit()
+        self.assertEqual(counts, {"user": 1, "subject": 1, "section": 1})
+        self.assertEqual(sorted((d.entity_type, d.entity_id, d.content) for d in self.db.query(SearchDocument)), expected)
+        self.assertEqual(self.db.query(SearchToken).count(), tokens)
+        self.assertEqual(self._ids("user", User, "juan"), [self.teacher.id])
@@ -0,0 +1,40 @@
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+from app.services import session_read_model
+from app.services.academic_hierarchy import Hierarchy
+
+_EMPTY = Hierarchy(0, 0.0, {}, {}, {}, {}, {})
+
+
+def _row(**values):
+    base = dict.fromkeys(column.key for column in session_read_model.SESSION_COLUMNS)
+    base.update(values)
+    return SimpleNamespace(_mapping=base, **base)
+
+
+class TestSessionReadModel(unittest.TestCase):
+    def test_missing_relations_use_the_placeholder(self) -> None:
+        row = _row(
+            id=3,
+            teacher_id=9,
+            subject_id=4,
+            section_id=5,
+            is_active=False,
+            start_time=datetime(2026, 10, 19, 8, 0),
+            average_engagement=Decimal("71.25"),
+        )
+        item = session_read_model.serialize_session(row, _EMPTY, placeholder="unknown")
+        self.assertEqual((item["subject_name"], item["section_name"]), ("unknown", "unknown"))
+        self.assertEqual((item["teacher_username"], item["teacher_fullname"]), ("unknown", None))
+        self.assertIsNone(item["college_name"])
+        self.assertEqual(item["average_engagement"], 71.25)
+        self.assertIsNone(session_read_model.final_behavior_averages(row))
+
+    def test_teacher_fullname_falls_back_to_username(self) -> None:
+        row = _row(id=1, teacher_user_id=9, teacher_username="jdoe", teacher_fullname="  ", summary_id=2, is_active=False)
+        item = session_read_model.serialize_session(row, _EMPTY)
+        self.assertEqual(item["teacher_fullname"], "jdoe")
+        self.assertEqual(session_read_model.final_behavior_averages(row)["on_task"], 0.0)
@@ -0,0 +1,33 @@
+import unittest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from app.services import session_summary_service
+
+
+class TestSessionSummary(unittest.TestCase):
+    def test_time_in_state_caps_pauses(self) -> None:
+        t = datetime(2026, 10, 19, 9, 0)
+        rows = [
+            (t, 10, 0, 0, 0, 0),
+            (t + timedelta(seconds=5), 8, 2, 0, 0, 0),
+            # 10 minute pause: counts as at most 3 ticks.
+            (t + timedelta(seconds=605), 6, 0, 4, 0, 0),
+            (t + timedelta(seconds=610), 6, 0, 4, 0, 0),
+        ]
+        seconds = session_summary_service._time_in_state(rows)
+        self.assertEqual(seconds["on_task"], 10 * 5 + 8 * 15 + 6 * 5 + 6 * 5)
+        self.assertEqual(seconds["sleeping"], 2 * 15)
+        self.assertEqual(seconds["using_phone"], 4 * 5 + 4 * 5)
+
+    def test_curve_digest_is_bounded(self) -> None:
+        start = datetime(2026, 10, 19, 9, 0)
+        windows = [
+            SimpleNamespace(window_start=start + timedelta(minutes=i), engagement_score=float(i % 2 * 100))
+            for i in range(150)
+        ]
+        curve = session_summary_service._curve_digest(start, windows)
+        self.assertLessEqual(len(curve), session_summary_service.CURVE_POINTS)
+        self.assertEqual(curve[0], [0.0, 33.33])
+        self.assertEqual(curve[1][0], 3.0)
+        self.assertEqual(session_summary_service._curve_digest(start, []), [])
@@ -0,0 +1,102 @@
+import json
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+import requests
+
+from ml_engine.run_detector import TickJournal, TickSender
+
+
+def _tick(second: int) -> dict:
+    return {"captured_at": f"2026-10-19T09:00:{second:02d}+00:00", "on_task": second}
+
+
+class _FakeHTTP:
+    """Stands in for requests.Session: answers posts with the queued status codes."""
+
+    def __init__(self, *statuses) -> None:
+        self.statuses = list(statuses)
+        self.posted: list[list[dict]] = []
+
+    def post(self, _url, json, timeout):
+        self.posted.append(json["ticks"])
+        status = self.statuses.pop(0)
+        if isinstance(status, Exception):
+            raise status
+        return SimpleNamespace(status_code=status, text="", json=lambda: {"accepted": len(json["ticks"])})
+
+
+class TestTickJournal(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = Path(tempfile.mkdtemp())
+
+    def test_acknowledged_offset_survives_reopen(self) -> None:
+        journal = TickJournal(self.directory, 7)
+        journal.append([_tick(0), _tick(1), _tick(2)])
+        ticks, end = journal.peek(2)
+        self.assertEqual(ticks, [_tick(0), _tick(1)])
+        journal.ack(end, len(ticks))
+
+        reopened = TickJournal(self.directory, 7)
+        self.assertEqual(reopened.pending, 1)
+        self.assertEqual(reopened.peek(10), ([_tick(2)], reopened.path.stat().st_size))
+        reopened.ack(reopened.peek(10)[1], 1)
+        self.assertFalse(reopened.path.exists())
+        self.assertFalse(reopened.offset_path.exists())
+
+    def test_torn_final_line_is_dropped(self) -> None:
+        journal = TickJournal(self.directory, 7)
+        journal.append([_tick(0), _tick(1)])
+        with journal.path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(_tick(2))[:10])
+
+        reopened = TickJournal(self.directory, 7)
+        self.assertEqual(reopened.pending, 2)
+        self.assertEqual(reopened.peek(10)[0], [_tick(0), _tick(1)])
+        reopened.append([_tick(3)])
+        self.assertEqual(reopened.peek(10)[0], [_tick(0), _tick(1), _tick(3)])
+
+
+class TestTickSender(unittest.TestCase):
+    def setUp(self) -> None:
+        self.journal = TickJournal(Path(tempfile.mkdtemp()), 7)
+        self.sender = TickSender("http://api/sessions/7/logs/batch", self.journal, token=None, batch_size=10)
+        # Each test swaps in a _FakeHTTP.
+        self.sender.http.close()
+
+    def _send(self, *ticks) -> None:
+        for tick in ticks:
+            self.sender.submit(tick)
+        self.sender._step(wait=0.0)
+
+    def test_server_errors_spool_and_back_off_then_replay_in_order(self) -> None:
+        self.sender.http = _FakeHTTP(503, requests.ConnectionError("down"), 200)
+        self._send(_tick(0))
+        self.assertEqual(self.journal.pending, 1)
+        self.assertAlmostEqual(self.sender._next_attempt - time.monotonic(), 1.0, delta=0.5)
+
+        # Still backing off: new ticks queue behind the backlog without a request.
+        self._send(_tick(1))
+        self.assertEqual(len(self.sender.http.posted), 1)
+        self.assertEqual(self.journal.pending, 2)
+
+        self.sender._next_attempt = 0.0
+        self.sender._step(wait=0.0)
+        self.assertEqual(self.sender._failures, 2)
+        self.assertAlmostEqual(self.sender._next_attempt - time.monotonic(), 2.0, delta=0.5)
+
+        self.sender._next_attempt = 0.0
+        self.sender._step(wait=0.0)
+        self.assertEqual(self.sender.http.posted[-1], [_tick(0), _tick(1)])
+        self.assertEqual(self.journal.pending, 0)
+        self.assertEqual(self.sender._failures, 0)
+
+    def test_permanent_client_errors_drop_the_batch(self) -> None:
+        self.sender.http = _FakeHTTP(422)
+        self._send(_tick(0), _tick(1))
+        self.assertEqual(self.sender.http.posted, [[_tick(0), _tick(1)]])
+        self.assertEqual(self.journal.pending, 0)
+        self.assertEqual(self.sender._failures, 0)
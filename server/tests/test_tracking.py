@@ -0,0 +1,33 @@
+import unittest
+
+import numpy as np
+
+from app.utils.detection import Detections
+from app.utils.tracking import BehaviorTracker
+
+
+NAMES = {0: "on_task", 1: "sleeping", 2: "using_phone", 3: "off_task"}
+
+
+def _tick(rows: list[tuple[int, float, float, float, float]]) -> Detections:
+    if not rows:
+        return Detections.empty()
+    arr = np.asarray(rows, dtype=np.float32)
+    return Detections(cls=arr[:, 0].astype(np.int32), conf=np.full(len(rows), 0.9, np.float32), boxes=arr[:, 1:5])
+
+
+class TestBehaviorTracker(unittest.TestCase):
+    def test_single_tick_flicker_is_suppressed(self) -> None:
+        tracker = BehaviorTracker(switch_ticks=2)
+        seen = [
+            tracker.update(_tick([(cls, 10, 10, 50, 90), (0, 100, 10, 140, 90)]), NAMES, 0.5)
+            for cls in (0, 3, 0, 3, 3)
+        ]
+        self.assertEqual([c["on_task"] for c in seen], [2, 2, 2, 2, 1])
+        self.assertEqual([c["off_task"] for c in seen], [0, 0, 0, 0, 1])
+
+    def test_missed_student_keeps_counting_briefly(self) -> None:
+        tracker = BehaviorTracker(max_missed_ticks=1)
+        student = [(1, 10, 10, 50, 90)]
+        totals = [sum(tracker.update(_tick(rows), NAMES, 0.5).values()) for rows in (student, [], [], student)]
+        self.assertEqual(totals, [1, 1, 0, 1])
@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import cv2
+import numpy as np
+
+from app.services import video_analysis_service
+from app.utils.datetime import utc_now
+
+
+class TestSampledFrames(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = os.path.join(self._tmp.name, "clip.avi")
+        writer = cv2.VideoWriter(self.path, cv2.VideoWriter_fourcc(*"MJPG"), 10, (64, 48))
+        for index in range(95):
+            # Encode the frame index in the brightness so samples can be identified.
+            writer.write(np.full((48, 64, 3), index * 2, dtype=np.uint8))
+        writer.release()
+
+    def _sample(self, seek: bool) -> list[tuple[float, int]]:
+        fps, frame_count = video_analysis_service.probe_video(self.path)
+        cap = cv2.VideoCapture(self.path)
+        try:
+            return [
+                (offset, int(round(frame.mean() / 2)))
+                for offset, frame in video_analysis_service.iter_sampled_frames(
+                    cap, fps, 3.0, frame_count, seek=seek
+                )
+            ]
+        finally:
+            cap.release()
+
+    def test_samples_every_interval(self) -> None:
+        samples = self._sample(seek=False)
+        self.assertEqual([offset for offset, _ in samples], [0.0, 3.0, 6.0, 9.0])
+        self.assertEqual([index for _, index in samples], [0, 30, 60, 90])
+
+    def test_seek_and_grab_agree(self) -> None:
+        self.assertEqual(self._sample(seek=True), self._sample(seek=False))
+
+
+class TestAnalysisJobs(unittest.TestCase):
+    def test_finished_jobs_are_dropped_after_the_retention_window(self) -> None:
+        now = utc_now()
+        jobs = {
+            "old": {"finished_at": now - video_analysis_service.JOB_RETENTION * 2, "result": {}},
+            "recent": {"finished_at": now, "result": {}},
+            "running": {"finished_at": None, "result": None},
+        }
+        with mock.patch.object(video_analysis_service, "_jobs", jobs):
+            self.assertIsNone(video_analysis_service.get_analysis_job("old"))
+            self.assertEqual(sorted(jobs), ["recent", "running"])